@@ -4,6 +4,7 @@ from .models import (
     LLMConfig,
     LLMConfigVersion,
     LLMUsageLog,
+    LLMUsageCounter,
     AuditLog,
     Notification,
     BroadcastMessage,
@@ -141,6 +142,12 @@ class LLMUsageLogAdmin(admin.ModelAdmin):
     list_filter = ('model_name', 'success', 'created_at')
 
 
+@admin.register(LLMUsageCounter)
+class LLMUsageCounterAdmin(admin.ModelAdmin):
+    list_display = ('month', 'model_name', 'request_type', 'calls', 'failed_calls', 'total_tokens', 'cost_total')
+    list_filter = ('month', 'model_name', 'request_type')
+
+
 @admin.register(AuditLog)
 class AuditLogAdmin(admin.ModelAdmin):
     list_display = (
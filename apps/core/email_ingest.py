@@ -69,6 +69,7 @@ def _ai_fallback(subject: str, body: str) -> dict:
     """
     try:
         import json
+        from core.llm_throttle import LLMBudgetExceeded
         from resumes.services import LLMService
     except Exception as exc:
         return {"status": EmailEvent.DetectedStatus.UNKNOWN, "confidence": 0, "error": str(exc)}
@@ -89,14 +90,18 @@ def _ai_fallback(subject: str, body: str) -> dict:
         "Return JSON only."
     )
 
-    content, _tokens, error = llm.generate_with_prompts(
-        job=None,
-        consultant=None,
-        system_prompt=system_prompt,
-        user_prompt=user_prompt,
-        actor=None,
-        temperature_override=0.0,
-    )
+    try:
+        content, _tokens, error = llm.generate_with_prompts(
+            job=None,
+            consultant=None,
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            actor=None,
+            temperature_override=0.0,
+        )
+    except LLMBudgetExceeded as exc:
+        # The poll marks messages seen, so a retry would not see this one again; leave it for review
+        return {"status": EmailEvent.DetectedStatus.UNKNOWN, "confidence": 0, "error": f"llm_busy: {exc}"}
     if error or not content:
         return {"status": EmailEvent.DetectedStatus.UNKNOWN, "confidence": 0, "error": error or "empty_response"}
 
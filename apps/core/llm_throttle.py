@@ -0,0 +1,289 @@
+"""
+Cross-process LLM concurrency and tokens-per-minute budget.
+
+Background pipelines (e.g. resumes.tasks auto-generation) fan out to many
+Celery workers; llm_slot() keeps the number of in-flight LLM calls across all
+of them at LLM_MAX_CONCURRENCY and the tokens reserved per wall-clock minute
+at LLM_TOKENS_PER_MINUTE (0 = unlimited). State lives in the broker Redis
+(core.shared_state): one SET NX EX key per concurrency slot (leased with a
+timeout so a killed worker cannot leak it) and one INCRBY counter per minute,
+checked and rolled back atomically in a Lua script. Without Redis (memory
+broker, or Redis down) it falls back to the Django cache, which is LocMem and
+therefore only enforces the limits per process.
+
+Celery tasks (in_task()) may hold at most LLM_BACKGROUND_CONCURRENCY of the
+slots (default: all but one), so a fan-out that keeps every background slot
+busy still leaves capacity for interactive generate / regenerate calls, which
+may use any slot.
+
+When the budget is exhausted llm_slot() raises LLMBudgetExceeded with a
+retry_after hint. Inside a task callers re-raise it so the task can
+self.retry(countdown=...); web requests wait at most
+LLM_INTERACTIVE_WAIT_SECONDS for a slot and then show exc.user_message()
+rather than holding a gunicorn worker in sleep().
+A reservation that is not settled because the call raised is refunded.
+
+llm_slot() is reentrant per thread: the LLM call sites (resumes.engine,
+resumes.services.LLMService) take a slot themselves, and when a caller such
+as the auto-draft task already holds one the inner slot is a no-op, so a call
+is never counted twice.
+
+Usage:
+    with llm_slot(estimated_tokens=6000) as reservation:
+        content, tokens, error, meta = generate_resume(...)
+        reservation.settle(tokens)
+"""
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+import redis
+from django.conf import settings
+from django.core.cache import cache
+
+from .shared_state import get_redis, mark_unavailable
+
+SLOT_KEY = "core:llm:slot:{n}"
+TPM_KEY = "core:llm:tpm:{minute}"
+SLOT_POLL_SECONDS = 0.5
+CHARS_PER_TOKEN = 4
+TPM_KEY_TTL = 120
+
+# KEYS[1] = minute bucket; ARGV = tokens, limit. Returns the new total, or -1 (rolled back)
+# when the reservation would overflow a bucket that already had usage.
+_RESERVE_LUA = """
+local used = redis.call('INCRBY', KEYS[1], ARGV[1])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+if used > tonumber(ARGV[2]) and used ~= tonumber(ARGV[1]) then
+  redis.call('DECRBY', KEYS[1], ARGV[1])
+  return -1
+end
+return used
+"""
+# Adjust a bucket only while it still exists (an expired minute needs no correction).
+_ADJUST_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+  return redis.call('INCRBY', KEYS[1], ARGV[1])
+end
+return 0
+"""
+# Release a slot only if this holder still owns the lease.
+_RELEASE_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+_held = threading.local()
+
+
+class LLMBudgetExceeded(Exception):
+    """No concurrency slot or per-minute token budget available right now."""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+    def user_message(self) -> str:
+        return f"The AI service is busy right now. Please try again in {self.retry_after}s."
+
+
+def in_task() -> bool:
+    """True while running inside a Celery task (worker or eager apply())."""
+    from celery import current_task
+
+    return bool(current_task and current_task.request.id)
+
+
+def _max_concurrency() -> int:
+    return max(1, int(getattr(settings, "LLM_MAX_CONCURRENCY", 4)))
+
+
+def _background_concurrency() -> int:
+    """Slots Celery tasks may hold (LLM_BACKGROUND_CONCURRENCY, 0 = all but one)."""
+    total = _max_concurrency()
+    configured = int(getattr(settings, "LLM_BACKGROUND_CONCURRENCY", 0) or 0)
+    return min(total, configured) if configured > 0 else max(1, total - 1)
+
+
+def _tokens_per_minute() -> int:
+    return max(0, int(getattr(settings, "LLM_TOKENS_PER_MINUTE", 0)))
+
+
+def _seconds_to_next_minute() -> int:
+    return 60 - int(time.time()) % 60 + 1
+
+
+def estimate_tokens(*texts: str, max_output_tokens: int = 0) -> int:
+    """Rough prompt + completion token count for a reservation (settled with real usage later)."""
+    return sum(len(t or "") for t in texts) // CHARS_PER_TOKEN + int(max_output_tokens or 0)
+
+
+def reserve_tokens(tokens: int) -> int:
+    """
+    Add `tokens` to this minute's counter; returns the minute bucket used.
+
+    Raises LLMBudgetExceeded when the reservation would exceed the budget
+    (a single request larger than the whole budget still runs in an empty minute).
+    """
+    minute = int(time.time() // 60)
+    limit = _tokens_per_minute()
+    if not limit or tokens <= 0:
+        return minute
+    key = TPM_KEY.format(minute=minute)
+    if not _reserve_in_bucket(key, tokens, limit):
+        raise LLMBudgetExceeded(
+            f"LLM token budget of {limit}/min exhausted", retry_after=_seconds_to_next_minute()
+        )
+    return minute
+
+
+def adjust_tokens(minute: int, delta: int) -> None:
+    """Correct a reservation once the real usage is known (delta may be negative)."""
+    if not delta or not _tokens_per_minute():
+        return
+    key = TPM_KEY.format(minute=minute)
+    client = get_redis()
+    if client is not None:
+        try:
+            client.eval(_ADJUST_LUA, 1, key, delta)
+            return
+        except redis.RedisError as exc:
+            mark_unavailable(exc)
+    try:
+        if delta > 0:
+            cache.incr(key, delta)
+        else:
+            cache.decr(key, -delta)
+    except ValueError:
+        pass  # bucket already expired
+
+
+def tokens_used_this_minute() -> int:
+    key = TPM_KEY.format(minute=int(time.time() // 60))
+    client = get_redis()
+    if client is not None:
+        try:
+            return int(client.get(key) or 0)
+        except redis.RedisError as exc:
+            mark_unavailable(exc)
+    return int(cache.get(key) or 0)
+
+
+def _reserve_in_bucket(key: str, tokens: int, limit: int) -> bool:
+    client = get_redis()
+    if client is not None:
+        try:
+            return int(client.eval(_RESERVE_LUA, 1, key, tokens, limit, TPM_KEY_TTL)) >= 0
+        except redis.RedisError as exc:
+            mark_unavailable(exc)
+    cache.add(key, 0, timeout=TPM_KEY_TTL)
+    try:
+        used = cache.incr(key, tokens)
+    except ValueError:  # expired between add() and incr()
+        cache.set(key, tokens, timeout=TPM_KEY_TTL)
+        used = tokens
+    if used > limit and used != tokens:
+        cache.decr(key, tokens)
+        return False
+    return True
+
+
+def _acquire_slot(key: str, token: str, lease: int) -> bool:
+    client = get_redis()
+    if client is not None:
+        try:
+            return bool(client.set(key, token, nx=True, ex=lease))
+        except redis.RedisError as exc:
+            mark_unavailable(exc)
+    return cache.add(key, token, timeout=lease)
+
+
+def _release_slot(key: str, token: str) -> None:
+    client = get_redis()
+    if client is not None:
+        try:
+            client.eval(_RELEASE_LUA, 1, key, token)
+            return
+        except redis.RedisError as exc:
+            mark_unavailable(exc)
+    if cache.get(key) == token:
+        cache.delete(key)
+
+
+class Reservation:
+    def __init__(self, minute: int | None, estimated_tokens: int):
+        self.minute = minute
+        self.estimated_tokens = estimated_tokens
+        self.settled = False
+
+    def settle(self, actual_tokens: int) -> None:
+        if self.minute is None:  # nested inside another slot; the outer one settles
+            return
+        adjust_tokens(self.minute, int(actual_tokens or 0) - self.estimated_tokens)
+        self.estimated_tokens = int(actual_tokens or 0)
+        self.settled = True
+
+
+@contextmanager
+def llm_slot(estimated_tokens: int = 0, *, wait_seconds: float | None = None, background: bool | None = None):
+    """
+    Hold one of LLM_MAX_CONCURRENCY slots (waiting up to wait_seconds for one)
+    with `estimated_tokens` reserved against this minute's budget.
+
+    Inside Celery tasks only the first LLM_BACKGROUND_CONCURRENCY slots are
+    tried and wait_seconds defaults to LLM_SLOT_WAIT_SECONDS; elsewhere every
+    slot is tried, the reserved ones first, for up to
+    LLM_INTERACTIVE_WAIT_SECONDS. If the block raises before settle(), the
+    reservation is refunded. Pass `background` explicitly from worker threads,
+    where in_task() cannot see the Celery task that started them.
+    """
+    if getattr(_held, "depth", 0):
+        _held.depth += 1
+        try:
+            yield Reservation(None, 0)
+        finally:
+            _held.depth -= 1
+        return
+    if background is None:
+        background = in_task()
+    if background:
+        slots = range(_background_concurrency())
+    else:
+        slots = range(_max_concurrency() - 1, -1, -1)
+    if wait_seconds is None:
+        wait_seconds = getattr(
+            settings, "LLM_SLOT_WAIT_SECONDS" if background else "LLM_INTERACTIVE_WAIT_SECONDS",
+            10 if background else 3,
+        )
+    lease = int(getattr(settings, "LLM_SLOT_LEASE_SECONDS", 300))
+    minute = reserve_tokens(estimated_tokens)
+    token = uuid.uuid4().hex
+    held = None
+    deadline = time.monotonic() + wait_seconds
+    while held is None:
+        for n in slots:
+            key = SLOT_KEY.format(n=n)
+            if _acquire_slot(key, token, lease):
+                held = key
+                break
+        if held is None:
+            if time.monotonic() >= deadline:
+                adjust_tokens(minute, -estimated_tokens)
+                raise LLMBudgetExceeded("All LLM concurrency slots are busy", retry_after=5)
+            time.sleep(SLOT_POLL_SECONDS)
+    _held.depth = 1
+    reservation = Reservation(minute, estimated_tokens)
+    try:
+        yield reservation
+    except BaseException:
+        if not reservation.settled:
+            reservation.settle(0)
+        raise
+    finally:
+        _held.depth = 0
+        _release_slot(held, token)
@@ -0,0 +1,147 @@
+"""
+Monthly LLM usage ledger (LLMUsageCounter) and the token-cap check.
+
+Every LLMUsageLog insert bumps its (month, model, request type) counter with
+F() expressions (core.signals), so the cap check before each generation sums a
+handful of counter rows instead of scanning the month's logs. Counters drift
+only if logs are created with bulk_create() / raw SQL or deleted;
+reconcile_usage_counters() (daily Celery task) rebuilds a month from the logs.
+
+The per-minute token budget and concurrency limit live in core.llm_throttle.
+"""
+from __future__ import annotations
+
+import datetime
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from .models import LLMUsageCounter, LLMUsageLog
+
+CAP_REACHED_MESSAGE = "Monthly token cap reached. Generation disabled."
+
+
+def month_start(when: datetime.datetime | None = None) -> datetime.date:
+    """First day of the UTC month containing `when` (default: now)."""
+    when = (when or timezone.now()).astimezone(datetime.timezone.utc)
+    return when.date().replace(day=1)
+
+
+def _month_bounds(month: datetime.date) -> tuple[datetime.datetime, datetime.datetime]:
+    utc = datetime.timezone.utc
+    start = datetime.datetime(month.year, month.month, 1, tzinfo=utc)
+    if month.month == 12:
+        return start, datetime.datetime(month.year + 1, 1, 1, tzinfo=utc)
+    return start, datetime.datetime(month.year, month.month + 1, 1, tzinfo=utc)
+
+
+def record_usage(log: LLMUsageLog) -> None:
+    """Add one log row to its counter (insert-or-increment, safe under concurrency)."""
+    key = {
+        "month": month_start(log.created_at),
+        "model_name": (log.model_name or "")[:100],
+        "request_type": (log.request_type or "")[:50],
+    }
+    deltas = {
+        "calls": 1,
+        "failed_calls": 0 if log.success else 1,
+        "prompt_tokens": log.prompt_tokens or 0,
+        "completion_tokens": log.completion_tokens or 0,
+        "total_tokens": log.total_tokens or 0,
+        "cost_total": Decimal(log.cost_total or 0),
+    }
+    increments = {field: F(field) + value for field, value in deltas.items()}
+    increments["updated_at"] = timezone.now()
+    if LLMUsageCounter.objects.filter(**key).update(**increments):
+        return
+    try:
+        with transaction.atomic():
+            LLMUsageCounter.objects.create(**key, **deltas)
+    except IntegrityError:  # another process created the row first
+        LLMUsageCounter.objects.filter(**key).update(**increments)
+
+
+def month_totals(month: datetime.date | None = None) -> dict:
+    """{"calls", "failed_calls", "tokens", "cost"} for a month (default: current)."""
+    agg = LLMUsageCounter.objects.filter(month=month or month_start()).aggregate(
+        calls=Sum("calls"),
+        failed_calls=Sum("failed_calls"),
+        tokens=Sum("total_tokens"),
+        cost=Sum("cost_total"),
+    )
+    return {key: value or 0 for key, value in agg.items()}
+
+
+def month_tokens(month: datetime.date | None = None) -> int:
+    return int(month_totals(month)["tokens"])
+
+
+def monthly_cap_reached(config) -> bool:
+    """
+    True when config.monthly_token_cap is used up and auto_disable_on_cap is on;
+    generation is switched off as a side effect (same behaviour as before the ledger).
+    """
+    if not config.monthly_token_cap or not config.auto_disable_on_cap:
+        return False
+    if month_tokens() < config.monthly_token_cap:
+        return False
+    config.generation_enabled = False
+    config.save()
+    return True
+
+
+def reconcile_usage_counters(month: datetime.date | None = None) -> dict:
+    """
+    Recompute one month's counters from LLMUsageLog and overwrite them.
+
+    Returns {"month", "rows", "drift_tokens"} where drift_tokens is how far the
+    running counters were off before the rebuild.
+    """
+    month = month or month_start()
+    start, end = _month_bounds(month)
+    before = month_tokens(month)
+    grouped = (
+        LLMUsageLog.objects.filter(created_at__gte=start, created_at__lt=end)
+        .values("model_name", "request_type")
+        .annotate(
+            calls=Count("id"),
+            failed_calls=Count("id", filter=Q(success=False)),
+            prompt_tokens=Sum("prompt_tokens"),
+            completion_tokens=Sum("completion_tokens"),
+            total_tokens=Sum("total_tokens"),
+            cost_total=Sum("cost_total"),
+        )
+    )
+    rows = [
+        LLMUsageCounter(
+            month=month,
+            model_name=g["model_name"][:100],
+            request_type=g["request_type"][:50],
+            calls=g["calls"],
+            failed_calls=g["failed_calls"],
+            prompt_tokens=g["prompt_tokens"] or 0,
+            completion_tokens=g["completion_tokens"] or 0,
+            total_tokens=g["total_tokens"] or 0,
+            cost_total=g["cost_total"] or 0,
+        )
+        for g in grouped
+    ]
+    with transaction.atomic():
+        stale = LLMUsageCounter.objects.filter(month=month)
+        for row in rows:
+            stale = stale.exclude(model_name=row.model_name, request_type=row.request_type)
+        stale.delete()
+        if rows:
+            LLMUsageCounter.objects.bulk_create(
+                rows,
+                update_conflicts=True,
+                unique_fields=["month", "model_name", "request_type"],
+                update_fields=[
+                    "calls", "failed_calls", "prompt_tokens", "completion_tokens",
+                    "total_tokens", "cost_total", "updated_at",
+                ],
+            )
+    after = sum(r.total_tokens for r in rows)
+    return {"month": month.isoformat(), "rows": len(rows), "drift_tokens": after - before}
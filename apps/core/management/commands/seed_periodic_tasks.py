@@ -106,6 +106,16 @@ TASKS = [
         "kwargs": {},
     },
 
+    {
+        "name": "LLM — reconcile usage counters",
+        "task": "core.reconcile_llm_usage_counters",
+        "category": "reports",
+        "description": "Rebuilds the monthly LLM token/cost counters (used by the token cap) from the usage log.",
+        "cron": {"minute": "15", "hour": "0", "day_of_week": "*", "day_of_month": "*", "month_of_year": "*"},
+        "schedule_label": "Daily 00:15 UTC",
+        "kwargs": {"previous_month_too": True},
+    },
+
     # ── ANALYTICS ──────────────────────────────────────────────────────────
     {
         "name": "Analytics — daily snapshot",
@@ -125,6 +135,26 @@ TASKS = [
         "schedule_label": "Weekly Sunday 02:00 UTC",
         "kwargs": {},
     },
+    {
+        "name": "Matching — refresh consultant job recommendations",
+        "task": "jobs.tasks.refresh_consultant_recommendations_task",
+        "category": "analytics",
+        "description": "Recomputes the stored top jobs per consultant (dashboard recommendations); signals keep it current between runs.",
+        "cron": {"minute": "20", "hour": "*", "day_of_week": "*", "day_of_month": "*", "month_of_year": "*"},
+        "schedule_label": "Hourly at :20",
+        "kwargs": {},
+    },
+
+    # ── RESUMES ────────────────────────────────────────────────────────────
+    {
+        "name": "Resume Exports — purge stale artifacts",
+        "task": "resumes.purge_stale_exports",
+        "category": "resumes",
+        "description": "Deletes cached PDF/DOCX export files rendered more than 30 days ago (re-rendered on next export).",
+        "cron": {"minute": "30", "hour": "5", "day_of_week": "0", "day_of_month": "*", "month_of_year": "*"},
+        "schedule_label": "Weekly Sunday 05:30 UTC",
+        "kwargs": {"older_than_days": 30},
+    },
 
     # ── HARVEST ENGINE ─────────────────────────────────────────────────────
     {
@@ -152,7 +182,7 @@ TASKS = [
         "description": "Promotes high-quality PENDING RawJobs into the live job pool (quality gate: desc>50 chars).",
         "cron": {"minute": "30", "hour": "6", "day_of_week": "*", "day_of_month": "*", "month_of_year": "*"},
         "schedule_label": "Daily 06:30 UTC",
-        "kwargs": {"max_jobs": 1000},
+        "kwargs": {"max_jobs": 2000},
     },
     {
         "name": "Harvest — cleanup expired jobs",
@@ -174,7 +204,7 @@ TASKS = [
     },
 ]
 
-CATEGORY_ORDER = ["email", "submissions", "jobs", "companies", "reports", "analytics", "harvest"]
+CATEGORY_ORDER = ["email", "submissions", "jobs", "companies", "reports", "analytics", "resumes", "harvest"]
 
 
 class Command(BaseCommand):
@@ -0,0 +1,69 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:55
+
+import datetime
+
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncMonth
+
+
+def backfill_counters(apps, schema_editor):
+    LLMUsageLog = apps.get_model('core', 'LLMUsageLog')
+    LLMUsageCounter = apps.get_model('core', 'LLMUsageCounter')
+    grouped = (
+        LLMUsageLog.objects.annotate(m=TruncMonth('created_at', tzinfo=datetime.timezone.utc))
+        .values('m', 'model_name', 'request_type')
+        .annotate(
+            calls=Count('id'),
+            failed_calls=Count('id', filter=Q(success=False)),
+            prompt_tokens=Sum('prompt_tokens'),
+            completion_tokens=Sum('completion_tokens'),
+            total_tokens=Sum('total_tokens'),
+            cost_total=Sum('cost_total'),
+        )
+    )
+    LLMUsageCounter.objects.bulk_create([
+        LLMUsageCounter(
+            month=g['m'].date(),
+            model_name=g['model_name'][:100],
+            request_type=g['request_type'][:50],
+            calls=g['calls'],
+            failed_calls=g['failed_calls'],
+            prompt_tokens=g['prompt_tokens'] or 0,
+            completion_tokens=g['completion_tokens'] or 0,
+            total_tokens=g['total_tokens'] or 0,
+            cost_total=g['cost_total'] or 0,
+        )
+        for g in grouped
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0028_auditlog_advanced_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LLMUsageCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the (UTC) month.')),
+                ('model_name', models.CharField(max_length=100)),
+                ('request_type', models.CharField(max_length=50)),
+                ('calls', models.PositiveIntegerField(default=0)),
+                ('failed_calls', models.PositiveIntegerField(default=0)),
+                ('prompt_tokens', models.PositiveBigIntegerField(default=0)),
+                ('completion_tokens', models.PositiveBigIntegerField(default=0)),
+                ('total_tokens', models.PositiveBigIntegerField(default=0)),
+                ('cost_total', models.DecimalField(decimal_places=6, default=0, max_digits=14)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-month', 'model_name', 'request_type'],
+                'constraints': [models.UniqueConstraint(fields=('month', 'model_name', 'request_type'), name='uniq_llm_usage_counter')],
+            },
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
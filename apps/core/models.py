@@ -496,6 +496,38 @@ class LLMUsageLog(models.Model):
         ordering = ['-created_at']
 
 
+class LLMUsageCounter(models.Model):
+    """
+    Running LLMUsageLog totals per (month, model, request type).
+
+    Incremented on every log insert (core.signals) so the monthly token cap is
+    a read of a handful of rows; core.llm_usage.reconcile_usage_counters()
+    rebuilds a month from the logs.
+    """
+
+    month = models.DateField(help_text='First day of the (UTC) month.')
+    model_name = models.CharField(max_length=100)
+    request_type = models.CharField(max_length=50)
+    calls = models.PositiveIntegerField(default=0)
+    failed_calls = models.PositiveIntegerField(default=0)
+    prompt_tokens = models.PositiveBigIntegerField(default=0)
+    completion_tokens = models.PositiveBigIntegerField(default=0)
+    total_tokens = models.PositiveBigIntegerField(default=0)
+    cost_total = models.DecimalField(max_digits=14, decimal_places=6, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-month', 'model_name', 'request_type']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['month', 'model_name', 'request_type'], name='uniq_llm_usage_counter',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.month:%Y-%m} {self.model_name} {self.request_type}: {self.total_tokens}'
+
+
 class FeatureFlag(models.Model):
     """
     Centralized feature toggles (replaces ad-hoc booleans over time).
@@ -0,0 +1,136 @@
+"""
+Redis client for state that every web and worker process must agree on.
+
+The Django cache is LocMemCache, i.e. private to one process, so counters,
+leases and generation keys that have to hold across gunicorn workers and
+Celery workers (core.llm_throttle, list-count generations, debounce keys) go
+to the broker Redis instead: SHARED_STATE_REDIS_URL, defaulting to
+CELERY_BROKER_URL.
+
+get_redis() returns None when that URL is not a redis:// URL (memory broker
+in the local harvester settings) or the server has just failed; callers then
+fall back to the Django cache, which is only exact within a single process.
+"""
+from __future__ import annotations
+
+import logging
+import time
+
+import redis
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# After a connection error, use the local fallback for this long before trying again
+RETRY_AFTER_ERROR_SECONDS = 30
+
+_client = None
+_client_url = None
+_down_until = 0.0
+
+
+def shared_state_url() -> str:
+    url = getattr(settings, "SHARED_STATE_REDIS_URL", None)
+    if url is None:
+        url = getattr(settings, "CELERY_BROKER_URL", "") or ""
+    return url if url.startswith(("redis://", "rediss://", "unix://")) else ""
+
+
+def get_redis():
+    """Shared Redis client, or None when shared state is unavailable."""
+    global _client, _client_url
+    url = shared_state_url()
+    if not url or time.monotonic() < _down_until:
+        return None
+    if _client is None or _client_url != url:
+        _client = redis.Redis.from_url(url, socket_connect_timeout=1, socket_timeout=2)
+        _client_url = url
+    return _client
+
+
+def mark_unavailable(exc: Exception) -> None:
+    """Record a Redis failure so callers use their local fallback for a while."""
+    global _down_until
+    if time.monotonic() >= _down_until:
+        logger.warning("Shared state Redis unavailable, using per-process cache: %s", exc)
+    _down_until = time.monotonic() + RETRY_AFTER_ERROR_SECONDS
+
+
+def add_flag(key: str, timeout: int | None) -> bool:
+    """Set `key` unless it exists (SET NX); True when this call set it."""
+    client = get_redis()
+    if client is not None:
+        try:
+            return bool(client.set(key, 1, nx=True, ex=timeout))
+        except redis.RedisError as exc:
+            mark_unavailable(exc)
+    return cache.add(key, True, timeout=timeout)
+
+
+def has_flag(key: str) -> bool:
+    client = get_redis()
+    if client is not None:
+        try:
+            return bool(client.exists(key))
+        except redis.RedisError as exc:
+            mark_unavailable(exc)
+    return bool(cache.get(key))
+
+
+def set_flags(keys: list[str], timeout: int | None = None) -> None:
+    if not keys:
+        return
+    client = get_redis()
+    if client is not None:
+        try:
+            with client.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.set(key, 1, ex=timeout)
+                pipe.execute()
+            return
+        except redis.RedisError as exc:
+            mark_unavailable(exc)
+    cache.set_many({key: True for key in keys}, timeout=timeout)
+
+
+def delete_flag(key: str) -> None:
+    client = get_redis()
+    if client is not None:
+        try:
+            client.delete(key)
+            return
+        except redis.RedisError as exc:
+            mark_unavailable(exc)
+    cache.delete(key)
+
+
+def incr_generation(key: str, timeout: int | None = None) -> int:
+    """Bump a cache-generation counter for every process; returns the new value."""
+    client = get_redis()
+    if client is not None:
+        try:
+            with client.pipeline() as pipe:
+                pipe.incr(key)
+                if timeout:
+                    pipe.expire(key, timeout)
+                return int(pipe.execute()[0])
+        except redis.RedisError as exc:
+            mark_unavailable(exc)
+    cache.add(key, 0, timeout=timeout)
+    try:
+        return int(cache.incr(key))
+    except ValueError:  # expired between add() and incr()
+        cache.set(key, 1, timeout=timeout)
+        return 1
+
+
+def get_generation(key: str) -> int:
+    """Current value of a counter bumped by incr_generation (0 when unset)."""
+    client = get_redis()
+    if client is not None:
+        try:
+            return int(client.get(key) or 0)
+        except redis.RedisError as exc:
+            mark_unavailable(exc)
+    return int(cache.get(key) or 0)
@@ -1,7 +1,7 @@
 from django.db.models.signals import post_save, m2m_changed
 from django.dispatch import receiver
 
-from .models import PlatformConfig, FeatureFlag, EmployeeDesignation
+from .models import PlatformConfig, FeatureFlag, EmployeeDesignation, LLMUsageLog
 from .feature_flags import invalidate_feature_flag_cache
 
 
@@ -20,6 +20,15 @@ def invalidate_flags_on_designation_m2m(sender, **kwargs):
     invalidate_feature_flag_cache()
 
 
+@receiver(post_save, sender=LLMUsageLog)
+def count_llm_usage(sender, instance: LLMUsageLog, created, raw=False, **kwargs):
+    """Keep the monthly LLMUsageCounter ledger current (see core.llm_usage)."""
+    if created and not raw:
+        from .llm_usage import record_usage
+
+        record_usage(instance)
+
+
 @receiver(post_save, sender=PlatformConfig)
 def sync_periodic_tasks(sender, instance: PlatformConfig, **kwargs):
     """
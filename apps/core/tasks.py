@@ -227,3 +227,20 @@ def send_weekly_consultant_pipeline_digest_task():
     return {"sent_count": sent}
 
 
+
+
+@shared_task(name="core.reconcile_llm_usage_counters")
+def reconcile_llm_usage_counters_task(previous_month_too: bool = True):
+    """
+    Rebuild LLMUsageCounter rows from LLMUsageLog (see core.llm_usage).
+
+    Also redoes last month while previous_month_too is set, so logs written
+    around midnight on the 1st are settled.
+    """
+    from core.llm_usage import month_start, reconcile_usage_counters
+
+    current = month_start()
+    results = [reconcile_usage_counters(current)]
+    if previous_month_too:
+        results.append(reconcile_usage_counters((current - timedelta(days=1)).replace(day=1)))
+    return results
@@ -81,6 +81,118 @@ class LLMConfigTests(TestCase):
         self.assertEqual(config.versions.count(), 2)
 
 
+class LLMUsageLedgerTests(TestCase):
+    def _log(self, tokens, model="gpt-4o-mini", request_type="resume_generation", success=True):
+        from .models import LLMUsageLog
+        return LLMUsageLog.objects.create(
+            model_name=model, request_type=request_type, total_tokens=tokens, success=success,
+        )
+
+    def test_logs_increment_monthly_counters(self):
+        from .llm_usage import month_totals
+        from .models import LLMUsageCounter
+
+        self._log(100)
+        self._log(50)
+        self._log(0, success=False)
+        self._log(30, request_type="jd_parse")
+        self.assertEqual(LLMUsageCounter.objects.count(), 2)
+        totals = month_totals()
+        self.assertEqual(totals["calls"], 4)
+        self.assertEqual(totals["failed_calls"], 1)
+        self.assertEqual(totals["tokens"], 180)
+
+    def test_cap_check_reads_counters_and_disables_generation(self):
+        from .llm_usage import monthly_cap_reached
+
+        config = LLMConfig.load()
+        config.monthly_token_cap = 150
+        config.save()
+        self._log(100)
+        self.assertFalse(monthly_cap_reached(config))
+        self._log(60)
+        self.assertTrue(monthly_cap_reached(config))
+        self.assertFalse(LLMConfig.objects.get(pk=1).generation_enabled)
+
+    def test_reconcile_rebuilds_drifted_counters(self):
+        from .llm_usage import month_tokens, reconcile_usage_counters
+        from .models import LLMUsageCounter, LLMUsageLog
+
+        self._log(100)
+        LLMUsageLog.objects.bulk_create([LLMUsageLog(model_name="gpt-4o-mini", total_tokens=40)])  # no signal
+        LLMUsageCounter.objects.create(
+            month=LLMUsageCounter.objects.get().month, model_name="gone", request_type="x", total_tokens=7,
+        )
+        result = reconcile_usage_counters()
+        self.assertEqual(result["drift_tokens"], 140 - 107)
+        self.assertEqual(month_tokens(), 140)
+        self.assertFalse(LLMUsageCounter.objects.filter(model_name="gone").exists())
+
+    def test_nested_llm_slot_reserves_once(self):
+        from django.core.cache import cache
+        from django.test import override_settings
+        from .llm_throttle import llm_slot, tokens_used_this_minute
+
+        cache.clear()
+        with override_settings(
+            LLM_MAX_CONCURRENCY=1, LLM_TOKENS_PER_MINUTE=10_000, LLM_SLOT_WAIT_SECONDS=0,
+            SHARED_STATE_REDIS_URL="",
+        ):
+            with llm_slot(1000) as outer:
+                with llm_slot(1000) as inner:
+                    inner.settle(5000)
+                outer.settle(1200)
+                self.assertEqual(tokens_used_this_minute(), 1200)
+
+    def test_llm_slot_refunds_reservation_when_the_call_raises(self):
+        from django.core.cache import cache
+        from django.test import override_settings
+        from .llm_throttle import llm_slot, tokens_used_this_minute
+
+        cache.clear()
+        with override_settings(LLM_TOKENS_PER_MINUTE=10_000, SHARED_STATE_REDIS_URL=""):
+            with self.assertRaises(RuntimeError):
+                with llm_slot(4000):
+                    self.assertEqual(tokens_used_this_minute(), 4000)
+                    raise RuntimeError("api down")
+            self.assertEqual(tokens_used_this_minute(), 0)
+
+    def test_background_slots_leave_one_for_interactive_calls(self):
+        from unittest.mock import patch
+        from django.core.cache import cache
+        from django.test import override_settings
+        from .llm_throttle import SLOT_KEY, LLMBudgetExceeded, llm_slot
+
+        cache.clear()
+        cache.add(SLOT_KEY.format(n=0), "busy", timeout=60)  # a running background call
+        with override_settings(
+            LLM_MAX_CONCURRENCY=2, LLM_SLOT_WAIT_SECONDS=0, LLM_INTERACTIVE_WAIT_SECONDS=0,
+            SHARED_STATE_REDIS_URL="",
+        ):
+            with patch("core.llm_throttle.in_task", return_value=True), self.assertRaises(LLMBudgetExceeded):
+                with llm_slot():
+                    pass
+            with llm_slot():
+                self.assertTrue(cache.get(SLOT_KEY.format(n=1)))
+
+    def test_llm_slot_falls_back_to_cache_when_redis_is_down(self):
+        from django.core.cache import cache
+        from django.test import override_settings
+        from . import shared_state
+        from .llm_throttle import llm_slot, tokens_used_this_minute
+
+        cache.clear()
+        self.addCleanup(setattr, shared_state, "_down_until", 0.0)
+        with override_settings(
+            LLM_TOKENS_PER_MINUTE=10_000, LLM_SLOT_WAIT_SECONDS=0,
+            SHARED_STATE_REDIS_URL="redis://127.0.0.1:1/0",
+        ):
+            with llm_slot(500) as reservation:
+                reservation.settle(800)
+            self.assertEqual(tokens_used_this_minute(), 800)
+            self.assertIsNone(shared_state.get_redis())
+
+
 class AuditLogTests(TestCase):
     def test_create_log(self):
         user = User.objects.create_user(username="u1", password="pass")
@@ -925,14 +925,13 @@ class AdminDashboardView(LoginRequiredMixin, UserPassesTestMixin, TemplateView):
 
     def _get_llm_usage_context(self):
         try:
-            month_start = timezone.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-            from core.models import LLMUsageLog
-            llm_qs = LLMUsageLog.objects.filter(created_at__gte=month_start)
+            from core.llm_usage import month_totals
+            totals = month_totals()
             return {
                 'llm_usage': {
-                    'calls': llm_qs.count(),
-                    'tokens': llm_qs.aggregate(t=Sum('total_tokens'))['t'] or 0,
-                    'cost': float(llm_qs.aggregate(c=Sum('cost_total'))['c'] or 0),
+                    'calls': totals['calls'],
+                    'tokens': totals['tokens'],
+                    'cost': float(totals['cost']),
                 },
             }
         except Exception:
@@ -7,6 +7,7 @@ from .models import (
     HarvestRoleCategory,
     HarvestSkippedTitle,
     JobBoardPlatform,
+    LLMPromptCache,
     LocationCache,
     PlatformEngineConfig,
     RawJob,
@@ -119,6 +120,14 @@ class LocationCacheAdmin(admin.ModelAdmin):
     readonly_fields = ["created_at", "looked_up_at"]
 
 
+@admin.register(LLMPromptCache)
+class LLMPromptCacheAdmin(admin.ModelAdmin):
+    list_display = ["cache_key", "kind", "model", "prompt_version", "hit_count", "created_at", "last_hit_at"]
+    list_filter = ["kind", "model", "prompt_version"]
+    search_fields = ["cache_key"]
+    readonly_fields = ["created_at", "last_hit_at"]
+
+
 @admin.register(PlatformEngineConfig)
 class PlatformEngineConfigAdmin(admin.ModelAdmin):
     list_display = ["platform", "auto_backfill", "backfill_priority", "fetch_cadence_hours", "inter_request_delay_ms", "is_active"]
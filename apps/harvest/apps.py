@@ -5,3 +5,6 @@ class HarvestConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "harvest"
     verbose_name = "Harvest Engine"
+
+    def ready(self):
+        from . import signals  # noqa: F401
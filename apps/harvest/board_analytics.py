@@ -16,20 +16,14 @@ from __future__ import annotations
 from datetime import timedelta
 from django.core.cache import cache
 from django.db import models
-from django.db.models import Avg, Case, CharField, Count, F, FloatField, Max, Q, Value, When
+from django.db.models import Avg, Case, Count, F, FloatField, Max, Q, Sum, Value, When
 from django.db.models.functions import Coalesce
 from django.utils import timezone
 
 from .board_capabilities import get_capabilities, capability_gap
-from .services.rawjob_query import (
-    duplicate_rawjob_q,
-    effective_classification_q,
-    json_array_contains_q,
-    production_rawjobs_queryset,
-    ready_stage_q,
-)
+from .services.rawjob_query import effective_classification_q, json_array_contains_q
+from .services.rawjob_rollup import COUNTERS, production_rollup_queryset
 from .enrichments import CURRENT_DOMAIN_VERSION
-from .runtime_config import get_ready_stage_min_confidence
 
 
 # Boards that harvest via Jarvis (manual paste) — excluded from ATS ranking.
@@ -38,6 +32,8 @@ JARVIS_SLUGS = {"jarvis"}
 # Minimum runs required before we trust the risk score.
 MIN_RUNS_FOR_RISK = 5
 CURRENT_ENRICHMENT_VERSION = "v3"
+# Scores reported as averages; the rollup stores their sums and known counts.
+SCORE_FIELDS = ("quality_score", "jd_quality_score", "classification_confidence", "category_confidence", "resume_ready_score")
 BOARD_ANALYTICS_CACHE_TTL = 300
 
 
@@ -217,15 +213,6 @@ def _tone_from_score(score_pct):
     return "bad"
 
 
-def _rawjob_platform_slug_expr():
-    fallback = Coalesce("job_platform__slug", "platform_label__platform__slug", Value("unknown"))
-    return Case(
-        When(Q(platform_slug__isnull=True) | Q(platform_slug=""), then=fallback),
-        default=F("platform_slug"),
-        output_field=CharField(),
-    )
-
-
 def _target_country_q(country_codes: list[str]) -> Q:
     q = Q()
     for code in country_codes:
@@ -235,50 +222,24 @@ def _target_country_q(country_codes: list[str]) -> Q:
     return q or Q(pk__in=[])
 
 
-def _build_board_analytics(window_days: int = 30) -> dict:
+def rawjob_coverage_annotations(*, ready_min_conf: float, target_countries: list[str]) -> dict:
     """
-    Returns a dict with:
-      - platforms: list of per-platform metric rows (ATS boards only, no Jarvis)
-      - jarvis: separate summary for Jarvis/manual ingest
-      - unsupported: list of slugs marked as UNSUPPORTED
-      - generated_at: ISO timestamp
-      - window_days: the run-history window used
+    Field-coverage counts and score sums per RawJob group, stored in
+    RawJobRollup.coverage by reconciliation (services/rawjob_rollup.py).
+    Status/funnel totals come from the rollup counters instead.
     """
-    from harvest.models import CompanyFetchRun, HarvestEngineConfig, JobBoardPlatform, RawJob
+    from harvest.models import RawJob
 
-    now = timezone.now()
-    run_window = now - timedelta(days=window_days)
-    fresh_30d_cutoff = now - timedelta(days=30)
-    target_countries = HarvestEngineConfig.get().get_target_countries()
-    target_country_q = _target_country_q(target_countries)
-    raw_platform_slug = _rawjob_platform_slug_expr()
-    run_platform_slug = Coalesce("label__platform__slug", Value("unknown"))
-
-    # ── 1. Per-platform RawJob metrics (job-level, all-time) ──────────────────
     # Detect which optional fields exist in this DB (handles schema drift gracefully).
     _raw_fields = {f.name for f in RawJob._meta.get_fields()}
 
-    ready_min_conf = get_ready_stage_min_confidence()
-    _field_annotations = {
-        "total":       Count("id"),
-        "synced":      Count("id", filter=Q(sync_status="SYNCED")),
-        "pending":     Count("id", filter=Q(sync_status="PENDING")),
-        "failed_sync": Count("id", filter=Q(sync_status="FAILED")),
-        "skipped":     Count("id", filter=Q(sync_status="SKIPPED")),
-        "duplicate_count": Count("id", filter=duplicate_rawjob_q()),
-        "inactive":    Count("id", filter=Q(is_active=False)),
-        "missing_jd":  Count("id", filter=Q(has_description=False)),
-        "jd_count":    Count("id", filter=Q(has_description=True)),
-        "parsed_count": Count("id", filter=Q(has_description=True)),
-        "enriched_count": Count("id", filter=Q(quality_score__isnull=False) | Q(jd_quality_score__isnull=False)),
-        "classified_count": Count("id", filter=effective_classification_q(min_conf=0.01)),
-        "ready_count": Count("id", filter=ready_stage_q(min_conf=ready_min_conf)),
-        "recent_30d_count": Count("id", filter=Q(fetched_at__gte=fresh_30d_cutoff)),
+    annotations = {
         "current_enrichment_version_count": Count("id", filter=Q(enrichment_version=CURRENT_ENRICHMENT_VERSION)),
         "current_domain_version_count": Count("id", filter=Q(domain_version=CURRENT_DOMAIN_VERSION)),
         "country_code_count": Count("id", filter=~Q(country_code="")),
-        "target_country_count": Count("id", filter=target_country_q),
+        "target_country_count": Count("id", filter=_target_country_q(target_countries)),
         "priority_target_count": Count("id", filter=Q(is_priority=True)),
+        "scope_priority_target_count": Count("id", filter=Q(scope_status="PRIORITY_TARGET")),
         "review_unknown_country_count": Count("id", filter=Q(scope_status="REVIEW_UNKNOWN_COUNTRY")),
         "cold_non_target_country_count": Count("id", filter=Q(scope_status="COLD_NON_TARGET_COUNTRY")),
         "cold_no_location_count": Count("id", filter=Q(scope_status="COLD_NO_LOCATION")),
@@ -330,20 +291,17 @@ def _build_board_analytics(window_days: int = 30) -> dict:
         "classification_confidence_known_count": Count("id", filter=Q(classification_confidence__isnull=False)),
         "category_confidence_known_count": Count("id", filter=Q(category_confidence__isnull=False)),
         "resume_ready_score_known_count": Count("id", filter=Q(resume_ready_score__isnull=False)),
-        "avg_quality_score": Avg("quality_score"),
-        "avg_jd_quality_score": Avg("jd_quality_score"),
-        "avg_classification_confidence": Avg("classification_confidence"),
-        "avg_category_confidence": Avg("category_confidence"),
-        "avg_resume_ready_score": Avg("resume_ready_score"),
     }
+    for field in SCORE_FIELDS:
+        annotations[f"{field}_sum"] = Sum(field)
     # Blocker reason counts (only if sync_skip_reason field exists)
     if "sync_skip_reason" in _raw_fields:
-        _field_annotations["blocked_inactive"]    = Count("id", filter=Q(sync_skip_reason="INACTIVE_POSTING"))
-        _field_annotations["blocked_jd_weak"]     = Count("id", filter=Q(sync_skip_reason="JD_TOO_WEAK"))
-        _field_annotations["blocked_mismatch"]    = Count("id", filter=Q(sync_skip_reason="PLATFORM_MISMATCH"))
-        _field_annotations["blocked_duplicate"]   = Count("id", filter=Q(sync_skip_reason__in=["DUPLICATE_RISK", "DUPLICATE_EXISTING"]))
-        _field_annotations["blocked_no_company"]  = Count("id", filter=Q(sync_skip_reason="COMPANY_UNRESOLVED"))
-    _field_annotations["blocked_low_conf"] = Count(
+        annotations["blocked_inactive"]    = Count("id", filter=Q(sync_skip_reason="INACTIVE_POSTING"))
+        annotations["blocked_jd_weak"]     = Count("id", filter=Q(sync_skip_reason="JD_TOO_WEAK"))
+        annotations["blocked_mismatch"]    = Count("id", filter=Q(sync_skip_reason="PLATFORM_MISMATCH"))
+        annotations["blocked_duplicate"]   = Count("id", filter=Q(sync_skip_reason__in=["DUPLICATE_RISK", "DUPLICATE_EXISTING"]))
+        annotations["blocked_no_company"]  = Count("id", filter=Q(sync_skip_reason="COMPANY_UNRESOLVED"))
+    annotations["blocked_low_conf"] = Count(
         "id",
         filter=(
             Q(sync_status="PENDING", has_description=True, is_active=True)
@@ -352,26 +310,80 @@ def _build_board_analytics(window_days: int = 30) -> dict:
         ),
     )
     if "requirements" in _raw_fields:
-        _field_annotations["has_requirements"] = Count("id", filter=~Q(requirements=""))
+        annotations["has_requirements"] = Count("id", filter=~Q(requirements=""))
     if "responsibilities" in _raw_fields:
-        _field_annotations["has_responsibilities"] = Count("id", filter=~Q(responsibilities=""))
+        annotations["has_responsibilities"] = Count("id", filter=~Q(responsibilities=""))
     if "department" in _raw_fields:
-        _field_annotations["has_department"] = Count("id", filter=~Q(department=""))
+        annotations["has_department"] = Count("id", filter=~Q(department=""))
     if "city" in _raw_fields:
-        _field_annotations["has_geo"] = Count("id", filter=~Q(city="") | ~Q(country=""))
+        annotations["has_geo"] = Count("id", filter=~Q(city="") | ~Q(country=""))
     if "education_required" in _raw_fields:
-        _field_annotations["has_education"] = Count("id", filter=~Q(education_required=""))
+        annotations["has_education"] = Count("id", filter=~Q(education_required=""))
     if "employment_type" in _raw_fields:
-        _field_annotations["has_schedule"] = Count("id", filter=~Q(employment_type="UNKNOWN"))
+        annotations["has_schedule"] = Count("id", filter=~Q(employment_type="UNKNOWN"))
+    return annotations
+
+
+def _add_counts(target: dict, source: dict) -> dict:
+    for key, value in source.items():
+        if isinstance(value, (int, float)):
+            target[key] = target.get(key, 0) + value
+    return target
+
+
+def _rollup_job_metrics(rollup_rows: list[dict], *, fresh_since) -> dict[str, dict]:
+    """Per-platform job metrics keyed like the old per-RawJob aggregate, summed from rollup rows."""
+    status_keys = {"SYNCED": "synced", "PENDING": "pending", "FAILED": "failed_sync", "SKIPPED": "skipped"}
+    by_slug: dict[str, dict] = {}
+    for row in rollup_rows:
+        j = by_slug.setdefault(row["platform_slug"] or "unknown", {})
+        jobs = row["jobs"]
+        _add_counts(j, {
+            "total": jobs,
+            status_keys.get(row["sync_status"], "other_status"): jobs,
+            "duplicate_count": row["duplicates"],
+            "inactive": jobs - row["active"],
+            "missing_jd": jobs - row["with_jd"],
+            "jd_count": row["with_jd"],
+            "parsed_count": row["with_jd"],
+            "enriched_count": row["enriched"],
+            "classified_count": row["classified"],
+            "ready_count": row["ready"],
+            "recent_30d_count": jobs if row["day"] >= fresh_since else 0,
+        })
+        _add_counts(j, row["coverage"] or {})
+    for j in by_slug.values():
+        for field in SCORE_FIELDS:
+            known = j.get(f"{field}_known_count", 0)
+            j[f"avg_{field}"] = (j.get(f"{field}_sum", 0) / known) if known else None
+    return by_slug
 
-    job_qs = (
-        production_rawjobs_queryset()
-        .annotate(metric_slug=raw_platform_slug)
-        .exclude(metric_slug__in=JARVIS_SLUGS)
-        .values("metric_slug")
-        .annotate(**_field_annotations)
+
+def _build_board_analytics(window_days: int = 30) -> dict:
+    """
+    Returns a dict with:
+      - platforms: list of per-platform metric rows (ATS boards only, no Jarvis)
+      - jarvis: separate summary for Jarvis/manual ingest
+      - unsupported: list of slugs marked as UNSUPPORTED
+      - generated_at: ISO timestamp
+      - window_days: the run-history window used
+    """
+    from harvest.models import CompanyFetchRun, HarvestEngineConfig, JobBoardPlatform
+
+    now = timezone.now()
+    run_window = now - timedelta(days=window_days)
+    target_countries = HarvestEngineConfig.get().get_target_countries()
+    run_platform_slug = Coalesce("label__platform__slug", Value("unknown"))
+
+    # ── 1. Per-platform RawJob metrics (job-level, all-time) ──────────────────
+    # Summed from RawJobRollup; coverage counts lag writes until reconciliation.
+    rollup_rows = list(
+        production_rollup_queryset().values("day", "platform_slug", "sync_status", *COUNTERS, "coverage")
     )
-    job_by_slug = {row["metric_slug"]: row for row in job_qs}
+    job_by_slug = _rollup_job_metrics(rollup_rows, fresh_since=timezone.localdate(now) - timedelta(days=29))
+    jarvis_jobs: dict = {}
+    for slug in JARVIS_SLUGS:
+        _add_counts(jarvis_jobs, job_by_slug.pop(slug, {}))
 
     # ── 2. Per-platform Run metrics (run-level, within window) ────────────────
     run_qs = (
@@ -624,14 +636,12 @@ def _build_board_analytics(window_days: int = 30) -> dict:
     ats_rows.sort(key=lambda x: (x["risk_score"] is None, -(x["risk_score"] or 0), -x["total_jobs"]))
 
     # ── 5. Jarvis summary ────────────────────────────────────────────────────
-    jarvis_qs = production_rawjobs_queryset().filter(platform_slug="jarvis")
-    jarvis_total = jarvis_qs.count()
     jarvis_summary = {
-        "total_jobs": jarvis_total,
-        "synced": jarvis_qs.filter(sync_status="SYNCED").count(),
-        "pending": jarvis_qs.filter(sync_status="PENDING").count(),
-        "missing_jd": jarvis_qs.filter(has_description=False).count(),
-        "inactive": jarvis_qs.filter(is_active=False).count(),
+        "total_jobs": jarvis_jobs.get("total", 0),
+        "synced": jarvis_jobs.get("synced", 0),
+        "pending": jarvis_jobs.get("pending", 0),
+        "missing_jd": jarvis_jobs.get("missing_jd", 0),
+        "inactive": jarvis_jobs.get("inactive", 0),
         "note": "Manual/Jarvis ingest — not ranked alongside ATS boards.",
     }
 
@@ -748,21 +758,18 @@ def _build_board_analytics(window_days: int = 30) -> dict:
             "total_synced":  sum(r["synced"]     for r in ats_rows),
             "total_pending": sum(r["pending"]     for r in ats_rows),
         },
-        "scope_summary": _build_scope_summary(target_countries),
+        "scope_summary": _build_scope_summary(target_countries, rollup_rows),
     }
 
 
-def _build_scope_summary(target_countries: list[str]) -> dict:
-    """Top-level Scoped Harvest Routing card. Single aggregate query, fast.
+def _build_scope_summary(target_countries: list[str], rollup_rows: list[dict]) -> dict:
+    """Top-level Scoped Harvest Routing card, summed from the production rollup rows.
 
     Returns counts + percentages for the 4 scope statuses, plus the top 8
     countries ranked by row count so the user sees both the routing split
     and where their unresolved/non-target volume is concentrated.
     """
-    from .models import RawJob
-
-    base = production_rawjobs_queryset()
-    total = base.count()
+    total = sum(row["jobs"] for row in rollup_rows)
     if total == 0:
         return {
             "total": 0,
@@ -771,11 +778,12 @@ def _build_scope_summary(target_countries: list[str]) -> dict:
             "target_countries": list(target_countries or []),
         }
 
-    by_status = dict(
-        base.values("scope_status")
-        .annotate(c=Count("id"))
-        .values_list("scope_status", "c")
-    )
+    scope: dict = {}
+    countries: dict = {}
+    for row in rollup_rows:
+        coverage = row["coverage"] or {}
+        _add_counts(scope, coverage)
+        _add_counts(countries, coverage.get("countries") or {})
 
     def _row(label: str, key: str, count: int, tone: str) -> dict:
         return {
@@ -788,23 +796,20 @@ def _build_scope_summary(target_countries: list[str]) -> dict:
 
     rows = [
         _row("Priority Target",   "PRIORITY_TARGET",
-             by_status.get("PRIORITY_TARGET", 0), "good"),
+             scope.get("scope_priority_target_count", 0), "good"),
         _row("Review (Unknown)",  "REVIEW_UNKNOWN_COUNTRY",
-             by_status.get("REVIEW_UNKNOWN_COUNTRY", 0), "warn"),
+             scope.get("review_unknown_country_count", 0), "warn"),
         _row("Cold Non-Target",   "COLD_NON_TARGET_COUNTRY",
-             by_status.get("COLD_NON_TARGET_COUNTRY", 0), "muted"),
+             scope.get("cold_non_target_country_count", 0), "muted"),
         _row("No Location",       "COLD_NO_LOCATION",
-             by_status.get("COLD_NO_LOCATION", 0), "muted"),
+             scope.get("cold_no_location_count", 0), "muted"),
     ]
 
-    top_countries = list(
-        base.exclude(country_code="")
-        .values("country_code")
-        .annotate(c=Count("id"))
-        .order_by("-c")[:8]
-    )
+    top_countries = [
+        {"country_code": code, "count": count}
+        for code, count in sorted(countries.items(), key=lambda item: (-item[1], item[0]))[:8]
+    ]
     for tc in top_countries:
-        tc["count"] = tc.pop("c")
         tc["pct"] = round(100.0 * tc["count"] / total, 1) if total else 0.0
         tc["is_target"] = tc["country_code"] in (target_countries or [])
 
@@ -11,8 +11,11 @@ How it works:
   1. Load a batch of AMBIGUOUS RawJobs (jd_gate_decision=PENDING or NULL + title_gate=AMBIGUOUS).
   2. For each job:
      a. If the platform has description in the LIST response → use list_payload_json snippet (free).
-     b. Otherwise → call harvester.fetch_job_snippet(url) to get first N chars.
-  3. Batch into groups of `batch_size` and call gate_jobs_batch() (LLM binary YES/NO).
+     b. Otherwise → call harvester.fetch_job_snippet(url) to get first N chars
+        (HTML pages are streamed and the connection closed once N chars are read).
+  3. Call gate_jobs_concurrent() (LLM binary YES/NO): cached prompts are answered
+     from LLMPromptCache, misses go out in `jd_gate_batch_size` batches with up
+     to `jd_gate_concurrency` calls in flight.
   4. Update RawJob: jd_gate_decision, jd_gate_confidence, jd_gate_reason, jd_gate_snippet.
   5. Route: CONFIRMED (YES) → queue for full JD backfill.
             REJECTED  (NO)  → mark done (no further processing).
@@ -46,6 +49,11 @@ GATE_UNCERTAIN  = "UNCERTAIN"   # LLM confidence too low → human review
 GATE_SKIPPED    = "SKIPPED"     # gate disabled / audit mode / no API key
 GATE_PENDING    = "PENDING"     # queued but not yet processed
 
+# Runs a transiently failing detail fetch (429/5xx, network) may postpone a
+# job; after that it is gated without a snippet. Counted in raw_payload.
+SNIPPET_MAX_DEFERRALS = 3
+SNIPPET_DEFERRALS_KEY = "jd_gate_snippet_deferrals"
+
 
 @dataclass
 class GateRunResult:
@@ -114,12 +122,15 @@ def _get_snippet_for_job(
     """
     Return (snippet_text, source) for a RawJob.
 
-    source is "list" (free) or "detail" (required HTTP call).
+    source is "list" (free), "detail" (required HTTP call), "existing",
+    "none", or "retry" when the detail page kept failing (429 / 5xx) — the
+    job is left pending for the next run rather than gated without a snippet.
 
     Priority:
       1. If platform has list_has_description=True and list_payload_json exists → extract free.
       2. If job already has a description (e.g. previously backfilled) → use it.
-      3. Otherwise → call harvester.fetch_job_snippet(url).
+      3. Otherwise → call harvester.fetch_job_snippet(url) — a streamed partial
+         fetch that stops reading once max_chars of text are available.
     """
     # ── Option 1: free from list payload ────────────────────────────────────
     platform = None
@@ -145,12 +156,17 @@ def _get_snippet_for_job(
 
     # ── Option 3: fetch from detail endpoint ─────────────────────────────────
     if harvester and raw_job.original_url:
+        from .harvesters.base import SnippetFetchError
+
         try:
             snippet = harvester.fetch_job_snippet(
                 raw_job.original_url, max_chars=max_chars
             )
             if snippet:
                 return snippet, "detail"
+        except SnippetFetchError as exc:
+            logger.info("content_gate: detail fetch for RawJob %s deferred: %s", raw_job.pk, exc)
+            return "", "retry"
         except Exception as exc:
             logger.warning(
                 "content_gate: fetch_job_snippet failed for RawJob %s: %s",
@@ -160,14 +176,41 @@ def _get_snippet_for_job(
     return "", "none"
 
 
-def _get_harvester_for_job(raw_job):
-    """Return the platform harvester for a RawJob, or None if unavailable."""
+def _snippet_deferrals(raw_job) -> int:
+    payload = raw_job.raw_payload if isinstance(raw_job.raw_payload, dict) else {}
+    try:
+        return int(payload.get(SNIPPET_DEFERRALS_KEY) or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _record_snippet_deferral(raw_job, deferrals: int) -> None:
+    payload = dict(raw_job.raw_payload) if isinstance(raw_job.raw_payload, dict) else {}
+    payload[SNIPPET_DEFERRALS_KEY] = deferrals
+    try:
+        type(raw_job).objects.filter(pk=raw_job.pk).update(raw_payload=payload)
+    except Exception as exc:
+        logger.warning("content_gate: could not record deferral for RawJob %s: %s", raw_job.pk, exc)
+
+
+def _get_harvester_for_job(raw_job, cache: dict | None = None):
+    """
+    Return the platform harvester for a RawJob, or None if unavailable.
+
+    When `cache` is given, one harvester (and so one pooled HTTP session) is
+    reused per platform for the whole gate run.
+    """
+    platform_slug = raw_job.platform_slug or ""
+    if cache is not None and platform_slug in cache:
+        return cache[platform_slug]
     try:
         from .harvesters import get_harvester
-        platform_slug = raw_job.platform_slug or ""
-        return get_harvester(platform_slug)
+        harvester = get_harvester(platform_slug)
     except Exception:
-        return None
+        harvester = None
+    if cache is not None:
+        cache[platform_slug] = harvester
+    return harvester
 
 
 def _load_pending_jobs(batch_size: int, scope: str = "ambiguous_only"):
@@ -226,6 +269,7 @@ def run_content_gate(
     snippet_chars: int | None = None,
     audit_mode: bool | None = None,
     trigger_backfill_on_confirm: bool = True,
+    concurrency: int | None = None,
 ) -> GateRunResult:
     """
     Main entry point for the Tier-2 JD content gate.
@@ -239,12 +283,13 @@ def run_content_gate(
         snippet_chars: override HarvestEngineConfig.jd_gate_snippet_chars.
         audit_mode: override HarvestEngineConfig.jd_gate_audit_mode.
         trigger_backfill_on_confirm: queue CONFIRMED jobs for JD backfill automatically.
+        concurrency: override HarvestEngineConfig.jd_gate_concurrency (LLM calls in flight).
 
     Returns:
         GateRunResult summary.
     """
     from .models import HarvestEngineConfig
-    from .llm_classifier import gate_jobs_batch
+    from .llm_classifier import gate_jobs_concurrent
 
     t_start = time.monotonic()
     result = GateRunResult(dry_run=dry_run)
@@ -261,6 +306,7 @@ def run_content_gate(
     _scope              = scope              or (cfg.jd_gate_scope              if cfg else "ambiguous_only")
     _audit_mode         = audit_mode if audit_mode is not None else (cfg.jd_gate_audit_mode if cfg else True)
     _gate_batch_size    = cfg.jd_gate_batch_size if cfg else 20
+    _concurrency        = concurrency        or (cfg.jd_gate_concurrency        if cfg else 4)
 
     result.audit_mode = _audit_mode
     result.model = _model
@@ -281,11 +327,25 @@ def run_content_gate(
     # ── Build snippets for each job ───────────────────────────────────────────
     job_inputs: list[dict] = []
     snippet_map: dict[int, str] = {}
+    harvester_cache: dict[str, Any] = {}
 
+    deferred: set[int] = set()
     for raw_job in jobs:
-        harvester = _get_harvester_for_job(raw_job)
+        harvester = _get_harvester_for_job(raw_job, cache=harvester_cache)
         snippet, source = _get_snippet_for_job(raw_job, harvester, max_chars=_snippet_chars)
 
+        if source == "retry":
+            deferrals = _snippet_deferrals(raw_job) + 1
+            if deferrals < SNIPPET_MAX_DEFERRALS:
+                if not dry_run:
+                    _record_snippet_deferral(raw_job, deferrals)
+                deferred.add(raw_job.pk)
+                result.skipped += 1
+                continue
+            logger.info(
+                "content_gate: RawJob %s deferred %d times, gating without a snippet",
+                raw_job.pk, deferrals - 1,
+            )
         if source == "list":
             result.snippet_from_list += 1
         elif source in ("detail", "existing"):
@@ -301,25 +361,24 @@ def run_content_gate(
             "snippet":    snippet,
         })
 
-    # ── Call LLM gate in batches ──────────────────────────────────────────────
+    # ── Call LLM gate (cached prompts skipped, misses dispatched concurrently) ─
     gate_results: dict[int, dict[str, Any]] = {}
-    for i in range(0, len(job_inputs), _gate_batch_size):
-        chunk = job_inputs[i : i + _gate_batch_size]
-        logger.info(
-            "content_gate: calling LLM gate batch %d–%d of %d",
-            i + 1, min(i + _gate_batch_size, len(job_inputs)), len(job_inputs),
+    logger.info(
+        "content_gate: gating %d jobs — batch=%d concurrency=%d",
+        len(job_inputs), _gate_batch_size, _concurrency,
+    )
+    try:
+        gate_results = gate_jobs_concurrent(
+            job_inputs,
+            model=_model,
+            confidence_threshold=_threshold,
+            batch_size=_gate_batch_size,
+            max_workers=_concurrency,
         )
-        try:
-            batch_result = gate_jobs_batch(
-                chunk,
-                model=_model,
-                confidence_threshold=_threshold,
-            )
-            gate_results.update(batch_result)
-        except Exception as exc:
-            logger.error("content_gate: gate_jobs_batch failed for chunk %d: %s", i, exc)
-            result.errors += len(chunk)
-            result.errors_detail.append(str(exc)[:200])
+    except Exception as exc:
+        logger.error("content_gate: gate_jobs_concurrent failed: %s", exc)
+        result.errors += len(job_inputs)
+        result.errors_detail.append(str(exc)[:200])
 
     # ── Apply decisions to RawJobs ────────────────────────────────────────────
     confirmed_ids: list[int] = []
@@ -327,6 +386,8 @@ def run_content_gate(
 
     for raw_job in jobs:
         pk = raw_job.pk
+        if pk in deferred:
+            continue  # still pending; picked up again by the next run
         gate = gate_results.get(pk)
         result.total_processed += 1
 
@@ -13,6 +13,9 @@ Rules (applied in priority order within each candidate group):
 
 Each rule emits (primary_id, duplicate_id, label, similarity, method) tuples.
 Primary is chosen as the one with the higher quality_score (tie → lower pk).
+
+Similarity rules only run on candidate pairs from a MinHash + LSH index over
+JD tokens (minhash.py), not on every pair within a company.
 """
 from __future__ import annotations
 
@@ -20,14 +23,19 @@ import hashlib
 import logging
 import re
 from datetime import timedelta
-from itertools import combinations
-from typing import Iterator
 
 from django.db import transaction
-from django.db.models import Count, Q
+from django.db.models import F, Q, Window
+from django.db.models.functions import FirstValue, RowNumber
 from django.utils import timezone
 
-from .models import DuplicateLabel, DuplicateResolution, RawJob, RawJobDuplicatePair
+from .models import (
+    DuplicateLabel,
+    DuplicateResolution,
+    RawJob,
+    RawJobDuplicatePair,
+    RawJobSignature,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -76,121 +84,116 @@ def _pick_primary(j1: dict, j2: dict) -> tuple[dict, dict]:
 
 # ── core detection logic ──────────────────────────────────────────────────────
 
-def _detect_for_company_group(
-    jobs: list[dict],
-) -> Iterator[tuple[int, int, str, float, str]]:
-    """
-    Yield (primary_id, dup_id, label, similarity, method) for all duplicate
-    pairs within a single company-name group.
+def _prepare_job(j: dict) -> None:
+    """Pre-compute tokens + hashes once per job (in place)."""
+    text = j["description_clean"] or j["description"]
+    j["_title_tok"] = _tokenize(j["normalized_title"] or j["title"])
+    j["_jd_tok"]    = _tokenize(text)
+    j["_jd_hash"]   = _jd_hash(text)
+    j["_loc"]       = (j["location_raw"] or "").strip().lower()
+
+
+def _classify_same_company_pair(
+    j1: dict, j2: dict,
+) -> tuple[int, int, str, float, str] | None:
     """
-    # Pre-compute tokens + hashes once per job
-    for j in jobs:
-        j["_title_tok"] = _tokenize(j["normalized_title"] or j["title"])
-        j["_jd_tok"]    = _tokenize(j["description_clean"] or j["description"])
-        j["_jd_hash"]   = _jd_hash(j["description_clean"] or j["description"])
-        j["_loc"]       = (j["location_raw"] or "").strip().lower()
+    Apply the same-company rules to one prepared pair.
 
-    seen: set[tuple[int, int]] = set()
+    Returns (primary_id, dup_id, label, similarity, method) or None.
+    """
+    title_sim = _jaccard(j1["_title_tok"], j2["_title_tok"])
+    jd_sim    = _jaccard(j1["_jd_tok"],    j2["_jd_tok"])
 
-    for j1, j2 in combinations(jobs, 2):
-        pair_key = (min(j1["id"], j2["id"]), max(j1["id"], j2["id"]))
-        if pair_key in seen:
-            continue
+    label = method = None
+    sim = 0.0
 
-        title_sim = _jaccard(j1["_title_tok"], j2["_title_tok"])
-        jd_sim    = _jaccard(j1["_jd_tok"],    j2["_jd_tok"])
+    # 1. Exact — same title tokens + same JD hash
+    if (
+        j1["_title_tok"] == j2["_title_tok"]
+        and j1["_jd_hash"] == j2["_jd_hash"]
+        and j1["_jd_hash"] != _jd_hash("")
+    ):
+        label, method, sim = DuplicateLabel.EXACT, "title_eq+jd_hash_eq", 1.0
 
-        label = method = None
-        sim = 0.0
+    # 2. Strong Match — same company, title & JD both very high, diff URL
+    elif title_sim >= 0.95 and jd_sim >= 0.95 and j1["url_hash"] != j2["url_hash"]:
+        label, method, sim = (
+            DuplicateLabel.STRONG_MATCH, "title_jaccard+jd_jaccard≥0.95", (title_sim + jd_sim) / 2
+        )
 
-        # 1. Exact — same title tokens + same JD hash
-        if (
-            j1["_title_tok"] == j2["_title_tok"]
-            and j1["_jd_hash"] == j2["_jd_hash"]
-            and j1["_jd_hash"] != _jd_hash("")
-        ):
-            label, method, sim = DuplicateLabel.EXACT, "title_eq+jd_hash_eq", 1.0
+    # 3. Location Variant — same title+JD but different location
+    elif (
+        title_sim >= 0.90
+        and jd_sim >= 0.90
+        and j1["_loc"] != j2["_loc"]
+        and j1["_loc"] and j2["_loc"]
+    ):
+        label, method, sim = (
+            DuplicateLabel.LOCATION_VARIANT, "title≥0.90+jd≥0.90+loc_diff",
+            (title_sim + jd_sim) / 2,
+        )
 
-        # 2. Strong Match — same company, title & JD both very high, diff URL
-        elif title_sim >= 0.95 and jd_sim >= 0.95 and j1["url_hash"] != j2["url_hash"]:
-            label, method, sim = (
-                DuplicateLabel.STRONG_MATCH, "title_jaccard+jd_jaccard≥0.95", (title_sim + jd_sim) / 2
-            )
+    # 4. Near Duplicate — same company, high title+JD similarity
+    elif title_sim >= 0.80 and jd_sim >= 0.90:
+        label, method, sim = (
+            DuplicateLabel.NEAR_DUPLICATE, "title≥0.80+jd≥0.90",
+            (title_sim + jd_sim) / 2,
+        )
 
-        # 3. Location Variant — same title+JD but different location
-        elif (
-            title_sim >= 0.90
-            and jd_sim >= 0.90
-            and j1["_loc"] != j2["_loc"]
-            and j1["_loc"] and j2["_loc"]
-        ):
+    # 5. Repost — same title+JD with ≥30-day gap
+    elif title_sim >= 0.85 and jd_sim >= 0.85:
+        d1 = j1.get("fetched_at")
+        d2 = j2.get("fetched_at")
+        if d1 and d2 and abs((d1 - d2).days) >= 30:
             label, method, sim = (
-                DuplicateLabel.LOCATION_VARIANT, "title≥0.90+jd≥0.90+loc_diff",
+                DuplicateLabel.REPOST, "title≥0.85+jd≥0.85+date_gap≥30d",
                 (title_sim + jd_sim) / 2,
             )
 
-        # 4. Near Duplicate — same company, high title+JD similarity
-        elif title_sim >= 0.80 and jd_sim >= 0.90:
-            label, method, sim = (
-                DuplicateLabel.NEAR_DUPLICATE, "title≥0.80+jd≥0.90",
-                (title_sim + jd_sim) / 2,
-            )
+    if not label:
+        return None
+    p, d = _pick_primary(j1, j2)
+    return p["id"], d["id"], label, round(sim, 4), method
+
+
+def _classify_agency_pair(
+    j1: dict, j2: dict,
+) -> tuple[int, int, str, float, str] | None:
+    """Agency Duplicate: same JD hash + title ≥ 0.90 across DIFFERENT companies."""
+    if _normalize_company(j1["company_name"]) == _normalize_company(j2["company_name"]):
+        return None
+    if j1["_jd_hash"] != j2["_jd_hash"] or j1["_jd_hash"] == _jd_hash(""):
+        return None
+    title_sim = _jaccard(j1["_title_tok"], j2["_title_tok"])
+    if title_sim < 0.90:
+        return None
+    p, d = _pick_primary(j1, j2)
+    return (
+        p["id"], d["id"],
+        DuplicateLabel.AGENCY_DUP,
+        round((1.0 + title_sim) / 2, 4),
+        "jd_hash_eq+title≥0.90+diff_company",
+    )
 
-        # 5. Repost — same title+JD with ≥30-day gap
-        elif title_sim >= 0.85 and jd_sim >= 0.85:
-            d1 = j1.get("fetched_at")
-            d2 = j2.get("fetched_at")
-            if d1 and d2 and abs((d1 - d2).days) >= 30:
-                label, method, sim = (
-                    DuplicateLabel.REPOST, "title≥0.85+jd≥0.85+date_gap≥30d",
-                    (title_sim + jd_sim) / 2,
-                )
-
-        if label:
-            seen.add(pair_key)
-            p, d = _pick_primary(j1, j2)
-            yield p["id"], d["id"], label, round(sim, 4), method
-
-
-def _detect_agency_pairs(
-    all_jobs: list[dict],
-) -> Iterator[tuple[int, int, str, float, str]]:
-    """
-    Detect Agency Duplicates: same JD + same title across DIFFERENT companies.
-    Uses JD hash bucketing for O(n) pre-grouping, then title similarity check.
-    """
-    from collections import defaultdict
 
-    by_jd_hash: dict[str, list[dict]] = defaultdict(list)
-    for j in all_jobs:
-        h = j.get("_jd_hash") or _jd_hash(j["description_clean"] or j["description"])
-        if h != _jd_hash(""):
-            by_jd_hash[h].append(j)
+def _classify_candidate_pair(j1: dict, j2: dict) -> tuple[int, int, str, float, str] | None:
+    """Route an LSH candidate pair to the same-company or agency rules."""
+    if _normalize_company(j1["company_name"]) == _normalize_company(j2["company_name"]):
+        return _classify_same_company_pair(j1, j2)
+    return _classify_agency_pair(j1, j2)
 
-    seen: set[tuple[int, int]] = set()
-    for bucket in by_jd_hash.values():
-        if len(bucket) < 2:
-            continue
-        for j1, j2 in combinations(bucket, 2):
-            # Different companies
-            if _normalize_company(j1["company_name"]) == _normalize_company(j2["company_name"]):
-                continue
-            pair_key = (min(j1["id"], j2["id"]), max(j1["id"], j2["id"]))
-            if pair_key in seen:
-                continue
-            title_sim = _jaccard(
-                j1.get("_title_tok") or _tokenize(j1["normalized_title"] or j1["title"]),
-                j2.get("_title_tok") or _tokenize(j2["normalized_title"] or j2["title"]),
-            )
-            if title_sim >= 0.90:
-                seen.add(pair_key)
-                p, d = _pick_primary(j1, j2)
-                yield (
-                    p["id"], d["id"],
-                    DuplicateLabel.AGENCY_DUP,
-                    round((1.0 + title_sim) / 2, 4),
-                    "jd_hash_eq+title≥0.90+diff_company",
-                )
+
+def _load_jd_tokens(ids: set[int], chunk_size: int = 1000) -> dict[int, frozenset[str]]:
+    """Re-read descriptions for candidate jobs only and tokenise them."""
+    tokens: dict[int, frozenset[str]] = {}
+    id_list = sorted(ids)
+    for i in range(0, len(id_list), chunk_size):
+        rows = RawJob.objects.filter(pk__in=id_list[i: i + chunk_size]).values_list(
+            "id", "description_clean", "description",
+        )
+        for pk, clean, raw in rows:
+            tokens[pk] = _tokenize(clean or raw)
+    return tokens
 
 
 # ── public API ────────────────────────────────────────────────────────────────
@@ -207,25 +210,47 @@ _PRIORITY = {
 }
 
 
+def _ranked_group_pairs(qs, partition_fields: list[str]) -> list[tuple[int, int]]:
+    """
+    (primary_id, duplicate_id) for every row of a duplicate group, in one query.
+
+    Groups are `partition_fields`; inside a group rows are ranked by
+    quality_score DESC (NULLs last), then pk. Row 1 is the primary, every other
+    row is emitted as its duplicate:
+
+        ROW_NUMBER()  OVER (PARTITION BY … ORDER BY quality_score DESC, id)
+        FIRST_VALUE(id) OVER (same window)
+    """
+    partition = [F(f) for f in partition_fields]
+    order = [F("quality_score").desc(nulls_last=True), F("id").asc()]
+    return list(
+        qs.annotate(
+            group_rank=Window(RowNumber(), partition_by=partition, order_by=order),
+            group_primary=Window(FirstValue("id"), partition_by=partition, order_by=order),
+        )
+        .filter(group_rank__gt=1)
+        .values_list("group_primary", "id")
+    )
+
+
 def run_detection(
-    limit: int = 5000,
+    limit: int | None = 5000,
     company_slug: str = "",
     skip_existing: bool = True,
-    company_chunk_size: int = 10,
-    sleep_between_chunks: float = 0.5,
-    max_jobs_per_company: int = 40,
 ) -> dict:
     """
-    CPU-friendly duplicate detection over RawJobs.
-
-    KEY DESIGN RULES (never violate these on a shared 2-vCPU server):
-    - company_chunk_size=10  → process 10 companies, then sleep
-    - sleep_between_chunks=0.5s → OS schedules other processes (nginx, gunicorn)
-    - max_jobs_per_company=40  → O(N²) pairs = max 780 per company, not 500k
-    - Always call via the Celery task — NEVER from a web request directly.
+    Duplicate detection over active RawJobs (pass limit=None for the whole set).
+
+    Similarity phases use a MinHash + LSH index over JD tokens (see minhash.py):
+    candidate pairs are generated in near-linear time across ALL companies and
+    verified with exact Jaccard only for those candidates, so large employers
+    get full coverage with no per-company or per-bucket caps. Rows are
+    streamed; JD tokens are only kept for jobs that appear in a candidate pair.
+    Always call via the Celery task — NEVER from a web request directly.
     """
     import time
-    from collections import defaultdict
+
+    from .minhash import LSHIndex, signature
 
     qs = RawJob.objects.filter(is_active=True, has_description=True)
     if company_slug:
@@ -236,112 +261,64 @@ def run_detection(
         "external_id", "location_raw", "quality_score",
         "fetched_at", "description_clean", "description",
     ]
-    jobs_qs = list(qs.values(*fields).order_by("-quality_score")[:limit])
-
-    if not jobs_qs:
-        return {"pairs_found": 0, "pairs_saved": 0, "pairs_skipped": 0, "companies_scanned": 0}
-
-    # Pre-compute tokens + hashes in one pass (CPU-light, no pairwise yet)
-    for j in jobs_qs:
+    qs = qs.values(*fields).order_by("-quality_score", "id")
+    if limit:
+        qs = qs[:limit]
+
+    # ── Pass 1: stream rows → light job dicts + MinHash signatures ───────────
+    jobs_by_id: dict[int, dict] = {}
+    companies: set[str] = set()
+    index = LSHIndex()
+    for j in qs.iterator(chunk_size=2000):
+        clean, raw = j.pop("description_clean"), j.pop("description")
+        text = clean or raw
         j["_title_tok"] = _tokenize(j["normalized_title"] or j["title"])
-        j["_jd_tok"]    = _tokenize(j["description_clean"] or j["description"])
-        j["_jd_hash"]   = _jd_hash(j["description_clean"] or j["description"])
+        j["_jd_hash"]   = _jd_hash(text)
         j["_loc"]       = (j["location_raw"] or "").strip().lower()
+        jobs_by_id[j["id"]] = j
+        companies.add(_normalize_company(j["company_name"]))
+        sig = signature(_tokenize(text))
+        if sig is not None:
+            index.add(j["id"], sig)
 
-    # ── Phase 1: Requisition duplicates — pure SQL GROUP BY, no Python CPU ───
-    req_pairs: list[tuple] = []
-    for group in (
-        RawJob.objects.filter(is_active=True)
-        .exclude(external_id="")
-        .values("company_name", "external_id")
-        .annotate(cnt=Count("id"))
-        .filter(cnt__gt=1)
-    ):
-        ids = list(
-            RawJob.objects.filter(
-                company_name=group["company_name"],
-                external_id=group["external_id"],
-                is_active=True,
-            ).values_list("id", "quality_score").order_by("-quality_score")
+    if not jobs_by_id:
+        return {"pairs_found": 0, "pairs_saved": 0, "pairs_skipped": 0, "companies_scanned": 0}
+
+    # ── Phase 1+2: Requisition + URL duplicates — one window query each ──────
+    req_pairs = [
+        (primary_id, dup_id, DuplicateLabel.REQUISITION, 1.0, "company+external_id")
+        for primary_id, dup_id in _ranked_group_pairs(
+            RawJob.objects.filter(is_active=True).exclude(external_id=""),
+            ["company_name", "external_id"],
         )
-        if len(ids) >= 2:
-            primary_id = ids[0][0]
-            for dup_id, _ in ids[1:]:
-                req_pairs.append((primary_id, dup_id, DuplicateLabel.REQUISITION, 1.0, "company+external_id"))
-
-    # ── Phase 2: URL duplicates — pure SQL, should be rare ───────────────────
-    url_pairs: list[tuple] = []
-    for group in (
-        RawJob.objects.filter(is_active=True)
-        .values("url_hash").annotate(cnt=Count("id")).filter(cnt__gt=1)
-    ):
-        ids = list(
-            RawJob.objects.filter(url_hash=group["url_hash"], is_active=True)
-            .values_list("id", "quality_score").order_by("-quality_score")
+    ]
+    url_pairs = [
+        (primary_id, dup_id, DuplicateLabel.URL_DUPLICATE, 1.0, "url_hash_eq")
+        for primary_id, dup_id in _ranked_group_pairs(
+            RawJob.objects.filter(is_active=True),
+            ["url_hash"],
         )
-        if len(ids) >= 2:
-            primary_id = ids[0][0]
-            for dup_id, _ in ids[1:]:
-                url_pairs.append((primary_id, dup_id, DuplicateLabel.URL_DUPLICATE, 1.0, "url_hash_eq"))
-
-    # ── Phase 3: Per-company similarity — capped + chunked ───────────────────
-    # max_jobs_per_company=40 means worst-case 780 pairs per company (O(40²/2))
-    # vs 500k pairs for a company with 1000 jobs — this is the critical cap.
-    by_company: dict[str, list[dict]] = defaultdict(list)
-    for j in jobs_qs:
-        slug = _normalize_company(j["company_name"])
-        by_company[slug].append(j)
-
-    company_pairs: list[tuple] = []
-    multi_job_companies = [
-        (slug, grp[:max_jobs_per_company])   # ← hard cap: only top-N per company
-        for slug, grp in by_company.items()
-        if len(grp) >= 2
     ]
 
-    pairs_since_sleep = 0
-    for chunk_start in range(0, len(multi_job_companies), company_chunk_size):
-        chunk = multi_job_companies[chunk_start: chunk_start + company_chunk_size]
-        for _, group_jobs in chunk:
-            for row in _detect_for_company_group(group_jobs):
-                company_pairs.append(row)
-                pairs_since_sleep += 1
-        # Hard sleep after every chunk — gives nginx/gunicorn CPU time
-        time.sleep(sleep_between_chunks)
-
-    # ── Phase 4: Agency duplicates — JD hash bucket, capped per bucket ───────
-    by_jd_hash: dict[str, list[dict]] = defaultdict(list)
-    empty_hash = _jd_hash("")
-    for j in jobs_qs:
-        h = j["_jd_hash"]
-        if h != empty_hash:
-            by_jd_hash[h].append(j)
+    # ── Phase 3+4: LSH candidates → exact Jaccard verification ───────────────
+    # Same-company pairs get the EXACT…REPOST rules, cross-company pairs the
+    # AGENCY_DUP rule. Every rule needs JD Jaccard ≥ 0.85 (or equal JD hash),
+    # which the LSH threshold (≈0.71) covers with high recall.
+    candidates = list(index.candidate_pairs())
+    jd_tokens = _load_jd_tokens({pk for pair in candidates for pk in pair})
+    for pk, toks in jd_tokens.items():
+        jobs_by_id[pk]["_jd_tok"] = toks
 
+    company_pairs: list[tuple] = []
     agency_pairs: list[tuple] = []
-    # Cap each JD bucket too — if 200 jobs share the same JD hash, only check first 20
-    buckets = [b[:20] for b in by_jd_hash.values() if len(b) >= 2]
-
-    for chunk_start in range(0, len(buckets), company_chunk_size):
-        chunk_buckets = buckets[chunk_start: chunk_start + company_chunk_size]
-        seen_agency: set[tuple[int, int]] = set()
-        for bucket in chunk_buckets:
-            for j1, j2 in combinations(bucket, 2):
-                if _normalize_company(j1["company_name"]) == _normalize_company(j2["company_name"]):
-                    continue
-                pair_key = (min(j1["id"], j2["id"]), max(j1["id"], j2["id"]))
-                if pair_key in seen_agency:
-                    continue
-                title_sim = _jaccard(j1["_title_tok"], j2["_title_tok"])
-                if title_sim >= 0.90:
-                    seen_agency.add(pair_key)
-                    p, d = _pick_primary(j1, j2)
-                    agency_pairs.append((
-                        p["id"], d["id"],
-                        DuplicateLabel.AGENCY_DUP,
-                        round((1.0 + title_sim) / 2, 4),
-                        "jd_hash_eq+title≥0.90+diff_company",
-                    ))
-        time.sleep(sleep_between_chunks)
+    for a, b in candidates:
+        row = _classify_candidate_pair(jobs_by_id[a], jobs_by_id[b])
+        if not row:
+            continue
+        if row[2] == DuplicateLabel.AGENCY_DUP:
+            agency_pairs.append(row)
+        else:
+            company_pairs.append(row)
 
     # ── Merge all candidates, keep highest-priority label per pair ────────────
     all_pairs: dict[tuple[int, int], tuple] = {}
@@ -391,14 +368,155 @@ def run_detection(
 
     logger.info(
         "Duplicate detection complete: %d found, %d saved, %d skipped, %d companies",
-        pairs_found, pairs_saved, pairs_skipped, len(by_company),
+        pairs_found, pairs_saved, pairs_skipped, len(companies),
     )
     return {
         "pairs_found":       pairs_found,
         "pairs_saved":       pairs_saved,
         "pairs_skipped":     pairs_skipped,
-        "companies_scanned": len(by_company),
+        "companies_scanned": len(companies),
+        "candidates_checked": len(candidates),
+    }
+
+
+# ── incremental detection (ingest path) ───────────────────────────────────────
+
+INCREMENTAL_MAX_CANDIDATES = 200   # LSH hits verified per job
+INCREMENTAL_MIN_ESTIMATE   = 0.60  # MinHash estimate needed before exact Jaccard
+
+_INCREMENTAL_FIELDS = [
+    "id", "title", "normalized_title", "company_name", "url_hash",
+    "external_id", "location_raw", "quality_score", "fetched_at",
+    "description_clean", "description", "is_active", "has_description",
+]
+
+
+def _incremental_pairs_for(job: dict, sig: tuple[int, ...], bands: list[int]) -> list[tuple]:
+    """Verify one prepared job against its LSH candidates + requisition twins."""
+    from .minhash import estimate_jaccard, unpack_signature
+
+    hits = (
+        RawJobSignature.objects
+        .filter(bands__overlap=bands, raw_job__is_active=True)
+        .exclude(raw_job_id=job["id"])
+        .order_by("-raw_job_id")  # newest postings first when a JD has more hits than the cap
+        .values_list("raw_job_id", "minhash")[:INCREMENTAL_MAX_CANDIDATES]
+    )
+    candidate_ids = [
+        pk for pk, packed in hits
+        if estimate_jaccard(sig, unpack_signature(packed) or ()) >= INCREMENTAL_MIN_ESTIMATE
+    ]
+
+    rows: list[tuple] = []
+    for other in RawJob.objects.filter(pk__in=candidate_ids).values(*_INCREMENTAL_FIELDS):
+        _prepare_job(other)
+        row = _classify_candidate_pair(job, other)
+        if row:
+            rows.append(row)
+
+    if job["external_id"]:
+        twins = (
+            RawJob.objects.filter(
+                company_name=job["company_name"],
+                external_id=job["external_id"],
+                is_active=True,
+            )
+            .exclude(pk=job["id"])
+            .values("id", "quality_score")
+        )
+        for other in twins:
+            p, d = _pick_primary(job, other)
+            rows.append((p["id"], d["id"], DuplicateLabel.REQUISITION, 1.0, "company+external_id"))
+    return rows
+
+
+def index_raw_jobs(raw_job_ids, *, detect: bool = True) -> dict:
+    """
+    Refresh RawJobSignature rows for the given RawJobs and detect their duplicates.
+
+    Run by index_raw_jobs_task after ingest/backfill commits (see harvest.signals) so new duplicate
+    pairs reach the review queue immediately instead of waiting for the batch
+    run. Jobs without a description (or inactive) lose their signature.
+    Only the given jobs are compared — against the persisted index, via one
+    GIN band-overlap query each.
+    """
+    from .minhash import band_keys, pack_signature, signature
+
+    ids = [int(pk) for pk in raw_job_ids if pk]
+    stats = {"indexed": 0, "removed": 0, "pairs_found": 0, "pairs_saved": 0}
+    if not ids:
+        return stats
+
+    jobs = list(RawJob.objects.filter(pk__in=ids).values(*_INCREMENTAL_FIELDS))
+    to_upsert: list[RawJobSignature] = []
+    prepared: list[tuple[dict, tuple[int, ...], list[int]]] = []
+    stale: list[int] = [pk for pk in ids if pk not in {j["id"] for j in jobs}]
+    for j in jobs:
+        _prepare_job(j)
+        sig = signature(j["_jd_tok"]) if j["is_active"] and j["has_description"] else None
+        if sig is None:
+            stale.append(j["id"])
+            continue
+        bands = band_keys(sig)
+        to_upsert.append(
+            RawJobSignature(
+                raw_job_id=j["id"], jd_hash=j["_jd_hash"], minhash=pack_signature(sig), bands=bands,
+            )
+        )
+        prepared.append((j, sig, bands))
+
+    if stale:
+        stats["removed"] = RawJobSignature.objects.filter(raw_job_id__in=stale).delete()[0]
+    if to_upsert:
+        RawJobSignature.objects.bulk_create(
+            to_upsert,
+            update_conflicts=True,
+            unique_fields=["raw_job"],
+            update_fields=["jd_hash", "minhash", "bands", "updated_at"],
+        )
+        stats["indexed"] = len(to_upsert)
+
+    if not detect or not prepared:
+        return stats
+
+    all_pairs: dict[tuple[int, int], tuple] = {}
+    for job, sig, bands in prepared:
+        for row in _incremental_pairs_for(job, sig, bands):
+            key = (min(row[0], row[1]), max(row[0], row[1]))
+            existing = all_pairs.get(key)
+            if not existing or _PRIORITY.get(row[2], 99) < _PRIORITY.get(existing[2], 99):
+                all_pairs[key] = row
+    stats["pairs_found"] = len(all_pairs)
+    if not all_pairs:
+        return stats
+
+    touched = {pk for key in all_pairs for pk in key}
+    existing_keys = {
+        (min(a, b), max(a, b))
+        for a, b in RawJobDuplicatePair.objects.filter(
+            Q(primary_id__in=touched) | Q(duplicate_id__in=touched)
+        ).values_list("primary_id", "duplicate_id")
     }
+    to_create = [
+        RawJobDuplicatePair(
+            primary_id=p_id,
+            duplicate_id=d_id,
+            label=label,
+            similarity=sim,
+            method=method,
+            resolution=DuplicateResolution.PENDING,
+        )
+        for key, (p_id, d_id, label, sim, method) in all_pairs.items()
+        if key not in existing_keys
+    ]
+    if to_create:
+        RawJobDuplicatePair.objects.bulk_create(to_create, ignore_conflicts=True)
+    stats["pairs_saved"] = len(to_create)
+    if to_create:
+        logger.info(
+            "Incremental duplicate detection: %d job(s) → %d new pair(s)", len(prepared), len(to_create),
+        )
+    return stats
 
 
 def merge_pair(pair: "RawJobDuplicatePair", resolved_by=None) -> dict:
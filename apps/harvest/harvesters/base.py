@@ -9,11 +9,14 @@ Policies enforced on every request:
   5. Full audit log    — every HTTP call logged with method, URL, status, latency
   6. Timeout           — hard 15-second cap on every request
 """
+import codecs
 import html
+import json
 import logging
 import re
 import time
 from abc import ABC, abstractmethod
+from html.parser import HTMLParser
 from typing import Any
 from urllib.parse import urlparse
 from urllib.robotparser import RobotFileParser
@@ -36,6 +39,18 @@ MAX_RETRIES = 3             # total attempts per request
 BACKOFF_FACTOR = 2          # 1s → 2s → 4s
 MAX_RETRY_AFTER = 120       # never wait more than 2 min for Retry-After
 
+# ─── Snippet streaming (Tier-2 JD gate) ───────────────────────────────────────
+# The gate only needs the first ~800 chars of JD text, so detail pages are
+# streamed and the connection is closed as soon as that budget is met.
+SNIPPET_RANGE_BYTES = 256 * 1024   # Range request size / hard cap on bytes read
+SNIPPET_CHUNK_BYTES = 8 * 1024     # iter_content chunk size
+SNIPPET_MIN_CHARS = 30             # below this a snippet is not useful
+SNIPPET_JSON_MAX_BYTES = 2 * 1024 * 1024  # non-HTML bodies are read whole (JSON needs it), up to this
+SNIPPET_SKIP_TAGS = frozenset({
+    "script", "style", "noscript", "template", "svg", "head", "nav", "header", "footer",
+})
+SNIPPET_DETAIL_FIELDS = ("description", "descriptionBody", "content", "jobDescription", "body", "text")
+
 # ─── robots.txt cache ─────────────────────────────────────────────────────────
 _robots_cache: dict[str, tuple[RobotFileParser, float]] = {}
 ROBOTS_CACHE_TTL = 3600     # seconds (refresh per domain once per hour)
@@ -76,6 +91,61 @@ def _check_robots_allowed(url: str) -> bool:
     return rp.can_fetch(BOT_USER_AGENT, url)
 
 
+class _SnippetTextParser(HTMLParser):
+    """
+    Incremental HTML → text extractor used by the streaming snippet fetch.
+
+    feed() can be called with partial documents; text inside script/style/head,
+    the page chrome (nav/header/footer) and similar non-content tags is dropped.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._parts: list[str] = []
+        self._skip_depth = 0
+        self.text_len = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SNIPPET_SKIP_TAGS:
+            self._skip_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in SNIPPET_SKIP_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data):
+        if self._skip_depth:
+            return
+        chunk = data.strip()
+        if chunk:
+            self._parts.append(chunk)
+            self.text_len += len(chunk) + 1
+
+    @property
+    def text(self) -> str:
+        return re.sub(r"\s+", " ", " ".join(self._parts)).strip()
+
+
+class SnippetFetchError(Exception):
+    """The detail page kept failing (429 / 5xx / network); retry later instead of storing no snippet."""
+
+
+def _snippet_from_detail(detail: Any, max_chars: int) -> str:
+    """First usable description-like field of a JSON detail payload, as plain text."""
+    if not isinstance(detail, dict) or detail.get("error"):
+        return ""
+    for name in SNIPPET_DETAIL_FIELDS:
+        raw_text = detail.get(name) or ""
+        if not raw_text:
+            continue
+        text = re.sub(r"<[^>]+>", " ", str(raw_text))
+        text = html.unescape(text)
+        text = re.sub(r"\s+", " ", text).strip()
+        if len(text) >= SNIPPET_MIN_CHARS:
+            return text[:max_chars]
+    return ""
+
+
 def _make_session() -> requests.Session:
     """Create a requests Session with retry-on-network-error, connection pooling."""
     session = requests.Session()
@@ -145,45 +215,146 @@ class BaseHarvester(ABC):
         """
         Fetch the first `max_chars` of clean job description text for Tier-2 JD gate.
 
-        Default implementation: calls fetch_job_detail() and extracts text from the
-        returned dict. Subclasses can override for a more efficient implementation
-        (e.g. truncating after parsing, or using a lightweight endpoint).
-
-        Returns: plain text snippet (stripped of HTML), or "" on failure.
-        Never raises — returns "" on any error.
+        HTML detail pages are streamed (see _stream_html_snippet) and the
+        connection is closed once enough text has been read. Non-HTML responses
+        (JSON detail APIs) are parsed from that same response; fetch_job_detail()
+        only runs when a subclass points it at a different endpoint or the body
+        was cut short by the Range request. Subclasses can override for a more
+        efficient implementation (e.g. a lightweight endpoint).
+
+        Returns: plain text snippet (stripped of HTML), or "" when the page has
+        none or answered with a client error.
+        Raises SnippetFetchError when the server kept failing (429 / 5xx /
+        network) so the caller retries later instead of gating on nothing.
         """
         try:
-            detail = self.fetch_job_detail(url)
-            if not detail or isinstance(detail, dict) and detail.get("error"):
-                return ""
-
-            # Try common description field names across platforms
-            candidates = []
-            if isinstance(detail, dict):
-                candidates = [
-                    detail.get("description") or "",
-                    detail.get("descriptionBody") or "",
-                    detail.get("content") or "",
-                    detail.get("jobDescription") or "",
-                    detail.get("body") or "",
-                    detail.get("text") or "",
-                ]
-
-            for raw_text in candidates:
-                if not raw_text:
-                    continue
-                # Strip HTML tags
-                text = re.sub(r"<[^>]+>", " ", str(raw_text))
-                text = html.unescape(text)
-                text = re.sub(r"\s+", " ", text).strip()
-                if len(text) >= 30:
-                    return text[:max_chars]
-
-            return ""
+            streamed = self._stream_html_snippet(url, max_chars=max_chars)
+            if isinstance(streamed, str):
+                return streamed
+            text = _snippet_from_detail(streamed, max_chars)
+            if text:
+                return text
+            own_detail_fetch = type(self).fetch_job_detail is not BaseHarvester.fetch_job_detail
+            if streamed is not None and not own_detail_fetch:
+                return ""  # the default detail fetch is this same GET
+            return _snippet_from_detail(self.fetch_job_detail(url), max_chars)
+        except SnippetFetchError:
+            raise
         except Exception as exc:
             logger.debug("fetch_job_snippet failed for %s: %s", url, exc)
             return ""
 
+    def _stream_html_snippet(self, url: str, max_chars: int = 800) -> str | dict | None:
+        """
+        Stream an HTML page and stop reading once `max_chars` of text are extracted.
+
+        Sends a Range header (bytes=0..SNIPPET_RANGE_BYTES) so servers that
+        support it never send the rest of the page; for servers that ignore
+        Range the body is read in SNIPPET_CHUNK_BYTES pieces and the connection
+        is closed as soon as the text budget (or the byte cap) is reached.
+        429 and 5xx responses are retried with the same backoff as
+        _request_with_retry.
+
+        Returns:
+            snippet text ("" when the page yields nothing usable or answered 4xx),
+            the parsed body (dict, {} when unusable) of a non-HTML response, or
+            None when a full detail fetch is needed (Range rejected or the
+            JSON body was truncated by it).
+        Raises SnippetFetchError once every attempt hit 429 / 5xx / network errors.
+        """
+        if self.is_scraper and not _check_robots_allowed(url):
+            logger.warning("[HARVEST] robots.txt BLOCKED GET %s — skipping", url)
+            return ""
+
+        headers = {
+            "Accept": "text/html,application/xhtml+xml,application/json;q=0.9,*/*;q=0.8",
+            "Range": f"bytes=0-{SNIPPET_RANGE_BYTES - 1}",
+        }
+        last_error = None
+        for attempt in range(1, MAX_RETRIES + 1):
+            self._enforce_rate_limit()
+            t0 = time.monotonic()
+            try:
+                resp = self._session.get(url, headers=headers, timeout=DEFAULT_TIMEOUT, stream=True)
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as exc:
+                self._last_request_at = time.monotonic()
+                backoff = BACKOFF_FACTOR ** attempt
+                logger.warning(
+                    "[HARVEST] %s on %s (snippet stream, attempt %d/%d) — backoff %ds",
+                    type(exc).__name__, url, attempt, MAX_RETRIES, backoff,
+                )
+                time.sleep(backoff)
+                last_error = type(exc).__name__
+                continue
+            self._last_request_at = time.monotonic()
+            try:
+                if resp.status_code == 429 or resp.status_code >= 500:
+                    if resp.status_code == 429:
+                        wait = int(resp.headers.get("Retry-After", BACKOFF_FACTOR ** attempt))
+                        wait = min(wait, MAX_RETRY_AFTER)
+                    else:
+                        wait = BACKOFF_FACTOR ** attempt
+                    logger.warning(
+                        "[HARVEST] GET %s → %s (snippet stream, attempt %d/%d) — waiting %ds",
+                        url, resp.status_code, attempt, MAX_RETRIES, wait,
+                    )
+                    last_error = f"HTTP {resp.status_code}"
+                    time.sleep(wait)
+                    continue
+                return self._read_snippet_response(resp, url, max_chars, t0)
+            finally:
+                resp.close()
+        raise SnippetFetchError(f"{url}: {last_error or 'max retries exceeded'}")
+
+    def _read_snippet_response(self, resp, url: str, max_chars: int, t0: float) -> str | dict | None:
+        if resp.status_code >= 400:
+            logger.info(
+                "[HARVEST] GET %s → %s (snippet stream, %dms)",
+                url, resp.status_code, int((time.monotonic() - t0) * 1000),
+            )
+            # 416 = server rejected the Range — let the full fetch handle it.
+            return None if resp.status_code == 416 else ""
+
+        content_type = (resp.headers.get("Content-Type") or "").lower()
+        if "html" not in content_type:
+            body = bytearray()
+            for chunk in resp.iter_content(chunk_size=SNIPPET_CHUNK_BYTES, decode_unicode=False):
+                body.extend(chunk or b"")
+                if len(body) >= SNIPPET_JSON_MAX_BYTES:
+                    break
+            logger.info(
+                "[HARVEST] GET %s → %s (snippet stream, non-HTML %d bytes, %dms)",
+                url, resp.status_code, len(body), int((time.monotonic() - t0) * 1000),
+            )
+            try:
+                detail = json.loads(bytes(body).decode(resp.encoding or "utf-8", errors="ignore"))
+            except ValueError:
+                # A 206 stops at the Range limit, so a bad body may just be cut short
+                return None if resp.status_code == 206 else {}
+            return detail if isinstance(detail, dict) else {}
+
+        charset = resp.encoding if "charset=" in content_type else "utf-8"
+        try:
+            decoder = codecs.getincrementaldecoder(charset or "utf-8")(errors="ignore")
+        except LookupError:
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+        parser = _SnippetTextParser()
+        bytes_read = 0
+        for chunk in resp.iter_content(chunk_size=SNIPPET_CHUNK_BYTES, decode_unicode=False):
+            if not chunk:
+                continue
+            bytes_read += len(chunk)
+            parser.feed(decoder.decode(chunk))
+            if parser.text_len >= max_chars or bytes_read >= SNIPPET_RANGE_BYTES:
+                break
+
+        logger.info(
+            "[HARVEST] GET %s → %s (snippet stream, %d bytes, %dms)",
+            url, resp.status_code, bytes_read, int((time.monotonic() - t0) * 1000),
+        )
+        text = parser.text
+        return text[:max_chars] if len(text) >= SNIPPET_MIN_CHARS else ""
+
     def fetch_job_detail(self, url: str) -> dict:
         """
         Fetch full job detail for JD backfill. Default is a simple GET to the URL.
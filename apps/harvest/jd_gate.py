@@ -32,6 +32,34 @@ def _normalized_text(value: str) -> str:
     return re.sub(r"[^a-z0-9 ]+", "", txt)
 
 
+def jd_text_stats(title: str, text: str, text_length: int | None = None) -> tuple[int, bool]:
+    """
+    (JD length, JD is only the title) — the parts of the gate that read the
+    text. Stored on RawJob at write time as jd_char_count / jd_title_only.
+    """
+    desc = _clean_spaces(text)
+    txt_len = len(desc) if text_length is None else int(text_length)
+    n_desc = _normalized_text(desc)
+    n_title = _normalized_text(title)
+    title_only = bool(
+        desc
+        and n_title
+        and txt_len <= len(desc)
+        and (n_desc == n_title or n_desc in {f"{n_title} apply now", f"apply now {n_title}"})
+    )
+    return txt_len, title_only
+
+
+def _stored_text_stats(raw_job) -> tuple[int, bool] | None:
+    """Stamped jd_char_count / jd_title_only when the JD itself was not loaded."""
+    from .services.rawjob_derived import is_stamped
+
+    deferred = set(getattr(raw_job, "get_deferred_fields", lambda: set())() or set())
+    if not {"description", "description_clean"} <= deferred or not is_stamped(raw_job):
+        return None
+    return int(raw_job.jd_char_count or 0), bool(raw_job.jd_title_only)
+
+
 def _runtime_thresholds() -> tuple[int, int, float]:
     default_words = max(1, int(getattr(settings, "RESUME_JD_MIN_WORDS", 80)))
     default_chars = max(1, int(getattr(settings, "RESUME_JD_MIN_CHARS", 400)))
@@ -75,14 +103,37 @@ class ResumeJDGate:
         return asdict(self)
 
 
-def evaluate_raw_job_resume_gate(raw_job) -> ResumeJDGate:
-    min_words, min_chars, min_class_conf = _runtime_thresholds()
+def evaluate_raw_job_resume_gate(
+    raw_job,
+    *,
+    thresholds: tuple[int, int, float] | None = None,
+    text: str | None = None,
+    text_length: int | None = None,
+) -> ResumeJDGate:
+    """
+    Batch callers (jobs.gating.evaluate_raw_job_gates) pass the thresholds once
+    and, instead of loading the JD, its first characters as `text` plus the
+    full trimmed length as `text_length`. Rows loaded without either JD column
+    use the jd_char_count / jd_title_only stamped on them at write time.
+    """
+    min_words, min_chars, min_class_conf = thresholds or _runtime_thresholds()
 
-    deferred = set(getattr(raw_job, "get_deferred_fields", lambda: set())() or set())
-    desc_clean = "" if "description_clean" in deferred else (getattr(raw_job, "description_clean", "") or "")
-    desc_raw = "" if "description" in deferred else (getattr(raw_job, "description", "") or "")
-    desc = _clean_spaces(desc_clean or desc_raw)
     title = _clean_spaces(getattr(raw_job, "title", ""))
+    stored = _stored_text_stats(raw_job) if text is None else None
+    if stored is not None:
+        # List pages load neither JD column; use the stats stamped at write time.
+        txt_len, title_only = stored
+        has_text = txt_len > 0
+        desc = ""
+    else:
+        if text is None:
+            deferred = set(getattr(raw_job, "get_deferred_fields", lambda: set())() or set())
+            desc_clean = "" if "description_clean" in deferred else (getattr(raw_job, "description_clean", "") or "")
+            desc_raw = "" if "description" in deferred else (getattr(raw_job, "description", "") or "")
+            text = desc_clean or desc_raw
+        desc = _clean_spaces(text)
+        txt_len, title_only = jd_text_stats(title, desc, text_length)
+        has_text = bool(desc)
     is_active = bool(getattr(raw_job, "is_active", True))
     class_conf = getattr(raw_job, "classification_confidence", None)
     class_conf = float(class_conf) if class_conf is not None else 0.0
@@ -90,7 +141,6 @@ def evaluate_raw_job_resume_gate(raw_job) -> ResumeJDGate:
     # Prefer stored enrichment word_count to avoid recomputing on list pages.
     stored_wc = getattr(raw_job, "word_count", 0) or 0
     wc = int(stored_wc) if stored_wc else _word_count(desc)
-    txt_len = len(desc)
 
     if not is_active:
         return ResumeJDGate(
@@ -103,7 +153,7 @@ def evaluate_raw_job_resume_gate(raw_job) -> ResumeJDGate:
             min_classification_confidence=min_class_conf,
         )
 
-    if not desc and not stored_wc:
+    if not has_text and not stored_wc:
         return ResumeJDGate(
             usable=False,
             reason_code=REASON_MISSING_JD,
@@ -114,9 +164,7 @@ def evaluate_raw_job_resume_gate(raw_job) -> ResumeJDGate:
             min_classification_confidence=min_class_conf,
         )
 
-    n_desc = _normalized_text(desc)
-    n_title = _normalized_text(title)
-    if desc and n_title and (n_desc == n_title or n_desc in {f"{n_title} apply now", f"apply now {n_title}"}):
+    if title_only:
         return ResumeJDGate(
             usable=False,
             reason_code=REASON_TITLE_ONLY,
@@ -127,7 +175,7 @@ def evaluate_raw_job_resume_gate(raw_job) -> ResumeJDGate:
             min_classification_confidence=min_class_conf,
         )
 
-    if wc < min_words or (desc and txt_len < min_chars):
+    if wc < min_words or (has_text and txt_len < min_chars):
         return ResumeJDGate(
             usable=False,
             reason_code=REASON_TOO_SHORT,
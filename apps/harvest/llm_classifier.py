@@ -13,15 +13,31 @@ LLM-based job classification — two separate functions:
 Both use the OpenAI chat completions API (model: gpt-4o-mini by default).
 Jobs are batched (20/call for gate, 10/call for classify) to keep cost minimal.
 Estimated cost: ~$0.001 per 20 gate calls, ~$0.001 per 10 classify calls.
+
+Results are cached in LLMPromptCache keyed on (model, prompt version,
+normalised title + snippet), so identical reposts are never re-sent.
+gate_jobs_concurrent() dispatches cache-miss gate batches through a bounded
+thread pool. Every API call holds a core.llm_throttle slot, so these calls
+count against the shared LLM_MAX_CONCURRENCY / LLM_TOKENS_PER_MINUTE budget;
+a batch that cannot get one is treated like a failed call (no results).
+Set OPENAI_BASE_URL to point both functions at a local stub
+server (manage.py llm_stub_server) for testing.
 """
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
+from django.db.models import F
+from django.utils import timezone
+
+from core.llm_throttle import LLMBudgetExceeded, estimate_tokens, in_task, llm_slot
+
 logger = logging.getLogger(__name__)
 
 # Fixed category list — must match _CATEGORY_PATTERNS in enrichments.py
@@ -50,6 +66,98 @@ BATCH_SIZE = 10          # jobs per LLM call
 LLM_CONFIDENCE = 0.82   # stored category_confidence for LLM-classified jobs
 LLM_SOURCE = "llm"      # classification_source value
 
+# Bump when the matching system prompt changes — invalidates LLMPromptCache rows.
+CLASSIFY_PROMPT_VERSION = "classify-v1"
+GATE_PROMPT_VERSION = "gate-v1"
+
+GATE_BATCH_SIZE = 20        # jobs per gate LLM call
+GATE_MAX_CONCURRENCY = 4    # gate LLM calls in flight at once
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Prompt-level result cache
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _normalise_for_cache(text: str) -> str:
+    return re.sub(r"\s+", " ", (text or "").strip().lower())
+
+
+def prompt_cache_key(
+    kind: str, model: str, prompt_version: str, title: str, snippet: str, *context: str
+) -> str:
+    """sha256 over everything that determines the LLM answer for one job.
+
+    `context` is any further prompt field (company, department, ...).
+    """
+    basis = "\x1f".join([
+        kind,
+        model,
+        prompt_version,
+        _normalise_for_cache(title),
+        _normalise_for_cache(snippet),
+        *(_normalise_for_cache(value) for value in context),
+    ])
+    return hashlib.sha256(basis.encode("utf-8")).hexdigest()
+
+
+def _cache_get_many(keys: list[str]) -> dict[str, dict]:
+    """Return {cache_key: result} for cached keys. Never raises."""
+    if not keys:
+        return {}
+    try:
+        from .models import LLMPromptCache
+
+        rows = dict(
+            LLMPromptCache.objects.filter(cache_key__in=set(keys)).values_list("cache_key", "result")
+        )
+        if rows:
+            LLMPromptCache.objects.filter(cache_key__in=list(rows)).update(
+                hit_count=F("hit_count") + 1,
+                last_hit_at=timezone.now(),
+            )
+        return rows
+    except Exception as exc:
+        logger.warning("llm_classifier: prompt cache read failed: %s", exc)
+        return {}
+
+
+def _cache_put_many(kind: str, model: str, prompt_version: str, entries: dict[str, dict]) -> None:
+    """Store {cache_key: result}. Existing keys are left untouched. Never raises."""
+    if not entries:
+        return
+    try:
+        from .models import LLMPromptCache
+
+        LLMPromptCache.objects.bulk_create(
+            [
+                LLMPromptCache(
+                    cache_key=key,
+                    kind=kind,
+                    model=model,
+                    prompt_version=prompt_version,
+                    result=result,
+                )
+                for key, result in entries.items()
+            ],
+            ignore_conflicts=True,
+        )
+    except Exception as exc:
+        logger.warning("llm_classifier: prompt cache write failed: %s", exc)
+
+
+def _openai_client(api_key: str | None, caller: str):
+    """Return an OpenAI client, or None (with a warning) when unavailable."""
+    key = api_key or os.environ.get("OPENAI_API_KEY", "")
+    if not key:
+        logger.warning("%s: OPENAI_API_KEY not set — skipping LLM pass", caller)
+        return None
+    try:
+        import openai
+    except ImportError:
+        logger.warning("%s: openai package not installed", caller)
+        return None
+    return openai.OpenAI(api_key=key)
+
 _SYSTEM_PROMPT = """\
 You are a job classification assistant. Classify each job into exactly one category from this list:
 
@@ -63,6 +171,11 @@ Rules:
 - Never return a category not in the list above"""
 
 
+def _usage_tokens(response) -> int:
+    usage = getattr(response, "usage", None)
+    return int(getattr(usage, "total_tokens", 0) or 0)
+
+
 def _make_user_prompt(jobs: list[dict]) -> str:
     lines = []
     for j in jobs:
@@ -92,11 +205,22 @@ def _parse_llm_response(text: str) -> list[dict]:
     return []
 
 
+def _classify_cache_key(job: dict, model: str) -> str:
+    return prompt_cache_key(
+        "classify",
+        model,
+        CLASSIFY_PROMPT_VERSION,
+        (job.get("title") or "")[:120],
+        (job.get("description") or "")[:300],
+    )
+
+
 def classify_batch(
     jobs: list[dict],
     *,
     api_key: str | None = None,
     model: str = "gpt-4o-mini",
+    use_cache: bool = True,
 ) -> dict[int, dict[str, Any]]:
     """
     Classify a batch of jobs via LLM.
@@ -105,6 +229,7 @@ def classify_batch(
         jobs: list of dicts with keys: id (int), title (str), description (str)
         api_key: OpenAI API key. Falls back to OPENAI_API_KEY env var.
         model: OpenAI model name.
+        use_cache: answer from / store into LLMPromptCache.
 
     Returns:
         dict mapping job id → {"category": str, "confidence": float}
@@ -113,38 +238,45 @@ def classify_batch(
     if not jobs:
         return {}
 
-    key = api_key or os.environ.get("OPENAI_API_KEY", "")
-    if not key:
-        logger.warning("llm_classifier: OPENAI_API_KEY not set — skipping LLM pass")
-        return {}
+    keys = {j["id"]: _classify_cache_key(j, model) for j in jobs}
+    cached = _cache_get_many(list(keys.values())) if use_cache else {}
+    results: dict[int, dict[str, Any]] = {
+        job_id: dict(cached[key]) for job_id, key in keys.items() if key in cached
+    }
+    misses = [j for j in jobs if j["id"] not in results]
+    if not misses:
+        return results
 
-    try:
-        import openai
-    except ImportError:
-        logger.warning("llm_classifier: openai package not installed")
-        return {}
+    client = _openai_client(api_key, "llm_classifier")
+    if client is None:
+        return results
 
-    client = openai.OpenAI(api_key=key)
-    user_prompt = _make_user_prompt(jobs)
+    user_prompt = _make_user_prompt(misses)
+    max_tokens = len(misses) * 60 + 50
 
     try:
-        response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": _SYSTEM_PROMPT},
-                {"role": "user", "content": user_prompt},
-            ],
-            temperature=0.1,
-            max_tokens=len(jobs) * 60 + 50,
-        )
+        with llm_slot(estimate_tokens(_SYSTEM_PROMPT, user_prompt, max_output_tokens=max_tokens)) as reservation:
+            response = client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": _SYSTEM_PROMPT},
+                    {"role": "user", "content": user_prompt},
+                ],
+                temperature=0.1,
+                max_tokens=max_tokens,
+            )
+            reservation.settle(_usage_tokens(response) or reservation.estimated_tokens)
+    except LLMBudgetExceeded as exc:
+        logger.warning("llm_classifier: skipped batch of %d, %s", len(misses), exc)
+        return results
     except Exception as exc:
         logger.error("llm_classifier: API call failed: %s", exc)
-        return {}
+        return results
 
     raw_text = (response.choices[0].message.content or "").strip()
     items = _parse_llm_response(raw_text)
 
-    results: dict[int, dict[str, Any]] = {}
+    fresh: dict[str, dict] = {}
     for item in items:
         if not isinstance(item, dict):
             continue
@@ -163,7 +295,11 @@ def classify_batch(
                 continue  # discard invalid category
         confidence = float(item.get("confidence") or LLM_CONFIDENCE)
         results[job_id] = {"category": category, "confidence": min(1.0, max(0.0, confidence))}
+        if job_id in keys:
+            fresh[keys[job_id]] = results[job_id]
 
+    if use_cache:
+        _cache_put_many("classify", model, CLASSIFY_PROMPT_VERSION, fresh)
     return results
 
 
@@ -207,14 +343,21 @@ Return ONLY a JSON array — no prose, no markdown fences:
 [{"id": <int>, "decision": "YES"|"NO", "confidence": <0.0-1.0>, "category": "<short tech category or 'non-tech'>", "reason": "<one sentence>"}]"""
 
 
+def _gate_prompt_fields(job: dict) -> tuple[str, str, str, str]:
+    """(title, company, department, snippet) exactly as the gate prompt shows them."""
+    return (
+        (job.get("title") or "").strip()[:120],
+        (job.get("company") or "").strip()[:80],
+        (job.get("department") or "").strip()[:80],
+        (job.get("snippet") or "").strip()[:800],
+    )
+
+
 def _make_gate_prompt(jobs: list[dict]) -> str:
     """Build the user prompt for gate_jobs_batch()."""
     lines = []
     for j in jobs:
-        title = (j.get("title") or "").strip()[:120]
-        company = (j.get("company") or "").strip()[:80]
-        dept = (j.get("department") or "").strip()[:80]
-        snippet = (j.get("snippet") or "").strip()[:800]
+        title, company, dept, snippet = _gate_prompt_fields(j)
         parts = [f'ID {j["id"]}: Title="{title}"']
         if company:
             parts.append(f'Company="{company}"')
@@ -228,12 +371,85 @@ def _make_gate_prompt(jobs: list[dict]) -> str:
     return "Evaluate these jobs:\n\n" + "\n\n".join(lines)
 
 
+def _gate_cache_key(job: dict, model: str) -> str:
+    # Everything the prompt shows the model, so two jobs share a verdict only
+    # when the model would have seen the same input.
+    title, company, dept, snippet = _gate_prompt_fields(job)
+    return prompt_cache_key("gate", model, GATE_PROMPT_VERSION, title, snippet, company, dept)
+
+
+def _gate_llm_call(client, jobs: list[dict], model: str, background: bool) -> dict[int, dict[str, Any]]:
+    """
+    One gate LLM request. Returns raw (un-thresholded) results keyed by job id.
+
+    Thread-safe (no ORM access, only the llm_slot state), so it can run inside
+    the gate pool; `background` is the calling task's in_task().
+    """
+    user_prompt = _make_gate_prompt(jobs)
+    max_tokens = len(jobs) * 80 + 50
+    estimate = estimate_tokens(_GATE_SYSTEM_PROMPT, user_prompt, max_output_tokens=max_tokens)
+    try:
+        with llm_slot(estimate, background=background) as reservation:
+            response = client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": _GATE_SYSTEM_PROMPT},
+                    {"role": "user", "content": user_prompt},
+                ],
+                temperature=0.05,           # near-deterministic for a filter
+                max_tokens=max_tokens,
+            )
+            reservation.settle(_usage_tokens(response) or reservation.estimated_tokens)
+    except LLMBudgetExceeded as exc:
+        logger.warning("gate_jobs_batch: skipped batch of %d, %s", len(jobs), exc)
+        return {}
+    except Exception as exc:
+        logger.error("gate_jobs_batch: API call failed: %s", exc)
+        return {}
+
+    raw_text = (response.choices[0].message.content or "").strip()
+    items = _parse_llm_response(raw_text)
+
+    results: dict[int, dict[str, Any]] = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        try:
+            job_id = int(item.get("id") or 0)
+        except (TypeError, ValueError):
+            continue
+        if not job_id:
+            continue
+
+        raw_decision = str(item.get("decision") or "").strip().upper()
+        try:
+            conf = float(item.get("confidence") or 0.0)
+        except (TypeError, ValueError):
+            conf = 0.0
+        results[job_id] = {
+            "decision":   raw_decision if raw_decision in ("YES", "NO") else "UNCERTAIN",
+            "confidence": min(1.0, max(0.0, conf)),
+            "category":   str(item.get("category") or "").strip().lower()[:64],
+            "reason":     str(item.get("reason") or "").strip()[:512],
+        }
+    return results
+
+
+def _apply_gate_threshold(raw: dict[str, Any], confidence_threshold: float) -> dict[str, Any]:
+    """Below the threshold → UNCERTAIN (human review), whatever the LLM said."""
+    decision = raw.get("decision") or "UNCERTAIN"
+    if raw.get("confidence", 0.0) < confidence_threshold:
+        decision = "UNCERTAIN"
+    return {**raw, "decision": decision}
+
+
 def gate_jobs_batch(
     jobs: list[dict],
     *,
     api_key: str | None = None,
     model: str = "gpt-4o-mini",
     confidence_threshold: float = 0.65,
+    use_cache: bool = True,
 ) -> dict[int, dict[str, Any]]:
     """
     Tier-2 JD content gate — binary YES/NO relevance filter.
@@ -245,6 +461,7 @@ def gate_jobs_batch(
         api_key: OpenAI API key. Falls back to OPENAI_API_KEY env var.
         model: OpenAI model. gpt-4o-mini is recommended (cheap + fast).
         confidence_threshold: results below this are returned with decision="UNCERTAIN".
+        use_cache: answer from / store into LLMPromptCache.
 
     Returns:
         dict mapping job id → {
@@ -255,78 +472,90 @@ def gate_jobs_batch(
         }
         Missing IDs = LLM returned no result (caller treats as UNCERTAIN).
     """
-    if not jobs:
-        return {}
+    return gate_jobs_concurrent(
+        jobs,
+        api_key=api_key,
+        model=model,
+        confidence_threshold=confidence_threshold,
+        batch_size=max(1, len(jobs)),
+        max_workers=1,
+        use_cache=use_cache,
+    )
 
-    key = api_key or os.environ.get("OPENAI_API_KEY", "")
-    if not key:
-        logger.warning("gate_jobs_batch: OPENAI_API_KEY not set — skipping JD gate")
-        return {}
 
-    try:
-        import openai
-    except ImportError:
-        logger.warning("gate_jobs_batch: openai package not installed")
-        return {}
+def gate_jobs_concurrent(
+    jobs: list[dict],
+    *,
+    api_key: str | None = None,
+    model: str = "gpt-4o-mini",
+    confidence_threshold: float = 0.65,
+    batch_size: int = GATE_BATCH_SIZE,
+    max_workers: int = GATE_MAX_CONCURRENCY,
+    use_cache: bool = True,
+) -> dict[int, dict[str, Any]]:
+    """
+    Gate any number of jobs: cache lookup first, then concurrent LLM batches.
 
-    client = openai.OpenAI(api_key=key)
-    user_prompt = _make_gate_prompt(jobs)
+    Jobs whose (model, prompt version, title + snippet) is already cached are
+    answered without an API call; identical jobs within the run are sent once.
+    The remaining jobs are split into `batch_size` prompts and dispatched
+    through a pool of at most `max_workers` threads. Cache reads/writes stay
+    on the calling thread.
 
-    try:
-        response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": _GATE_SYSTEM_PROMPT},
-                {"role": "user", "content": user_prompt},
-            ],
-            temperature=0.05,           # near-deterministic for a filter
-            max_tokens=len(jobs) * 80 + 50,
-        )
-    except Exception as exc:
-        logger.error("gate_jobs_batch: API call failed: %s", exc)
+    Same return shape as gate_jobs_batch(). A failed batch simply has no
+    results (callers treat missing ids as UNCERTAIN).
+    """
+    if not jobs:
         return {}
 
-    raw_text = (response.choices[0].message.content or "").strip()
-    items = _parse_llm_response(raw_text)
-
-    results: dict[int, dict[str, Any]] = {}
-    for item in items:
-        if not isinstance(item, dict):
-            continue
-        try:
-            job_id = int(item.get("id") or 0)
-        except (TypeError, ValueError):
-            continue
-        if not job_id:
-            continue
-
-        raw_decision = str(item.get("decision") or "").strip().upper()
-        conf = float(item.get("confidence") or 0.0)
-        conf = min(1.0, max(0.0, conf))
-        category = str(item.get("category") or "").strip().lower()[:64]
-        reason = str(item.get("reason") or "").strip()[:512]
-
-        # Apply confidence threshold — below it, mark UNCERTAIN for human review
-        if conf < confidence_threshold:
-            decision = "UNCERTAIN"
-        elif raw_decision == "YES":
-            decision = "YES"
-        elif raw_decision == "NO":
-            decision = "NO"
-        else:
-            decision = "UNCERTAIN"
-
-        results[job_id] = {
-            "decision":   decision,
-            "confidence": conf,
-            "category":   category,
-            "reason":     reason,
-        }
+    keys = {j["id"]: _gate_cache_key(j, model) for j in jobs}
+    cached = _cache_get_many(list(keys.values())) if use_cache else {}
+
+    raw_by_key: dict[str, dict[str, Any]] = dict(cached)
+    representatives: dict[str, dict] = {}
+    for job in jobs:
+        key = keys[job["id"]]
+        if key not in raw_by_key and key not in representatives:
+            representatives[key] = job
+
+    if representatives:
+        client = _openai_client(api_key, "gate_jobs_batch")
+        if client is not None:
+            pending = list(representatives.values())
+            size = max(1, int(batch_size))
+            chunks = [pending[i: i + size] for i in range(0, len(pending), size)]
+            workers = max(1, min(int(max_workers), len(chunks)))
+            background = in_task()
+            if workers == 1:
+                chunk_results = [_gate_llm_call(client, chunk, model, background) for chunk in chunks]
+            else:
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    chunk_results = list(
+                        pool.map(lambda chunk: _gate_llm_call(client, chunk, model, background), chunks)
+                    )
+
+            fresh: dict[str, dict[str, Any]] = {}
+            for chunk_result in chunk_results:
+                for job_id, raw in chunk_result.items():
+                    key = keys.get(job_id)
+                    if key in representatives:
+                        fresh[key] = raw
+            raw_by_key.update(fresh)
+            if use_cache:
+                _cache_put_many("gate", model, GATE_PROMPT_VERSION, fresh)
+
+    results: dict[int, dict[str, Any]] = {
+        job_id: _apply_gate_threshold(raw_by_key[key], confidence_threshold)
+        for job_id, key in keys.items()
+        if key in raw_by_key
+    }
 
     logger.info(
-        "gate_jobs_batch: %d jobs → %d results (YES=%d NO=%d UNCERTAIN=%d)",
+        "gate_jobs_batch: %d jobs → %d results (cached=%d sent=%d YES=%d NO=%d UNCERTAIN=%d)",
         len(jobs),
         len(results),
+        sum(1 for key in keys.values() if key in cached),
+        len(representatives),
         sum(1 for r in results.values() if r["decision"] == "YES"),
         sum(1 for r in results.values() if r["decision"] == "NO"),
         sum(1 for r in results.values() if r["decision"] == "UNCERTAIN"),
@@ -0,0 +1,116 @@
+"""
+Local stub for the OpenAI chat completions API — for testing the harvest LLM passes.
+
+Answers the two prompt shapes built by llm_classifier deterministically, with
+no network and no token bill:
+  • JD gate prompt   → YES when the title/snippet contains a tech keyword, else NO
+  • classify prompt  → "Engineering" for every job
+
+Point the OpenAI client at it with OPENAI_BASE_URL=http://127.0.0.1:<port>/v1
+(any non-empty OPENAI_API_KEY works). Start it with
+`python manage.py llm_stub_server` or start_stub_server() in tests.
+"""
+from __future__ import annotations
+
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_JOB_LINE_RE = re.compile(r'^ID (\d+): Title="([^"]*)"(.*)$', re.M)
+_TECH_RE = re.compile(
+    r"\b(engineer|developer|devops|sre|cloud|data|software|platform|security|"
+    r"python|java|sql|aws|azure|kubernetes|ml|ai|qa|servicenow|salesforce|sap)\b",
+    re.I,
+)
+
+
+def stub_answer(system_prompt: str, user_prompt: str) -> list[dict]:
+    """Return the JSON array the stub replies with for one prompt."""
+    is_gate = "hiring intake filter" in (system_prompt or "")
+    items: list[dict] = []
+    for m in _JOB_LINE_RE.finditer(user_prompt or ""):
+        job_id, title, rest = int(m.group(1)), m.group(2), m.group(3)
+        if is_gate:
+            tech = bool(_TECH_RE.search(title) or _TECH_RE.search(rest))
+            items.append({
+                "id": job_id,
+                "decision": "YES" if tech else "NO",
+                "confidence": 0.9,
+                "category": "engineering" if tech else "non-tech",
+                "reason": "stub: keyword match" if tech else "stub: no tech keyword",
+            })
+        else:
+            items.append({"id": job_id, "category": "Engineering", "confidence": 0.9})
+    return items
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):  # noqa: A002 — silence default stderr logging
+        pass
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self.send_error(404)
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self.send_error(400)
+            return
+
+        messages = body.get("messages") or []
+        system = next((m.get("content", "") for m in messages if m.get("role") == "system"), "")
+        user = next((m.get("content", "") for m in messages if m.get("role") == "user"), "")
+        content = json.dumps(stub_answer(system, user))
+
+        with self.server.lock:
+            self.server.request_count += 1
+            count = self.server.request_count
+
+        payload = json.dumps({
+            "id": f"chatcmpl-stub-{count}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model") or "stub",
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": len(user) // 4,
+                "completion_tokens": len(content) // 4,
+                "total_tokens": (len(user) + len(content)) // 4,
+            },
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class StubLLMServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer that counts chat completion requests."""
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int]):
+        super().__init__(address, _StubHandler)
+        self.lock = threading.Lock()
+        self.request_count = 0
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+
+def start_stub_server(host: str = "127.0.0.1", port: int = 0) -> StubLLMServer:
+    """Start the stub on a background thread (port=0 picks a free port)."""
+    server = StubLLMServer((host, port))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -13,6 +13,8 @@ from django.core.management.base import BaseCommand
 from django.db import transaction
 from django.utils import timezone
 
+from jobs.event_buffer import deferred_pipeline_events
+
 
 class Command(BaseCommand):
     help = "Bulk-sync high-quality PENDING RawJobs into the Job pool"
@@ -23,6 +25,7 @@ class Command(BaseCommand):
         parser.add_argument("--min-desc-len", type=int, default=50, help="Minimum description length (default 50)")
         parser.add_argument("--dry-run", action="store_true", help="Count eligible rows without syncing")
 
+    @deferred_pipeline_events()
     def handle(self, *args, **options):
         from harvest.models import RawJob
         from jobs.models import Job
@@ -0,0 +1,42 @@
+"""
+backfill_rawjob_derived_fields
+==============================
+Stamp the write-time list columns (country_detected, jd_char_count,
+jd_title_only) on RawJob rows written before they existed or before the last
+DERIVED_VERSION bump. Until a row is stamped the Raw Jobs list computes the
+values on read, so this can run in chunks at any time.
+
+Usage:
+    python manage.py backfill_rawjob_derived_fields
+    python manage.py backfill_rawjob_derived_fields --platform workday --limit 50000
+    python manage.py backfill_rawjob_derived_fields --all
+"""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from harvest.models import RawJob
+from harvest.services.rawjob_derived import REFRESH_BATCH_SIZE, refresh_derived_fields
+
+
+class Command(BaseCommand):
+    help = "Stamp RawJob country_detected / jd_char_count / jd_title_only for list pages."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--all", action="store_true", help="Re-stamp rows that are already current too.")
+        parser.add_argument("--platform", default="", help="Limit to one platform slug.")
+        parser.add_argument("--limit", type=int, default=0, help="Maximum rows to process.")
+        parser.add_argument("--batch-size", type=int, default=REFRESH_BATCH_SIZE, help="Rows per read/bulk_update.")
+
+    def handle(self, *args, **options):
+        qs = RawJob.objects.all()
+        if options["platform"]:
+            qs = qs.filter(platform_slug=options["platform"])
+        batch_size = max(100, min(int(options["batch_size"] or REFRESH_BATCH_SIZE), 5000))
+        written = refresh_derived_fields(
+            qs,
+            stale_only=not options["all"],
+            batch_size=batch_size,
+            limit=options["limit"] or None,
+        )
+        self.stdout.write(self.style.SUCCESS(f"Stamped derived list fields on {written:,} RawJob rows"))
@@ -6,6 +6,7 @@ from django.db import transaction
 
 from harvest.location_resolver import evaluate_rawjob_scope
 from harvest.models import HarvestEngineConfig, HarvestOpsRun, RawJob
+from harvest.services.rawjob_derived import DERIVED_FIELDS, stamp_derived_fields
 
 from ._ops_base import OpsTrackedCommand
 
@@ -63,6 +64,7 @@ class Command(OpsTrackedCommand):
             "job_domain_candidates",
             "job_category",
             "department_normalized",
+            *DERIVED_FIELDS,
         )
         if options["limit"] and options["limit"] > 0:
             qs = qs[: options["limit"]]
@@ -94,6 +96,7 @@ class Command(OpsTrackedCommand):
             "state",
             "city",
             "location_raw",
+            *DERIVED_FIELDS,
         ]
 
         def flush():
@@ -110,6 +113,7 @@ class Command(OpsTrackedCommand):
             updates = evaluate_rawjob_scope(raw_job, cfg=cfg, use_provider=use_provider, save=False)
             for field, value in updates.items():
                 setattr(raw_job, field, value)
+            stamp_derived_fields(raw_job)
             counters[updates.get("scope_status") or "UNSCOPED"] += 1
             counters[f"country:{updates.get('country_code') or 'UNKNOWN'}"] += 1
             buffer.append(raw_job)
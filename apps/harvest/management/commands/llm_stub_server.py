@@ -0,0 +1,34 @@
+"""
+Management command: llm_stub_server
+
+Runs a local OpenAI-compatible stub so the JD gate / LLM classifier can be
+exercised end-to-end without network access or API cost.
+
+Usage:
+    python manage.py llm_stub_server --port 8765
+    # in another shell:
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=stub \
+        python manage.py run_content_gate --batch-size 200 --dry-run
+"""
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Serve a deterministic OpenAI chat-completions stub for the harvest LLM passes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", type=str, default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8765)
+
+    def handle(self, *args, **options):
+        from harvest.llm_stub import StubLLMServer
+
+        server = StubLLMServer((options["host"], options["port"]))
+        self.stdout.write(self.style.SUCCESS(f"LLM stub listening — OPENAI_BASE_URL={server.base_url}"))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            self.stdout.write(f"Served {server.request_count} chat completion request(s).")
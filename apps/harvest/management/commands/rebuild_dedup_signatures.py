@@ -0,0 +1,52 @@
+"""
+Management command: rebuild_dedup_signatures
+
+Backfills / reconciles the incremental duplicate index (RawJobSignature).
+New and re-described RawJobs are indexed automatically on save; run this once
+after deploying, or after bulk `.update()` writes that bypass signals.
+
+Usage:
+    python manage.py rebuild_dedup_signatures                 # missing signatures only
+    python manage.py rebuild_dedup_signatures --all           # re-index every active job
+    python manage.py rebuild_dedup_signatures --detect        # also emit duplicate pairs
+    python manage.py rebuild_dedup_signatures --batch-size 1000 --limit 50000
+"""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Backfill RawJob MinHash signatures used by incremental duplicate detection."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--all", action="store_true", help="Re-index jobs that already have a signature")
+        parser.add_argument("--detect", action="store_true", help="Run duplicate detection for each batch")
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--limit", type=int, default=0, help="Cap total indexed (0 = all)")
+
+    def handle(self, *args, **options):
+        from harvest.duplicate_engine import index_raw_jobs
+        from harvest.models import RawJob
+
+        batch_size = max(1, options["batch_size"])
+        limit = options["limit"]
+        detect = options["detect"]
+
+        qs = RawJob.objects.filter(is_active=True, has_description=True)
+        if not options["all"]:
+            qs = qs.filter(dedup_signature__isnull=True)
+        ids = qs.order_by("pk").values_list("pk", flat=True)
+        if limit:
+            ids = ids[:limit]
+        ids = list(ids)
+        self.stdout.write(f"Indexing {len(ids):,} RawJob(s) (detect={detect})…")
+
+        totals = {"indexed": 0, "removed": 0, "pairs_saved": 0}
+        for i in range(0, len(ids), batch_size):
+            stats = index_raw_jobs(ids[i: i + batch_size], detect=detect)
+            for key in totals:
+                totals[key] += stats.get(key, 0)
+            self.stdout.write(f"  {min(i + batch_size, len(ids)):,}/{len(ids):,}  {totals}")
+
+        self.stdout.write(self.style.SUCCESS(f"Done: {totals}"))
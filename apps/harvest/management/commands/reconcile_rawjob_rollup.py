@@ -0,0 +1,30 @@
+"""
+reconcile_rawjob_rollup
+=======================
+Rebuild the RawJobRollup dashboard counters from RawJob. Run once after the
+table is created (the scheduled task also does a full pass until then), or any
+time the dashboards look off.
+
+Usage:
+    python manage.py reconcile_rawjob_rollup
+    python manage.py reconcile_rawjob_rollup --days 3
+"""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from harvest.services.rawjob_rollup import reconcile_rollup
+
+
+class Command(BaseCommand):
+    help = "Recount RawJobRollup (dashboard counters) from RawJob."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=0, help="Only the last N fetched days (0 = all).")
+
+    def handle(self, *args, **options):
+        result = reconcile_rollup(days=options["days"] or None)
+        self.stdout.write(self.style.SUCCESS(
+            f"Reconciled {result['rows']:,} rollup rows "
+            f"({result['corrected']:,} corrected, {result['removed']:,} removed)"
+        ))
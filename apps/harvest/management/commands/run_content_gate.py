@@ -71,6 +71,12 @@ class Command(BaseCommand):
             default=None,
             help="Max JD snippet chars sent to LLM. Default from config (800).",
         )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=None,
+            help="Max concurrent LLM gate calls. Default from config (4).",
+        )
         parser.add_argument(
             "--audit-mode",
             action="store_true",
@@ -100,6 +106,7 @@ class Command(BaseCommand):
         model            = options["model"]
         threshold        = options["threshold"]
         snippet_chars    = options["snippet_chars"]
+        concurrency      = options["concurrency"]
         audit_mode       = options["audit_mode"] or None  # None = use config value
         dry_run          = options["dry_run"]
         loop             = options["loop"]
@@ -125,6 +132,7 @@ class Command(BaseCommand):
                 snippet_chars=snippet_chars,
                 audit_mode=audit_mode,
                 trigger_backfill_on_confirm=trigger_backfill,
+                concurrency=concurrency,
             )
             elapsed = time.monotonic() - t0
 
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('harvest', '0064_jobdomain'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='harvestengineconfig',
+            name='jd_gate_concurrency',
+            field=models.PositiveSmallIntegerField(default=4, help_text="Max JD gate LLM batches in flight at once. Cached prompts are never re-sent. Keep low enough to stay under the provider's rate limit.", verbose_name='JD gate — concurrent LLM calls'),
+        ),
+        migrations.CreateModel(
+            name='LLMPromptCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cache_key', models.CharField(db_index=True, max_length=64, unique=True)),
+                ('kind', models.CharField(db_index=True, max_length=16)),
+                ('model', models.CharField(max_length=64)),
+                ('prompt_version', models.CharField(max_length=32)),
+                ('result', models.JSONField(default=dict)),
+                ('hit_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_hit_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['kind', 'prompt_version'], name='llm_cache_kind_version_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:17
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('harvest', '0065_llm_prompt_cache'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RawJobSignature',
+            fields=[
+                ('raw_job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='dedup_signature', serialize=False, to='harvest.rawjob')),
+                ('jd_hash', models.CharField(db_index=True, max_length=32)),
+                ('minhash', models.BinaryField()),
+                ('bands', django.contrib.postgres.fields.ArrayField(base_field=models.BigIntegerField(), size=None)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [django.contrib.postgres.indexes.GinIndex(fields=['bands'], name='rawjob_sig_bands_gin')],
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('harvest', '0066_rawjob_signature'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rawjob',
+            name='country_detected',
+            field=models.CharField(blank=True, max_length=128),
+        ),
+        migrations.AddField(
+            model_name='rawjob',
+            name='derived_version',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='rawjob',
+            name='jd_char_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='rawjob',
+            name='jd_title_only',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='rawjob',
+            index=models.Index(fields=['-fetched_at', '-id'], name='harvest_raw_fetched_id_idx'),
+        ),
+    ]
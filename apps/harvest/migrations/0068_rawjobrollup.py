@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('harvest', '0067_rawjob_derived_list_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RawJobRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('platform_slug', models.CharField(blank=True, max_length=64)),
+                ('sync_status', models.CharField(max_length=16)),
+                ('is_test_run', models.BooleanField(default=False)),
+                ('jobs', models.IntegerField(default=0)),
+                ('active', models.IntegerField(default=0)),
+                ('remote', models.IntegerField(default=0)),
+                ('with_jd', models.IntegerField(default=0)),
+                ('jd_backlog', models.IntegerField(default=0)),
+                ('enriched', models.IntegerField(default=0)),
+                ('classified', models.IntegerField(default=0)),
+                ('ready', models.IntegerField(default=0)),
+                ('duplicates', models.IntegerField(default=0)),
+                ('coverage', models.JSONField(blank=True, default=dict)),
+                ('reconciled_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['platform_slug', 'day'], name='harvest_rollup_plat_day_idx')],
+                'constraints': [models.UniqueConstraint(fields=('day', 'platform_slug', 'sync_status', 'is_test_run'), name='harvest_rawjob_rollup_key')],
+            },
+        ),
+    ]
@@ -0,0 +1,145 @@
+"""
+MinHash signatures + LSH banding for near-duplicate candidate generation.
+
+Used by duplicate_engine to find RawJob pairs whose JD token sets are likely
+similar without comparing every pair: each job gets a NUM_BINS-slot MinHash
+signature, the signature is cut into BANDS bands of ROWS slots, and two jobs
+become candidates when any band matches exactly. Candidates are then verified
+with exact Jaccard by the caller.
+
+Signatures use one-permutation hashing (one 64-bit hash per token, binned and
+densified), so building a signature is O(tokens) instead of O(tokens × NUM_BINS).
+Hashing is blake2b-based and therefore stable across processes — signatures
+can be persisted and compared later.
+
+With BANDS=16 × ROWS=8 the LSH threshold is ≈0.71 Jaccard:
+  P(candidate | J=0.85) ≈ 0.99,  P(candidate | J=0.50) ≈ 0.06.
+"""
+from __future__ import annotations
+
+import hashlib
+import struct
+from collections import defaultdict
+from functools import lru_cache
+from typing import Iterable, Iterator
+
+NUM_BINS = 128
+BANDS = 16
+ROWS = NUM_BINS // BANDS
+MAX_BUCKET_SIZE = 200       # larger buckets emit a star (first member vs rest), not all pairs
+
+_BIN_BITS = NUM_BINS.bit_length() - 1
+_BIN_MASK = NUM_BINS - 1
+_VALUE_MAX = (1 << (64 - _BIN_BITS)) - 1
+
+
+@lru_cache(maxsize=200_000)
+def token_hash(token: str) -> int:
+    """Stable 64-bit hash for one token (vocabulary repeats, so it is memoised)."""
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def signature(tokens: Iterable[str]) -> tuple[int, ...] | None:
+    """
+    One-permutation MinHash signature of a token set, or None for an empty set.
+
+    Empty bins are densified by borrowing the next non-empty bin to the right
+    (circularly), offset by the distance so borrowed values stay distinguishable.
+    """
+    mins = [-1] * NUM_BINS
+    for tok in tokens:
+        h = token_hash(tok)
+        b = h & _BIN_MASK
+        v = h >> _BIN_BITS
+        if mins[b] < 0 or v < mins[b]:
+            mins[b] = v
+    if all(m < 0 for m in mins):
+        return None
+    sig = list(mins)
+    for i in range(NUM_BINS):
+        if sig[i] >= 0:
+            continue
+        dist = 1
+        while mins[(i + dist) % NUM_BINS] < 0:
+            dist += 1
+        sig[i] = (mins[(i + dist) % NUM_BINS] + dist * 0x9E3779B1) & _VALUE_MAX
+    return tuple(sig)
+
+
+def estimate_jaccard(a: tuple[int, ...], b: tuple[int, ...]) -> float:
+    """Fraction of equal slots — an unbiased Jaccard estimate."""
+    if not a or not b:
+        return 0.0
+    return sum(1 for x, y in zip(a, b) if x == y) / NUM_BINS
+
+
+def band_keys(sig: tuple[int, ...]) -> list[int]:
+    """
+    One signed 64-bit key per band (fits a BIGINT column).
+
+    blake2b-based so keys stay identical across processes and Python versions
+    — RawJobSignature persists them.
+    """
+    keys: list[int] = []
+    for band in range(BANDS):
+        packed = struct.pack(f">H{ROWS}Q", band, *sig[band * ROWS:(band + 1) * ROWS])
+        keys.append(int.from_bytes(hashlib.blake2b(packed, digest_size=8).digest(), "big", signed=True))
+    return keys
+
+
+def pack_signature(sig: tuple[int, ...]) -> bytes:
+    return struct.pack(f">{NUM_BINS}Q", *sig)
+
+
+def unpack_signature(data: bytes | memoryview | None) -> tuple[int, ...] | None:
+    if not data:
+        return None
+    data = bytes(data)
+    if len(data) != NUM_BINS * 8:
+        return None
+    return struct.unpack(f">{NUM_BINS}Q", data)
+
+
+class LSHIndex:
+    """In-memory LSH band index: id → signature, band key → ids."""
+
+    def __init__(self):
+        self._buckets: dict[int, list[int]] = defaultdict(list)
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def add(self, item_id: int, sig: tuple[int, ...]) -> None:
+        for key in band_keys(sig):
+            self._buckets[key].append(item_id)
+
+    def query(self, sig: tuple[int, ...]) -> set[int]:
+        """Ids sharing at least one band with `sig`."""
+        found: set[int] = set()
+        for key in band_keys(sig):
+            found.update(self._buckets.get(key, ()))
+        return found
+
+    def candidate_pairs(self) -> Iterator[tuple[int, int]]:
+        """
+        Yield each (low_id, high_id) candidate pair once.
+
+        Buckets above MAX_BUCKET_SIZE (mass-reposted boilerplate) only pair
+        their first member with the rest, keeping output linear in bucket size.
+        """
+        seen: set[tuple[int, int]] = set()
+        for ids in self._buckets.values():
+            if len(ids) < 2:
+                continue
+            if len(ids) > MAX_BUCKET_SIZE:
+                head = ids[0]
+                pairs = ((head, other) for other in ids[1:])
+            else:
+                pairs = ((ids[i], ids[k]) for i in range(len(ids)) for k in range(i + 1, len(ids)))
+            for a, b in pairs:
+                if a == b:
+                    continue
+                key = (a, b) if a < b else (b, a)
+                if key not in seen:
+                    seen.add(key)
+                    yield key
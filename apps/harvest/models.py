@@ -4,6 +4,8 @@ import uuid
 from datetime import timedelta
 
 from django.conf import settings
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models, transaction
 from django.db.models import Q
 from django.utils import timezone
@@ -782,6 +784,34 @@ class LocationCache(models.Model):
         return f"{self.normalized_text} -> {label}"
 
 
+class LLMPromptCache(models.Model):
+    """
+    Persistent result cache for the harvest LLM prompts (JD gate, category classifier).
+
+    Keyed on sha256(kind, model, prompt version, normalised title + snippet), so
+    identical reposts are answered from here instead of being re-sent to the LLM.
+    Bumping the prompt version in llm_classifier invalidates old rows.
+    """
+
+    cache_key = models.CharField(max_length=64, unique=True, db_index=True)
+    kind = models.CharField(max_length=16, db_index=True)
+    model = models.CharField(max_length=64)
+    prompt_version = models.CharField(max_length=32)
+    result = models.JSONField(default=dict)
+    hit_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_hit_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["kind", "prompt_version"], name="llm_cache_kind_version_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}/{self.model}/{self.prompt_version} {self.cache_key[:12]}"
+
+
 class RawJob(models.Model):
     """Comprehensive job record harvested from an external ATS platform."""
 
@@ -1090,6 +1120,12 @@ class RawJob(models.Model):
     field_provenance = models.JSONField(default=dict, blank=True)
     resume_ready_score = models.FloatField(null=True, blank=True)
 
+    # ── Derived at write time for list pages (services/rawjob_derived.py) ────
+    country_detected = models.CharField(max_length=128, blank=True)
+    jd_char_count = models.PositiveIntegerField(default=0)
+    jd_title_only = models.BooleanField(default=False)
+    derived_version = models.PositiveSmallIntegerField(default=0)
+
     # ── Lifecycle ─────────────────────────────────────────────────────────────
     is_test_run = models.BooleanField(
         default=False,
@@ -1130,6 +1166,8 @@ class RawJob(models.Model):
             models.Index(fields=["sync_status"]),
             models.Index(fields=["is_test_run"]),
             models.Index(fields=["fetched_at"],       name="harvest_raw_fetched_idx"),
+            # Keyset pagination of the Raw Jobs list: ORDER BY fetched_at DESC, id DESC
+            models.Index(fields=["-fetched_at", "-id"], name="harvest_raw_fetched_id_idx"),
             models.Index(fields=["is_remote"],         name="harvest_raw_remote_idx"),
             models.Index(fields=["has_description"],   name="harvest_raw_hasdesc_idx"),
             models.Index(fields=["filter_decision"]),
@@ -1182,14 +1220,56 @@ class RawJob(models.Model):
         verbose_name = "Raw Job"
         verbose_name_plural = "Raw Jobs"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Kept by reference, no per-row work: harvest.signals diffs against it on save.
+        instance._db_row = (field_names, values)
+        return instance
+
+    def loaded_values(self, fields) -> tuple | None:
+        """`fields` as loaded from the DB; None for unsaved instances or deferred fields."""
+        row = self.__dict__.get("_db_row")
+        if row is None:
+            return None
+        field_names, values = row
+        try:
+            return tuple(values[field_names.index(field)] for field in fields)
+        except ValueError:
+            return None
+
     def has_meaningful_description(self) -> bool:
         """True when stored description has more than trivial whitespace (matches Jobs Browser)."""
         return len((self.description or "").strip()) > 1
 
     def save(self, *args, **kwargs):
+        from .services.rawjob_derived import DERIVED_INPUT_FIELDS, stamp_derived_fields
+
         self.has_description = self.has_meaningful_description()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None:
+            stamp_derived_fields(self)
+        elif DERIVED_INPUT_FIELDS.intersection(update_fields):
+            update_fields = list(update_fields)
+            kwargs["update_fields"] = update_fields + [
+                f for f in stamp_derived_fields(self) if f not in update_fields
+            ]
         super().save(*args, **kwargs)
 
+    def detected_country(self) -> str:
+        """infer_country_from_location() for this row — the stamped value when current."""
+        from .services.rawjob_derived import is_stamped
+
+        if is_stamped(self):
+            return self.country_detected
+        from .enrichments import infer_country_from_location
+
+        return infer_country_from_location(
+            location_raw=self.location_raw or "",
+            state=self.state or "",
+            country=self.country or "",
+        )
+
     def is_expired_listing(self) -> bool:
         """
         Best-effort: job is no longer open (closed date passed, explicit expiry, delisted,
@@ -1501,6 +1581,78 @@ class RawJobDuplicatePair(models.Model):
         return f"{self.get_label_display()}: #{self.primary_id} ↔ #{self.duplicate_id}"
 
 
+class RawJobSignature(models.Model):
+    """
+    Persistent MinHash sketch of a RawJob's JD — the incremental duplicate index.
+
+    Written on ingest (harvest.duplicate_engine.index_raw_jobs, queued by
+    harvest.signals) whenever the description changes.
+    `bands` holds the LSH band keys; a GIN index makes "any band in common"
+    a single indexed overlap query, so a new job is compared only with its
+    LSH candidates instead of re-scanning the table.
+    """
+
+    raw_job = models.OneToOneField(
+        RawJob, on_delete=models.CASCADE, primary_key=True, related_name="dedup_signature",
+    )
+    jd_hash = models.CharField(max_length=32, db_index=True)
+    minhash = models.BinaryField()
+    bands = ArrayField(models.BigIntegerField())
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=["bands"], name="rawjob_sig_bands_gin"),
+        ]
+
+    def __str__(self):
+        return f"Signature for RawJob #{self.raw_job_id}"
+
+
+class RawJobRollup(models.Model):
+    """
+    RawJob counters per fetched day × platform_slug × sync_status (× test flag).
+
+    Dashboards sum these rows instead of counting RawJob. The counters are kept
+    current on write (harvest.signals and the bulk sync/enrich paths, see
+    services/rawjob_rollup.py) and rebuilt from RawJob by the periodic
+    reconciliation task, which also fills `coverage` — the per-field coverage
+    counts and score sums behind Board Analytics.
+    """
+
+    day = models.DateField()
+    platform_slug = models.CharField(max_length=64, blank=True)
+    sync_status = models.CharField(max_length=16)
+    is_test_run = models.BooleanField(default=False)
+
+    jobs = models.IntegerField(default=0)
+    active = models.IntegerField(default=0)
+    remote = models.IntegerField(default=0)
+    with_jd = models.IntegerField(default=0)
+    jd_backlog = models.IntegerField(default=0)
+    enriched = models.IntegerField(default=0)
+    classified = models.IntegerField(default=0)
+    ready = models.IntegerField(default=0)
+    duplicates = models.IntegerField(default=0)
+
+    coverage = models.JSONField(default=dict, blank=True)
+    reconciled_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["day", "platform_slug", "sync_status", "is_test_run"],
+                name="harvest_rawjob_rollup_key",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["platform_slug", "day"], name="harvest_rollup_plat_day_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.platform_slug or '-'} {self.sync_status}: {self.jobs}"
+
+
 class PlatformEngineConfig(models.Model):
     """Per-platform runtime config — replaces hardcoded `_NEEDS_BACKFILL` list and sleep delays.
 
@@ -1931,6 +2083,14 @@ class HarvestEngineConfig(models.Model):
         verbose_name="JD gate — LLM batch size",
         help_text="Jobs per LLM API call in JD gate. 20 is the sweet spot for cost vs latency.",
     )
+    jd_gate_concurrency = models.PositiveSmallIntegerField(
+        default=4,
+        verbose_name="JD gate — concurrent LLM calls",
+        help_text=(
+            "Max JD gate LLM batches in flight at once. Cached prompts are never re-sent. "
+            "Keep low enough to stay under the provider's rate limit."
+        ),
+    )
     jd_gate_snippet_chars = models.PositiveSmallIntegerField(
         default=800,
         verbose_name="JD gate — snippet length (chars)",
@@ -2039,11 +2199,12 @@ class HarvestEngineConfig(models.Model):
         self.detect_batch_size = max(10, min(int(self.detect_batch_size or 50), 50))
         self.classify_chunk_limit = min(int(self.classify_chunk_limit or 0), 20000)
         old_target_countries = None
+        old_ready_conf = None
         try:
-            old_target_countries = type(self).objects.filter(pk=1).values_list(
+            old_target_countries, old_ready_conf = type(self).objects.filter(pk=1).values_list(
                 "target_countries",
-                flat=True,
-            ).first()
+                "ready_stage_min_confidence",
+            ).first() or (None, None)
         except Exception:
             old_target_countries = None
         self.pk = 1  # enforce singleton
@@ -2084,6 +2245,17 @@ class HarvestEngineConfig(models.Model):
                     pass
 
             transaction.on_commit(_queue_rescope)
+        ready_conf_changed = old_ready_conf is not None and old_ready_conf != self.ready_stage_min_confidence
+        if target_countries_changed or ready_conf_changed:
+            # RawJobRollup's ready counter and target-country coverage use these.
+            def _queue_rollup_reconcile():
+                try:
+                    from .tasks import reconcile_rawjob_rollup_task
+                    reconcile_rawjob_rollup_task.apply_async(kwargs={"days": 0}, countdown=30, queue="harvest")
+                except Exception:
+                    pass
+
+            transaction.on_commit(_queue_rollup_reconcile)
         # Broadcast updated rate limit to all running Celery workers immediately.
         # Workers that are offline will pick up the new rate from DB on next task start.
         try:
@@ -15,7 +15,6 @@ from datetime import date, datetime
 from django.conf import settings
 from django.core.cache import cache
 from django.db import IntegrityError
-from django.db.models import Q
 from django.http import JsonResponse
 from django.utils import timezone
 from django.utils.decorators import method_decorator
@@ -87,56 +86,24 @@ def _safe_list(val) -> list:
     return [str(val)]
 
 
-def _resolve_company(company_name: str):
-    """Find or create a Company stub by name. Returns Company or None."""
-    if not company_name:
-        return None
+def _resolve_companies(company_names: list[str]) -> dict:
+    """
+    Bulk find-or-create Company stubs for a push batch.
+
+    Returns {raw name: Company | None}; resolution goes through the shared
+    identity index (companies.resolution), so a batch costs a few queries.
+    """
+    from companies.resolution import clean_company_name, resolve_many
+
+    names = [n for n in dict.fromkeys(company_names) if n]
+    if not names:
+        return {}
     try:
-        import re
-
-        from companies.models import Company
-        raw_name = re.sub(r"\s+", " ", company_name).strip(" -_,.")
-        company = Company.objects.filter(Q(name__iexact=raw_name) | Q(alias__iexact=raw_name)).first()
-        if company:
-            return company
-
-        def _name_key(v: str) -> str:
-            txt = (v or "").strip().lower().replace("&", " and ")
-            txt = re.sub(r"[^a-z0-9]+", " ", txt)
-            toks = [t for t in txt.split() if t]
-            stop = {
-                "the", "inc", "incorporated", "llc", "ltd", "ltda", "corp", "corporation",
-                "co", "company", "group", "holdings", "plc", "gmbh", "sa", "bv", "srl",
-                "pte", "and", "of", "for", "a", "an", "do", "de", "da",
-            }
-            reduced = [t for t in toks if t not in stop] or toks
-            return " ".join(reduced)
-
-        lookup_key = _name_key(raw_name)
-        lookup_compact = lookup_key.replace(" ", "")
-        if lookup_key:
-            token_q = Q()
-            for tok in lookup_key.split()[:3]:
-                token_q |= Q(name__icontains=tok) | Q(alias__icontains=tok)
-            candidates = Company.objects.filter(token_q) if token_q else Company.objects.all()
-            best = None
-            for cand in candidates.only("id", "name", "alias").order_by("name")[:300]:
-                for cname in (cand.name, cand.alias):
-                    cand_key = _name_key(cname)
-                    if not cand_key:
-                        continue
-                    if cand_key == lookup_key or cand_key.replace(" ", "") == lookup_compact:
-                        if best is None or len(cand.name) < len(best.name):
-                            best = cand
-                        break
-            if best:
-                return best
-
-        company, _ = Company.objects.get_or_create(name=raw_name, defaults={"name": raw_name})
-        return company
+        resolved = resolve_many(names, create=True)
     except Exception:
-        logger.exception("push_api: company lookup failed for %r", company_name)
-        return None
+        logger.exception("push_api: company lookup failed for %d name(s)", len(names))
+        return {}
+    return {n: resolved.get(clean_company_name(n)) for n in names}
 
 
 def _resolve_platform(slug: str):
@@ -343,6 +310,12 @@ class PushJobsView(View):
                 },
             )
 
+        companies_by_name = _resolve_companies([
+            str(job_data.get("company_name") or "")
+            for job_data in jobs
+            if isinstance(job_data, dict) and (job_data.get("original_url") or job_data.get("url_hash"))
+        ])
+
         for job_data in jobs:
             try:
                 original_url = job_data.get("original_url", "").strip()
@@ -354,7 +327,7 @@ class PushJobsView(View):
                     errors += 1
                     continue
 
-                company = _resolve_company(job_data.get("company_name", ""))
+                company = companies_by_name.get(str(job_data.get("company_name") or ""))
                 if company is None:
                     logger.warning(
                         "push_api: skipping job %s — cannot resolve company %r",
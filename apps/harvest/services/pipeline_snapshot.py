@@ -7,9 +7,10 @@ from django.core.cache import cache
 from django.db.models import Avg, Count, Max, Min, Q
 from django.utils import timezone
 
-from harvest.models import CompanyFetchRun, RawJob
+from harvest.models import CompanyFetchRun, RawJob, RawJobRollup
 from harvest.runtime_config import get_jd_backfill_lock_stale_minutes, get_ready_stage_min_confidence
 from harvest.services.rawjob_query import build_funnel_counts, filtered_out_q, production_rawjobs_queryset
+from harvest.services.rawjob_rollup import rollup_totals
 
 
 def raw_jobs_missing_description_count() -> int:
@@ -51,23 +52,21 @@ def load_rawjobs_dashboard_stats(*, force_refresh: bool = False) -> dict:
     if stats is not None:
         return stats
 
+    # Totals come from RawJobRollup (a few rows per platform and day); only the
+    # rolling 24h window is counted on RawJob, as an indexed fetched_at range.
     last_24h_cutoff = timezone.now() - timedelta(hours=24)
-    base = production_rawjobs_queryset()
-    agg = base.aggregate(
-        total=Count("id"),
-        active=Count("id", filter=Q(is_active=True)),
-        remote=Count("id", filter=Q(is_remote=True)),
-        synced=Count("id", filter=Q(sync_status="SYNCED")),
-        pending=Count("id", filter=Q(sync_status="PENDING")),
-        failed=Count("id", filter=Q(sync_status="FAILED")),
-        new_today=Count("id", filter=Q(fetched_at__gte=last_24h_cutoff)),
-        missing_jd=Count(
-            "id",
-            filter=Q(has_description=False, is_cold=False, jd_fetch_skipped=False)
-            & ~Q(filter_decision__in=["COLD", "NO_MATCH"]),
-        ),
-    )
-    agg["test_rows"] = RawJob.objects.filter(is_test_run=True).count()
+    totals = rollup_totals()
+    agg = {
+        "total": totals["jobs"],
+        "active": totals["active"],
+        "remote": totals["remote"],
+        "synced": totals["synced"],
+        "pending": totals["pending"],
+        "failed": totals["failed"],
+        "new_today": production_rawjobs_queryset().filter(fetched_at__gte=last_24h_cutoff).count(),
+        "missing_jd": totals["jd_backlog"],
+    }
+    agg["test_rows"] = rollup_totals(RawJobRollup.objects.filter(is_test_run=True))["jobs"]
 
     expired_missing = None if force_refresh else cache.get(expired_key)
     if expired_missing is None:
@@ -92,7 +91,7 @@ def raw_jobs_workflow_insights(*, stale_pending_hours: int = 6) -> dict:
     recent_cutoff = now - timedelta(hours=24)
 
     base = production_rawjobs_queryset()
-    funnel = build_funnel_counts(base)
+    funnel = build_funnel_counts()
 
     pending_qs = base.filter(sync_status=RawJob.SyncStatus.PENDING)
     pending_total = pending_qs.count()
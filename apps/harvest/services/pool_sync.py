@@ -0,0 +1,365 @@
+"""
+Set-based RawJob → Job pool promotion for sync_harvested_to_pool_task.
+
+sync_chunk() handles one keyset page of RawJobs with a fixed number of
+queries instead of ~10 per row:
+
+  - gates are evaluated in memory (jobs.gating.evaluate_raw_job_gate), with
+    the gate's duplicate lookups prefetched once (build_gate_context);
+  - existing pool Jobs are resolved with one query over the chunk's url_hash
+    values, canonical URL hashes and original links; rows that repeat a URL
+    inside the chunk are duplicates of the first one;
+  - new Jobs are bulk_create()d with gate, quality and validation fields and
+    auto marketing-role slugs already set, then linked to their roles with one
+    through-table insert;
+  - RawJob sync status is written with one bulk_update() (plus one
+    RawJobRollup upsert for the status moves) and the audit trail (including
+    the 'signal.job_created' event post_save would have recorded) with one
+    PipelineEvent bulk_create().
+
+If the Job insert fails the chunk falls back to one insert per row, each in its
+own savepoint, so a single bad row is marked POOL_SYNC_ERROR as before instead
+of failing the whole chunk.
+"""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from harvest.models import RawJob
+from harvest.normalizer import compute_url_hash
+from harvest.services.rawjob_rollup import record_rollup_changes
+from jobs.models import Job, PipelineEvent
+
+logger = logging.getLogger(__name__)
+
+TASK_NAME = "harvest.sync_harvested_to_pool"
+RAW_JOB_FIELDS = ["sync_status", "sync_skip_reason", "raw_payload", "updated_at"]
+WRITE_BATCH_SIZE = 500
+
+
+@dataclass
+class ChunkSyncResult:
+    synced: int = 0
+    skipped: int = 0
+    failed: int = 0
+    skipped_reasons: dict[str, int] = field(default_factory=dict)
+    job_ids: list[int] = field(default_factory=list)
+
+
+def _scores(gate) -> dict:
+    return {
+        "data_quality": gate.data_quality_score,
+        "trust": gate.trust_score,
+        "candidate_fit": gate.candidate_fit_score,
+        "vet_priority": gate.vet_priority_score,
+    }
+
+
+def _identity_keys(rj) -> list[tuple[str, str]]:
+    """Keys a pool Job can match this RawJob on, in lookup priority order."""
+    keys = []
+    if rj.url_hash:
+        keys.append(("hash", rj.url_hash))
+    canonical = compute_url_hash(rj.original_url) if rj.original_url else ""
+    if canonical and canonical != rj.url_hash:
+        keys.append(("hash", canonical))
+    # original_link is URLField(max_length=500); longer values cannot match (and
+    # raise DataError on PostgreSQL when used in a filter).
+    if rj.original_url and len(rj.original_url) <= 500:
+        keys.append(("link", rj.original_url))
+    return keys
+
+
+def _existing_jobs(batch) -> dict[tuple[str, str], tuple[int, str]]:
+    """{identity key: (job id, stage)} for pool Jobs matching any row in the chunk, earliest first."""
+    hashes, links = set(), set()
+    for rj in batch:
+        for kind, value in _identity_keys(rj):
+            (hashes if kind == "hash" else links).add(value)
+    if not hashes and not links:
+        return {}
+    found: dict[tuple[str, str], tuple[int, str]] = {}
+    rows = (
+        Job.objects.filter(
+            Q(url_hash__in=hashes, is_archived=False) | Q(original_link__in=links)
+        )
+        .order_by("created_at", "pk")
+        .values_list("pk", "url_hash", "original_link", "is_archived", "stage")
+    )
+    for pk, url_hash, link, archived, stage in rows:
+        if url_hash in hashes and not archived:
+            found.setdefault(("hash", url_hash), (pk, stage or ""))
+        if link in links:
+            found.setdefault(("link", link), (pk, stage or ""))
+    return found
+
+
+def build_pool_job(rj, gate, *, system_user, now) -> Job:
+    """Unsaved pool Job for a RawJob that passed the gate, ready for bulk_create()."""
+    from jobs.gating import apply_gate_result_to_job
+    from jobs.marketing_role_routing import auto_role_slugs_for_raw_job
+    from jobs.quality import compute_quality_score
+
+    platform_slug = rj.platform_slug or (rj.job_platform.slug if rj.job_platform else "")
+    job_location = " | ".join(rj.location_candidates or []) or rj.location_raw or ""
+    job_country = rj.country or ((rj.country_codes or [""])[0] if rj.country_codes else "")
+    job = Job(
+        title=(rj.title or "")[:200],  # Job.title max_length=200; RawJob.title up to 512
+        company=(rj.company_name or (rj.company.name if rj.company else ""))[:200],
+        company_obj=rj.company,
+        location=job_location[:200],   # Job.location max_length=200
+        description=rj.description or rj.title or "",  # Job.description is NOT NULL
+        original_link=(rj.original_url or "")[:500],  # Job.original_link max_length=500; RawJob up to 1024
+        salary_range=(rj.salary_raw or "")[:100],     # Job.salary_range max_length=100
+        job_type=(rj.employment_type if rj.employment_type and rj.employment_type != "UNKNOWN" else "FULL_TIME")[:20],
+        status="POOL",
+        stage=Job.Stage.VETTED,
+        stage_changed_at=now,
+        url_hash=rj.url_hash or "",
+        job_source=(f"HARVESTED_{platform_slug.upper()}" if platform_slug else "HARVESTED")[:100],
+        posted_by=system_user,
+        source_raw_job=rj,
+        queue_entered_at=now,
+        # Propagate classification from RawJob if available
+        country=job_country[:100],                    # Job.country max_length=100
+        department=(rj.department_normalized or "")[:20],  # Job.department max_length=20
+    )
+    job.sync_company_name()
+    job.refresh_dedup_keys()
+    apply_gate_result_to_job(job, gate)
+    job.quality_score = compute_quality_score(job)
+    job.validation_score = int(round(gate.vet_priority_score * 100))
+    job.validation_result = {
+        "score": job.validation_score,
+        "lane": gate.lane,
+        "gate_status": gate.status,
+        "reason_code": gate.reason_code,
+        "reasons": gate.reasons,
+        "checks": gate.checks,
+        "multi_score": _scores(gate),
+    }
+    job.validation_run_at = now
+    job.gate_checked_at = now
+    try:
+        job.auto_marketing_role_slugs = auto_role_slugs_for_raw_job(rj)
+    except Exception as exc:
+        logger.warning("Could not infer marketing roles for raw job %s: %s", rj.pk, exc)
+        job.auto_marketing_role_slugs = []
+    return job
+
+
+def _insert_jobs(jobs: list[Job]) -> dict[int, Exception]:
+    """
+    bulk_create the jobs; on failure retry one by one. Returns {index: error}
+    for the jobs that could not be inserted (their pk stays None).
+    """
+    if not jobs:
+        return {}
+    try:
+        with transaction.atomic():
+            Job.objects.bulk_create(jobs, batch_size=WRITE_BATCH_SIZE)
+        return {}
+    except Exception as exc:
+        logger.warning("Bulk insert of %d pool job(s) failed, retrying per row: %s", len(jobs), exc)
+    errors: dict[int, Exception] = {}
+    for i, job in enumerate(jobs):
+        job.pk = None  # a rolled-back earlier batch may have assigned one
+        job._state.adding = True
+        try:
+            with transaction.atomic():
+                Job.objects.bulk_create([job])
+        except Exception as exc:
+            job.pk = None
+            errors[i] = exc
+    return errors
+
+
+def _record_events(events: list[PipelineEvent]) -> None:
+    if not events:
+        return
+    try:
+        with transaction.atomic():
+            PipelineEvent.objects.bulk_create(events, batch_size=WRITE_BATCH_SIZE)
+    except Exception:
+        logger.exception("PipelineEvent bulk insert failed for pool sync (swallowed)")
+
+
+def sync_chunk(batch, *, gate_cfg, system_user, qualified_only: bool = False, celery_id: str = "") -> ChunkSyncResult:
+    """Gate, dedupe and promote one chunk of RawJobs (see module docstring)."""
+    from jobs.gating import build_gate_context, evaluate_raw_job_gate
+    from jobs.marketing_role_routing import bulk_add_auto_marketing_roles
+
+    now = timezone.now()
+    checked_at = now.isoformat()
+    result = ChunkSyncResult()
+    existing = _existing_jobs(batch)
+    gate_context = build_gate_context(batch)
+    claimed: dict[tuple[str, str], int] = {}   # identity key -> index into `new`
+    new: list[tuple] = []                       # (rj, gate, job)
+    dup_of_new: list[tuple] = []                # (rj, index into `new`)
+    raw_updates = []
+    events: list[PipelineEvent] = []
+
+    def mark(rj, status: str, vet_gate: dict, skip_reason: str | None = None):
+        payload = dict(rj.raw_payload or {})
+        payload["vet_gate"] = vet_gate
+        rj.sync_status = status
+        if skip_reason is not None:
+            rj.sync_skip_reason = skip_reason
+        rj.raw_payload = payload
+        rj.updated_at = now
+        raw_updates.append(rj)
+
+    def mark_duplicate(rj, job_id: int, stage: str):
+        mark(rj, "SKIPPED", {
+            "status": "duplicate",
+            "reason_code": "DUPLICATE_EXISTING",
+            "existing_job_id": job_id,
+            "checked_at": checked_at,
+        }, skip_reason="DUPLICATE_EXISTING")
+        events.append(PipelineEvent(
+            job_id=job_id,
+            url_hash=rj.url_hash or "",
+            from_stage=stage,
+            to_stage=stage,
+            task_name=TASK_NAME,
+            celery_id=celery_id,
+            status=PipelineEvent.Status.SKIPPED,
+            meta={"raw_job_id": rj.pk, "qualified_only": bool(qualified_only), "reason_code": "DUPLICATE_EXISTING"},
+        ))
+        result.skipped += 1
+
+    def mark_error(rj, exc: Exception):
+        mark(rj, "FAILED", {
+            "status": "failed",
+            "reason_code": "POOL_SYNC_ERROR",
+            "error": str(exc)[:240],
+            "checked_at": checked_at,
+        })
+        events.append(PipelineEvent(
+            url_hash=rj.url_hash or "",
+            from_stage="ENRICHED",
+            to_stage="ERROR",
+            task_name=TASK_NAME,
+            celery_id=celery_id,
+            status=PipelineEvent.Status.FAILED,
+            error=str(exc)[:240],
+            meta={"raw_job_id": rj.pk, "qualified_only": bool(qualified_only), "reason_code": "POOL_SYNC_ERROR"},
+        ))
+        logger.error("Sync failed for RawJob %s: %s", rj.pk, exc)
+        result.failed += 1
+
+    for rj in batch:
+        try:
+            gate = evaluate_raw_job_gate(rj, cfg=gate_cfg, context=gate_context)
+        except Exception as exc:
+            logger.error("evaluate_raw_job_gate crashed for RawJob %s: %s", rj.pk, exc)
+            result.failed += 1
+            continue
+
+        keys = _identity_keys(rj)
+        hit = next((existing[k] for k in keys if k in existing), None)
+        if hit:
+            mark_duplicate(rj, *hit)
+            continue
+        pending = next((claimed[k] for k in keys if k in claimed), None)
+        if pending is not None:
+            dup_of_new.append((rj, pending))
+            continue
+
+        if not gate.passed:
+            if qualified_only:
+                # For qualified-only runs, keep non-passing rows pending so they can
+                # be re-enriched/revalidated later instead of being force-failed here.
+                reason_key = (gate.reason_code or "UNKNOWN").strip() or "UNKNOWN"
+                result.skipped_reasons[reason_key] = result.skipped_reasons.get(reason_key, 0) + 1
+                result.skipped += 1
+                continue
+            mark(rj, "FAILED", {
+                "status": "blocked",
+                "reason_code": gate.reason_code,
+                "reasons": gate.reasons,
+                "checks": gate.checks,
+                "scores": _scores(gate),
+                "checked_at": checked_at,
+            }, skip_reason=(gate.reason_code or "")[:32])
+            result.failed += 1
+            continue
+
+        try:
+            job = build_pool_job(rj, gate, system_user=system_user, now=now)
+        except Exception as exc:
+            mark_error(rj, exc)
+            continue
+        for key in keys:
+            claimed.setdefault(key, len(new))
+        new.append((rj, gate, job))
+
+    with transaction.atomic():
+        errors = _insert_jobs([job for _, _, job in new])
+        created = []
+        for i, (rj, gate, job) in enumerate(new):
+            if i in errors:
+                mark_error(rj, errors[i])
+                continue
+            created.append(job)
+            mark(rj, "SYNCED", {
+                "status": "eligible",
+                "lane": gate.lane,
+                "reason_code": gate.reason_code,
+                "checks": gate.checks,
+                "scores": _scores(gate),
+                "job_id": job.pk,
+                "checked_at": checked_at,
+            })
+            events.append(PipelineEvent(
+                job_id=job.pk,
+                url_hash=job.url_hash,
+                to_stage=job.stage,
+                task_name="signal.job_created",
+                status=PipelineEvent.Status.SUCCESS,
+                meta={"source": job.job_source or "", "company": job.company},
+            ))
+            events.append(PipelineEvent(
+                job_id=job.pk,
+                url_hash=job.url_hash,
+                from_stage=Job.Stage.ENRICHED,
+                to_stage=Job.Stage.VETTED,
+                task_name=TASK_NAME,
+                celery_id=celery_id,
+                status=PipelineEvent.Status.SUCCESS,
+                meta={
+                    "raw_job_id": rj.pk,
+                    "qualified_only": bool(qualified_only),
+                    "gate_status": gate.status,
+                    "lane": gate.lane,
+                    "reason_code": gate.reason_code,
+                    "scores": _scores(gate),
+                },
+            ))
+            result.synced += 1
+            result.job_ids.append(job.pk)
+
+        # Same URL twice in one chunk: the later rows duplicate the Job just created.
+        # If that insert failed they stay PENDING for the next run.
+        for rj, i in dup_of_new:
+            job = new[i][2]
+            if job.pk:
+                mark_duplicate(rj, job.pk, job.stage)
+
+        try:
+            with transaction.atomic():
+                bulk_add_auto_marketing_roles(created)
+        except Exception as exc:
+            logger.warning("Could not assign marketing roles to %d synced job(s): %s", len(created), exc)
+
+        if raw_updates:
+            RawJob.objects.bulk_update(raw_updates, RAW_JOB_FIELDS, batch_size=WRITE_BATCH_SIZE)
+            record_rollup_changes(raw_updates)
+        _record_events(events)
+    return result
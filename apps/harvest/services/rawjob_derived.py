@@ -0,0 +1,116 @@
+"""
+RawJob read-side columns computed at write time (DERIVED_FIELDS).
+
+The Raw Jobs list used to run infer_country_from_location() and the text
+checks of the resume JD gate for every row it rendered. Both depend only on
+columns the harvest, JD backfill and scope passes write, so those writers
+stamp them instead:
+
+  - country_detected: infer_country_from_location(location_raw, state, country)
+  - jd_char_count:    trimmed length of the JD text the resume gate measures
+  - jd_title_only:    the JD is only the title (gate reason TITLE_ONLY_JD)
+
+RawJob.save() stamps them whenever one of DERIVED_INPUT_FIELDS is written;
+bulk_update/update() writers call stamp_derived_fields() / derived_values()
+and add DERIVED_FIELDS. The threshold comparisons stay on read, so resume JD
+gate threshold changes in HarvestEngineConfig still apply immediately.
+
+derived_version is 0 on rows written before these columns existed; readers
+fall back to computing the values and `manage.py backfill_rawjob_derived_fields`
+stamps them in bulk. Bump DERIVED_VERSION when the logic changes.
+"""
+from __future__ import annotations
+
+from typing import Iterator
+
+from django.db.models import QuerySet, Value
+from django.db.models.functions import Coalesce, Left, Length, NullIf, Trim
+
+DERIVED_VERSION = 1
+DERIVED_FIELDS = ["country_detected", "jd_char_count", "jd_title_only", "derived_version"]
+DERIVED_INPUT_FIELDS = frozenset(
+    {"title", "description", "description_clean", "location_raw", "state", "country"}
+)
+# Longer JDs cannot be title-only (titles are at most 512 chars), so batch
+# refreshes only read this much of the text.
+JD_HEAD_CHARS = 1024
+REFRESH_BATCH_SIZE = 2000
+
+
+def derived_values(raw_job, *, text: str | None = None, text_length: int | None = None) -> dict:
+    """DERIVED_FIELDS for the row's current values (JD taken from the instance unless given)."""
+    from harvest.enrichments import infer_country_from_location
+    from harvest.jd_gate import jd_text_stats
+
+    if text is None:
+        text = (raw_job.description_clean or "") or (raw_job.description or "")
+    char_count, title_only = jd_text_stats(raw_job.title or "", text, text_length)
+    country = infer_country_from_location(
+        location_raw=raw_job.location_raw or "",
+        state=raw_job.state or "",
+        country=raw_job.country or "",
+    )
+    return {
+        "country_detected": (country or "")[:128],
+        "jd_char_count": char_count,
+        "jd_title_only": title_only,
+        "derived_version": DERIVED_VERSION,
+    }
+
+
+def stamp_derived_fields(raw_job, **kwargs) -> list[str]:
+    """Set DERIVED_FIELDS on the instance and return them for the caller's update_fields."""
+    for field, value in derived_values(raw_job, **kwargs).items():
+        setattr(raw_job, field, value)
+    return list(DERIVED_FIELDS)
+
+
+def is_stamped(raw_job) -> bool:
+    return getattr(raw_job, "derived_version", 0) == DERIVED_VERSION
+
+
+def _refresh_batches(qs: QuerySet, batch_size: int, limit: int | None) -> Iterator[list]:
+    jd = Trim(Coalesce(NullIf("description_clean", Value("")), "description", Value("")))
+    qs = (
+        qs.only("id", "title", "location_raw", "state", "country", *DERIVED_FIELDS)
+        .annotate(_jd_len=Length(jd), _jd_head=Left(jd, JD_HEAD_CHARS))
+        .order_by("pk")
+    )
+    last_pk = 0
+    remaining = limit
+    while remaining is None or remaining > 0:
+        take = batch_size if remaining is None else min(batch_size, remaining)
+        batch = list(qs.filter(pk__gt=last_pk)[:take])
+        if not batch:
+            return
+        yield batch
+        if len(batch) < take:
+            return
+        last_pk = batch[-1].pk
+        if remaining is not None:
+            remaining -= len(batch)
+
+
+def refresh_derived_fields(
+    qs: QuerySet | None = None,
+    *,
+    stale_only: bool = True,
+    batch_size: int = REFRESH_BATCH_SIZE,
+    limit: int | None = None,
+) -> int:
+    """
+    Stamp DERIVED_FIELDS for `qs` (default: every RawJob) in keyset batches,
+    reading the JD as its length and first characters only. Returns rows written.
+    """
+    from harvest.models import RawJob
+
+    qs = RawJob.objects.all() if qs is None else qs
+    if stale_only:
+        qs = qs.exclude(derived_version=DERIVED_VERSION)
+    written = 0
+    for batch in _refresh_batches(qs, batch_size, limit):
+        for raw_job in batch:
+            stamp_derived_fields(raw_job, text=raw_job._jd_head, text_length=raw_job._jd_len)
+        RawJob.objects.bulk_update(batch, DERIVED_FIELDS, batch_size=batch_size)
+        written += len(batch)
+    return written
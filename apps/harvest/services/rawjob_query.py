@@ -1,14 +1,17 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta
+import hashlib
+from datetime import datetime, timedelta, timezone as dt_timezone
 from typing import Mapping
 
 from django.conf import settings
+from django.core.cache import cache
 from django.db import connection
 from django.db.models import Q, QuerySet
 from django.utils import timezone
 from django.utils.timezone import make_aware
 
+from core.shared_state import get_generation, incr_generation
 from harvest.models import RawJob
 from harvest.runtime_config import get_ready_stage_min_confidence
 
@@ -84,6 +87,17 @@ FILTER_STATE_KEYS = (
 )
 
 
+# Raw Jobs list (pipeline raw tab + its XHR loader): keyset pages on
+# (fetched_at, id) newest first, with a cached filtered count.
+LIST_PAGE_SIZE = 100
+LIST_ORDERING = ("-fetched_at", "-id")
+LIST_COUNT_CACHE_SECONDS = 60
+LIST_COUNT_GENERATION_KEY = "harvest:rawjob_list_count:gen"
+# Request keys that move through the list without changing the filtered set.
+LIST_NON_FILTER_KEYS = frozenset({"cursor", "page", "raw_json", "tab", "_subtab"})
+_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
 def _get(params: Mapping[str, str], key: str) -> str:
     return (params.get(key, "") or "").strip()
 
@@ -173,7 +187,12 @@ def apply_stage_filter(qs: QuerySet[RawJob], stage: str) -> QuerySet[RawJob]:
 
 
 def build_funnel_counts(base_qs: QuerySet[RawJob] | None = None) -> dict[str, int]:
-    qs = base_qs if base_qs is not None else RawJob.objects.all()
+    """Stage counts for `base_qs`; without one, the production funnel from RawJobRollup."""
+    if base_qs is None:
+        from harvest.services.rawjob_rollup import rollup_funnel_counts
+
+        return rollup_funnel_counts()
+    qs = base_qs
     return {
         "fetched": qs.count(),
         "parsed": apply_stage_filter(qs, "PARSED").count(),
@@ -506,3 +525,67 @@ def rawjob_filter_state(params: Mapping[str, str]) -> dict[str, str]:
         state[f"selected_{key}"] = _get(params, key)
     state["q"] = _get(params, "q")
     return state
+
+
+def encode_list_cursor(raw_job: RawJob) -> str:
+    """Opaque position after `raw_job` in LIST_ORDERING: "<fetched_at µs since epoch>.<id>"."""
+    micros = (raw_job.fetched_at - _EPOCH) // timedelta(microseconds=1)
+    return f"{micros}.{raw_job.pk}"
+
+
+def decode_list_cursor(cursor: str) -> tuple[datetime, int]:
+    """Inverse of encode_list_cursor(); ValueError for anything malformed."""
+    micros, _, pk = (cursor or "").partition(".")
+    return _EPOCH + timedelta(microseconds=int(micros)), int(pk)
+
+
+def rawjob_list_page(
+    qs: QuerySet[RawJob],
+    cursor: str = "",
+    size: int = LIST_PAGE_SIZE,
+) -> tuple[list[RawJob], str]:
+    """
+    One page of `qs` in LIST_ORDERING starting after `cursor` (first page when
+    blank). Returns (rows, next_cursor); next_cursor is "" on the last page.
+
+    Seeks on (fetched_at, id) instead of OFFSET, so page 5,000 costs the same
+    index range scan as page 1. Raises ValueError for a malformed cursor.
+    """
+    qs = qs.order_by(*LIST_ORDERING)
+    if cursor:
+        fetched_at, pk = decode_list_cursor(cursor)
+        qs = qs.filter(Q(fetched_at__lt=fetched_at) | Q(fetched_at=fetched_at, pk__lt=pk))
+    rows = list(qs[: size + 1])
+    if len(rows) > size:
+        return rows[:size], encode_list_cursor(rows[size - 1])
+    return rows, ""
+
+
+def cached_rawjob_list_count(qs: QuerySet[RawJob], params: Mapping[str, str]) -> int:
+    """
+    COUNT(*) of the filtered list, cached per filter set for
+    LIST_COUNT_CACHE_SECONDS, so scrolling does not recount on every page.
+
+    Counts live in each process's own cache, but the generation in their key
+    is shared state (core.shared_state), so invalidate_rawjob_list_counts()
+    from a worker retires them in every web process. Without Redis the
+    generation is per-process too and counts only age out with the TTL.
+    """
+    lists = params.lists() if hasattr(params, "lists") else ((k, [v]) for k, v in params.items())
+    state = sorted(
+        (key, tuple(v.strip() for v in values))
+        for key, values in lists
+        if key not in LIST_NON_FILTER_KEYS
+    )
+    generation = get_generation(LIST_COUNT_GENERATION_KEY)
+    digest = hashlib.sha1(repr(state).encode("utf-8")).hexdigest()
+    key = f"harvest:rawjob_list_count:{generation}:{digest}"
+    total = cache.get(key)
+    if total is None:
+        total = qs.count()
+        cache.set(key, total, timeout=LIST_COUNT_CACHE_SECONDS)
+    return total
+
+
+def invalidate_rawjob_list_counts() -> None:
+    incr_generation(LIST_COUNT_GENERATION_KEY)
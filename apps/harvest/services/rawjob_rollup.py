@@ -0,0 +1,348 @@
+"""
+RawJobRollup upkeep: dashboard counters per fetched day × platform × status.
+
+The Raw Jobs cards, workflow funnel, stats endpoint, Jarvis page and Board
+Analytics read RawJobRollup (a few rows per platform and day) instead of
+counting RawJob. Each RawJob maps to one rollup key (ROLLUP_KEY) and adds 1 to
+the COUNTERS it satisfies; the predicates mirror rawjob_query's stage filters.
+
+Incremental upkeep
+  On post_save / post_delete, harvest.signals moves the row's contribution from
+  the ROLLUP_INPUT_FIELDS it was loaded with (RawJob.from_db) to the new ones.
+  Bulk writers that load full rows (pool sync, the enrichment passes) call
+  record_rollup_changes() after bulk_update. All deltas of a call go out as
+  one INSERT ... ON CONFLICT DO UPDATE in the caller's transaction, so a
+  rollback undoes them too.
+
+Reconciliation
+  queryset.update() writers and rows saved with deferred input fields are not
+  tracked. reconcile_rollup() recounts RawJob with one GROUP BY for the range
+  (harvest.reconcile_rawjob_rollup: recent days every 15 minutes, everything
+  nightly, and after ready-threshold / target-country changes). It also
+  refreshes `coverage`, which is only written here.
+  The recount and the current rollup rows are read from one REPEATABLE READ
+  snapshot without taking any lock; only the difference between the two is
+  then added to the rollup rows, in a short transaction with a lock_timeout.
+  Deltas committed while the recount ran are kept, and writers never wait for
+  the GROUP BY.
+"""
+from __future__ import annotations
+
+import json
+from datetime import datetime, time, timedelta
+
+from django.db import connection, transaction
+from django.db.models import Count, Q, QuerySet, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from harvest.models import RawJob, RawJobRollup
+from harvest.runtime_config import get_ready_stage_min_confidence
+from harvest.services.rawjob_query import (
+    DUPLICATE_SKIP_REASONS,
+    FILTERED_OUT_DECISIONS,
+    POOL_ALLOWED_FILTER_DECISIONS,
+    WEAK_OR_NON_TARGET_DOMAINS,
+    duplicate_rawjob_q,
+    effective_classification_q,
+    ready_stage_q,
+)
+
+ROLLUP_KEY = ("day", "platform_slug", "sync_status", "is_test_run")
+COUNTERS = (
+    "jobs", "active", "remote", "with_jd", "jd_backlog",
+    "enriched", "classified", "ready", "duplicates",
+)
+ROLLUP_INPUT_FIELDS = (
+    "fetched_at", "platform_slug", "sync_status", "is_test_run",
+    "is_active", "is_remote", "has_description", "is_cold", "jd_fetch_skipped",
+    "filter_decision", "quality_score", "jd_quality_score",
+    "category_confidence", "classification_confidence", "job_domain", "sync_skip_reason",
+)
+STATUS_TOTALS = {"synced": "SYNCED", "pending": "PENDING", "failed": "FAILED", "skipped": "SKIPPED"}
+RECONCILE_BATCH_SIZE = 1000
+# How long the reconcile write waits on rollup rows a long ingest transaction holds.
+# On timeout the run fails and the next scheduled one recounts.
+RECONCILE_LOCK_TIMEOUT_MS = 5000
+
+
+def counter_filters(ready_min_conf: float) -> dict[str, Q]:
+    """SQL predicate per counter (`jobs` counts every row)."""
+    return {
+        "jobs": Q(),
+        "active": Q(is_active=True),
+        "remote": Q(is_remote=True),
+        "with_jd": Q(has_description=True),
+        "jd_backlog": Q(has_description=False, is_cold=False, jd_fetch_skipped=False)
+        & ~Q(filter_decision__in=FILTERED_OUT_DECISIONS),
+        "enriched": Q(quality_score__isnull=False) | Q(jd_quality_score__isnull=False),
+        "classified": effective_classification_q(min_conf=0.01),
+        "ready": ready_stage_q(min_conf=ready_min_conf),
+        "duplicates": duplicate_rawjob_q(),
+    }
+
+
+def rollup_state(raw_job) -> tuple | None:
+    """ROLLUP_INPUT_FIELDS as loaded on the instance; None when any is deferred."""
+    # __dict__ access: never trigger a query for deferred fields.
+    values = raw_job.__dict__
+    if any(field not in values for field in ROLLUP_INPUT_FIELDS):
+        return None
+    return tuple(values[field] for field in ROLLUP_INPUT_FIELDS)
+
+
+def _contribution(state: tuple, ready_min_conf: float) -> tuple[tuple, dict[str, int]]:
+    """(rollup key, counters) for one row — counter_filters() evaluated in Python."""
+    v = dict(zip(ROLLUP_INPUT_FIELDS, state))
+    fetched_at = v["fetched_at"] or timezone.now()
+    key = (timezone.localdate(fetched_at), v["platform_slug"] or "", v["sync_status"], bool(v["is_test_run"]))
+    conf = v["category_confidence"] if v["category_confidence"] is not None else v["classification_confidence"]
+    pool_ok = not v["is_cold"] and not v["jd_fetch_skipped"]
+    flags = {
+        "jobs": True,
+        "active": v["is_active"],
+        "remote": v["is_remote"],
+        "with_jd": v["has_description"],
+        "jd_backlog": not v["has_description"] and pool_ok and v["filter_decision"] not in FILTERED_OUT_DECISIONS,
+        "enriched": v["quality_score"] is not None or v["jd_quality_score"] is not None,
+        "classified": conf is not None and conf >= 0.01,
+        "ready": (
+            not v["is_test_run"]
+            and v["has_description"]
+            and v["is_active"]
+            and pool_ok
+            and conf is not None
+            and conf >= ready_min_conf
+            and (v["filter_decision"] is None or v["filter_decision"] in POOL_ALLOWED_FILTER_DECISIONS)
+            and v["job_domain"] not in WEAK_OR_NON_TARGET_DOMAINS
+        ),
+        "duplicates": v["sync_status"] == RawJob.SyncStatus.DUPLICATE
+        or (v["sync_status"] == RawJob.SyncStatus.SKIPPED and v["sync_skip_reason"] in DUPLICATE_SKIP_REASONS),
+    }
+    return key, {name: int(bool(flag)) for name, flag in flags.items()}
+
+
+class RollupDeltas:
+    """Counter changes per rollup key, written by apply()."""
+
+    def __init__(self, ready_min_conf: float | None = None):
+        self.ready_min_conf = get_ready_stage_min_confidence() if ready_min_conf is None else ready_min_conf
+        self.changes: dict[tuple, dict[str, int]] = {}
+
+    def add(self, state: tuple | None, sign: int) -> None:
+        if state is None:
+            return
+        key, counts = _contribution(state, self.ready_min_conf)
+        bucket = self.changes.setdefault(key, dict.fromkeys(COUNTERS, 0))
+        for name, n in counts.items():
+            bucket[name] += sign * n
+
+    def move(self, before: tuple | None, after: tuple | None) -> None:
+        if before == after:
+            return
+        self.add(before, -1)
+        self.add(after, 1)
+
+    def apply(self) -> int:
+        """Upsert the non-zero deltas in one statement; returns keys touched."""
+        rows = sorted((key, counts, {}) for key, counts in self.changes.items() if any(counts.values()))
+        self.changes = {}
+        if not rows:
+            return 0
+        with connection.cursor() as cursor:
+            _upsert_rollups(cursor, rows)
+        return len(rows)
+
+
+def _upsert_rollups(cursor, rows: list[tuple], *, reconciled_at=None) -> None:
+    """
+    Add (key, counter deltas, coverage) rows to RawJobRollup in one INSERT ...
+    ON CONFLICT DO UPDATE. Rows come sorted by key, so concurrent writers lock
+    rollup rows in the same order. With `reconciled_at`, coverage is replaced
+    and the rows are stamped as reconciled.
+    """
+    table = connection.ops.quote_name(RawJobRollup._meta.db_table)
+    qn = connection.ops.quote_name
+    columns = [*ROLLUP_KEY, *COUNTERS, "coverage"]
+    updates = [f"{qn(c)} = {table}.{qn(c)} + EXCLUDED.{qn(c)}" for c in COUNTERS]
+    if reconciled_at is not None:
+        columns.append("reconciled_at")
+        updates += [f"{qn(c)} = EXCLUDED.{qn(c)}" for c in ("coverage", "reconciled_at")]
+    placeholders = "(" + ", ".join(["%s"] * len(columns)) + ")"
+    params: list = []
+    for key, counts, coverage in rows:
+        params.extend(key)
+        params.extend(counts[name] for name in COUNTERS)
+        params.append(json.dumps(coverage))
+        if reconciled_at is not None:
+            params.append(reconciled_at)
+    cursor.execute(
+        f"INSERT INTO {table} ({', '.join(qn(c) for c in columns)}) "
+        f"VALUES {', '.join([placeholders] * len(rows))} "
+        f"ON CONFLICT ({', '.join(qn(c) for c in ROLLUP_KEY)}) DO UPDATE SET " + ", ".join(updates),
+        params,
+    )
+
+
+def previous_rollup_state(raw_job) -> tuple | None:
+    """Rollup inputs as of the last load or recorded write (None when unknown)."""
+    if "_rollup_state" in raw_job.__dict__:
+        return raw_job._rollup_state
+    return raw_job.loaded_values(ROLLUP_INPUT_FIELDS)
+
+
+def record_rollup_changes(raw_jobs, *, created: bool = False) -> int:
+    """
+    Apply the rollup deltas for RawJob instances just written (saved, created
+    or bulk_updated) and re-snapshot them. Instances loaded with deferred
+    ROLLUP_INPUT_FIELDS are left to reconciliation.
+    """
+    deltas = RollupDeltas()
+    for raw_job in raw_jobs:
+        after = rollup_state(raw_job)
+        if created:
+            deltas.add(after, 1)
+        else:
+            before = previous_rollup_state(raw_job)
+            if before is not None and after is not None:
+                deltas.move(before, after)
+        raw_job._rollup_state = after
+    return deltas.apply()
+
+
+def record_rollup_delete(raw_job) -> int:
+    deltas = RollupDeltas()
+    deltas.add(previous_rollup_state(raw_job) or rollup_state(raw_job), -1)
+    return deltas.apply()
+
+
+# ── Reconciliation ────────────────────────────────────────────────────────────
+
+def _range_start(days: int) -> tuple:
+    since = timezone.localdate() - timedelta(days=max(1, int(days)) - 1)
+    return since, timezone.make_aware(datetime.combine(since, time.min))
+
+
+def reconcile_rollup(*, days: int | None = None) -> dict:
+    """
+    Recount RawJob into RawJobRollup for the last `days` fetched days (all days
+    when None) and replace the rollup rows in that range, coverage included.
+    """
+    from harvest.board_analytics import rawjob_coverage_annotations
+    from harvest.models import HarvestEngineConfig
+
+    ready_min_conf = get_ready_stage_min_confidence()
+    raw_qs = RawJob.objects.all()
+    rollup_qs = RawJobRollup.objects.all()
+    if days:
+        since, start = _range_start(days)
+        raw_qs = raw_qs.filter(fetched_at__gte=start)
+        rollup_qs = rollup_qs.filter(day__gte=since)
+
+    key_values = ("rollup_day", "platform_slug", "sync_status", "is_test_run")
+    keyed = raw_qs.annotate(rollup_day=TruncDate("fetched_at")).values(*key_values)
+    coverage_aggs = rawjob_coverage_annotations(
+        ready_min_conf=ready_min_conf,
+        target_countries=HarvestEngineConfig.get().get_target_countries(),
+    )
+    counter_aggs = {
+        f"n_{name}": Count("id", filter=q) if q else Count("id")
+        for name, q in counter_filters(ready_min_conf).items()
+    }
+
+    # One snapshot for the recount and the rows it corrects (see module docstring).
+    snapshot = connection.vendor == "postgresql" and not connection.in_atomic_block
+    with transaction.atomic():
+        if snapshot:
+            with connection.cursor() as cursor:
+                cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+        countries: dict[tuple, dict[str, int]] = {}
+        for row in keyed.exclude(country_code="").annotate(n=Count("id")).values(*key_values, "country_code", "n"):
+            key = tuple(row[k] for k in key_values)
+            countries.setdefault(key, {})[row["country_code"]] = row["n"]
+
+        counted: dict[tuple, tuple[dict, dict]] = {}
+        for row in keyed.annotate(**counter_aggs, **coverage_aggs).order_by():
+            key = tuple(row[k] for k in key_values)
+            coverage = {
+                name: (float(row[name]) if isinstance(row[name], float) else int(row[name] or 0))
+                for name in coverage_aggs
+            }
+            coverage["countries"] = countries.get(key, {})
+            rollup_key = (key[0], key[1] or "", key[2], key[3])
+            counted[rollup_key] = ({name: row[f"n_{name}"] for name in COUNTERS}, coverage)
+
+        current = {
+            tuple(row[k] for k in ROLLUP_KEY): row
+            for row in rollup_qs.values(*ROLLUP_KEY, *COUNTERS)
+        }
+
+    empty = dict.fromkeys(COUNTERS, 0)
+    rows = []
+    corrected = 0
+    for key in sorted(set(counted) | set(current)):
+        counts, coverage = counted.get(key, (empty, {}))
+        have = current.get(key, empty)
+        diff = {name: counts[name] - have[name] for name in COUNTERS}
+        corrected += any(diff.values())
+        rows.append((key, diff, coverage))
+
+    now = timezone.now()
+    with transaction.atomic(), connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute(f"SET LOCAL lock_timeout = {int(RECONCILE_LOCK_TIMEOUT_MS)}")
+        for start in range(0, len(rows), RECONCILE_BATCH_SIZE):
+            _upsert_rollups(cursor, rows[start:start + RECONCILE_BATCH_SIZE], reconciled_at=now)
+        removed, _ = rollup_qs.filter(jobs=0).delete()
+    return {"days": days, "rows": len(counted), "corrected": corrected, "removed": removed}
+
+
+def rollup_ever_reconciled() -> bool:
+    return RawJobRollup.objects.filter(reconciled_at__isnull=False).exists()
+
+
+# ── Reads ─────────────────────────────────────────────────────────────────────
+
+def production_rollup_queryset() -> QuerySet[RawJobRollup]:
+    """Rollup rows behind production dashboards (mirrors production_rawjobs_queryset)."""
+    return RawJobRollup.objects.filter(is_test_run=False)
+
+
+def _total_aggregates() -> dict:
+    # Aliased: an aggregate named like a column cannot be referenced by the next one.
+    return {
+        **{f"sum_{name}": Sum(name) for name in COUNTERS},
+        **{f"sum_{label}": Sum("jobs", filter=Q(sync_status=status)) for label, status in STATUS_TOTALS.items()},
+    }
+
+
+def rollup_totals(rows: QuerySet[RawJobRollup] | None = None) -> dict[str, int]:
+    """COUNTERS plus synced/pending/failed/skipped summed over `rows` (default: production)."""
+    rows = production_rollup_queryset() if rows is None else rows
+    return {
+        name.removeprefix("sum_"): int(value or 0)
+        for name, value in rows.aggregate(**_total_aggregates()).items()
+    }
+
+
+def rollup_platform_counts(rows: QuerySet[RawJobRollup] | None = None) -> list[dict]:
+    """[{"platform_slug", "count"}] by row count, largest first."""
+    rows = production_rollup_queryset() if rows is None else rows
+    return [
+        {"platform_slug": row["platform_slug"], "count": int(row["count"] or 0)}
+        for row in rows.values("platform_slug").annotate(count=Sum("jobs")).order_by("-count", "platform_slug")
+        if row["count"]
+    ]
+
+
+def rollup_funnel_counts(rows: QuerySet[RawJobRollup] | None = None) -> dict[str, int]:
+    """build_funnel_counts() shape from the rollup."""
+    totals = rollup_totals(rows)
+    return {
+        "fetched": totals["jobs"],
+        "parsed": totals["with_jd"],
+        "enriched": totals["enriched"],
+        "classified": totals["classified"],
+        "ready": totals["ready"],
+        "synced": totals["synced"],
+    }
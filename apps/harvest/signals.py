@@ -0,0 +1,101 @@
+"""Incremental duplicate index and dashboard rollup upkeep for RawJob.
+
+RawJob.from_db keeps a reference to the row it was loaded from (no per-row
+work, and nothing at all for instances built in memory for bulk_create).
+post_save compares the description against it and, only when the JD actually
+changed (or the row is new), queues the RawJob for the incremental duplicate
+index. Ids are collected per transaction and sent, after commit, to
+index_raw_jobs_task in chunks, so a bulk save costs one Celery message rather
+than a synchronous index pass per row. Saves that do not touch the JD cost
+nothing.
+
+The same hooks keep RawJobRollup current: post_save / post_delete move the
+row's counters when its rollup inputs changed (see services/rawjob_rollup.py).
+"""
+import logging
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import RawJob
+from .services.rawjob_rollup import record_rollup_changes, record_rollup_delete
+
+log = logging.getLogger(__name__)
+
+JD_SOURCE_FIELDS = ("description_clean", "description")
+INDEX_TASK_CHUNK = 500
+
+
+def _jd_source(instance) -> tuple:
+    # __dict__ access: never trigger a query for deferred description fields.
+    return tuple(instance.__dict__.get(field) for field in JD_SOURCE_FIELDS)
+
+
+def _previous_jd_source(instance) -> tuple:
+    if "_dedup_jd_source" in instance.__dict__:
+        return instance._dedup_jd_source
+    return instance.loaded_values(JD_SOURCE_FIELDS) or (None, None)
+
+
+class _IndexQueue:
+    """The one on_commit callback per transaction that collects RawJob ids to index."""
+
+    def __init__(self):
+        self.pks: set[int] = set()
+        self.sent = False
+
+    def __call__(self):
+        from .tasks import index_raw_jobs_task
+
+        self.sent = True
+        pks = sorted(self.pks)
+        for start in range(0, len(pks), INDEX_TASK_CHUNK):
+            chunk = pks[start:start + INDEX_TASK_CHUNK]
+            try:
+                index_raw_jobs_task.apply_async(args=[chunk], queue="harvest")
+            except Exception:
+                log.exception("Could not queue incremental duplicate detection for %d RawJob(s)", len(chunk))
+
+
+def _queue_index(pk: int) -> None:
+    connection = transaction.get_connection()
+    if connection.in_atomic_block:
+        for _savepoints, callback, _robust in connection.run_on_commit:
+            if isinstance(callback, _IndexQueue) and not callback.sent:
+                callback.pks.add(pk)
+                return
+    queue = _IndexQueue()
+    queue.pks.add(pk)
+    transaction.on_commit(queue)
+
+
+@receiver(post_save, sender=RawJob)
+def _rawjob_queue_incremental_dedup(sender, instance, created: bool, raw: bool = False, **kwargs):
+    if raw or not getattr(settings, "HARVEST_INCREMENTAL_DEDUP", True):
+        return
+    current = _jd_source(instance)
+    if not created and current == _previous_jd_source(instance):
+        return
+    instance._dedup_jd_source = current
+    if created and not instance.has_description:
+        return
+    _queue_index(instance.pk)
+
+
+def _rollup_enabled() -> bool:
+    return getattr(settings, "HARVEST_RAWJOB_ROLLUP", True)
+
+
+@receiver(post_save, sender=RawJob)
+def _rawjob_update_rollup(sender, instance, created: bool, raw: bool = False, **kwargs):
+    if raw or not _rollup_enabled():
+        return
+    record_rollup_changes([instance], created=created)
+
+
+@receiver(post_delete, sender=RawJob)
+def _rawjob_remove_from_rollup(sender, instance, **kwargs):
+    if _rollup_enabled():
+        record_rollup_delete(instance)
@@ -11,6 +11,7 @@ from django.db.models.functions import Coalesce, Length, Mod, Trim
 from django.utils import timezone
 
 from core.task_progress import update_task_progress
+from jobs.event_buffer import deferred_pipeline_events
 from .ops_audit import tick_ops_run_progress
 from .runtime_config import (
     DEFAULT_JD_BACKFILL_LOCK_STALE_MINUTES,
@@ -18,6 +19,8 @@ from .runtime_config import (
     require_harvest_engine_config,
 )
 from .services.enrichment_input import build_enrichment_input
+from .services.rawjob_derived import DERIVED_FIELDS, derived_values, stamp_derived_fields
+from .services.rawjob_rollup import record_rollup_changes
 
 # ─── Harvest compliance constants ────────────────────────────────────────────
 # Delay between processing each company within a platform run.
@@ -147,9 +150,12 @@ def _release_ops_singleton(lock_key: str | None, task_id: str) -> None:
 
 def _invalidate_rawjobs_dashboard_cache() -> None:
     """Ensure Raw Jobs KPI cards refresh quickly after writes."""
+    from .services.rawjob_query import invalidate_rawjob_list_counts
+
     try:
         cache.delete("rawjobs_dashboard_stats")
         cache.delete("rawjobs_expired_missing_jd")
+        invalidate_rawjob_list_counts()
     except Exception:
         pass
 
@@ -308,6 +314,34 @@ def release_stale_jd_backfill_locks_task(self):
     return completion
 
 
+@shared_task(bind=True, name="harvest.reconcile_rawjob_rollup", max_retries=0, soft_time_limit=1800, time_limit=2100)
+def reconcile_rawjob_rollup_task(self, days: int = 0):
+    """
+    Recount RawJobRollup from RawJob for the last `days` fetched days (0 = all).
+
+    Catches up the writers the incremental upkeep does not see (queryset
+    .update(), deferred-field saves) and refreshes Board Analytics coverage.
+    A recent-days run falls back to a full pass until the table has been
+    reconciled once, so a fresh deploy fills itself.
+    """
+    from .services.rawjob_rollup import reconcile_rollup, rollup_ever_reconciled
+
+    days = max(0, int(days or 0))
+    if days and not rollup_ever_reconciled():
+        days = 0
+    result = reconcile_rollup(days=days or None)
+    logger.info("RawJob rollup reconciled: %s", result)
+    return result
+
+
+@shared_task(name="harvest.index_raw_jobs")
+def index_raw_jobs_task(raw_job_ids):
+    """Incremental duplicate index for RawJobs whose JD changed (queued by harvest.signals)."""
+    from .duplicate_engine import index_raw_jobs
+
+    return index_raw_jobs(raw_job_ids)
+
+
 @shared_task(bind=True, name="harvest.run_jd_gate", max_retries=0, soft_time_limit=1800, time_limit=2100)
 def run_jd_gate_task(
     self,
@@ -454,7 +488,7 @@ def reevaluate_cold_scope_jobs_task(
         "country_code", "country_confidence", "country_source", "country_codes",
         "location_candidates", "scope_status", "scope_reason", "is_priority",
         "last_scope_evaluated_at", "country", "state", "city", "location_raw",
-        "updated_at",
+        "updated_at", *DERIVED_FIELDS,
     ]
     now = timezone.now()
     promoted = review = cold = errors = 0
@@ -464,6 +498,7 @@ def reevaluate_cold_scope_jobs_task(
             updates = evaluate_rawjob_scope(job, cfg=cfg, use_provider=None, save=False)
             for field, value in updates.items():
                 setattr(job, field, value)
+            stamp_derived_fields(job)
             job.updated_at = now
             to_update.append(job)
             if job.scope_status == RawJob.ScopeStatus.PRIORITY_TARGET:
@@ -1084,6 +1119,7 @@ def verify_all_portals_task(self):
     time_limit=600,
     rate_limit="6/m",
 )
+@deferred_pipeline_events()
 def fetch_raw_jobs_for_company_task(
     self,
     label_pk: int,
@@ -1994,9 +2030,10 @@ def fetch_raw_jobs_for_company_task(
                 )
                 for field, value in scope_updates.items():
                     setattr(job, field, value)
+                stamp_derived_fields(job)
                 bulk_scope.append(job)
             if bulk_scope:
-                RawJob.objects.bulk_update(bulk_scope, SCOPE_FIELDS)
+                RawJob.objects.bulk_update(bulk_scope, SCOPE_FIELDS + DERIVED_FIELDS)
 
             # ── Inline enrich (pure Python, ~1 ms/job, no HTTP) ─────────────
             enriched = 0
@@ -2033,10 +2070,12 @@ def fetch_raw_jobs_for_company_task(
                     for f in ENRICH_FIELDS:
                         if f in enriched_data:
                             setattr(job, f, enriched_data[f])
+                    stamp_derived_fields(job)
                     bulk_enrich.append(job)
                     enriched += 1
                 if bulk_enrich:
-                    RawJob.objects.bulk_update(bulk_enrich, ENRICH_FIELDS)
+                    RawJob.objects.bulk_update(bulk_enrich, ENRICH_FIELDS + DERIVED_FIELDS)
+                    record_rollup_changes(bulk_enrich)
 
             logger.info(
                 "Inline enrich done: label=%s new_jobs=%d enriched=%d",
@@ -2839,12 +2878,9 @@ def sync_harvested_to_pool_task(
     """
     from .models import HarvestOpsRun, RawJob
     from .ops_audit import begin_ops_run, finish_ops_run
-    from jobs.models import Job, PipelineEvent
-    from jobs.dedup import find_existing_job_by_url
-    from jobs.quality import compute_quality_score
-    from jobs.gating import apply_gate_result_to_job, evaluate_raw_job_gate
+    from .services.pool_sync import sync_chunk
+    from jobs.jd_store import schedule_parse
     from django.contrib.auth import get_user_model
-    from django.utils import timezone as _tz
 
     User = get_user_model()
     system_user = User.objects.filter(is_superuser=True).first()
@@ -2972,260 +3008,31 @@ def sync_harvested_to_pool_task(
             if not batch:
                 break
             last_pk = batch[-1].pk
-            for rj in batch:
-                processed += 1
-                try:
-                    gate = evaluate_raw_job_gate(rj, cfg=gate_cfg)
-                except Exception as _gate_exc:
-                    logger.error("evaluate_raw_job_gate crashed for RawJob %s: %s", rj.pk, _gate_exc)
-                    failed += 1
-                    continue
-
-                existing = (
-                    (Job.objects.filter(url_hash=rj.url_hash, is_archived=False).first() if rj.url_hash else None)
-                    or find_existing_job_by_url(rj.original_url)
-                    # Guard: original_link is URLField(max_length=500); a query with a longer
-                    # value raises DataError in PostgreSQL and crashes the whole task since this
-                    # line is outside the per-job try/except.
-                    or (Job.objects.filter(original_link=rj.original_url).first() if rj.original_url and len(rj.original_url) <= 500 else None)
-                )
-                if existing:
-                    payload = dict(rj.raw_payload or {})
-                    payload["vet_gate"] = {
-                        "status": "duplicate",
-                        "reason_code": "DUPLICATE_EXISTING",
-                        "existing_job_id": existing.pk,
-                        "checked_at": _tz.now().isoformat(),
-                    }
-                    rj.sync_status = "SKIPPED"
-                    rj.sync_skip_reason = "DUPLICATE_EXISTING"
-                    rj.raw_payload = payload
-                    try:
-                        rj.save(update_fields=["sync_status", "sync_skip_reason", "raw_payload", "updated_at"])
-                    except Exception as _save_exc:
-                        logger.warning("Could not save duplicate-skip status for RawJob %s: %s", rj.pk, _save_exc)
-                    PipelineEvent.record(
-                        job=existing,
-                        url_hash=rj.url_hash or "",
-                        from_stage=getattr(existing, "stage", "") or "",
-                        to_stage=getattr(existing, "stage", "") or "",
-                        task_name="harvest.sync_harvested_to_pool",
-                        celery_id=getattr(self.request, "id", "") or "",
-                        status=PipelineEvent.Status.SKIPPED,
-                        meta={
-                            "raw_job_id": rj.pk,
-                            "qualified_only": bool(qualified_only),
-                            "reason_code": "DUPLICATE_EXISTING",
-                        },
-                    )
-                    skipped += 1
-                    if total_target:
-                        update_task_progress(
-                            self,
-                            current=processed,
-                            total=total_target,
-                            message=(
-                                f"Qualified sync {processed:,}/{total_target:,}"
-                                if qualified_only
-                                else f"Sync {processed:,}/{total_target:,}"
-                            ),
-                        )
-                    continue
-    
-                if not gate.passed:
-                    if qualified_only:
-                        # For qualified-only runs, keep non-passing rows pending so they can
-                        # be re-enriched/revalidated later instead of being force-failed here.
-                        reason_key = (gate.reason_code or "UNKNOWN").strip() or "UNKNOWN"
-                        skipped_reasons[reason_key] = skipped_reasons.get(reason_key, 0) + 1
-                        skipped += 1
-                        if total_target:
-                            update_task_progress(
-                                self,
-                                current=processed,
-                                total=total_target,
-                                message=f"Qualified sync {processed:,}/{total_target:,}",
-                            )
-                        continue
-                    payload = dict(rj.raw_payload or {})
-                    payload["vet_gate"] = {
-                        "status": "blocked",
-                        "reason_code": gate.reason_code,
-                        "reasons": gate.reasons,
-                        "checks": gate.checks,
-                        "scores": {
-                            "data_quality": gate.data_quality_score,
-                            "trust": gate.trust_score,
-                            "candidate_fit": gate.candidate_fit_score,
-                            "vet_priority": gate.vet_priority_score,
-                        },
-                        "checked_at": _tz.now().isoformat(),
-                    }
-                    rj.sync_status = "FAILED"
-                    rj.sync_skip_reason = (gate.reason_code or "")[:32]
-                    rj.raw_payload = payload
-                    try:
-                        rj.save(update_fields=["sync_status", "sync_skip_reason", "raw_payload", "updated_at"])
-                    except Exception as _save_exc:
-                        logger.warning("Could not save gate-fail status for RawJob %s: %s", rj.pk, _save_exc)
-                    failed += 1
-                    if total_target:
-                        update_task_progress(
-                            self,
-                            current=processed,
-                            total=total_target,
-                            message=f"Sync {processed:,}/{total_target:,}",
-                        )
-                    continue
-    
-                try:
-                    platform_slug = rj.platform_slug or (rj.job_platform.slug if rj.job_platform else "")
-                    job_location = " | ".join(rj.location_candidates or []) or rj.location_raw or ""
-                    job_country = rj.country or ((rj.country_codes or [""])[0] if rj.country_codes else "")
-                    with transaction.atomic():
-                        job = Job.objects.create(
-                            title=(rj.title or "")[:200],  # Job.title max_length=200; RawJob.title up to 512
-                            company=(rj.company_name or (rj.company.name if rj.company else ""))[:200],
-                            company_obj=rj.company,
-                            location=job_location[:200],   # Job.location max_length=200
-                            description=rj.description or rj.title or "",  # Job.description is NOT NULL
-                            original_link=(rj.original_url or "")[:500],  # Job.original_link max_length=500; RawJob up to 1024
-                            salary_range=(rj.salary_raw or "")[:100],     # Job.salary_range max_length=100
-                            job_type=(rj.employment_type if rj.employment_type and rj.employment_type != "UNKNOWN" else "FULL_TIME")[:20],  # max_length=20; guard None
-                            status="POOL",
-                            stage=Job.Stage.VETTED,
-                            stage_changed_at=_tz.now(),
-                            url_hash=rj.url_hash or "",
-                            job_source=(f"HARVESTED_{platform_slug.upper()}" if platform_slug else "HARVESTED")[:100],  # max_length=100
-                            posted_by=system_user,
-                            source_raw_job=rj,
-                            queue_entered_at=_tz.now(),
-                            # Propagate classification from RawJob if available
-                            country=job_country[:100],                    # Job.country max_length=100
-                            department=(rj.department_normalized or "")[:20],  # Job.department max_length=20
-                        )
-                        apply_gate_result_to_job(job, gate)
-                        job.quality_score = compute_quality_score(job)
-                        job.validation_score = int(round(gate.vet_priority_score * 100))
-                        job.validation_result = {
-                            "score": job.validation_score,
-                            "lane": gate.lane,
-                            "gate_status": gate.status,
-                            "reason_code": gate.reason_code,
-                            "reasons": gate.reasons,
-                            "checks": gate.checks,
-                            "multi_score": {
-                                "data_quality": gate.data_quality_score,
-                                "trust": gate.trust_score,
-                                "candidate_fit": gate.candidate_fit_score,
-                                "vet_priority": gate.vet_priority_score,
-                            },
-                        }
-                        job.validation_run_at = _tz.now()
-                        job.gate_checked_at = _tz.now()
-                        job.save(
-                            update_fields=[
-                                "hard_gate_passed", "gate_status", "vet_lane",
-                                "pipeline_reason_code", "pipeline_reason_detail",
-                                "hard_gate_failures", "hard_gate_checks",
-                                "data_quality_score", "trust_score", "candidate_fit_score", "vet_priority_score",
-                                "quality_score", "validation_score", "validation_result", "validation_run_at",
-                                "gate_checked_at",
-                            ]
-                        )
-                        payload = dict(rj.raw_payload or {})
-                        payload["vet_gate"] = {
-                            "status": "eligible",
-                            "lane": gate.lane,
-                            "reason_code": gate.reason_code,
-                            "checks": gate.checks,
-                            "scores": {
-                                "data_quality": gate.data_quality_score,
-                                "trust": gate.trust_score,
-                                "candidate_fit": gate.candidate_fit_score,
-                                "vet_priority": gate.vet_priority_score,
-                            },
-                            "job_id": job.pk,
-                            "checked_at": _tz.now().isoformat(),
-                        }
-                        try:
-                            from jobs.marketing_role_routing import assign_marketing_roles_to_job
-
-                            assign_marketing_roles_to_job(job, raw_job=rj)
-                        except Exception as _mr_exc:
-                            logger.warning(
-                                "Could not assign marketing roles to job %s from raw job %s: %s",
-                                job.pk, rj.pk, _mr_exc,
-                            )
-                        rj.sync_status = "SYNCED"
-                        rj.raw_payload = payload
-                        rj.save(update_fields=["sync_status", "raw_payload", "updated_at"])
-                        PipelineEvent.record(
-                            job=job,
-                            from_stage=Job.Stage.ENRICHED,
-                            to_stage=Job.Stage.VETTED,
-                            task_name="harvest.sync_harvested_to_pool",
-                            celery_id=getattr(self.request, "id", "") or "",
-                            status=PipelineEvent.Status.SUCCESS,
-                            meta={
-                                "raw_job_id": rj.pk,
-                                "qualified_only": bool(qualified_only),
-                                "gate_status": gate.status,
-                                "lane": gate.lane,
-                                "reason_code": gate.reason_code,
-                                "scores": {
-                                    "data_quality": gate.data_quality_score,
-                                    "trust": gate.trust_score,
-                                    "candidate_fit": gate.candidate_fit_score,
-                                    "vet_priority": gate.vet_priority_score,
-                                },
-                            },
-                        )
-                        synced += 1
-                except Exception as e:
-                    payload = dict(rj.raw_payload or {})
-                    payload["vet_gate"] = {
-                        "status": "failed",
-                        "reason_code": "POOL_SYNC_ERROR",
-                        "error": str(e)[:240],
-                        "checked_at": _tz.now().isoformat(),
-                    }
-                    rj.sync_status = "FAILED"
-                    rj.raw_payload = payload
-                    try:
-                        rj.save(update_fields=["sync_status", "raw_payload", "updated_at"])
-                    except Exception as _save_exc:
-                        # If we can't persist the failure status, just log and continue —
-                        # don't let the error-handler crash the whole task run.
-                        logger.warning("Could not save error status for RawJob %s: %s", rj.pk, _save_exc)
-                    PipelineEvent.record(
-                        url_hash=rj.url_hash or "",
-                        from_stage="ENRICHED",
-                        to_stage="ERROR",
-                        task_name="harvest.sync_harvested_to_pool",
-                        celery_id=getattr(self.request, "id", "") or "",
-                        status=PipelineEvent.Status.FAILED,
-                        error=str(e)[:240],
-                        meta={
-                            "raw_job_id": rj.pk,
-                            "qualified_only": bool(qualified_only),
-                            "reason_code": "POOL_SYNC_ERROR",
-                        },
-                    )
-                    logger.error("Sync failed for RawJob %s: %s", rj.pk, e)
-                    failed += 1
-    
-                if total_target:
-                    update_task_progress(
-                        self,
-                        current=processed,
-                        total=total_target,
-                        message=(
-                            f"Qualified sync {processed:,}/{total_target:,}"
-                            if qualified_only
-                            else f"Sync {processed:,}/{total_target:,}"
-                        ),
-                    )
+            chunk = sync_chunk(
+                batch,
+                gate_cfg=gate_cfg,
+                system_user=system_user,
+                qualified_only=qualified_only,
+                celery_id=getattr(self.request, "id", "") or "",
+            )
+            processed += len(batch)
+            synced += chunk.synced
+            skipped += chunk.skipped
+            failed += chunk.failed
+            for reason_key, n in chunk.skipped_reasons.items():
+                skipped_reasons[reason_key] = skipped_reasons.get(reason_key, 0) + n
+            # Parse the new Jobs' descriptions in one batch per chunk (jobs.jd_store)
+            schedule_parse(chunk.job_ids)
+            update_task_progress(
+                self,
+                current=processed,
+                total=total_target,
+                message=(
+                    f"Qualified sync {processed:,}/{total_target:,}"
+                    if qualified_only
+                    else f"Sync {processed:,}/{total_target:,}"
+                ),
+            )
 
         _invalidate_rawjobs_dashboard_cache()
         logger.info(
@@ -3839,31 +3646,15 @@ def _jarvis_parse_date(raw: str):
 
 def _jarvis_company_name_key(raw: str) -> str:
     """Normalize name for duplicate checks (ignore punctuation/legal suffix noise)."""
-    import re as _re
+    from companies.resolution import company_name_key
 
-    if not raw:
-        return ""
-    text = raw.strip().lower().replace("&", " and ")
-    text = _re.sub(r"[^a-z0-9]+", " ", text)
-    tokens = [t for t in text.split() if t]
-    if not tokens:
-        return ""
-    stop = {
-        "the", "inc", "incorporated", "llc", "ltd", "ltda", "corp", "corporation",
-        "co", "company", "group", "holdings", "plc", "gmbh",
-        "sa", "bv", "srl", "pte", "and", "of", "for", "a", "an", "do", "de", "da",
-    }
-    reduced = [t for t in tokens if t not in stop] or tokens
-    return " ".join(reduced)
+    return company_name_key(raw)
 
 
 def _jarvis_clean_company_name(raw: str) -> str:
-    import re as _re
+    from companies.resolution import clean_company_name
 
-    text = (raw or "").strip()
-    if not text:
-        return ""
-    return _re.sub(r"\s+", " ", text).strip(" -_,.")
+    return clean_company_name(raw)
 
 
 def _jarvis_resolve_company(company_name: str, job_url: str):
@@ -3878,14 +3669,14 @@ def _jarvis_resolve_company(company_name: str, job_url: str):
                           e.g. "Bayview" ↔ "Bayview Asset Management"
       4. Create new     — only when all matching strategies fail
     """
-    from django.db.models import Q
     from companies.models import Company
+    from companies.resolution import get_company_index, resolve_many
     from urllib.parse import urlparse
 
     company_name = _jarvis_clean_company_name(company_name)
 
     # ── 1. Domain match ──────────────────────────────────────────────────────
-    root_domain = ""
+    company_host = ""
     try:
         host = urlparse(job_url).netloc.lower()
         # Strip well-known ATS/career subdomains
@@ -3906,59 +3697,28 @@ def _jarvis_resolve_company(company_name: str, job_url: str):
             if host == ats_root or host.endswith(ats):
                 host = ""
                 break
-        if host:
-            parts = host.split(".")
-            root_domain = ".".join(parts[-2:]) if len(parts) >= 2 else host
+        # The identity index keys on the full host, so acme.co.uk and other.co.uk stay apart
+        company_host = host
     except Exception:
         pass
 
-    if root_domain:
-        match = Company.objects.filter(
-            Q(domain__iexact=root_domain) |
-            Q(domain__iendswith="." + root_domain) |
-            Q(website__icontains=root_domain)
-        ).first()
+    # Lookups below go through the shared identity index (companies.resolution)
+    # instead of icontains scans; only the chosen Company is loaded.
+    index = get_company_index()
+
+    if company_host:
+        domain_pk = index.best(index.by_domain(company_host))
+        match = Company.objects.filter(pk=domain_pk).first() if domain_pk is not None else None
         if match:
-            logger.info("Jarvis company match by domain: %s → %s", root_domain, match.name)
+            logger.info("Jarvis company match by domain: %s → %s", company_host, match.name)
             return match
 
     # ── 2. Exact match (case-insensitive) + normalized key match ───────────
     if company_name:
-        exact = (
-            Company.objects.filter(Q(name__iexact=company_name) | Q(alias__iexact=company_name))
-            .order_by(Length("name"), "name")
-            .first()
-        )
-        if exact:
-            logger.info("Jarvis exact company match: '%s' → '%s'", company_name, exact.name)
-            return exact
-
-        key = _jarvis_company_name_key(company_name)
-        compact = key.replace(" ", "")
-        if key:
-            token_q = Q()
-            for tok in key.split()[:3]:
-                token_q |= Q(name__icontains=tok) | Q(alias__icontains=tok)
-            candidate_qs = Company.objects.filter(token_q) if token_q else Company.objects.all()
-            # Compact-name inputs like "Appliedsystems" should still match existing
-            # canonical rows like "Applied Systems". If the token filter returns
-            # nothing, widen the scan and rely on normalized compact comparison.
-            if token_q and not candidate_qs.exists():
-                candidate_qs = Company.objects.all()
-            best = None
-            for cand in candidate_qs.only("id", "name", "alias").order_by("name")[:300]:
-                for cand_name in (cand.name, cand.alias):
-                    cand_key = _jarvis_company_name_key(cand_name or "")
-                    if not cand_key:
-                        continue
-                    cand_compact = cand_key.replace(" ", "")
-                    if cand_key == key or (compact and cand_compact == compact):
-                        if best is None or len(cand.name) < len(best.name):
-                            best = cand
-                        break
-            if best:
-                logger.info("Jarvis normalized company match: '%s' → '%s'", company_name, best.name)
-                return best
+        best = resolve_many([company_name]).get(company_name)
+        if best:
+            logger.info("Jarvis normalized company match: '%s' → '%s'", company_name, best.name)
+            return best
 
     # ── 3. Word-by-word fuzzy scan ───────────────────────────────────────────
     # NOTE: intentionally skipping a plain exact-name match here.
@@ -3975,51 +3735,32 @@ def _jarvis_resolve_company(company_name: str, job_url: str):
              "of", "for", "a", "an", "&"}
 
     if company_name:
-        name_lower = company_name.lower()
-        words = [w.strip(".,") for w in company_name.split()
+        words = [w.strip(".,").lower() for w in company_name.split()
                  if len(w.strip(".,")) >= 2 and w.lower().strip(".,") not in _STOP]
 
-        best = None
-        seen_ids: set[int] = set()
-
+        best_pk = None
         for word in words:
             # First try: exact company name == this single word (e.g., "3M")
-            try:
-                exact_word = Company.objects.get(name__iexact=word)
-                if exact_word.pk not in seen_ids:
+            exact_word = index.best(
+                pk for pk in index.by_token(word) if index.name_of(pk).lower() == word
+            )
+            if exact_word is not None:
+                exact_company = Company.objects.filter(pk=exact_word).first()
+                if exact_company:
                     logger.info(
                         "Jarvis word-exact match: '%s' (word '%s') → '%s'",
-                        company_name, word, exact_word.name,
+                        company_name, word, exact_company.name,
                     )
-                    return exact_word
-            except Company.DoesNotExist:
-                pass
-            except Company.MultipleObjectsReturned:
-                pass
+                    return exact_company
 
-            # Second try: word-boundary scan.
-            # Advanced technique: use \bword\b regex instead of substring containment.
-            # This means "Whop" will NOT match "Whoop" (different tokens) but
-            # "Bayview" WILL match "Bayview Asset Management" (whole word present).
-            # No length-ratio hacks needed — word boundaries handle it cleanly.
-            import re as _re2
-            word_pat = _re2.compile(r'\b' + _re2.escape(word.lower()) + r'\b')
-            for cand in Company.objects.filter(name__icontains=word).order_by("name")[:10]:
-                if cand.pk in seen_ids:
-                    continue
-                seen_ids.add(cand.pk)
-                cn = cand.name.lower()
-                # Build reverse pattern: first significant word of candidate in our name
-                cand_first = (cn.split() or [""])[0]
-                cand_pat = (
-                    _re2.compile(r'\b' + _re2.escape(cand_first) + r'\b')
-                    if len(cand_first) >= 3 else None
-                )
-                # Accept if our word appears as a whole token in candidate,
-                # OR candidate's first word appears as a whole token in our name.
-                if word_pat.search(cn) or (cand_pat and cand_pat.search(name_lower)):
-                    if best is None or len(cand.name) < len(best.name):
-                        best = cand
+            # Second try: whole-word match via the index token postings.
+            # "Whop" will NOT match "Whoop" (different tokens) but "Bayview"
+            # WILL match "Bayview Asset Management" (whole word present).
+            cand_pk = index.best(index.by_token(word))
+            if cand_pk is not None:
+                best_pk = index.best(p for p in (best_pk, cand_pk) if p is not None)
+
+        best = Company.objects.filter(pk=best_pk).first() if best_pk is not None else None
 
         if best:
             # ── Fuzzy match found — DO NOT auto-merge ────────────────────────
@@ -4781,6 +4522,8 @@ def _backfill_process_one_job(job, jarvis, force_jarvis: bool = False):
             upd["raw_payload"] = pl
         if isinstance(pl, dict) and pl.get("active") is False:
             upd["is_active"] = False
+        job.description = upd["description"]
+        upd.update(derived_values(job))
         RawJob.objects.filter(pk=job.pk).update(**upd)
         log = {
             **log_base,
@@ -4873,6 +4616,10 @@ def _backfill_process_one_job(job, jarvis, force_jarvis: bool = False):
     for field, value in update_fields.items():
         setattr(job, field, value)
     update_fields.update(evaluate_rawjob_scope(job, use_provider=None, save=False))
+    for field in ("country", "state", "location_raw"):
+        if field in update_fields:
+            setattr(job, field, update_fields[field])
+    update_fields.update(derived_values(job))
 
     RawJob.objects.filter(pk=job.pk).update(**update_fields)
     if data.get("raw_payload"):
@@ -5545,6 +5292,7 @@ def enrich_existing_jobs_task(
                 has_change = True
 
         if has_change:
+            stamp_derived_fields(job)
             bulk_updates.append(job)
             updated += 1
         else:
@@ -5552,7 +5300,8 @@ def enrich_existing_jobs_task(
 
         # Flush chunk
         if len(bulk_updates) >= CHUNK:
-            RawJob.objects.bulk_update(bulk_updates, ENRICH_FIELDS)
+            RawJob.objects.bulk_update(bulk_updates, ENRICH_FIELDS + DERIVED_FIELDS)
+            record_rollup_changes(bulk_updates)
             bulk_updates.clear()
 
         if idx % 100 == 0:
@@ -5565,7 +5314,8 @@ def enrich_existing_jobs_task(
 
     # Flush remainder
     if bulk_updates:
-        RawJob.objects.bulk_update(bulk_updates, ENRICH_FIELDS)
+        RawJob.objects.bulk_update(bulk_updates, ENRICH_FIELDS + DERIVED_FIELDS)
+        record_rollup_changes(bulk_updates)
 
     result = {
         "updated":         updated,
@@ -5637,6 +5387,7 @@ def backfill_resume_contract_task(
         "company_size",
         "company_employee_count_band",
         "company_founding_year",
+        *DERIVED_FIELDS,
     ]
 
     for idx, job in enumerate(jobs, start=1):
@@ -5669,6 +5420,7 @@ def backfill_resume_contract_task(
         job.company_size = ((job.company_size or "") or (company.size_band if company else "") or (company.headcount_range if company else "") or "")[:64]
         job.company_employee_count_band = ((job.company_employee_count_band or "") or (company.employee_count_band if company else "") or (company.headcount_range if company else "") or "")[:64]
         job.company_founding_year = job.company_founding_year or (company.founding_year if company else None)
+        stamp_derived_fields(job)
         bulk_updates.append(job)
         updated += 1
 
@@ -5711,17 +5463,14 @@ def backfill_resume_contract_task(
 def run_duplicate_detection_task(self, limit: int = 5000, company_slug: str = ""):
     """
     Background Celery task for duplicate detection.
-    Runs chunked + throttled — will NOT spike CPU or block web workers.
+    MinHash/LSH candidate generation keeps this near-linear in the job count.
     """
     from .duplicate_engine import run_detection
-    logger.info("Duplicate detection task started (limit=%d, company=%s)", limit, company_slug or "all")
+    logger.info("Duplicate detection task started (limit=%s, company=%s)", limit, company_slug or "all")
     result = run_detection(
         limit=limit,
         company_slug=company_slug,
         skip_existing=True,
-        company_chunk_size=10,        # 10 companies per micro-batch
-        sleep_between_chunks=0.5,     # 500ms sleep between batches — never pegs CPU
-        max_jobs_per_company=40,      # hard cap: O(40²/2)=780 pairs max per company
     )
     logger.info("Duplicate detection task finished: %s", result)
     return result
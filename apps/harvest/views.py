@@ -39,24 +39,31 @@ from .models import (
     JobBoardPlatform,
     RawJob,
     RawJobDuplicatePair,
+    RawJobRollup,
 )
 from .platform_engine import harvester_class_name_for_slug, kind_for_slug
 from .resume_profile import build_resume_job_profile
-from .jd_gate import evaluate_raw_job_resume_gate
-from .enrichments import infer_country_from_location
+from .jd_gate import _runtime_thresholds as _jd_gate_thresholds, evaluate_raw_job_resume_gate
 from .services.pipeline_snapshot import (
     load_rawjobs_dashboard_stats as _svc_load_rawjobs_dashboard_stats,
     raw_jobs_missing_description_count as _svc_raw_jobs_missing_description_count,
     raw_jobs_missing_jd_expired_count as _svc_raw_jobs_missing_jd_expired_count,
     raw_jobs_workflow_insights as _svc_raw_jobs_workflow_insights,
 )
+from .services.rawjob_derived import DERIVED_FIELDS
 from .services.rawjob_query import (
     apply_rawjob_filters as _svc_apply_rawjob_filters,
+    cached_rawjob_list_count as _svc_cached_rawjob_list_count,
     effective_classification_q as _svc_effective_classification_q,
     production_rawjobs_queryset as _svc_production_rawjobs_queryset,
+    rawjob_list_page as _svc_rawjob_list_page,
     ready_stage_q as _svc_ready_stage_q,
     rawjob_filter_state as _svc_rawjob_filter_state,
 )
+from .services.rawjob_rollup import (
+    rollup_platform_counts as _svc_rollup_platform_counts,
+    rollup_totals as _svc_rollup_totals,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -975,9 +982,8 @@ class RawJobListView(SuperuserRequiredMixin, ListView):
     paginate_by = 100
 
     def get(self, request, *args, **kwargs):
-        """JSON path for infinite-scroll: ?page=N with X-Requested-With:XMLHttpRequest"""
+        """JSON path for infinite-scroll: ?cursor=<next_cursor> with X-Requested-With:XMLHttpRequest"""
         if request.headers.get("X-Requested-With") == "XMLHttpRequest":
-            from django.core.paginator import Paginator
             # Fetch only the columns rendered in the list — skips description /
             # raw_payload blobs which can be 10–50 KB each and are never shown here.
             qs = self.get_queryset().only(
@@ -994,23 +1000,20 @@ class RawJobListView(SuperuserRequiredMixin, ListView):
                 "jd_quality_score", "raw_payload",
                 "job_keywords", "title_keywords",
                 "company_industry", "company_size",
-                "word_count",
+                "word_count", *DERIVED_FIELDS,
             )
-            paginator = Paginator(qs, self.paginate_by)
             try:
-                page_num = int(request.GET.get("page", 1))
-                page_obj = paginator.page(page_num)
-            except Exception:
-                return JsonResponse({"jobs": [], "has_next": False, "total": 0})
+                rows, next_cursor = _svc_rawjob_list_page(
+                    qs, (request.GET.get("cursor") or "").strip(), self.paginate_by
+                )
+            except ValueError:
+                return JsonResponse({"jobs": [], "has_next": False, "total": 0, "next_cursor": ""})
 
+            thresholds = _jd_gate_thresholds()
             jobs_data = []
-            for job in page_obj.object_list:
-                jd_gate = evaluate_raw_job_resume_gate(job)
-                detected_country = infer_country_from_location(
-                    location_raw=job.location_raw or "",
-                    state=job.state or "",
-                    country=job.country or "",
-                )
+            for job in rows:
+                jd_gate = evaluate_raw_job_resume_gate(job, thresholds=thresholds)
+                detected_country = job.detected_country()
                 jobs_data.append({
                     "id": job.pk,
                     "company_name": (job.company_name or "")[:30],
@@ -1068,10 +1071,9 @@ class RawJobListView(SuperuserRequiredMixin, ListView):
 
             return JsonResponse({
                 "jobs": jobs_data,
-                "has_next": page_obj.has_next(),
-                "next_page": page_obj.next_page_number() if page_obj.has_next() else None,
-                "total": paginator.count,
-                "num_pages": paginator.num_pages,
+                "has_next": bool(next_cursor),
+                "next_cursor": next_cursor,
+                "total": _svc_cached_rawjob_list_count(qs, request.GET),
             })
         # HTML Raw Jobs command center is consolidated into /jobs/pipeline/?tab=raw
         # while this endpoint remains for legacy XHR table consumers.
@@ -1101,12 +1103,7 @@ class RawJobListView(SuperuserRequiredMixin, ListView):
         # Display fallback country immediately from location text, even before
         # a full backfill writes inferred country into DB rows.
         for job in ctx.get("object_list", []):
-            detected_country = infer_country_from_location(
-                location_raw=job.location_raw or "",
-                state=job.state or "",
-                country=job.country or "",
-            )
-            setattr(job, "country_display", detected_country)
+            setattr(job, "country_display", job.detected_country())
 
         # Unified KPI aggregation with short TTL + invalidation on writes.
         stats = _load_rawjobs_dashboard_stats(force_refresh=False)
@@ -2508,12 +2505,7 @@ class RawJobStatsView(SuperuserRequiredMixin, View):
             "missing_description_jobs": stats["missing_jd"],
             "missing_jd_expired_jobs": stats["expired_missing"],
             "running_batch": batch_data,
-            "platform_stats": list(
-                _svc_production_rawjobs_queryset().values("platform_slug")
-                .annotate(count=Count("id"))
-                .order_by("-count")
-                .values("platform_slug", "count")
-            ),
+            "platform_stats": _svc_rollup_platform_counts(),
             "insights": _raw_jobs_workflow_insights(stale_pending_hours=6),
             "meta": {
                 "cache": "fresh" if (running_batch or running_company_fetch) else "short_ttl",
@@ -2725,22 +2717,22 @@ class JarvisView(SuperuserRequiredMixin, TemplateView):
         ctx["active_tab"] = "jarvis"
 
         jarvis_qs = RawJob.objects.filter(platform_slug="jarvis")
-        today = timezone.now().date()
-
-        # Core metrics
-        ctx["jarvis_total"]   = jarvis_qs.count()
-        ctx["jarvis_today"]   = jarvis_qs.filter(fetched_at__date=today).count()
-        ctx["jarvis_synced"]  = jarvis_qs.filter(sync_status="SYNCED").count()
-        ctx["jarvis_pending"] = jarvis_qs.filter(sync_status="PENDING").count()
-        ctx["jarvis_failed"]  = jarvis_qs.filter(sync_status="FAILED").count()
-        ctx["jarvis_skipped"] = jarvis_qs.filter(sync_status="SKIPPED").count()
+        today = timezone.localdate()
+        week_start = today - timezone.timedelta(days=today.weekday())
+
+        # Core metrics — one aggregate over the Jarvis rollup rows
+        jarvis_rollup = RawJobRollup.objects.filter(platform_slug="jarvis")
+        totals = _svc_rollup_totals(jarvis_rollup)
+        ctx["jarvis_total"]   = totals["jobs"]
+        ctx["jarvis_synced"]  = totals["synced"]
+        ctx["jarvis_pending"] = totals["pending"]
+        ctx["jarvis_failed"]  = totals["failed"]
+        ctx["jarvis_skipped"] = totals["skipped"]
+        ctx["jarvis_today"]   = _svc_rollup_totals(jarvis_rollup.filter(day=today))["jobs"]
+        ctx["jarvis_this_week"] = _svc_rollup_totals(jarvis_rollup.filter(day__gte=week_start))["jobs"]
         total = ctx["jarvis_total"] or 1
         ctx["jarvis_success_rate"] = round(ctx["jarvis_synced"] / total * 100)
 
-        # This week
-        week_start = today - timezone.timedelta(days=today.weekday())
-        ctx["jarvis_this_week"] = jarvis_qs.filter(fetched_at__date__gte=week_start).count()
-
         # Platform breakdown — single aggregation query, no Python loop over model instances
         ctx["jarvis_platform_breakdown"] = [
             (row["job_platform__name"] or "Unknown", row["count"])
@@ -4368,8 +4360,16 @@ class UnknownCountryReviewView(SuperuserRequiredMixin, View):
 
 # ── Vet Gate Config ──────────────────────────────────────────────────────────
 
+VET_GATE_PREVIEW_LIMIT = 5000
+
+
 def _vet_gate_preview_count(cfg) -> dict:
-    """Compute how many RawJobs would qualify for sync with these settings."""
+    """
+    Compute how many RawJobs would qualify for sync with these settings, and
+    run the vet gate itself over the newest VET_GATE_PREVIEW_LIMIT of them
+    (jobs.gating.evaluate_raw_job_gates) to show how they would be laned.
+    """
+    from jobs.gating import evaluate_raw_job_gates
     from .models import RawJob
     from django.db.models import Q, Value, F
     from django.db.models.functions import Length, Coalesce
@@ -4403,7 +4403,16 @@ def _vet_gate_preview_count(cfg) -> dict:
         ).filter(_jd_len__gte=cfg.min_char_count)
 
     total = qs.count()
-    return {"total": total}
+    gate = {"evaluated": 0, "passed": 0, "lanes": {}, "blocked_reasons": {}}
+    for _raw_job, result in evaluate_raw_job_gates(qs, cfg, limit=VET_GATE_PREVIEW_LIMIT):
+        gate["evaluated"] += 1
+        if result.passed:
+            gate["passed"] += 1
+            gate["lanes"][result.lane] = gate["lanes"].get(result.lane, 0) + 1
+        else:
+            reasons = gate["blocked_reasons"]
+            reasons[result.reason_code] = reasons.get(result.reason_code, 0) + 1
+    return {"total": total, "gate": gate}
 
 
 class VetGateConfigView(SuperuserRequiredMixin, View):
@@ -4481,6 +4490,11 @@ class VetGatePreviewView(SuperuserRequiredMixin, View):
             cfg.min_char_count = max(1, int(request.POST.get("min_char_count") or 400))
         except (ValueError, TypeError):
             pass
+        for name in ("auto_lane_min_vet_priority", "auto_lane_min_data_quality", "auto_lane_min_trust"):
+            try:
+                setattr(cfg, name, float(request.POST[name]))
+            except (KeyError, ValueError, TypeError):
+                pass
         raw_domains = request.POST.get("blocked_domains_json") or "[]"
         try:
             parsed = json.loads(raw_domains)
@@ -21,7 +21,7 @@ class JobAdmin(admin.ModelAdmin):
 
 @admin.register(JobEmbedding)
 class JobEmbeddingAdmin(admin.ModelAdmin):
-    list_display = ('job', 'model', 'updated_at')
+    list_display = ('job', 'model', 'dims', 'updated_at')
     readonly_fields = ('created_at', 'updated_at')
 
 
@@ -8,3 +8,4 @@ class JobsConfig(AppConfig):
     def ready(self):
         from . import signals  # noqa: F401
         signals.wire_rawjob_signal()
+        signals.wire_consultant_role_signal()
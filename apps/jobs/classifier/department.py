@@ -19,6 +19,7 @@ Edge cases covered (#11-14, 21-25 from audit):
 """
 from __future__ import annotations
 
+import logging
 import os
 import re
 import unicodedata
@@ -30,6 +31,8 @@ import yaml
 
 from .country import strip_html
 
+logger = logging.getLogger(__name__)
+
 _DATA_DIR = Path(__file__).resolve().parent.parent / "data"
 
 # ── Role domain → department mapping (reuse parsed_jd) ───────────────────────
@@ -167,15 +170,36 @@ def _role_domain_classify(role_domain: str) -> tuple[str, float]:
 
 # ── Tier 3: Embedding cosine similarity ─────────────────────────────────────
 
+@lru_cache(maxsize=4)
+def load_embedding_model(model_name: str, quantize: bool = False):
+    """SentenceTransformer on CPU (optionally int8 dynamic-quantised), or None if not installed.
+
+    Shared with jobs.matching, so the two load one copy of the same model.
+    """
+    try:
+        from sentence_transformers import SentenceTransformer  # type: ignore
+
+        model = SentenceTransformer(model_name, device="cpu")
+        if quantize:
+            import torch  # type: ignore
+
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        return model
+    except ImportError:
+        logger.warning("sentence-transformers not installed; local embeddings unavailable")
+        return None
+    except Exception:
+        logger.exception("Failed to load local embedding model %s", model_name)
+        return None
+
+
 @lru_cache(maxsize=1)
 def _load_anchor_embeddings():
     """Lazy-load model and pre-compute anchor embeddings. Returns (model, dept_list, matrix)."""
     try:
-        from sentence_transformers import SentenceTransformer  # type: ignore
-        import numpy as np  # type: ignore
-
-        model_name = os.environ.get("DEPT_EMBED_MODEL", "BAAI/bge-small-en-v1.5")
-        model = SentenceTransformer(model_name)
+        model = load_embedding_model(os.environ.get("DEPT_EMBED_MODEL", "BAAI/bge-small-en-v1.5"))
+        if model is None:
+            return None, None, None, None
         anchors = _load_anchors()
 
         dept_names: list[str] = []
@@ -3,14 +3,55 @@
 Prevents duplicate Job rows when the same posting is discovered through
 multiple ATS detections (e.g. SmartRecruiters + a company's career page both
 pointing at the same URL).
+
+Also holds the keys behind the manual duplicate check
+(services.find_potential_duplicate_jobs): normalised title/company columns
+(pg_trgm GIN-indexed when the extension is available) and a MinHash sketch of
+the description tokens, all written in Job.save().
 """
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Optional
 
+from django.db import connection
+
+from harvest.minhash import estimate_jaccard, pack_signature, signature, unpack_signature
 from harvest.normalizer import compute_url_hash
 
 from .models import Job
+from .services import _norm_text, _tokenize
+
+# Same tokens as the title/description scoring in jobs.services
+normalize_dedup_text = _norm_text
+dedup_tokens = _tokenize
+
+
+def description_sketch(description: str) -> bytes | None:
+    """Packed MinHash signature of the description's token set (None when empty)."""
+    sig = signature(dedup_tokens(description))
+    return pack_signature(sig) if sig else None
+
+
+def sketch_similarity(a: bytes | memoryview | None, b: bytes | memoryview | None) -> float:
+    """Estimated Jaccard between two packed sketches (0.0 if either is missing)."""
+    sa, sb = unpack_signature(a), unpack_signature(b)
+    if not sa or not sb:
+        return 0.0
+    return estimate_jaccard(sa, sb)
+
+
+@lru_cache(maxsize=1)
+def trigram_search_available() -> bool:
+    """True when pg_trgm is installed, i.e. the title/company GIN indexes exist."""
+    if connection.vendor != "postgresql":
+        return False
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            return cursor.fetchone() is not None
+    except Exception:
+        return False
 
 
 def url_hash_for(url: str) -> str:
@@ -0,0 +1,148 @@
+"""
+Deferred PipelineEvent writes and Job → Company linking for bulk operations.
+
+Inside ``with deferred_pipeline_events():`` (also usable as a decorator):
+
+  - PipelineEvent.record(), and with it the Job / RawJob shadow events in
+    jobs.signals, appends to an in-memory buffer instead of running one INSERT
+    per event. The buffer is written with a single bulk_create when the block
+    exits, or every MAX_BUFFERED events so long loops keep occurred_at close to
+    the real time. Events whose Job was rolled back in the meantime are dropped.
+  - companies.signals.auto_create_company_from_job only notes Jobs saved without
+    a company_obj. On exit the distinct company names are resolved together
+    through the identity index (companies.resolution.resolve_many), missing ones
+    are created as stubs and queued for enrichment, and each company is linked
+    with one UPDATE.
+
+coalesce=True merges repeated transitions of the same job by the same task
+within the buffer: A→B then B→C becomes one A→C event and an identical repeat
+is folded into the first one, with meta["coalesced"] counting the merged events.
+
+Blocks nest; inner blocks share the outermost buffer. Errors while flushing are
+logged and swallowed, like jobs.signals._safe_record.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from contextlib import ContextDecorator
+
+from django.db import transaction
+
+log = logging.getLogger(__name__)
+
+MAX_BUFFERED = 500
+
+_local = threading.local()
+
+
+class _Buffer:
+    def __init__(self, coalesce: bool):
+        self.coalesce = coalesce
+        self.events: list = []
+        self.last: dict[tuple, object] = {}
+        self.company_links: dict[str, list[int]] = {}
+
+    def add(self, event):
+        if self.coalesce and (event.job_id or event.url_hash):
+            key = (event.job_id, event.url_hash, event.task_name)
+            prev = self.last.get(key)
+            if prev is not None and prev.status == event.status and (
+                prev.to_stage == event.from_stage
+                or (prev.from_stage, prev.to_stage) == (event.from_stage, event.to_stage)
+            ):
+                merged = int(prev.meta.get("coalesced", 1)) + 1
+                prev.to_stage = event.to_stage
+                prev.error = event.error or prev.error
+                prev.meta = {**prev.meta, **event.meta, "coalesced": merged}
+                return prev
+            self.last[key] = event
+        self.events.append(event)
+        if len(self.events) >= MAX_BUFFERED:
+            self.flush_events()
+        return event
+
+    def flush_events(self) -> None:
+        from .models import Job, PipelineEvent
+
+        events, self.events, self.last = self.events, [], {}
+        if not events:
+            return
+        job_ids = {e.job_id for e in events if e.job_id}
+        if job_ids:
+            live = set(Job.objects.filter(pk__in=job_ids).values_list("pk", flat=True))
+            events = [e for e in events if not e.job_id or e.job_id in live]
+        try:
+            with transaction.atomic():
+                PipelineEvent.objects.bulk_create(events, batch_size=MAX_BUFFERED)
+        except Exception:
+            log.exception("Deferred PipelineEvent flush failed for %d event(s) (swallowed)", len(events))
+
+    def flush_company_links(self) -> None:
+        links, self.company_links = self.company_links, {}
+        if not links:
+            return
+        from companies.resolution import clean_company_name, resolve_many
+        from companies.services import normalize_company_name
+        from companies.signals import link_jobs_to_company
+        from companies.tasks import enrich_company_task
+
+        try:
+            names = {raw: normalize_company_name(raw) or raw for raw in links}
+            resolved = resolve_many(names.values())
+            missing = [n for n in dict.fromkeys(names.values()) if not resolved.get(clean_company_name(n))]
+            if missing:
+                created = resolve_many(missing, create=True)
+                resolved.update(created)
+                for company in {c.pk: c for c in created.values() if c}.values():
+                    enrich_company_task.delay(company.pk)
+            for raw_name, job_ids in links.items():
+                company = resolved.get(clean_company_name(names[raw_name]))
+                if company is not None:
+                    link_jobs_to_company(job_ids, company)
+        except Exception:
+            log.exception("Deferred company linking failed for %d name(s) (swallowed)", len(links))
+
+    def flush(self) -> None:
+        self.flush_company_links()
+        self.flush_events()
+
+
+def _stack() -> list:
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def current_buffer() -> _Buffer | None:
+    stack = _stack()
+    return stack[0] if stack else None
+
+
+def defer_company_link(job_id: int, raw_name: str) -> bool:
+    """Note a Job to link to a Company at flush time; False when no block is active."""
+    buffer = current_buffer()
+    if buffer is None:
+        return False
+    buffer.company_links.setdefault(raw_name, []).append(job_id)
+    return True
+
+
+class deferred_pipeline_events(ContextDecorator):
+    """Buffer PipelineEvents and company links for the duration of the block (see module docstring)."""
+
+    def __init__(self, *, coalesce: bool = False):
+        self.coalesce = coalesce
+
+    def __enter__(self):
+        stack = _stack()
+        stack.append(stack[0] if stack else _Buffer(self.coalesce))
+        return self
+
+    def __exit__(self, *exc_info):
+        stack = _stack()
+        buffer = stack.pop()
+        if not stack:
+            buffer.flush()
+        return False
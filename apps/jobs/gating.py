@@ -1,13 +1,14 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Iterator
 from urllib.parse import urlparse
 import re
 
-from django.db.models import Q
+from django.db.models import Q, QuerySet, Value
+from django.db.models.functions import Coalesce, Left, Length, NullIf, Trim, Upper
 
-from harvest.jd_gate import REASON_LOW_CLASSIFICATION, evaluate_raw_job_resume_gate
+from harvest.jd_gate import REASON_LOW_CLASSIFICATION, _runtime_thresholds, evaluate_raw_job_resume_gate
 
 from .models import Job
 
@@ -30,6 +31,24 @@ _PASSABLE_SCOPE_DEFAULT = frozenset({"PRIORITY_TARGET", "REVIEW_UNKNOWN_COUNTRY"
 # Kept for backwards-compat with any code that imported this name directly.
 _PASSABLE_SCOPE = _PASSABLE_SCOPE_DEFAULT
 
+GATE_BATCH_SIZE = 2000
+JD_HEAD_CHARS = 4000
+# RawJob columns evaluate_raw_job_gate reads (evaluate_raw_job_gates loads only these).
+GATE_FIELDS = (
+    "id", "title", "normalized_title", "company", "company_name", "platform_label",
+    "platform_slug", "job_domain", "scope_status", "is_active", "original_url", "url_hash",
+    "location_raw", "city", "state", "country", "jd_quality_score", "quality_score",
+    "salary_min", "salary_max", "salary_raw", "years_required", "years_required_max",
+    "experience_level", "tech_stack", "skills", "job_keywords", "category_confidence",
+    "classification_confidence", "has_html_content", "employment_type", "benefits_list",
+    "benefits", "languages_required", "department_normalized", "department", "word_count",
+)
+GATE_RELATED_FIELDS = (
+    "company__name", "company__is_blacklisted",
+    "platform_label__platform", "platform_label__tenant_id", "platform_label__confidence",
+    "platform_label__platform__url_patterns",
+)
+
 
 @dataclass
 class GateResult:
@@ -67,8 +86,16 @@ def _is_title_meaningful(title: str) -> bool:
     return t not in {"job", "position", "opening", "opportunity", "role", "vacancy"}
 
 
-def _has_clean_jd(raw_job) -> bool:
-    gate = evaluate_raw_job_resume_gate(raw_job)
+def _has_clean_jd(raw_job, context: GateContext | None = None) -> bool:
+    if context is None:
+        gate = evaluate_raw_job_resume_gate(raw_job)
+    else:
+        gate = evaluate_raw_job_resume_gate(
+            raw_job,
+            thresholds=context.resume_thresholds,
+            text=getattr(raw_job, "_gate_jd_head", None),
+            text_length=getattr(raw_job, "_gate_jd_len", None),
+        )
     if gate.usable:
         return True
     # Vet Queue gate is intentionally looser than Resume gate:
@@ -76,22 +103,10 @@ def _has_clean_jd(raw_job) -> bool:
     return gate.reason_code == REASON_LOW_CLASSIFICATION
 
 
-def _platform_tenant_match(raw_job) -> bool:
-    url = (raw_job.original_url or "").strip()
-    if not url:
-        return False
-    label = getattr(raw_job, "platform_label", None)
-    if not label or not label.platform_id:
-        return True
-
-    host = (urlparse(url).netloc or "").lower()
+def _label_match_rules(label) -> tuple[list[str], str, list[str]]:
+    """(url patterns, tenant, tenant tokens) for a platform label."""
     patterns = [p.lower() for p in (label.platform.url_patterns or []) if p]
-    pattern_ok = True if not patterns else any(p in host or p in url.lower() for p in patterns)
-
     tenant = (label.tenant_id or "").strip().lower()
-    if not tenant:
-        return pattern_ok
-
     # Tenants are often stored as composite tokens for ATS links
     # (examples: "wgu.wd5|external", "kestra|kestracareersite").
     # Require at least one meaningful tenant token to appear in URL/host.
@@ -104,7 +119,29 @@ def _platform_tenant_match(raw_job) -> bool:
         tokens.append(tok.replace("_", ""))
         tokens.append(tok.replace(".", ""))
     tokens = [t for t in dict.fromkeys(tokens) if len(t) >= 3]
-    if not tokens:
+    return patterns, tenant, tokens
+
+
+def _platform_tenant_match(raw_job, context: GateContext | None = None) -> bool:
+    url = (raw_job.original_url or "").strip()
+    if not url:
+        return False
+    label = getattr(raw_job, "platform_label", None)
+    if not label or not label.platform_id:
+        return True
+
+    if context is None:
+        patterns, tenant, tokens = _label_match_rules(label)
+    else:
+        rules = context.label_rules.get(label.pk)
+        if rules is None:
+            rules = context.label_rules[label.pk] = _label_match_rules(label)
+        patterns, tenant, tokens = rules
+
+    host = (urlparse(url).netloc or "").lower()
+    pattern_ok = True if not patterns else any(p in host or p in url.lower() for p in patterns)
+
+    if not tenant or not tokens:
         return pattern_ok
 
     url_l = url.lower()
@@ -116,13 +153,20 @@ def _platform_tenant_match(raw_job) -> bool:
     return pattern_ok and tenant_ok
 
 
-def _duplicate_risk(raw_job) -> bool:
+def _duplicate_key(raw_job) -> tuple[str, str]:
+    title = (raw_job.normalized_title or raw_job.title or "").strip()
+    company = (raw_job.company_name or (raw_job.company.name if raw_job.company_id else "") or "").strip()
+    return company, title
+
+
+def _duplicate_risk(raw_job, context: GateContext | None = None) -> bool:
     # Fast dedupe: same url hash, or tight company+title+location match in live/pool.
+    if context is not None:
+        return context.duplicate_risk(raw_job)
     if raw_job.url_hash and Job.objects.filter(url_hash=raw_job.url_hash, is_archived=False).exists():
         return True
 
-    title = (raw_job.normalized_title or raw_job.title or "").strip()
-    company = (raw_job.company_name or (raw_job.company.name if raw_job.company_id else "") or "").strip()
+    company, title = _duplicate_key(raw_job)
     if not (title and company):
         return False
 
@@ -133,6 +177,62 @@ def _duplicate_risk(raw_job) -> bool:
     return base.exists()
 
 
+@dataclass
+class GateContext:
+    """
+    The per-row lookups of evaluate_raw_job_gate, prefetched for a batch of
+    RawJobs (build_gate_context). Comparisons are upper-cased like iexact.
+    """
+    live_url_hashes: set[str]
+    live_locations: dict[tuple[str, str], set[str]]  # (COMPANY, TITLE) -> {LOCATION}
+    resume_thresholds: tuple[int, int, float]
+    label_rules: dict[int, tuple] = field(default_factory=dict)
+
+    def duplicate_risk(self, raw_job) -> bool:
+        if raw_job.url_hash and raw_job.url_hash in self.live_url_hashes:
+            return True
+        company, title = _duplicate_key(raw_job)
+        if not (title and company):
+            return False
+        locations = self.live_locations.get((company.upper(), title.upper()))
+        if not locations:
+            return False
+        loc = (raw_job.location_raw or "").strip()
+        return not loc or "" in locations or loc.upper() in locations
+
+
+def build_gate_context(raw_jobs: Iterable, resume_thresholds: tuple[int, int, float] | None = None) -> GateContext:
+    """One query for live url hashes and one for company+title matches across `raw_jobs`."""
+    raw_jobs = list(raw_jobs)
+    hashes = {rj.url_hash for rj in raw_jobs if rj.url_hash}
+    live_url_hashes = set(
+        Job.objects.filter(url_hash__in=hashes, is_archived=False).order_by().values_list("url_hash", flat=True)
+    ) if hashes else set()
+
+    companies, titles = set(), set()
+    for rj in raw_jobs:
+        company, title = _duplicate_key(rj)
+        if company and title:
+            companies.add(company.upper())
+            titles.add(title.upper())
+    live_locations: dict[tuple[str, str], set[str]] = {}
+    if companies:
+        rows = (
+            Job.objects.filter(is_archived=False)
+            .annotate(_company_u=Upper("company"), _title_u=Upper("title"))
+            .filter(_company_u__in=companies, _title_u__in=titles)
+            .order_by()
+            .values_list("_company_u", "_title_u", Upper("location"))
+        )
+        for company, title, location in rows:
+            live_locations.setdefault((company, title), set()).add(location or "")
+    return GateContext(
+        live_url_hashes=live_url_hashes,
+        live_locations=live_locations,
+        resume_thresholds=resume_thresholds or _runtime_thresholds(),
+    )
+
+
 def _scope_blocked_result(reason_code: str, scope_status: str) -> GateResult:
     """Fast-path BLOCKED result for jobs that fail the scope pre-check."""
     return GateResult(
@@ -157,7 +257,11 @@ def _scope_blocked_result(reason_code: str, scope_status: str) -> GateResult:
     )
 
 
-def evaluate_raw_job_gate(raw_job, cfg=None) -> GateResult:
+def evaluate_raw_job_gate(raw_job, cfg=None, context: GateContext | None = None) -> GateResult:
+    """
+    Vet gate for one RawJob. Pass a GateContext (build_gate_context) to skip the
+    per-row duplicate queries; evaluate_raw_job_gates() does that for batches.
+    """
     if cfg is None:
         from harvest.models import VetGateConfig
         cfg = VetGateConfig.get()
@@ -206,9 +310,9 @@ def evaluate_raw_job_gate(raw_job, cfg=None) -> GateResult:
         "scope_ok": True,
         "active_posting": bool(raw_job.is_active),
         "valid_source_url": bool((raw_job.original_url or "").strip()),
-        "tenant_platform_match": _platform_tenant_match(raw_job),
-        "dedupe_passed": not _duplicate_risk(raw_job),
-        "clean_jd_present": _has_clean_jd(raw_job),
+        "tenant_platform_match": _platform_tenant_match(raw_job, context),
+        "dedupe_passed": not _duplicate_risk(raw_job, context),
+        "clean_jd_present": _has_clean_jd(raw_job, context),
         "company_resolved": bool(raw_job.company_id),
     }
 
@@ -318,6 +422,68 @@ def apply_gate_result_to_job(job: Job, gate: GateResult) -> None:
     job.vet_priority_score = gate.vet_priority_score
 
 
+def _projected(qs: QuerySet) -> QuerySet:
+    """Only the columns the gate reads; the JD is reduced to its length and first characters."""
+    jd = Trim(Coalesce(NullIf("description_clean", Value("")), "description", Value("")))
+    return (
+        qs.select_related("company", "platform_label__platform")
+        .only(*GATE_FIELDS, *GATE_RELATED_FIELDS)
+        .annotate(_gate_jd_len=Length(jd), _gate_jd_head=Left(jd, JD_HEAD_CHARS))
+    )
+
+
+def _queryset_batches(qs: QuerySet, batch_size: int, limit: int | None) -> Iterator[list]:
+    """Newest-first keyset pages of the projected queryset."""
+    qs = _projected(qs).order_by("-pk")
+    last_pk = None
+    remaining = limit
+    while remaining is None or remaining > 0:
+        take = batch_size if remaining is None else min(batch_size, remaining)
+        page = qs if last_pk is None else qs.filter(pk__lt=last_pk)
+        batch = list(page[:take])
+        if not batch:
+            return
+        yield batch
+        if len(batch) < take:
+            return
+        last_pk = batch[-1].pk
+        if remaining is not None:
+            remaining -= len(batch)
+
+
+def evaluate_raw_job_gates(
+    raw_jobs,
+    cfg=None,
+    *,
+    batch_size: int = GATE_BATCH_SIZE,
+    limit: int | None = None,
+) -> Iterator[tuple[Any, GateResult]]:
+    """
+    Yield (raw_job, GateResult) for many RawJobs with a fixed number of queries
+    per batch_size rows.
+
+    A RawJob queryset is read newest-first in keyset pages loading only
+    GATE_FIELDS (up to `limit` rows); a list of already-loaded RawJobs is
+    evaluated as given. Results match evaluate_raw_job_gate row by row.
+    """
+    if cfg is None:
+        from harvest.models import VetGateConfig
+        cfg = VetGateConfig.get()
+
+    thresholds = _runtime_thresholds()
+    if isinstance(raw_jobs, QuerySet):
+        batches = _queryset_batches(raw_jobs, batch_size, limit)
+    else:
+        rows = list(raw_jobs)[:limit] if limit is not None else list(raw_jobs)
+        batches = (rows[i:i + batch_size] for i in range(0, len(rows), batch_size))
+    label_rules: dict[int, tuple] = {}
+    for batch in batches:
+        context = build_gate_context(batch, resume_thresholds=thresholds)
+        context.label_rules = label_rules
+        for raw_job in batch:
+            yield raw_job, evaluate_raw_job_gate(raw_job, cfg=cfg, context=context)
+
+
 def evaluate_job_gate(job: Job) -> GateResult:
     title_ok = _is_title_meaningful(job.title)
     desc = (job.description or "").strip()
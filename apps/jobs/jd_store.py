@@ -0,0 +1,168 @@
+"""
+Versioned, content-hashed parsed-JD store (Job.parsed_jd*).
+
+A parse is valid for exactly one description: Job.parsed_jd_hash holds
+jd_content_hash(description) — sha256 over PARSER_VERSION and the text — of
+the description it was built from, and is stamped on failures too, so a JD
+whose parse failed is not retried on every page view, only when its text
+changes (or when someone presses "Parse JD", which always re-parses).
+
+Jobs are parsed in bulk when they enter the pool (harvest sync schedules
+parse_job_descriptions_task), rules first with one consultant skill
+vocabulary for the whole batch and a single bulk_update; the LLM parser only
+runs for descriptions the rules found nothing in. Views, matching, the
+resume engine and validation call ensure_parsed_jd(), which is a hash compare
+when the store is current.
+
+Bump PARSER_VERSION when rule_parse_jd or the LLM parser prompt change in a
+way that should invalidate stored parses.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+from datetime import timedelta
+from typing import Iterable
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+PARSER_VERSION = 1
+STORE_FIELDS = ["parsed_jd", "parsed_jd_status", "parsed_jd_error", "parsed_jd_updated_at", "parsed_jd_hash"]
+SKILL_VOCABULARY_SIZE = 2500
+BATCH_SIZE = 200
+TRANSIENT_RETRY_MINUTES = 15
+
+
+def jd_content_hash(description: str) -> str:
+    return hashlib.sha256(f"v{PARSER_VERSION}\n{(description or '').strip()}".encode("utf-8")).hexdigest()
+
+
+def is_current(job: Job) -> bool:
+    """True when the stored parse (or parse failure) was built from the current description."""
+    return bool(job.parsed_jd_hash) and job.parsed_jd_hash == jd_content_hash(job.description)
+
+
+def stamp(job: Job, data: dict | None, status: str, error: str = "") -> None:
+    """Set the store fields on the instance (caller saves STORE_FIELDS)."""
+    if data is not None:
+        job.parsed_jd = data
+    job.parsed_jd_status = status
+    job.parsed_jd_error = error
+    job.parsed_jd_updated_at = timezone.now()
+    job.parsed_jd_hash = jd_content_hash(job.description)
+
+
+def store(job: Job, data: dict | None, status: str, error: str = "") -> None:
+    stamp(job, data, status, error)
+    job.save(update_fields=STORE_FIELDS)
+
+
+def store_transient_error(job: Job, error: str) -> None:
+    """Record a failure that is not about this description; the hash stays unset so it is retried."""
+    job.parsed_jd_status = "ERROR"
+    job.parsed_jd_error = error
+    job.parsed_jd_updated_at = timezone.now()
+    job.parsed_jd_hash = ""
+    job.save(update_fields=STORE_FIELDS)
+
+
+def _transient_error_is_recent(job: Job) -> bool:
+    return (
+        job.parsed_jd_status == "ERROR"
+        and not job.parsed_jd_hash
+        and job.parsed_jd_updated_at is not None
+        and timezone.now() - job.parsed_jd_updated_at < timedelta(minutes=TRANSIENT_RETRY_MINUTES)
+    )
+
+
+def known_skill_vocabulary() -> list[str]:
+    """Distinct consultant skills (lower-cased), longest first — rule_parse_jd's match list."""
+    from users.models import ConsultantProfile
+
+    known = set()
+    for skills in ConsultantProfile.objects.values_list("skills", flat=True):
+        if not skills:
+            continue
+        try:
+            for s in skills:
+                if isinstance(s, str) and s.strip():
+                    known.add(s.strip().lower())
+        except Exception:
+            continue
+    return [s for s in sorted(known, key=lambda x: (-len(x), x)) if len(s) >= 2][:SKILL_VOCABULARY_SIZE]
+
+
+def required_skills(job: Job) -> list[str]:
+    """Required skills from the stored parse (rules write required_skills, older LLM parses skills)."""
+    parsed = job.parsed_jd or {}
+    return list(parsed.get("required_skills") or parsed.get("skills") or [])
+
+
+def parse_jobs(jobs: Iterable[Job], *, force: bool = False, actor=None) -> dict:
+    """
+    Bring the store up to date for `jobs`: rules parse with one shared skill
+    vocabulary and one bulk_update, LLM parse only where the rules found nothing.
+
+    Returns {"rules", "llm", "failed", "unchanged"} counts.
+    """
+    from .services import JDParserService, rule_parse_jd
+
+    jobs = [j for j in jobs if (j.description or "").strip()]
+    stale = [j for j in jobs if force or not is_current(j)]
+    counts = {"rules": 0, "llm": 0, "failed": 0, "unchanged": len(jobs) - len(stale)}
+    if not stale:
+        return counts
+
+    vocabulary = known_skill_vocabulary()
+    by_rules: list[Job] = []
+    gaps: list[Job] = []
+    for job in stale:
+        data = rule_parse_jd(job.description, known=vocabulary)
+        if data and data.get("required_skills"):
+            stamp(job, data, "OK_RULES")
+            by_rules.append(job)
+        else:
+            gaps.append(job)
+    if by_rules:
+        Job.objects.bulk_update(by_rules, STORE_FIELDS, batch_size=BATCH_SIZE)
+        counts["rules"] = len(by_rules)
+
+    for job in gaps:
+        ok, _err = JDParserService.parse_with_llm(job, actor=actor)
+        counts["llm" if ok else "failed"] += 1
+    return counts
+
+
+def ensure_parsed_jd(job: Job, actor=None):
+    """Parse the job unless the store already holds a parse of its current description."""
+    from .services import JDParserService
+
+    if is_current(job):
+        if job.parsed_jd_status == "ERROR":
+            return False, job.parsed_jd_error
+        return True, ""
+    if _transient_error_is_recent(job):
+        return False, job.parsed_jd_error
+    return JDParserService.parse_job(job, actor=actor)
+
+
+def schedule_parse(job_ids: Iterable[int]) -> None:
+    """Queue parse_job_descriptions_task for the ids once the current transaction commits."""
+    ids = [int(pk) for pk in job_ids]
+    if not ids:
+        return
+
+    def _send():
+        from .tasks import parse_job_descriptions_task
+
+        try:
+            parse_job_descriptions_task.delay(ids)
+        except Exception:
+            logger.exception("Could not queue JD parse for %d job(s)", len(ids))
+
+    transaction.on_commit(_send)
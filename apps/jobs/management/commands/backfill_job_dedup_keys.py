@@ -0,0 +1,52 @@
+"""
+Management command: backfill_job_dedup_keys
+
+Fills Job.title_norm / company_norm / description_sketch for rows saved before
+the keys existed (or written with bulk `.update()`). Job.save() maintains them
+from then on; find_potential_duplicate_jobs falls back to tokenising the
+description for rows still missing a sketch, so this only affects speed.
+
+Usage:
+    python manage.py backfill_job_dedup_keys                  # rows without a sketch
+    python manage.py backfill_job_dedup_keys --all            # recompute every row
+    python manage.py backfill_job_dedup_keys --batch-size 1000
+"""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Backfill Job duplicate-check keys (normalised title/company + description sketch)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--all", action="store_true", help="Recompute rows that already have a sketch")
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        from jobs.dedup import description_sketch, normalize_dedup_text
+        from jobs.models import Job
+
+        batch_size = max(1, options["batch_size"])
+        qs = Job.objects.all()
+        if not options["all"]:
+            qs = qs.filter(description_sketch__isnull=True).exclude(description="")
+        qs = qs.only("pk", "title", "company", "description").order_by("pk")
+
+        total = 0
+        batch: list[Job] = []
+        for job in qs.iterator(chunk_size=batch_size):
+            job.title_norm = normalize_dedup_text(job.title)[:200]
+            job.company_norm = normalize_dedup_text(job.company)[:200]
+            job.description_sketch = description_sketch(job.description)
+            batch.append(job)
+            if len(batch) >= batch_size:
+                Job.objects.bulk_update(batch, Job._DEDUP_KEY_FIELDS)
+                total += len(batch)
+                batch = []
+                self.stdout.write(f"  {total:,} updated")
+        if batch:
+            Job.objects.bulk_update(batch, Job._DEDUP_KEY_FIELDS)
+            total += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"Done: {total:,} Job(s) updated"))
@@ -0,0 +1,63 @@
+"""
+Management command: rebuild_job_matches
+
+Re-embeds consultants and jobs with the chosen embedding backend, then
+recomputes MatchScore rows. With --backend local nothing leaves the machine,
+so a full re-match can run offline (e.g. after switching embedding models).
+
+Usage:
+    python manage.py rebuild_job_matches                          # settings backend, OPEN jobs
+    python manage.py rebuild_job_matches --backend local
+    python manage.py rebuild_job_matches --status OPEN --status POOL --limit 500
+    python manage.py rebuild_job_matches --force                  # ignore content hashes
+"""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Re-embed consultants/jobs and recompute job–consultant match scores."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--backend", choices=["openai", "local"], default=None)
+        parser.add_argument("--status", action="append", default=None, help="Job status to include (repeatable)")
+        parser.add_argument("--limit", type=int, default=0, help="Cap jobs processed (0 = all)")
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--force", action="store_true", help="Re-embed even when text is unchanged")
+
+    def handle(self, *args, **options):
+        from jobs.matching import compute_matches_for_jobs, embed_consultants, embed_jobs, get_embedding_provider
+        from jobs.models import Job
+        from users.models import ConsultantProfile
+
+        provider = get_embedding_provider(options["backend"])
+        batch_size = max(1, options["batch_size"])
+        force = options["force"]
+        self.stdout.write(f"Embedding provider: {provider.name}")
+
+        profiles = list(
+            ConsultantProfile.objects.select_related("user")
+            .prefetch_related("marketing_roles", "experience")
+            .order_by("pk")
+        )
+        totals = {"embedded": 0, "unchanged": 0, "failed": 0}
+        for i in range(0, len(profiles), batch_size):
+            for key, value in embed_consultants(profiles[i: i + batch_size], force=force, provider=provider).items():
+                totals[key] += value
+        self.stdout.write(f"Consultants: {totals}")
+
+        jobs = Job.objects.filter(status__in=options["status"] or [Job.Status.OPEN]).order_by("pk")
+        if options["limit"]:
+            jobs = jobs[: options["limit"]]
+        jobs = list(jobs)
+        totals = {"embedded": 0, "unchanged": 0, "failed": 0}
+        for i in range(0, len(jobs), batch_size):
+            for key, value in embed_jobs(jobs[i: i + batch_size], force=force, provider=provider).items():
+                totals[key] += value
+        self.stdout.write(f"Jobs: {totals}")
+
+        for i in range(0, len(jobs), batch_size):
+            compute_matches_for_jobs(jobs[i: i + batch_size], provider=provider)
+            self.stdout.write(f"  matched {min(i + batch_size, len(jobs)):,}/{len(jobs):,}")
+        self.stdout.write(self.style.SUCCESS(f"Done: matched {len(jobs):,} job(s)"))
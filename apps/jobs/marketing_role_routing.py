@@ -236,6 +236,38 @@ def infer_marketing_role_slugs_from_raw_job(raw_job, *, max_roles: int = _MAX_AU
     )
 
 
+def _active_slugs(role_slugs: Iterable[str] | None, role_map: dict[str, MarketingRole]) -> list[str]:
+    auto_slugs = [slug for slug in _dedupe_preserve_order(role_slugs or []) if slug in role_map]
+    if not auto_slugs:
+        auto_slugs = [slug for slug in _fallback_slugs_for_top_category("OTHER") if slug in role_map]
+    return auto_slugs
+
+
+def auto_role_slugs_for_raw_job(raw_job) -> list[str]:
+    """The auto role slugs assign_marketing_roles_to_job would give a job synced from raw_job."""
+    return _active_slugs(infer_marketing_role_slugs_from_raw_job(raw_job), _active_role_map())
+
+
+def bulk_add_auto_marketing_roles(jobs: Iterable) -> int:
+    """
+    Link freshly bulk-created jobs to the roles in their auto_marketing_role_slugs
+    with one through-table insert (they have no manual roles to preserve).
+
+    Returns the number of links written. Fires no m2m_changed signals.
+    """
+    role_map = _active_role_map()
+    through = MarketingRole.jobs.through
+    links = [
+        through(job_id=job.pk, marketingrole_id=role_map[slug].pk)
+        for job in jobs
+        for slug in (job.auto_marketing_role_slugs or [])
+        if job.pk and slug in role_map
+    ]
+    if links:
+        through.objects.bulk_create(links, ignore_conflicts=True)
+    return len(links)
+
+
 def assign_marketing_roles_to_job(job, *, raw_job=None, role_slugs: Iterable[str] | None = None) -> list[str]:
     """
     Assign auto-detected roles without wiping manually-added roles.
@@ -257,9 +289,7 @@ def assign_marketing_roles_to_job(job, *, raw_job=None, role_slugs: Iterable[str
                 primary_domain="",
             )
 
-    auto_slugs = [slug for slug in _dedupe_preserve_order(role_slugs or []) if slug in role_map]
-    if not auto_slugs:
-        auto_slugs = [slug for slug in _fallback_slugs_for_top_category("OTHER") if slug in role_map]
+    auto_slugs = _active_slugs(role_slugs, role_map)
 
     current_auto = set(getattr(job, "auto_marketing_role_slugs", []) or [])
     current_slugs = set(job.marketing_roles.values_list("slug", flat=True))
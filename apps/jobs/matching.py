@@ -1,50 +1,232 @@
 """
-Semantic job–consultant matching using OpenAI embeddings + cosine similarity.
+Semantic job–consultant matching using embeddings + cosine similarity.
+
+Embeddings come from a pluggable provider (get_embedding_provider): OpenAI
+text-embedding-3-small by default, or a local SentenceTransformer on CPU
+(MATCHING_EMBEDDING_BACKEND=local, needs requirements-ml.txt). Each stored
+vector records its provider in `model`; matching only compares vectors from
+the active provider.
+
+Vectors are stored packed/normalised and ranked through the in-memory
+consultant index in jobs.vector_index. Embedding requests are batched
+(EMBED_BATCH_SIZE inputs per call, EMBED_MAX_CONCURRENCY calls in flight) and
+texts whose content hash is unchanged since the last run are skipped.
+Only the best MATCHING_STORED_SCORES consultants per job are kept as
+MatchScore rows, and recomputation rewrites just the rows that changed.
 
 Usage:
   from jobs.matching import embed_job, embed_consultant, compute_matches_for_job
+  from jobs.matching import embed_jobs, embed_consultants   # bulk
+  from jobs.matching import compute_matches_for_jobs        # bulk, one transaction
 """
+import hashlib
 import logging
-import math
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional
 
 from django.conf import settings
 
+from . import jd_store
+from .classifier.department import load_embedding_model
+from .vector_index import consultant_index, pack_vector, unpack_vector
+
 logger = logging.getLogger(__name__)
 
 
-def _openai_embed(text: str) -> Optional[List[float]]:
-    """Return embedding vector via OpenAI text-embedding-3-small, or None on failure."""
+EMBED_MODEL = "text-embedding-3-small"
+EMBED_BATCH_SIZE = 256          # inputs per embeddings.create call (API cap is 2048)
+EMBED_MAX_CONCURRENCY = 4
+EMBED_MAX_CHARS = 8000
+LOCAL_EMBED_BATCH_SIZE = 64
+MATCH_SCORE_EPSILON = 1e-4      # score drift below this does not rewrite a MatchScore row
+
+
+def _openai_api_key() -> Optional[str]:
+    from core.models import LLMConfig
+    from core.security import decrypt_value
+
+    cfg = LLMConfig.load()
+    raw_key = decrypt_value(cfg.encrypted_api_key) if getattr(cfg, 'encrypted_api_key', None) else None
+    return raw_key or getattr(settings, 'OPENAI_API_KEY', None)
+
+
+def _openai_embed_many(texts: List[str]) -> List[Optional[List[float]]]:
+    """
+    Embed many texts via OpenAI, EMBED_BATCH_SIZE per request with up to
+    EMBED_MAX_CONCURRENCY requests in flight. Failed batches yield None slots.
+    """
+    if not texts:
+        return []
     try:
         import openai
-        from core.models import LLMConfig
-        from core.security import decrypt_value
 
-        cfg = LLMConfig.load()
-        raw_key = decrypt_value(cfg.encrypted_api_key) if getattr(cfg, 'encrypted_api_key', None) else None
-        api_key = raw_key or getattr(settings, 'OPENAI_API_KEY', None)
+        api_key = _openai_api_key()
         if not api_key:
             logger.warning("No OpenAI API key available for embeddings")
-            return None
-
+            return [None] * len(texts)
         client = openai.OpenAI(api_key=api_key)
-        response = client.embeddings.create(
-            model="text-embedding-3-small",
-            input=text[:8000],
-        )
-        return response.data[0].embedding
     except Exception:
-        logger.exception("Embedding generation failed")
-        return None
+        logger.exception("Embedding client setup failed")
+        return [None] * len(texts)
+
+    def _call(batch: List[str]) -> List[Optional[List[float]]]:
+        try:
+            response = client.embeddings.create(
+                model=EMBED_MODEL,
+                input=[t[:EMBED_MAX_CHARS] or " " for t in batch],
+            )
+            by_index = {d.index: d.embedding for d in response.data}
+            return [by_index.get(i) for i in range(len(batch))]
+        except Exception:
+            logger.exception("Embedding generation failed for a batch of %d", len(batch))
+            return [None] * len(batch)
+
+    batches = [texts[i:i + EMBED_BATCH_SIZE] for i in range(0, len(texts), EMBED_BATCH_SIZE)]
+    if len(batches) == 1:
+        return _call(batches[0])
+    with ThreadPoolExecutor(max_workers=min(EMBED_MAX_CONCURRENCY, len(batches))) as pool:
+        return [vec for batch_result in pool.map(_call, batches) for vec in batch_result]
+
+
+def _openai_embed(text: str) -> Optional[List[float]]:
+    """Return embedding vector via OpenAI text-embedding-3-small, or None on failure."""
+    return _openai_embed_many([text])[0]
 
 
-def _cosine_similarity(a: List[float], b: List[float]) -> float:
-    dot = sum(x * y for x, y in zip(a, b))
-    norm_a = math.sqrt(sum(x * x for x in a))
-    norm_b = math.sqrt(sum(x * x for x in b))
-    if norm_a == 0 or norm_b == 0:
-        return 0.0
-    return dot / (norm_a * norm_b)
+class EmbeddingProvider(ABC):
+    """Turns texts into vectors. `name` is stored in the embedding rows' `model` field."""
+
+    name = ""
+
+    @abstractmethod
+    def embed_many(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """One vector per text, in order; None where a text could not be embedded."""
+
+
+class OpenAIEmbeddingProvider(EmbeddingProvider):
+    name = EMBED_MODEL
+
+    def embed_many(self, texts: List[str]) -> List[Optional[List[float]]]:
+        return _openai_embed_many(texts)
+
+
+class LocalEmbeddingProvider(EmbeddingProvider):
+    """Local CPU model (default BAAI/bge-small-en-v1.5, 384 dims) — no network calls."""
+
+    def __init__(self, model_name: str, quantize: bool = False):
+        self.model_name = model_name
+        self.quantize = quantize
+        self.name = f"local:{model_name}" + (":int8" if quantize else "")
+
+    def embed_many(self, texts: List[str]) -> List[Optional[List[float]]]:
+        if not texts:
+            return []
+        model = load_embedding_model(self.model_name, self.quantize)
+        if model is None:
+            return [None] * len(texts)
+        try:
+            vectors = model.encode(
+                [t[:EMBED_MAX_CHARS] for t in texts],
+                batch_size=LOCAL_EMBED_BATCH_SIZE,
+                normalize_embeddings=True,
+                show_progress_bar=False,
+            )
+        except Exception:
+            logger.exception("Local embedding failed for %d texts", len(texts))
+            return [None] * len(texts)
+        return [[float(x) for x in vec] for vec in vectors]
+
+
+def get_embedding_provider(backend: Optional[str] = None) -> EmbeddingProvider:
+    """Provider for `backend` ('openai' | 'local'), defaulting to settings.MATCHING_EMBEDDING_BACKEND."""
+    backend = (backend or getattr(settings, 'MATCHING_EMBEDDING_BACKEND', 'openai') or 'openai').lower()
+    if backend == 'local':
+        return LocalEmbeddingProvider(
+            getattr(settings, 'MATCHING_LOCAL_EMBED_MODEL', 'BAAI/bge-small-en-v1.5'),
+            quantize=bool(getattr(settings, 'MATCHING_LOCAL_EMBED_INT8', False)),
+        )
+    return OpenAIEmbeddingProvider()
+
+
+def _content_hash(text: str, model_name: str = EMBED_MODEL) -> str:
+    return hashlib.sha256(f"{model_name}\n{text}".encode("utf-8")).hexdigest()
+
+
+def _embed_and_store(
+    model_cls,
+    owner_field: str,
+    owners: list,
+    build_text,
+    *,
+    force: bool = False,
+    provider: Optional[EmbeddingProvider] = None,
+) -> dict:
+    """
+    Shared bulk path for embed_jobs / embed_consultants.
+
+    Texts whose hash (provider name + text) matches the stored content_hash are
+    skipped; the rest are embedded in batches and upserted with one
+    bulk_create(update_conflicts=True).
+    """
+    stats = {"embedded": 0, "unchanged": 0, "failed": 0}
+    if not owners:
+        return stats
+    provider = provider or get_embedding_provider()
+    texts = {o.pk: build_text(o) for o in owners}
+    hashes = {pk: _content_hash(t, provider.name) for pk, t in texts.items()}
+    existing = dict(
+        model_cls.objects.filter(**{f"{owner_field}_id__in": list(texts)})
+        .exclude(vector_f32=None)
+        .values_list(f"{owner_field}_id", "content_hash")
+    )
+    todo = [pk for pk in texts if force or existing.get(pk) != hashes[pk]]
+    stats["unchanged"] = len(texts) - len(todo)
+
+    vectors = provider.embed_many([texts[pk] for pk in todo])
+    rows = []
+    for pk, vector in zip(todo, vectors):
+        if vector is None:
+            stats["failed"] += 1
+            continue
+        rows.append(model_cls(**{
+            f"{owner_field}_id": pk,
+            "vector": None,
+            "vector_f32": pack_vector(vector),
+            "dims": len(vector),
+            "model": provider.name,
+            "content_hash": hashes[pk],
+        }))
+    if rows:
+        model_cls.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=[owner_field],
+            update_fields=["vector", "vector_f32", "dims", "model", "content_hash", "updated_at"],
+        )
+    stats["embedded"] = len(rows)
+    return stats
+
+
+def embed_jobs(jobs, *, force: bool = False, provider: Optional[EmbeddingProvider] = None) -> dict:
+    """Embed many jobs in batches. Returns {"embedded", "unchanged", "failed"}."""
+    from jobs.models import JobEmbedding
+
+    return _embed_and_store(JobEmbedding, "job", list(jobs), _build_job_text, force=force, provider=provider)
+
+
+def embed_consultants(consultants, *, force: bool = False, provider: Optional[EmbeddingProvider] = None) -> dict:
+    """
+    Embed many consultant profiles in batches. Returns {"embedded", "unchanged", "failed"}.
+
+    Prefetch marketing_roles and experience on the queryset to keep text building query-free.
+    """
+    from users.models import ConsultantEmbedding
+
+    return _embed_and_store(
+        ConsultantEmbedding, "consultant", list(consultants), _build_consultant_text,
+        force=force, provider=provider,
+    )
 
 
 def _build_job_text(job) -> str:
@@ -55,10 +237,9 @@ def _build_job_text(job) -> str:
         parts.append(f"Location: {job.location}")
     if job.description:
         parts.append(job.description[:3000])
-    if job.parsed_jd:
-        skills = job.parsed_jd.get('skills') or []
-        if skills:
-            parts.append("Required skills: " + ", ".join(skills[:30]))
+    skills = jd_store.required_skills(job)
+    if skills:
+        parts.append("Required skills: " + ", ".join(str(s) for s in skills[:30]))
     return "\n".join(parts)
 
 
@@ -71,7 +252,7 @@ def _build_consultant_text(consultant) -> str:
     if consultant.skills:
         skills = consultant.skills if isinstance(consultant.skills, list) else []
         parts.append("Skills: " + ", ".join(str(s) for s in skills[:40]))
-    roles = list(consultant.marketing_roles.values_list('name', flat=True))
+    roles = [role.name for role in consultant.marketing_roles.all()]
     if roles:
         parts.append("Marketing roles: " + ", ".join(roles))
     for exp in consultant.experience.all()[:5]:
@@ -82,75 +263,124 @@ def _build_consultant_text(consultant) -> str:
 
 
 def embed_job(job) -> bool:
-    """Generate and store embedding for a job. Returns True on success."""
-    from jobs.models import JobEmbedding
-    text = _build_job_text(job)
-    vector = _openai_embed(text)
-    if vector is None:
-        return False
-    JobEmbedding.objects.update_or_create(
-        job=job,
-        defaults={"vector": vector, "model": "text-embedding-3-small"},
-    )
-    return True
+    """Generate and store embedding for a job (skipped when unchanged). Returns True on success."""
+    return embed_jobs([job])["failed"] == 0
 
 
 def embed_consultant(consultant) -> bool:
     """Generate and store embedding for a consultant profile. Returns True on success."""
-    from users.models import ConsultantEmbedding
-    text = _build_consultant_text(consultant)
-    vector = _openai_embed(text)
-    if vector is None:
-        return False
-    ConsultantEmbedding.objects.update_or_create(
-        consultant=consultant,
-        defaults={"vector": vector, "model": "text-embedding-3-small"},
-    )
-    return True
+    return embed_consultants([consultant])["failed"] == 0
 
 
-def compute_matches_for_job(job, top_n: int = 20) -> List[dict]:
+def _store_match_scores(ranked_by_job: dict, keep: int) -> dict:
     """
-    Compute cosine similarity between job and all consultants that have embeddings.
-    Persists MatchScore rows and returns top_n ranked results.
+    Persist the top `keep` (consultant_id, score) pairs per job as a diff.
 
-    Returns list of dicts: {consultant, score, score_pct, rank}
+    Rows whose rank and score (within MATCH_SCORE_EPSILON) are unchanged are
+    left alone, changed/new rows are upserted in place, and rows that fell out
+    of the top `keep` are deleted. Everything runs in one transaction.
+    Returns {"written", "deleted", "unchanged"}.
     """
-    from jobs.models import JobEmbedding, MatchScore
-    from users.models import ConsultantEmbedding
+    from django.db import transaction
 
-    try:
-        job_emb = JobEmbedding.objects.get(job=job)
-    except JobEmbedding.DoesNotExist:
-        if not embed_job(job):
-            return []
-        try:
-            job_emb = JobEmbedding.objects.get(job=job)
-        except JobEmbedding.DoesNotExist:
-            return []
+    from jobs.models import MatchScore
+
+    stats = {"written": 0, "deleted": 0, "unchanged": 0}
+    if not ranked_by_job:
+        return stats
+    existing: dict = {}
+    for pk, job_id, consultant_id, score, rank in MatchScore.objects.filter(
+        job_id__in=list(ranked_by_job)
+    ).values_list("pk", "job_id", "consultant_id", "score", "rank"):
+        existing[(job_id, consultant_id)] = (pk, score, rank)
+
+    upserts = []
+    wanted = set()
+    for job_id, ranked in ranked_by_job.items():
+        for rank, (consultant_id, sim) in enumerate(ranked[:keep], start=1):
+            wanted.add((job_id, consultant_id))
+            row = existing.get((job_id, consultant_id))
+            if row is not None and row[2] == rank and abs(row[1] - sim) <= MATCH_SCORE_EPSILON:
+                stats["unchanged"] += 1
+                continue
+            upserts.append(MatchScore(job_id=job_id, consultant_id=consultant_id, score=sim, rank=rank))
+    stale = [row[0] for key, row in existing.items() if key not in wanted]
+
+    with transaction.atomic():
+        if stale:
+            MatchScore.objects.filter(pk__in=stale).delete()
+        if upserts:
+            MatchScore.objects.bulk_create(
+                upserts,
+                batch_size=1000,
+                update_conflicts=True,
+                unique_fields=["job", "consultant"],
+                update_fields=["score", "rank", "computed_at"],
+            )
+    stats["written"] = len(upserts)
+    stats["deleted"] = len(stale)
+    return stats
+
+
+def compute_matches_for_jobs(jobs, top_n: int = 20, provider: Optional[EmbeddingProvider] = None) -> dict:
+    """
+    Rank consultants for many jobs at once and persist the MatchScore diffs in
+    one transaction (see _store_match_scores; MATCHING_STORED_SCORES rows per job).
 
-    job_vec = job_emb.vector
-    consultant_embs = ConsultantEmbedding.objects.select_related('consultant__user').all()
+    Returns {job_id: [{consultant, score, score_pct, rank}, ...top_n]}; jobs
+    that could not be embedded map to [].
+    """
+    from jobs.models import JobEmbedding
+    from users.models import ConsultantProfile
+
+    jobs = list(jobs)
+    if not jobs:
+        return {}
+    provider = provider or get_embedding_provider()
+
+    def _vectors():
+        return dict(
+            JobEmbedding.objects.filter(job__in=jobs, model=provider.name)
+            .exclude(vector_f32=None)
+            .values_list("job_id", "vector_f32")
+        )
+
+    vectors = _vectors()
+    missing = [job for job in jobs if job.pk not in vectors]
+    if missing:
+        embed_jobs(missing, provider=provider)
+        vectors = _vectors()
 
-    scores = []
-    for emb in consultant_embs:
-        sim = _cosine_similarity(job_vec, emb.vector)
-        scores.append((emb.consultant, sim))
+    keep = max(top_n, getattr(settings, "MATCHING_STORED_SCORES", 100))
+    # One matrix-vector product per job over every consultant vector of this provider (see jobs.vector_index)
+    index = consultant_index(provider.name)
+    ranked_by_job = {
+        job_id: index.search(unpack_vector(data), k=keep)
+        for job_id, data in vectors.items()
+    }
+    _store_match_scores(ranked_by_job, keep)
 
-    scores.sort(key=lambda x: x[1], reverse=True)
+    top_ids = {pk for ranked in ranked_by_job.values() for pk, _ in ranked[:top_n]}
+    consultants = ConsultantProfile.objects.select_related('user').in_bulk(top_ids)
+    results = {}
+    for job in jobs:
+        top = ranked_by_job.get(job.pk, [])[:top_n]
+        results[job.pk] = [
+            {"consultant": consultants[pk], "score": s, "score_pct": int(s * 100), "rank": i}
+            for i, (pk, s) in enumerate(top, start=1)
+            if pk in consultants
+        ]
+    return results
 
-    # Persist scores
-    MatchScore.objects.filter(job=job).delete()
-    bulk = []
-    for rank, (consultant, sim) in enumerate(scores, start=1):
-        bulk.append(MatchScore(job=job, consultant=consultant, score=sim, rank=rank))
-    if bulk:
-        MatchScore.objects.bulk_create(bulk, ignore_conflicts=True)
 
-    return [
-        {"consultant": c, "score": s, "score_pct": int(s * 100), "rank": i}
-        for i, (c, s) in enumerate(scores[:top_n], start=1)
-    ]
+def compute_matches_for_job(job, top_n: int = 20, provider: Optional[EmbeddingProvider] = None) -> List[dict]:
+    """
+    Compute cosine similarity between job and all consultants that have embeddings.
+    Persists the top MatchScore rows and returns top_n ranked results.
+
+    Returns list of dicts: {consultant, score, score_pct, rank}
+    """
+    return compute_matches_for_jobs([job], top_n=top_n, provider=provider).get(job.pk, [])
 
 
 def notify_top_matches_for_job(job, top_n: int = 5):
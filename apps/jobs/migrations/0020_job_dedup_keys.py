@@ -0,0 +1,64 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:23
+
+from django.db import migrations, models
+
+
+def backfill_norm_columns(apps, schema_editor):
+    # Same normalisation as jobs.dedup.normalize_dedup_text (lower + collapse whitespace).
+    # Description sketches are filled by `manage.py backfill_job_dedup_keys`.
+    schema_editor.execute(
+        "UPDATE jobs_job SET "
+        "title_norm = left(lower(regexp_replace(trim(title), '\\s+', ' ', 'g')), 200), "
+        "company_norm = left(lower(regexp_replace(trim(company), '\\s+', ' ', 'g')), 200)"
+    )
+
+
+def create_trigram_indexes(apps, schema_editor):
+    """GIN trigram indexes when pg_trgm can be installed; otherwise the b-tree/contains fallback is used."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        if cursor.fetchone() is None:
+            return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS jobs_job_company_norm_trgm ON jobs_job USING gin (company_norm gin_trgm_ops)"
+    )
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS jobs_job_title_norm_trgm ON jobs_job USING gin (title_norm gin_trgm_ops)"
+    )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS jobs_job_company_norm_trgm")
+    schema_editor.execute("DROP INDEX IF EXISTS jobs_job_title_norm_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0019_job_auto_marketing_role_slugs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='company_norm',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=200),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='description_sketch',
+            field=models.BinaryField(blank=True, help_text='Packed MinHash of description tokens', null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='title_norm',
+            field=models.CharField(blank=True, default='', editable=False, max_length=200),
+        ),
+        migrations.RunPython(backfill_norm_columns, migrations.RunPython.noop),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:33
+
+import math
+import sys
+from array import array
+
+from django.db import migrations, models
+
+
+def pack_json_vectors(apps, schema_editor):
+    """Move JSON float lists into vector_f32 (normalised little-endian float32, see jobs.vector_index)."""
+    Embedding = apps.get_model("jobs", "JobEmbedding")
+    batch = []
+    for emb in Embedding.objects.filter(vector_f32__isnull=True).exclude(vector=None).iterator(chunk_size=500):
+        vec = array("f", emb.vector or [])
+        if not vec:
+            continue
+        norm = math.sqrt(sum(x * x for x in vec))
+        if norm:
+            vec = array("f", (x / norm for x in vec))
+        if sys.byteorder != "little":
+            vec.byteswap()
+        emb.vector_f32 = vec.tobytes()
+        emb.dims = len(vec)
+        emb.vector = None
+        batch.append(emb)
+        if len(batch) >= 500:
+            Embedding.objects.bulk_update(batch, ["vector_f32", "dims", "vector"])
+            batch = []
+    if batch:
+        Embedding.objects.bulk_update(batch, ["vector_f32", "dims", "vector"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0020_job_dedup_keys'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobembedding',
+            name='dims',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='jobembedding',
+            name='vector_f32',
+            field=models.BinaryField(help_text='L2-normalised float32 vector (jobs.vector_index)', null=True),
+        ),
+        migrations.AlterField(
+            model_name='jobembedding',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='jobembedding',
+            name='vector',
+            field=models.JSONField(blank=True, help_text='Legacy float list (superseded by vector_f32)', null=True),
+        ),
+        migrations.RunPython(pack_json_vectors, migrations.RunPython.noop),
+    ]
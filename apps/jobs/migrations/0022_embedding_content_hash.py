@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0021_embedding_vector_f32'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobembedding',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', help_text='sha256 of model + embedded text', max_length=64),
+        ),
+    ]
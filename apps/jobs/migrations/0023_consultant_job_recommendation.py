@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0022_embedding_content_hash'),
+        ('users', '0030_embedding_content_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConsultantJobRecommendation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.PositiveIntegerField(default=0, help_text='Heuristic skill/role score')),
+                ('rank', models.PositiveSmallIntegerField(default=0, help_text='1 = best for this consultant')),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+                ('consultant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_recommendations', to='users.consultantprofile')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='consultant_recommendations', to='jobs.job')),
+            ],
+            options={
+                'verbose_name': 'Consultant Job Recommendation',
+                'ordering': ['consultant', 'rank'],
+                'indexes': [models.Index(fields=['consultant', 'rank'], name='jobs_rec_consultant_rank')],
+                'unique_together': {('consultant', 'job')},
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:02
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def stamp_existing_parses(apps, schema_editor):
+    """Existing successful parses are treated as built from the current description (PARSER_VERSION 1)."""
+    Job = apps.get_model('jobs', 'Job')
+    batch = []
+    qs = Job.objects.filter(parsed_jd_status__in=['OK', 'OK_RULES']).only('id', 'description')
+    for job in qs.iterator(chunk_size=2000):
+        job.parsed_jd_hash = hashlib.sha256(f"v1\n{(job.description or '').strip()}".encode('utf-8')).hexdigest()
+        batch.append(job)
+        if len(batch) >= 2000:
+            Job.objects.bulk_update(batch, ['parsed_jd_hash'])
+            batch = []
+    if batch:
+        Job.objects.bulk_update(batch, ['parsed_jd_hash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0023_consultant_job_recommendation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='parsed_jd_hash',
+            field=models.CharField(blank=True, help_text='Content hash (jobs.jd_store) of the description parsed_jd was built from.', max_length=64),
+        ),
+        migrations.RunPython(stamp_existing_parses, migrations.RunPython.noop),
+    ]
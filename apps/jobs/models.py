@@ -184,6 +184,10 @@ class Job(models.Model):
     parsed_jd_status = models.CharField(max_length=20, blank=True)
     parsed_jd_error = models.TextField(blank=True)
     parsed_jd_updated_at = models.DateTimeField(null=True, blank=True)
+    parsed_jd_hash = models.CharField(
+        max_length=64, blank=True,
+        help_text="Content hash (jobs.jd_store) of the description parsed_jd was built from.",
+    )
     
     # Phase 5: Job source tracking
     job_source = models.CharField(
@@ -235,13 +239,41 @@ class Job(models.Model):
     classified_at          = models.DateTimeField(null=True, blank=True, db_index=True)
     needs_reclassification = models.BooleanField(default=False, db_index=True)
 
+    # ── Duplicate-check keys (maintained in save(); see jobs.dedup) ──────────
+    title_norm         = models.CharField(max_length=200, blank=True, default="", editable=False)
+    company_norm       = models.CharField(max_length=200, blank=True, default="", db_index=True, editable=False)
+    description_sketch = models.BinaryField(null=True, blank=True, editable=False,
+                           help_text="Packed MinHash of description tokens")
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
-    def save(self, *args, **kwargs):
-        # Auto-sync legacy company name from company_obj FK
+    _DEDUP_SOURCE_FIELDS = {"title", "company", "company_obj", "description"}
+    _DEDUP_KEY_FIELDS = ["title_norm", "company_norm", "description_sketch"]
+
+    def sync_company_name(self):
+        """Legacy company name follows the company_obj FK."""
         if self.company_obj_id and self.company_obj:
             self.company = self.company_obj.name
+
+    def refresh_dedup_keys(self):
+        """Recompute the duplicate-check keys (bulk_create callers must call this; save() does)."""
+        from .dedup import description_sketch, normalize_dedup_text
+
+        self.title_norm = normalize_dedup_text(self.title)[:200]
+        self.company_norm = normalize_dedup_text(self.company)[:200]
+        self.description_sketch = description_sketch(self.description)
+
+    def save(self, *args, **kwargs):
+        self.sync_company_name()
+        # Refresh duplicate-check keys whenever their source fields are written
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or self._DEDUP_SOURCE_FIELDS & set(update_fields):
+            self.refresh_dedup_keys()
+            if update_fields is not None:
+                kwargs["update_fields"] = list(update_fields) + [
+                    f for f in self._DEDUP_KEY_FIELDS if f not in update_fields
+                ]
         # Flag stale classification when title or location changes
         if self.pk:
             changed = Job.objects.filter(pk=self.pk).values("title", "location").first()
@@ -274,10 +306,13 @@ class JobTemplate(models.Model):
 class JobEmbedding(models.Model):
     """Stores the OpenAI embedding vector for a job (for semantic matching)."""
     job = models.OneToOneField(Job, on_delete=models.CASCADE, related_name='embedding')
-    vector = models.JSONField(help_text="Embedding float list from text-embedding-3-small")
+    vector = models.JSONField(null=True, blank=True, help_text="Legacy float list (superseded by vector_f32)")
+    vector_f32 = models.BinaryField(null=True, editable=False, help_text="L2-normalised float32 vector (jobs.vector_index)")
+    dims = models.PositiveSmallIntegerField(default=0)
     model = models.CharField(max_length=80, default='text-embedding-3-small')
+    content_hash = models.CharField(max_length=64, blank=True, default='', help_text="sha256 of model + embedded text")
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         verbose_name = "Job Embedding"
@@ -309,6 +344,26 @@ class MatchScore(models.Model):
         return int(self.score * 100)
 
 
+class ConsultantJobRecommendation(models.Model):
+    """Materialised top-N OPEN jobs for a consultant (maintained by jobs.recommendations)."""
+    consultant = models.ForeignKey(
+        'users.ConsultantProfile', on_delete=models.CASCADE, related_name='job_recommendations'
+    )
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='consultant_recommendations')
+    score = models.PositiveIntegerField(default=0, help_text="Heuristic skill/role score")
+    rank = models.PositiveSmallIntegerField(default=0, help_text="1 = best for this consultant")
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('consultant', 'job')
+        ordering = ['consultant', 'rank']
+        indexes = [models.Index(fields=['consultant', 'rank'], name='jobs_rec_consultant_rank')]
+        verbose_name = "Consultant Job Recommendation"
+
+    def __str__(self):
+        return f"Consultant {self.consultant_id} → Job {self.job_id} (#{self.rank})"
+
+
 class PipelineEvent(models.Model):
     """Single source of truth for job lifecycle transitions.
 
@@ -358,7 +413,10 @@ class PipelineEvent(models.Model):
     def record(cls, *, job=None, url_hash='', from_stage='', to_stage='',
                task_name='', celery_id='', status='SUCCESS', error='',
                duration_ms=None, meta=None):
-        return cls.objects.create(
+        """Insert one event, or buffer it inside jobs.event_buffer.deferred_pipeline_events()."""
+        from .event_buffer import current_buffer
+
+        event = cls(
             job=job,
             url_hash=url_hash or (getattr(job, 'url_hash', '') if job else ''),
             from_stage=from_stage,
@@ -370,3 +428,8 @@ class PipelineEvent(models.Model):
             duration_ms=duration_ms,
             meta=meta or {},
         )
+        buffer = current_buffer()
+        if buffer is not None:
+            return buffer.add(event)
+        event.save(force_insert=True)
+        return event
@@ -0,0 +1,489 @@
+"""
+Materialised "recommended jobs" per consultant.
+
+match_jobs_for_consultant used to walk every OPEN job per request, with two
+marketing-role queries per job inside the scorer. Instead, OpenJobIndex loads
+all OPEN jobs once (three queries) into sparse postings — normalised required
+skill → job ids, marketing role → job ids — plus the facts the preference
+filter needs, and refresh_recommendations() scores any number of consultants
+against it and stores their top RECOMMENDATIONS_PER_CONSULTANT rows in
+ConsultantJobRecommendation. Dashboards read that table with one indexed query.
+
+Scoring and filtering mirror services._score_job_for_consultant and
+services._job_matches_consultant_preferences exactly.
+
+Upkeep (jobs.signals):
+  - a job leaving OPEN drops its rows immediately;
+  - a job entering OPEN (or changing roles) schedules one debounced full refresh;
+  - a consultant profile / role change refreshes that consultant against the
+    process-wide OpenJobIndex (get_open_job_index), which is only rebuilt when
+    the open jobs changed or its TTL lapsed.
+A periodic refresh backstops edits that bypass signals (parsed_jd re-parses,
+queryset .update()). Jobs another consultant has claimed since the rows were
+stored are filtered out when they are read.
+
+The debounce flag, the per-consultant "fresh" flags and the index generations
+are cross-process state, so they live in the broker Redis (core.shared_state).
+
+The reverse direction — ranking consultants for one job on the job detail
+page — uses ConsultantSkillIndex: normalised skill / role / country /
+seniority → consultant id postings over every ACTIVE consultant, so a job's
+required skills score everyone with a few set unions and counters instead of
+a consultant_job_match_detail() call (and its queries) per consultant.
+"""
+from __future__ import annotations
+
+import heapq
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Iterable
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+
+from core.shared_state import add_flag, delete_flag, get_generation, has_flag, incr_generation, set_flags
+
+from .models import ConsultantJobRecommendation, Job
+
+logger = logging.getLogger(__name__)
+
+RECOMMENDATIONS_PER_CONSULTANT = 25
+REFRESH_DEBOUNCE_SECONDS = 60
+_REFRESH_PENDING_KEY = "jobs:recommendations:refresh-pending"
+_FRESH_KEY = "jobs:recommendations:fresh:{pk}"
+OPEN_JOB_INDEX_TTL_SECONDS = 300
+OPEN_JOB_INDEX_GENERATION_KEY = "jobs:open-job-index:generation"
+SKILL_INDEX_TTL_SECONDS = 300
+SKILL_INDEX_GENERATION_KEY = "jobs:consultant-skill-index:generation"
+
+
+class OpenJobIndex:
+    """Sparse, in-memory view of every OPEN job for bulk consultant scoring."""
+
+    def __init__(self, generation: int = 0):
+        from submissions.models import ApplicationSubmission
+
+        from .services import _ACTIVE_SUBMISSION_STATUSES, _job_country, _job_seniority_bucket, _normalize_list
+
+        self.generation = generation
+        self.built_at = time.monotonic()
+        self.job_ids: list[int] = []
+        self.required: dict[int, set[str]] = {}
+        self.roles: dict[int, set[int]] = defaultdict(set)
+        self.country: dict[int, str] = {}
+        self.seniority: dict[int, str] = {}
+        self.claimed_by: dict[int, set[int]] = defaultdict(set)
+        self.skill_postings: dict[str, set[int]] = defaultdict(set)
+        self.role_postings: dict[int, set[int]] = defaultdict(set)
+        self._descriptions: dict[int, str] | None = None
+
+        open_jobs = Job.objects.filter(status=Job.Status.OPEN).order_by("-created_at")
+        for job in open_jobs.only("id", "title", "country", "location", "parsed_jd"):
+            self.job_ids.append(job.pk)
+            required = set(_normalize_list((job.parsed_jd or {}).get("required_skills") or []))
+            self.required[job.pk] = required
+            for skill in required:
+                self.skill_postings[skill].add(job.pk)
+            self.country[job.pk] = (_job_country(job) or "").strip().lower()
+            self.seniority[job.pk] = _job_seniority_bucket(job)
+
+        through = Job.marketing_roles.through
+        for job_id, role_id in through.objects.filter(job__status=Job.Status.OPEN).values_list(
+            "job_id", "marketingrole_id"
+        ):
+            self.roles[job_id].add(role_id)
+            self.role_postings[role_id].add(job_id)
+
+        for job_id, consultant_id in ApplicationSubmission.objects.filter(
+            job__status=Job.Status.OPEN,
+            status__in=_ACTIVE_SUBMISSION_STATUSES,
+            is_archived=False,
+        ).values_list("job_id", "consultant_id"):
+            self.claimed_by[job_id].add(consultant_id)
+
+        self._order = {pk: i for i, pk in enumerate(self.job_ids)}
+
+    def expired(self) -> bool:
+        return time.monotonic() - self.built_at > OPEN_JOB_INDEX_TTL_SECONDS
+
+    def descriptions(self) -> dict[int, str]:
+        """Lower-cased descriptions, loaded on first use (only the no-overlap fallback needs them)."""
+        if self._descriptions is None:
+            self._descriptions = {
+                pk: (desc or "").lower()
+                for pk, desc in Job.objects.filter(pk__in=self.job_ids).values_list("id", "description")
+            }
+        return self._descriptions
+
+    def _allowed(self, job_id: int, consultant, role_ids: set[int]) -> bool:
+        job_roles = self.roles.get(job_id, set())
+        if role_ids and job_roles and not (role_ids & job_roles):
+            return False
+        work_countries = {str(c).strip().lower() for c in (consultant.work_countries or []) if str(c).strip()}
+        if work_countries and self.country[job_id] and self.country[job_id] not in work_countries:
+            return False
+        preferred = {
+            str(level).strip().lower() for level in (consultant.preferred_seniority_levels or []) if str(level).strip()
+        }
+        if preferred and self.seniority[job_id] not in preferred:
+            return False
+        claimed = self.claimed_by.get(job_id)
+        if claimed and (claimed - {consultant.pk}):
+            return False
+        return True
+
+    def top_jobs(self, consultant, limit: int = RECOMMENDATIONS_PER_CONSULTANT) -> list[tuple[int, int]]:
+        """[(job_id, score)] best-first for one consultant (marketing_roles should be prefetched)."""
+        from .services import _normalize_list
+
+        skills = _normalize_list(consultant.skills)
+        skill_set = set(skills)
+        role_ids = {role.pk for role in consultant.marketing_roles.all()}
+
+        if role_ids:
+            candidates: Iterable[int] = set().union(*(self.role_postings.get(r, ()) for r in role_ids))
+        else:
+            candidates = self.job_ids
+
+        scored: list[tuple[int, int]] = []
+        for job_id in candidates:
+            if not self._allowed(job_id, consultant, role_ids):
+                continue
+            score = 0
+            required = self.required[job_id]
+            if skill_set and required:
+                score += len(skill_set & required) * 5
+            job_roles = self.roles.get(job_id)
+            if role_ids and job_roles:
+                score += len(role_ids & job_roles) * 3
+            if score == 0 and skills:
+                desc = self.descriptions().get(job_id, "")
+                if desc:
+                    score += sum(1 for s in skills[:10] if s and s in desc)
+            if score > 0:
+                scored.append((job_id, score))
+        scored.sort(key=lambda x: (-x[1], self._order[x[0]]))
+        return scored[:limit]
+
+
+_open_job_index: OpenJobIndex | None = None
+_open_job_index_lock = threading.Lock()
+
+
+def get_open_job_index(*, rebuild: bool = False) -> OpenJobIndex:
+    """Process-wide OpenJobIndex, rebuilt when open jobs changed anywhere or the TTL lapsed."""
+    global _open_job_index
+    generation = get_generation(OPEN_JOB_INDEX_GENERATION_KEY)
+    index = _open_job_index
+    if rebuild or index is None or index.generation != generation or index.expired():
+        with _open_job_index_lock:
+            index = _open_job_index
+            if rebuild or index is None or index.generation != generation or index.expired():
+                index = OpenJobIndex(generation)
+                _open_job_index = index
+    return index
+
+
+def note_open_jobs_changed() -> None:
+    """Invalidate every process's OpenJobIndex."""
+    global _open_job_index
+    incr_generation(OPEN_JOB_INDEX_GENERATION_KEY)
+    with _open_job_index_lock:
+        _open_job_index = None
+
+
+def _store(consultant_id: int, ranked: list[tuple[int, int]], existing: dict[int, tuple[int, int]]) -> int:
+    """Diff one consultant's rows against `ranked`; returns rows written or deleted."""
+    wanted = {job_id: (score, rank) for rank, (job_id, score) in enumerate(ranked, start=1)}
+    stale = [job_id for job_id in existing if job_id not in wanted]
+    changed = [
+        ConsultantJobRecommendation(consultant_id=consultant_id, job_id=job_id, score=score, rank=rank)
+        for job_id, (score, rank) in wanted.items()
+        if existing.get(job_id) != (score, rank)
+    ]
+    if stale:
+        ConsultantJobRecommendation.objects.filter(consultant_id=consultant_id, job_id__in=stale).delete()
+    if changed:
+        ConsultantJobRecommendation.objects.bulk_create(
+            changed,
+            update_conflicts=True,
+            unique_fields=["consultant", "job"],
+            update_fields=["score", "rank", "computed_at"],
+        )
+    return len(stale) + len(changed)
+
+
+def refresh_recommendations(consultant_ids: Iterable[int] | None = None, *, index: OpenJobIndex | None = None) -> dict:
+    """
+    Recompute stored recommendations for the given consultants (all when None).
+    A full refresh rebuilds the open-job index; a few consultants reuse it.
+
+    Returns {"consultants", "rows_changed"}.
+    """
+    from users.models import ConsultantProfile
+
+    index = index or get_open_job_index(rebuild=consultant_ids is None)
+    qs = ConsultantProfile.objects.prefetch_related("marketing_roles").only(
+        "id", "skills", "work_countries", "preferred_seniority_levels"
+    ).order_by("pk")
+    if consultant_ids is not None:
+        qs = qs.filter(pk__in=list(consultant_ids))
+
+    stats = {"consultants": 0, "rows_changed": 0}
+    chunk: list = []
+
+    def _flush():
+        ids = [c.pk for c in chunk]
+        existing: dict[int, dict[int, tuple[int, int]]] = defaultdict(dict)
+        for cid, job_id, score, rank in ConsultantJobRecommendation.objects.filter(
+            consultant_id__in=ids
+        ).values_list("consultant_id", "job_id", "score", "rank"):
+            existing[cid][job_id] = (score, rank)
+        with transaction.atomic():
+            for consultant in chunk:
+                stats["rows_changed"] += _store(consultant.pk, index.top_jobs(consultant), existing[consultant.pk])
+        set_flags([_FRESH_KEY.format(pk=pk) for pk in ids])
+        stats["consultants"] += len(chunk)
+        chunk.clear()
+
+    for consultant in qs.iterator(chunk_size=500):
+        chunk.append(consultant)
+        if len(chunk) >= 500:
+            _flush()
+    if chunk:
+        _flush()
+    return stats
+
+
+def recommended_jobs(consultant, limit: int = 10) -> list[Job]:
+    """
+    Stored recommendations for a consultant, computing them on first use.
+    Jobs claimed by another consultant after the rows were stored are skipped.
+    """
+    from submissions.models import ApplicationSubmission
+
+    from .services import _ACTIVE_SUBMISSION_STATUSES
+
+    claimed_by_other = ApplicationSubmission.objects.filter(
+        job_id=OuterRef("job_id"), status__in=_ACTIVE_SUBMISSION_STATUSES, is_archived=False,
+    ).exclude(consultant_id=consultant.pk)
+
+    def _read():
+        return [
+            rec.job
+            for rec in ConsultantJobRecommendation.objects.filter(
+                consultant=consultant, job__status=Job.Status.OPEN
+            ).exclude(Exists(claimed_by_other)).select_related("job").order_by("rank")[:limit]
+        ]
+
+    jobs = _read()
+    if not jobs and not has_flag(_FRESH_KEY.format(pk=consultant.pk)):
+        refresh_recommendations([consultant.pk])
+        jobs = _read()
+    return jobs
+
+
+def drop_job(job_id: int) -> None:
+    ConsultantJobRecommendation.objects.filter(job_id=job_id).delete()
+    note_open_jobs_changed()
+
+
+def schedule_full_refresh() -> None:
+    """Queue one refresh for everyone, at most once per REFRESH_DEBOUNCE_SECONDS."""
+    note_open_jobs_changed()
+    if not add_flag(_REFRESH_PENDING_KEY, REFRESH_DEBOUNCE_SECONDS):
+        return
+    from .tasks import refresh_consultant_recommendations_task
+
+    try:
+        refresh_consultant_recommendations_task.apply_async(countdown=REFRESH_DEBOUNCE_SECONDS)
+    except Exception:
+        delete_flag(_REFRESH_PENDING_KEY)
+        logger.exception("Could not queue consultant recommendation refresh")
+
+
+def schedule_consultant_refresh(consultant_id: int) -> None:
+    from .tasks import refresh_consultant_recommendations_task
+
+    delete_flag(_FRESH_KEY.format(pk=consultant_id))
+    try:
+        refresh_consultant_recommendations_task.delay([consultant_id])
+    except Exception:
+        logger.exception("Could not queue recommendation refresh for consultant %s", consultant_id)
+
+
+class ConsultantSkillIndex:
+    """Sparse postings over every ACTIVE consultant for ranking them against one job."""
+
+    def __init__(self, generation: int = 0):
+        from users.models import ConsultantProfile
+
+        from .services import _normalize_list
+
+        self.generation = generation
+        self.built_at = time.monotonic()
+        self.skills: dict[int, list[str]] = {}
+        self.names: dict[int, str] = {}
+        self.has_roles: set[int] = set()
+        self.skill_postings: dict[str, set[int]] = defaultdict(set)
+        self.role_postings: dict[int, set[int]] = defaultdict(set)
+        self.country_postings: dict[str, set[int]] = defaultdict(set)
+        self.seniority_postings: dict[str, set[int]] = defaultdict(set)
+        self.any_country: set[int] = set()
+        self.any_seniority: set[int] = set()
+
+        active = ConsultantProfile.objects.filter(status=ConsultantProfile.Status.ACTIVE)
+        for pk, skills, countries, levels, first, last, username in active.values_list(
+            "id", "skills", "work_countries", "preferred_seniority_levels",
+            "user__first_name", "user__last_name", "user__username",
+        ).iterator(chunk_size=2000):
+            normalized = _normalize_list(skills)
+            self.skills[pk] = normalized
+            self.names[pk] = f"{first} {last}".strip() or username
+            for skill in set(normalized):
+                self.skill_postings[skill].add(pk)
+            countries = {str(c).strip().lower() for c in (countries or []) if str(c).strip()}
+            for country in countries:
+                self.country_postings[country].add(pk)
+            if not countries:
+                self.any_country.add(pk)
+            levels = {str(level).strip().lower() for level in (levels or []) if str(level).strip()}
+            for level in levels:
+                self.seniority_postings[level].add(pk)
+            if not levels:
+                self.any_seniority.add(pk)
+
+        through = ConsultantProfile.marketing_roles.through
+        for consultant_id, role_id in through.objects.filter(
+            consultantprofile__status=ConsultantProfile.Status.ACTIVE
+        ).values_list("consultantprofile_id", "marketingrole_id"):
+            self.role_postings[role_id].add(consultant_id)
+            self.has_roles.add(consultant_id)
+
+    def expired(self) -> bool:
+        return time.monotonic() - self.built_at > SKILL_INDEX_TTL_SECONDS
+
+    def _eligible(self, job: Job, job_roles: set[int], claimed: set[int]) -> set[int]:
+        """Consultants passing services._job_matches_consultant_preferences for this job."""
+        from .services import _job_country, _job_seniority_bucket
+
+        eligible = set(self.skills)
+        if job_roles:
+            eligible -= self.has_roles - set().union(*(self.role_postings.get(r, ()) for r in job_roles))
+        country = (_job_country(job) or "").strip().lower()
+        if country:
+            eligible &= self.any_country | self.country_postings.get(country, set())
+        eligible &= self.any_seniority | self.seniority_postings.get(_job_seniority_bucket(job), set())
+        if len(claimed) > 1:
+            return set()
+        if claimed:
+            eligible &= claimed
+        return eligible
+
+    def rank(self, job: Job, job_roles: set[int], claimed: set[int], limit: int) -> list[dict]:
+        """
+        [{"consultant_id", "match_pct", "raw_score", "matched_required", "total_required"}]
+        best-first, with the same numbers as services.consultant_job_match_detail().
+        """
+        from .services import _normalize_list
+
+        eligible = self._eligible(job, job_roles, claimed)
+        if not eligible:
+            return []
+        required = _normalize_list((job.parsed_jd or {}).get("required_skills") or [])
+        overlap = Counter()
+        for skill in set(required):
+            overlap.update(self.skill_postings.get(skill, ()))
+        role_overlap = Counter()
+        for role_id in job_roles:
+            role_overlap.update(self.role_postings.get(role_id, ()))
+
+        desc = (job.description or "").lower()
+        in_desc: dict[str, bool] = {}
+
+        def _in_desc(skill: str) -> bool:
+            hit = in_desc.get(skill)
+            if hit is None:
+                hit = in_desc[skill] = bool(skill) and skill in desc
+            return hit
+
+        rows = []
+        for pk in eligible:
+            matched = overlap.get(pk, 0) if required else 0
+            raw = matched * 5 + role_overlap.get(pk, 0) * 3
+            skills = self.skills[pk]
+            if raw == 0 and skills and desc:
+                raw = sum(1 for s in skills[:10] if _in_desc(s))
+            if required:
+                pct = min(100, round(100 * matched / len(required)))
+            elif skills and desc:
+                unique = set(skills)
+                hits = sum(1 for s in unique if len(s) >= 2 and _in_desc(s))
+                pct = min(100, round(100 * hits / max(1, len(unique))))
+            else:
+                pct = min(100, raw) if raw else 0
+            rows.append((-pct, -raw, self.names[pk], pk, matched))
+
+        return [
+            {
+                "consultant_id": pk,
+                "match_pct": -neg_pct,
+                "raw_score": -neg_raw,
+                "matched_required": matched,
+                "total_required": len(required),
+            }
+            for neg_pct, neg_raw, _name, pk, matched in heapq.nsmallest(limit, rows)
+        ]
+
+
+_skill_index: ConsultantSkillIndex | None = None
+_skill_index_lock = threading.Lock()
+
+
+def get_consultant_skill_index() -> ConsultantSkillIndex:
+    """Process-wide index, rebuilt when consultants changed anywhere or the TTL lapsed."""
+    global _skill_index
+    generation = get_generation(SKILL_INDEX_GENERATION_KEY)
+    index = _skill_index
+    if index is None or index.generation != generation or index.expired():
+        with _skill_index_lock:
+            index = _skill_index
+            if index is None or index.generation != generation or index.expired():
+                index = ConsultantSkillIndex(generation)
+                _skill_index = index
+    return index
+
+
+def note_consultants_changed() -> None:
+    """Invalidate every process's ConsultantSkillIndex."""
+    global _skill_index
+    incr_generation(SKILL_INDEX_GENERATION_KEY)
+    with _skill_index_lock:
+        _skill_index = None
+
+
+def ranked_consultants(job: Job, limit: int = 25) -> list[dict]:
+    """Backend for services.ranked_consultants_for_job (rows carry ConsultantProfile objects)."""
+    from submissions.models import ApplicationSubmission
+    from users.models import ConsultantProfile
+
+    from .services import _ACTIVE_SUBMISSION_STATUSES
+
+    job_roles = set(job.marketing_roles.values_list("id", flat=True))
+    claimed = set(
+        ApplicationSubmission.objects.filter(
+            job=job, status__in=_ACTIVE_SUBMISSION_STATUSES, is_archived=False
+        ).values_list("consultant_id", flat=True)
+    )
+    rows = get_consultant_skill_index().rank(job, job_roles, claimed, limit)
+    profiles = ConsultantProfile.objects.select_related("user").prefetch_related("marketing_roles").in_bulk(
+        [row["consultant_id"] for row in rows]
+    )
+    ranked = []
+    for row in rows:
+        consultant = profiles.get(row.pop("consultant_id"))
+        if consultant is not None:
+            ranked.append({"consultant": consultant, **row})
+    return ranked
@@ -5,8 +5,7 @@ import logging
 import re
 from typing import List
 
-from django.utils import timezone
-
+from . import jd_store
 from .models import Job
 from resumes.services import LLMService
 from users.models import ConsultantProfile
@@ -101,6 +100,32 @@ def _job_matches_consultant_preferences(job: Job, consultant: ConsultantProfile)
     return True
 
 
+def _duplicate_candidates(title_n: str, company_n: str, exclude_job_id: int | None):
+    """
+    Candidate Jobs for the duplicate check, best title matches first.
+
+    With pg_trgm: company_norm % company (GIN trigram index) ordered by title
+    trigram similarity. Without it (plain Postgres / SQLite): substring match on
+    the normalised company column.
+    """
+    from .dedup import trigram_search_available
+
+    qs = Job.objects.all()
+    if exclude_job_id:
+        qs = qs.exclude(pk=exclude_job_id)
+    if trigram_search_available():
+        from django.contrib.postgres.search import TrigramSimilarity
+
+        qs = (
+            qs.filter(Q(company_norm__trigram_similar=company_n) | Q(company_norm__contains=company_n))
+            .annotate(_title_sim=TrigramSimilarity("title_norm", title_n))
+            .order_by("-_title_sim", "-created_at")
+        )
+    else:
+        qs = qs.filter(company_norm__contains=company_n)
+    return qs.only("id", "title", "company", "company_norm", "description_sketch", "status", "created_at")
+
+
 def find_potential_duplicate_jobs(
     *,
     title: str,
@@ -112,31 +137,43 @@ def find_potential_duplicate_jobs(
     """
     Rules-based duplicate detection:
     - Strong signal: same company + very similar title
-    - Secondary: description similarity (Jaccard on tokens)
+    - Secondary: description similarity (Jaccard on tokens, estimated from the
+      stored Job.description_sketch so candidate bodies are never re-tokenised)
 
     Returns list of dicts: {job, title_score, desc_score, overall_score}
     """
+    from .dedup import description_sketch, sketch_similarity
+
     title_n = _norm_text(title)
     company_n = _norm_text(company)
-    desc_tokens = _tokenize(description or "")
 
     if not title_n or not company_n:
         return []
 
-    qs = Job.objects.all()
-    if exclude_job_id:
-        qs = qs.exclude(pk=exclude_job_id)
-    # Narrow candidate set cheaply
-    qs = qs.filter(company__icontains=company.strip()).only("id", "title", "company", "description", "status", "created_at")
-
+    desc_sketch = description_sketch(description or "")
     title_tokens = _tokenize(title_n)
+    candidates = list(_duplicate_candidates(title_n, company_n, exclude_job_id)[:200])  # safety cap
+    # Legacy rows without a sketch (see backfill_job_dedup_keys): their descriptions in one query.
+    legacy_sketches = {}
+    if desc_sketch is not None:
+        legacy_ids = [j.pk for j in candidates if j.description_sketch is None]
+        if legacy_ids:
+            legacy_sketches = {
+                j.pk: description_sketch(j.description or "")
+                for j in Job.objects.filter(pk__in=legacy_ids).only("id", "description")
+            }
     results = []
-    for j in qs[:200]:  # safety cap
+    for j in candidates:
         jt = _tokenize(j.title)
         title_score = _jaccard(title_tokens, jt)
-        if title_score < 0.55 and company_n != _norm_text(j.company):
+        if title_score < 0.55 and company_n != j.company_norm:
             continue
-        desc_score = _jaccard(desc_tokens, _tokenize(j.description or "")) if desc_tokens else 0.0
+        if desc_sketch is None:
+            desc_score = 0.0
+        elif j.description_sketch is not None:
+            desc_score = sketch_similarity(desc_sketch, j.description_sketch)
+        else:
+            desc_score = sketch_similarity(desc_sketch, legacy_sketches.get(j.pk))
         overall = (title_score * 0.75) + (desc_score * 0.25)
         if overall >= 0.62 or (title_score >= 0.72 and desc_score >= 0.35):
             results.append(
@@ -151,11 +188,14 @@ def find_potential_duplicate_jobs(
     return results[:limit]
 
 
-def rule_parse_jd(description: str) -> dict:
+def rule_parse_jd(description: str, known: list[str] | None = None) -> dict:
     """
     Rules-first JD parsing (no LLM):
     - Extract required_skills by matching against existing consultant skills
     - Lightweight extraction of keywords from common 'Requirements' style sections
+
+    `known` is jd_store.known_skill_vocabulary(); batch callers pass it in so the
+    consultant skills are read once per batch rather than once per job.
     """
     text = (description or "").strip()
     if not text:
@@ -163,28 +203,19 @@ def rule_parse_jd(description: str) -> dict:
 
     low = text.lower()
 
-    # Build known skill universe from stored consultant skills (data-driven, no tokens)
-    known = set()
-    for skills in ConsultantProfile.objects.values_list("skills", flat=True):
-        if not skills:
-            continue
-        try:
-            for s in skills:
-                if isinstance(s, str) and s.strip():
-                    known.add(s.strip().lower())
-        except Exception:
-            continue
+    # Known skill universe from stored consultant skills (data-driven, no tokens)
+    if known is None:
+        from .jd_store import known_skill_vocabulary
+
+        known = known_skill_vocabulary()
 
     required = []
-    if known:
-        # Prefer exact/phrase hits (substring match) for multi-word skills
-        for skill in sorted(known, key=lambda x: (-len(x), x))[:2500]:
-            if len(skill) < 2:
-                continue
-            if skill in low:
-                required.append(skill)
-            if len(required) >= 40:
-                break
+    # Prefer exact/phrase hits (substring match) for multi-word skills
+    for skill in known:
+        if skill in low:
+            required.append(skill)
+        if len(required) >= 40:
+            break
 
     # Fallback: try to capture bullet-ish requirement lines as keywords
     req_section = ""
@@ -210,7 +241,7 @@ class JDParserService:
     @staticmethod
     def parse_job(job: Job, actor=None):
         """
-        Parse JD into structured JSON and persist it on the Job.
+        Parse JD into structured JSON and persist it on the Job (see jobs.jd_store).
         Rules-first (no tokens). Uses LLM only if rules parsing finds nothing AND LLM is configured.
         """
         if not job or not job.description:
@@ -219,30 +250,31 @@ class JDParserService:
         # 1) Rules-first parse
         data = rule_parse_jd(job.description)
         if data and data.get("required_skills"):
-            job.parsed_jd = data
-            job.parsed_jd_status = "OK_RULES"
-            job.parsed_jd_error = ""
-            job.parsed_jd_updated_at = timezone.now()
-            job.save(update_fields=["parsed_jd", "parsed_jd_status", "parsed_jd_error", "parsed_jd_updated_at"])
+            jd_store.store(job, data, "OK_RULES")
             return True, ""
 
         # 2) LLM fallback (only if configured)
+        return JDParserService.parse_with_llm(job, actor=actor)
+
+    @staticmethod
+    def parse_with_llm(job: Job, actor=None):
+        """
+        LLM parse for descriptions the rules found nothing in; persists the result or the error.
+        Config, budget and API errors are stored as transient (retried), unusable output against the hash.
+        """
         llm = LLMService()
         if not llm.client:
-            job.parsed_jd_status = "ERROR"
-            job.parsed_jd_error = "No rules parse result and LLM not configured"
-            job.parsed_jd_updated_at = timezone.now()
-            job.save(update_fields=["parsed_jd_status", "parsed_jd_error", "parsed_jd_updated_at"])
+            jd_store.store_transient_error(job, "No rules parse result and LLM not configured")
             return False, job.parsed_jd_error
 
         system_prompt = JD_PARSER_SYSTEM_PROMPT
         user_prompt = JD_PARSER_USER_PROMPT.replace("{jd_text}", job.description)
         content, _, error = llm.generate_with_prompts(job, None, system_prompt, user_prompt, actor=actor, force_new=True)
-        if error or not content:
-            job.parsed_jd_status = "ERROR"
-            job.parsed_jd_error = error or "Empty parser response"
-            job.parsed_jd_updated_at = timezone.now()
-            job.save(update_fields=["parsed_jd_status", "parsed_jd_error", "parsed_jd_updated_at"])
+        if error:
+            jd_store.store_transient_error(job, error)
+            return False, job.parsed_jd_error
+        if not content:
+            jd_store.store(job, None, "ERROR", "Empty parser response")
             return False, job.parsed_jd_error
 
         try:
@@ -255,37 +287,22 @@ class JDParserService:
                 try:
                     data = json.loads(content[start:end+1])
                 except Exception as exc:
-                    job.parsed_jd_status = "ERROR"
-                    job.parsed_jd_error = f"Parser JSON decode failed: {exc}"
-                    job.parsed_jd_updated_at = timezone.now()
-                    job.save(update_fields=["parsed_jd_status", "parsed_jd_error", "parsed_jd_updated_at"])
+                    jd_store.store(job, None, "ERROR", f"Parser JSON decode failed: {exc}")
                     return False, job.parsed_jd_error
             else:
-                job.parsed_jd_status = "ERROR"
-                job.parsed_jd_error = "Parser returned non-JSON"
-                job.parsed_jd_updated_at = timezone.now()
-                job.save(update_fields=["parsed_jd_status", "parsed_jd_error", "parsed_jd_updated_at"])
+                jd_store.store(job, None, "ERROR", "Parser returned non-JSON")
                 return False, job.parsed_jd_error
 
         if not isinstance(data, dict):
-            job.parsed_jd_status = "ERROR"
-            job.parsed_jd_error = "Parser output is not a JSON object"
-            job.parsed_jd_updated_at = timezone.now()
-            job.save(update_fields=["parsed_jd_status", "parsed_jd_error", "parsed_jd_updated_at"])
+            jd_store.store(job, None, "ERROR", "Parser output is not a JSON object")
             return False, job.parsed_jd_error
 
-        job.parsed_jd = data
-        job.parsed_jd_status = "OK"
-        job.parsed_jd_error = ""
-        job.parsed_jd_updated_at = timezone.now()
-        job.save(update_fields=["parsed_jd", "parsed_jd_status", "parsed_jd_error", "parsed_jd_updated_at"])
+        jd_store.store(job, data, "OK")
         return True, ""
 
 
 def ensure_parsed_jd(job: Job, actor=None):
-    if not job.parsed_jd:
-        return JDParserService.parse_job(job, actor=actor)
-    return True, ""
+    return jd_store.ensure_parsed_jd(job, actor=actor)
 
 
 def _normalize_list(values):
@@ -348,26 +365,14 @@ def consultant_job_match_detail(job: Job, consultant: ConsultantProfile) -> dict
 def ranked_consultants_for_job(job: Job, limit: int = 25) -> List[dict]:
     """
     All active consultants with a match % and raw score, sorted best-first.
+
+    Scored in bulk against the in-memory consultant skill index
+    (jobs.recommendations.ConsultantSkillIndex); numbers match
+    consultant_job_match_detail().
     """
-    qs = ConsultantProfile.objects.filter(status=ConsultantProfile.Status.ACTIVE).prefetch_related(
-        "marketing_roles", "user"
-    )
-    rows = []
-    for consultant in qs:
-        if not _job_matches_consultant_preferences(job, consultant):
-            continue
-        detail = consultant_job_match_detail(job, consultant)
-        rows.append(
-            {
-                "consultant": consultant,
-                "match_pct": detail["match_pct"],
-                "raw_score": detail["raw_score"],
-                "matched_required": detail["matched_required"],
-                "total_required": detail["total_required"],
-            }
-        )
-    rows.sort(key=lambda r: (-r["match_pct"], -r["raw_score"], r["consultant"].user.get_full_name() or r["consultant"].user.username))
-    return rows[:limit]
+    from .recommendations import ranked_consultants
+
+    return ranked_consultants(job, limit=limit)
 
 
 def _score_job_for_consultant(job: Job, consultant: ConsultantProfile) -> int:
@@ -540,20 +545,13 @@ def match_jobs_for_consultant(
 ):
     """
     Return a list of best matching OPEN jobs for a consultant.
+
+    Reads the materialised ConsultantJobRecommendation rows (see
+    jobs.recommendations), computing them on first use.
     """
-    qs = Job.objects.filter(status=Job.Status.OPEN)
-    consultant_role_ids = list(consultant.marketing_roles.values_list("id", flat=True))
-    if consultant_role_ids:
-        qs = qs.filter(marketing_roles__in=consultant_role_ids).distinct()
-    scores = []
-    for job in qs.prefetch_related("marketing_roles"):
-        if not _job_matches_consultant_preferences(job, consultant):
-            continue
-        s = _score_job_for_consultant(job, consultant)
-        if s > 0:
-            scores.append((s, job))
-    scores.sort(key=lambda x: x[0], reverse=True)
-    return [job for _, job in scores[:limit]]
+    from .recommendations import recommended_jobs
+
+    return recommended_jobs(consultant, limit=limit)
 
 
 def match_consultants_for_job(
@@ -3,10 +3,17 @@
 Listens to Job + harvest.RawJob post_save. Records events without changing any
 existing behavior so we can validate the audit trail against live data before
 cutting over the actual tasks to stage-driven flow (Phase 3).
+
+Also keeps the materialised consultant recommendations (jobs.recommendations)
+in step with jobs opening/closing and consultant profile edits.
+
+Bulk operations wrap their loops in jobs.event_buffer.deferred_pipeline_events()
+so these events are written with one bulk_create instead of one INSERT each.
 """
 import logging
 
-from django.db.models.signals import post_save, pre_save
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_save, pre_save
 from django.dispatch import receiver
 
 from harvest.normalizer import compute_url_hash
@@ -31,15 +38,20 @@ def _safe_record(**kwargs):
 
 
 @receiver(pre_save, sender=Job)
-def _job_pre_save_capture_prev_stage(sender, instance: Job, **kwargs):
-    """Stash previous stage on the instance so post_save knows the transition."""
+def _job_pre_save_capture_prev_stage(sender, instance: Job, update_fields=None, **kwargs):
+    """Stash previous stage/status on the instance so post_save knows the transition."""
+    instance._prev_status = None
     if not instance.pk:
         instance._prev_stage = None
         return
-    try:
-        instance._prev_stage = Job.objects.only('stage').get(pk=instance.pk).stage
-    except Job.DoesNotExist:
-        instance._prev_stage = None
+    if update_fields is not None and not {'stage', 'status'} & set(update_fields):
+        # Neither is being written: no transition, no lookup (bulk field updates stay one query per row)
+        instance._prev_stage = instance.stage
+        instance._prev_status = instance.status
+        return
+    prev = Job.objects.filter(pk=instance.pk).values('stage', 'status').first()
+    instance._prev_stage = prev['stage'] if prev else None
+    instance._prev_status = prev['status'] if prev else None
 
 
 @receiver(post_save, sender=Job)
@@ -69,6 +81,55 @@ def _job_post_save_record_event(sender, instance: Job, created: bool, **kwargs):
         )
 
 
+@receiver(post_save, sender=Job)
+def _job_post_save_refresh_recommendations(sender, instance: Job, created: bool, raw: bool = False, **kwargs):
+    if raw:
+        return
+    prev_status = getattr(instance, '_prev_status', None)
+    if not created and prev_status == instance.status:
+        return
+    from .recommendations import drop_job, note_open_jobs_changed, schedule_full_refresh
+
+    if instance.status == Job.Status.OPEN:
+        note_open_jobs_changed()
+        transaction.on_commit(schedule_full_refresh)
+    elif prev_status == Job.Status.OPEN:
+        note_open_jobs_changed()
+        transaction.on_commit(lambda pk=instance.pk: drop_job(pk))
+
+
+@receiver(m2m_changed, sender=Job.marketing_roles.through)
+def _job_roles_changed_refresh_recommendations(sender, instance, action: str, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if isinstance(instance, Job) and instance.status == Job.Status.OPEN:
+        from .recommendations import note_open_jobs_changed, schedule_full_refresh
+
+        note_open_jobs_changed()
+        transaction.on_commit(schedule_full_refresh)
+
+
+@receiver(post_save, sender='users.ConsultantProfile')
+def _consultant_saved_refresh_recommendations(sender, instance, raw: bool = False, **kwargs):
+    if raw:
+        return
+    from .recommendations import note_consultants_changed, schedule_consultant_refresh
+
+    transaction.on_commit(note_consultants_changed)
+    transaction.on_commit(lambda pk=instance.pk: schedule_consultant_refresh(pk))
+
+
+def _consultant_roles_changed_refresh_recommendations(sender, instance, action: str, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    from users.models import ConsultantProfile
+    from .recommendations import note_consultants_changed, schedule_consultant_refresh
+
+    if isinstance(instance, ConsultantProfile):
+        transaction.on_commit(note_consultants_changed)
+        transaction.on_commit(lambda pk=instance.pk: schedule_consultant_refresh(pk))
+
+
 def _rawjob_post_save_record_event(sender, instance, created: bool, **kwargs):
     if not created:
         return
@@ -96,3 +157,14 @@ def wire_rawjob_signal():
         log.exception("Could not import harvest.RawJob; skipping shadow signal")
         return
     post_save.connect(_rawjob_post_save_record_event, sender=RawJob, dispatch_uid='jobs.shadow.rawjob_created')
+
+
+def wire_consultant_role_signal():
+    """Called from JobsConfig.ready() — the M2M through model needs the users app loaded."""
+    from users.models import ConsultantProfile
+
+    m2m_changed.connect(
+        _consultant_roles_changed_refresh_recommendations,
+        sender=ConsultantProfile.marketing_roles.through,
+        dispatch_uid='jobs.recommendations.consultant_roles',
+    )
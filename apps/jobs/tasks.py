@@ -3,6 +3,7 @@ from celery import shared_task
 from core.task_progress import update_task_progress
 from urllib.parse import urlparse
 import logging
+import random
 
 from django.utils import timezone
 
@@ -33,19 +34,40 @@ def generate_job_matches_task(job_id: int, notify: bool = True):
 
 
 @shared_task
-def refresh_consultant_embeddings_task():
-    """Regenerate embeddings for all active consultant profiles. Run weekly."""
+def refresh_consultant_embeddings_task(force: bool = False):
+    """Regenerate embeddings for all active consultant profiles. Run weekly.
+
+    Profiles whose text is unchanged since the last run are skipped; the rest
+    are embedded in batched, concurrent API calls.
+    """
     from users.models import ConsultantProfile
-    from .matching import embed_consultant
+    from .matching import embed_consultants
 
     profiles = ConsultantProfile.objects.select_related('user').prefetch_related(
         'marketing_roles', 'experience'
-    )
-    updated = 0
-    for profile in profiles:
-        if embed_consultant(profile):
-            updated += 1
-    return {"updated": updated}
+    ).order_by('pk')
+    totals = {"embedded": 0, "unchanged": 0, "failed": 0}
+    chunk_size = 1000
+    last_pk = 0
+    while True:
+        chunk = list(profiles.filter(pk__gt=last_pk)[:chunk_size])
+        if not chunk:
+            break
+        last_pk = chunk[-1].pk
+        for key, value in embed_consultants(chunk, force=force).items():
+            totals[key] += value
+    return {"updated": totals["embedded"], **totals}
+
+
+@shared_task
+def refresh_consultant_recommendations_task(consultant_ids=None):
+    """Recompute materialised job recommendations (all consultants when no ids are given)."""
+    from core.shared_state import delete_flag
+    from .recommendations import _REFRESH_PENDING_KEY, refresh_recommendations
+
+    if consultant_ids is None:
+        delete_flag(_REFRESH_PENDING_KEY)
+    return refresh_recommendations(consultant_ids)
 
 
 def _normalize_url(url: str) -> str:
@@ -71,13 +93,53 @@ def _check_job_url(url: str) -> bool:
         return False
 
 
-@shared_task
-def run_job_validation(job_id: int):
+@shared_task(bind=True, name="jobs.parse_job_descriptions", max_retries=5)
+def parse_job_descriptions_task(self, job_ids=None, force: bool = False):
+    """
+    Bring the parsed-JD store up to date (jobs.jd_store.parse_jobs).
+
+    job_ids=None sweeps every POOL / OPEN job whose parse is missing or stale.
+    When the LLM budget runs out mid-sweep the task retries later; jobs parsed
+    so far are current and are skipped on the retry.
+    """
+    from core.llm_throttle import LLMBudgetExceeded
+    from .jd_store import BATCH_SIZE, parse_jobs
+
+    qs = Job.objects.exclude(description="")
+    if job_ids is not None:
+        qs = qs.filter(pk__in=list(job_ids))
+    else:
+        qs = qs.filter(status__in=["POOL", "OPEN"])
+    totals = {"rules": 0, "llm": 0, "failed": 0, "unchanged": 0}
+    batch = []
+    try:
+        for job in qs.order_by("pk").iterator(chunk_size=BATCH_SIZE):
+            batch.append(job)
+            if len(batch) >= BATCH_SIZE:
+                for key, value in parse_jobs(batch, force=force).items():
+                    totals[key] += value
+                batch = []
+        if batch:
+            for key, value in parse_jobs(batch, force=force).items():
+                totals[key] += value
+    except LLMBudgetExceeded as exc:
+        if self.request.retries >= self.max_retries:
+            logger.warning("JD parse stopped, LLM budget unavailable: %s", exc)
+            return {**totals, "error": str(exc)}
+        # force=False on retry: whatever was parsed before the budget ran out is current now
+        raise self.retry(exc=exc, countdown=exc.retry_after + random.randint(0, 10),
+                         kwargs={"job_ids": job_ids, "force": False})
+    return totals
+
+
+@shared_task(bind=True, max_retries=3)
+def run_job_validation(self, job_id: int):
     """
     Run quality validation on a single job and persist the score.
     Auto-promotes to OPEN if the score meets PlatformConfig.auto_approve_pool_threshold.
     Called async when a job enters POOL status.
     """
+    from core.llm_throttle import LLMBudgetExceeded
     from .services import validate_job_quality, ensure_parsed_jd
     from .gating import apply_gate_result_to_job, evaluate_job_gate
 
@@ -87,7 +149,12 @@ def run_job_validation(job_id: int):
         return {"error": f"Job {job_id} not found"}
 
     # Ensure JD is parsed first so skills check is meaningful
-    ensure_parsed_jd(job)
+    try:
+        ensure_parsed_jd(job)
+    except LLMBudgetExceeded as exc:
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=exc, countdown=exc.retry_after + random.randint(0, 10))
+        logger.warning("Validating job %s without an LLM parse: %s", job_id, exc)
     job.refresh_from_db()
 
     result = validate_job_quality(job)
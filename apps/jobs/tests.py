@@ -21,7 +21,7 @@ from .marketing_role_routing import (
     clear_marketing_role_cache,
     infer_marketing_role_slugs,
 )
-from .services import match_jobs_for_consultant
+from .services import find_potential_duplicate_jobs, match_jobs_for_consultant, ranked_consultants_for_job
 from .tasks import classify_jobs_task
 from .tasks import validate_job_urls_task, auto_close_jobs_task
 
@@ -117,6 +117,57 @@ class JobListUrlHealthFilterTests(TestCase):
         self.assertNotContains(resp, 'Live role')
 
 
+class FindPotentialDuplicateJobsTests(TestCase):
+    def setUp(self):
+        self.employee = User.objects.create_user(
+            username='dupemp', password='testpass', role=User.Role.EMPLOYEE
+        )
+        self.desc = (
+            "Build data pipelines in python and spark, own airflow dags, tune postgres "
+            "queries, mentor engineers and ship dashboards for analytics stakeholders."
+        )
+        self.job = Job.objects.create(
+            title='Senior  Data Engineer',
+            company='Acme   Corp',
+            posted_by=self.employee,
+            description=self.desc,
+        )
+        Job.objects.create(
+            title='Office Manager', company='Other Inc', posted_by=self.employee, description='Front desk.'
+        )
+
+    def test_save_maintains_dedup_keys(self):
+        self.assertEqual(self.job.title_norm, 'senior data engineer')
+        self.assertEqual(self.job.company_norm, 'acme corp')
+        self.assertIsNotNone(self.job.description_sketch)
+        self.job.description = 'Completely different text about accounting ledgers.'
+        self.job.save(update_fields=['description'])
+        self.job.refresh_from_db()
+        from .dedup import description_sketch
+        self.assertEqual(bytes(self.job.description_sketch), description_sketch(self.job.description))
+
+    def test_matches_on_normalised_company_and_sketch(self):
+        results = find_potential_duplicate_jobs(
+            title='Senior Data Engineer', company='ACME Corp', description=self.desc
+        )
+        self.assertEqual([r['job'].pk for r in results], [self.job.pk])
+        self.assertEqual(results[0]['title_score'], 1.0)
+        self.assertEqual(results[0]['desc_score'], 1.0)
+        self.assertEqual(
+            find_potential_duplicate_jobs(
+                title='Senior Data Engineer', company='Acme Corp', exclude_job_id=self.job.pk
+            ),
+            [],
+        )
+
+    def test_legacy_row_without_sketch_still_scored(self):
+        Job.objects.filter(pk=self.job.pk).update(description_sketch=None)
+        results = find_potential_duplicate_jobs(
+            title='Senior Data Engineer', company='Acme Corp', description=self.desc
+        )
+        self.assertEqual(results[0]['desc_score'], 1.0)
+
+
 class MatchScoreStringTests(TestCase):
     def test_match_score_str_does_not_reference_missing_title(self):
         from .models import MatchScore
@@ -129,6 +180,404 @@ class MatchScoreStringTests(TestCase):
         self.assertIn("0.875", rendered)
 
 
+class VectorIndexMatchingTests(TestCase):
+    def setUp(self):
+        from users.models import ConsultantEmbedding
+        from .vector_index import pack_vector
+
+        self.employee = User.objects.create_user(username='vecemp', password='x', role=User.Role.EMPLOYEE)
+        self.job = Job.objects.create(title='ML Engineer', company='Acme', posted_by=self.employee, description='D')
+        self.profiles = []
+        for i, vec in enumerate(([1.0, 0.0, 0.0], [0.6, 0.8, 0.0], [0.0, 0.0, 2.0])):
+            user = User.objects.create_user(username=f'vec{i}', password='x', role=User.Role.CONSULTANT)
+            profile = ConsultantProfile.objects.create(user=user)
+            ConsultantEmbedding.objects.create(consultant=profile, vector_f32=pack_vector(vec), dims=3)
+            self.profiles.append(profile)
+
+    def test_packed_vectors_are_normalised(self):
+        from .vector_index import pack_vector, unpack_vector
+
+        self.assertEqual(list(unpack_vector(pack_vector([0.0, 3.0, 4.0]))), [0.0, 0.6000000238418579, 0.800000011920929])
+
+    def test_compute_matches_ranks_via_index_and_sees_new_embeddings(self):
+        from users.models import ConsultantEmbedding
+        from .matching import compute_matches_for_job
+        from .models import MatchScore
+
+        with patch('jobs.matching._openai_embed_many', return_value=[[1.0, 0.0, 0.0]]):
+            results = compute_matches_for_job(self.job, top_n=2)
+        self.assertEqual([r['consultant'].pk for r in results], [self.profiles[0].pk, self.profiles[1].pk])
+        self.assertAlmostEqual(results[1]['score'], 0.6, places=5)
+        self.assertEqual(MatchScore.objects.filter(job=self.job).count(), 3)
+
+        from .vector_index import pack_vector
+        emb = ConsultantEmbedding.objects.get(consultant=self.profiles[0])
+        emb.vector_f32 = pack_vector([0.0, 0.0, 1.0])
+        emb.save()
+        results = compute_matches_for_job(self.job, top_n=1)
+        self.assertEqual(results[0]['consultant'].pk, self.profiles[1].pk)
+
+    def test_match_scores_are_diffed_and_capped(self):
+        from django.test import override_settings
+        from .matching import _store_match_scores, compute_matches_for_jobs
+        from .models import MatchScore
+
+        with patch('jobs.matching._openai_embed_many', return_value=[[1.0, 0.0, 0.0]]):
+            compute_matches_for_jobs([self.job], top_n=3)
+        before = dict(MatchScore.objects.filter(job=self.job).values_list('consultant_id', 'computed_at'))
+
+        ranked = [(pk, score) for pk, score in MatchScore.objects.filter(job=self.job).values_list('consultant_id', 'score')]
+        self.assertEqual(_store_match_scores({self.job.pk: ranked}, keep=3), {'written': 0, 'deleted': 0, 'unchanged': 3})
+        self.assertEqual(
+            dict(MatchScore.objects.filter(job=self.job).values_list('consultant_id', 'computed_at')), before
+        )
+
+        with override_settings(MATCHING_STORED_SCORES=1):
+            compute_matches_for_jobs([self.job], top_n=1)
+        self.assertEqual(
+            list(MatchScore.objects.filter(job=self.job).values_list('consultant_id', 'rank')),
+            [(self.profiles[0].pk, 1)],
+        )
+
+    def test_pure_python_fallback_matches_numpy_ranking(self):
+        from . import vector_index
+
+        index = vector_index.consultant_index()
+        query = vector_index.unpack_vector(vector_index.pack_vector([1.0, 0.0, 0.0]))
+        expected = [pk for pk, _ in index.search(query, k=2)]
+        with patch.object(vector_index, 'np', None):
+            fallback = vector_index.VectorIndex('users.ConsultantEmbedding', 'consultant_id', 'test')
+            fallback.refresh()
+            got = [pk for pk, _ in fallback.search(vector_index.unpack_vector(vector_index.pack_vector([1.0, 0.0, 0.0])), k=2)]
+        self.assertEqual(got, expected)
+
+
+class EmbeddingBatchTests(TestCase):
+    def setUp(self):
+        self.profiles = []
+        for i in range(5):
+            user = User.objects.create_user(username=f'emb{i}', password='x', role=User.Role.CONSULTANT)
+            self.profiles.append(ConsultantProfile.objects.create(user=user, bio=f'Consultant {i}'))
+
+    def _fake_client(self, calls):
+        from types import SimpleNamespace
+
+        def create(model, input):
+            calls.append(len(input))
+            return SimpleNamespace(data=[SimpleNamespace(index=i, embedding=[1.0, float(i)]) for i in range(len(input))])
+
+        return SimpleNamespace(embeddings=SimpleNamespace(create=create))
+
+    def test_batches_requests_and_skips_unchanged_texts(self):
+        from users.models import ConsultantEmbedding
+        from .matching import embed_consultants
+
+        calls = []
+        with patch('jobs.matching._openai_api_key', return_value='sk-test'), \
+                patch('openai.OpenAI', return_value=self._fake_client(calls)), \
+                patch('jobs.matching.EMBED_BATCH_SIZE', 2):
+            first = embed_consultants(self.profiles)
+            self.assertEqual(sorted(calls), [1, 2, 2])
+            self.assertEqual(first, {"embedded": 5, "unchanged": 0, "failed": 0})
+            self.assertEqual(ConsultantEmbedding.objects.exclude(content_hash='').count(), 5)
+
+            self.profiles[0].bio = 'Changed bio'
+            calls.clear()
+            second = embed_consultants(self.profiles)
+        self.assertEqual(calls, [1])
+        self.assertEqual(second, {"embedded": 1, "unchanged": 4, "failed": 0})
+
+
+class LocalEmbeddingProviderTests(TestCase):
+    def test_local_backend_embeds_without_network_and_matches(self):
+        from types import SimpleNamespace
+        from django.test import override_settings
+        from users.models import ConsultantEmbedding
+        from .matching import compute_matches_for_job, embed_consultants, get_embedding_provider
+
+        def encode(texts, **kwargs):
+            return [[1.0, 0.0] if 'Python' in t else [0.0, 1.0] for t in texts]
+
+        employee = User.objects.create_user(username='localemp', password='x', role=User.Role.EMPLOYEE)
+        job = Job.objects.create(title='Python Developer', company='Acme', posted_by=employee, description='D')
+        users = [User.objects.create_user(username=f'local{i}', password='x', role=User.Role.CONSULTANT) for i in range(2)]
+        py = ConsultantProfile.objects.create(user=users[0], bio='Python expert')
+        java = ConsultantProfile.objects.create(user=users[1], bio='Java expert')
+
+        with override_settings(MATCHING_EMBEDDING_BACKEND='local'), \
+                patch('jobs.matching.load_embedding_model', return_value=SimpleNamespace(encode=encode)), \
+                patch('jobs.matching._openai_embed_many', side_effect=AssertionError('network')):
+            provider = get_embedding_provider()
+            self.assertEqual(provider.name, 'local:BAAI/bge-small-en-v1.5')
+            embed_consultants([py, java])
+            results = compute_matches_for_job(job, top_n=2)
+
+        self.assertEqual([r['consultant'].pk for r in results], [py.pk, java.pk])
+        self.assertEqual(
+            set(ConsultantEmbedding.objects.values_list('model', flat=True)), {'local:BAAI/bge-small-en-v1.5'}
+        )
+
+
+class ConsultantRecommendationTests(TestCase):
+    def setUp(self):
+        self.employee = User.objects.create_user(username='recemp', password='x', role=User.Role.EMPLOYEE)
+        user = User.objects.create_user(username='reccon', password='x', role=User.Role.CONSULTANT)
+        self.consultant = ConsultantProfile.objects.create(user=user, skills=['Python', 'Django', 'AWS'])
+        self.jobs = {}
+        for title, skills in (
+            ('Backend Engineer', ['python', 'django']),
+            ('Cloud Engineer', ['aws']),
+            ('Designer', ['figma']),
+        ):
+            self.jobs[title] = Job.objects.create(
+                title=title, company='Acme', posted_by=self.employee, status=Job.Status.OPEN,
+                description='Role', parsed_jd={'required_skills': skills},
+            )
+
+    def test_refresh_matches_legacy_scoring_and_reads_in_one_query(self):
+        from .models import ConsultantJobRecommendation
+        from .recommendations import refresh_recommendations
+        from .services import _score_job_for_consultant
+
+        refresh_recommendations([self.consultant.pk])
+        rows = list(ConsultantJobRecommendation.objects.filter(consultant=self.consultant).order_by('rank'))
+        self.assertEqual([r.job_id for r in rows], [self.jobs['Backend Engineer'].pk, self.jobs['Cloud Engineer'].pk])
+        self.assertEqual(
+            [r.score for r in rows],
+            [_score_job_for_consultant(Job.objects.get(pk=r.job_id), self.consultant) for r in rows],
+        )
+        with self.assertNumQueries(1):
+            matches = match_jobs_for_consultant(self.consultant, limit=5)
+        self.assertEqual(matches[0].pk, self.jobs['Backend Engineer'].pk)
+
+    def test_closing_a_job_drops_it_from_recommendations(self):
+        from .recommendations import refresh_recommendations
+
+        refresh_recommendations()
+        job = self.jobs['Backend Engineer']
+        with self.captureOnCommitCallbacks(execute=True):
+            job.status = Job.Status.CLOSED
+            job.save()
+        self.assertEqual(
+            [j.pk for j in match_jobs_for_consultant(self.consultant)], [self.jobs['Cloud Engineer'].pk]
+        )
+
+
+    def test_job_claimed_by_another_consultant_is_hidden_at_read_time(self):
+        from submissions.models import ApplicationSubmission
+        from .recommendations import refresh_recommendations
+
+        refresh_recommendations([self.consultant.pk])
+        other_user = User.objects.create_user(username='recother', password='x', role=User.Role.CONSULTANT)
+        other = ConsultantProfile.objects.create(user=other_user, skills=['Python'])
+        ApplicationSubmission.objects.create(
+            job=self.jobs['Backend Engineer'], consultant=other, status=ApplicationSubmission.Status.APPLIED,
+        )
+        self.assertEqual(
+            [j.pk for j in match_jobs_for_consultant(self.consultant)], [self.jobs['Cloud Engineer'].pk]
+        )
+
+    def test_consultant_refresh_reuses_the_open_job_index(self):
+        from .recommendations import get_open_job_index, refresh_recommendations
+
+        index = get_open_job_index()
+        refresh_recommendations([self.consultant.pk])
+        self.assertIs(get_open_job_index(), index)
+        Job.objects.create(
+            title='Data Engineer', company='Acme', posted_by=self.employee, status=Job.Status.OPEN,
+            description='Role', parsed_jd={'required_skills': ['python']},
+        )
+        self.assertIsNot(get_open_job_index(), index)
+
+
+class RankedConsultantsForJobTests(TestCase):
+    def setUp(self):
+        from .recommendations import note_consultants_changed
+
+        note_consultants_changed()
+        employee = User.objects.create_user(username='rankemp', password='x', role=User.Role.EMPLOYEE)
+        self.job = Job.objects.create(
+            title='Senior Python Engineer', company='Acme', posted_by=employee, status=Job.Status.OPEN,
+            country='USA', description='Python and Kubernetes on AWS',
+            parsed_jd={'required_skills': ['Python', 'AWS', 'Terraform']},
+        )
+        self.consultants = []
+        for username, skills, extra in (
+            ('alice', ['python', 'aws', 'terraform'], {}),
+            ('bob', ['python'], {}),
+            ('carol', ['kubernetes'], {}),
+            ('dave', ['python', 'aws'], {'work_countries': ['Canada']}),
+            ('erin', ['python'], {'preferred_seniority_levels': ['junior']}),
+        ):
+            user = User.objects.create_user(username=username, password='x', role=User.Role.CONSULTANT)
+            self.consultants.append(ConsultantProfile.objects.create(user=user, skills=skills, **extra))
+
+    def test_matches_per_consultant_detail(self):
+        from .services import _job_matches_consultant_preferences, consultant_job_match_detail
+
+        rows = ranked_consultants_for_job(self.job, limit=10)
+        self.assertEqual([r['consultant'].user.username for r in rows], ['alice', 'bob', 'carol'])
+        for row in rows:
+            detail = consultant_job_match_detail(self.job, row['consultant'])
+            for key in ('match_pct', 'raw_score', 'matched_required', 'total_required'):
+                self.assertEqual(row[key], detail[key], (row['consultant'].user.username, key))
+        excluded = {'dave', 'erin'}
+        for consultant in self.consultants:
+            if consultant.user.username in excluded:
+                self.assertFalse(_job_matches_consultant_preferences(self.job, consultant))
+
+    def test_profile_edits_invalidate_the_index(self):
+        ranked_consultants_for_job(self.job)
+        carol = self.consultants[2]
+        with self.captureOnCommitCallbacks(execute=True):
+            carol.skills = ['python', 'aws', 'terraform', 'go']
+            carol.save()
+        rows = ranked_consultants_for_job(self.job, limit=2)
+        self.assertEqual([r['consultant'].user.username for r in rows], ['alice', 'carol'])
+
+
+class ParsedJDStoreTests(TestCase):
+    def setUp(self):
+        employee = User.objects.create_user(username='jdstore', password='x', role=User.Role.EMPLOYEE)
+        consultant = User.objects.create_user(username='jdskills', password='x', role=User.Role.CONSULTANT)
+        ConsultantProfile.objects.create(user=consultant, skills=['Python', 'Terraform'])
+        self.jobs = [
+            Job.objects.create(title='Python dev', company='Acme', posted_by=employee,
+                               description='Python services on AWS with Terraform.'),
+            Job.objects.create(title='Painter', company='Acme', posted_by=employee,
+                               description='Paint walls.'),
+        ]
+
+    @patch("jobs.services.LLMService")
+    def test_batch_parse_is_rules_first_and_keyed_by_description(self, llm_cls):
+        from datetime import timedelta
+        from .jd_store import ensure_parsed_jd, is_current, parse_jobs
+
+        llm_cls.return_value.client = None
+        counts = parse_jobs(self.jobs)
+        self.assertEqual(counts, {'rules': 1, 'llm': 0, 'failed': 1, 'unchanged': 0})
+        python_job, painter = (Job.objects.get(pk=j.pk) for j in self.jobs)
+        self.assertEqual(python_job.parsed_jd['required_skills'], ['terraform', 'python'])
+        self.assertEqual(python_job.parsed_jd_status, 'OK_RULES')
+        self.assertTrue(is_current(python_job))
+        # "LLM not configured" is not about the text: no hash, page views back off, batches retry
+        self.assertEqual(painter.parsed_jd_status, 'ERROR')
+        self.assertFalse(is_current(painter))
+        llm_cls.reset_mock()
+        self.assertFalse(ensure_parsed_jd(painter)[0])
+        llm_cls.assert_not_called()
+        Job.objects.filter(pk=painter.pk).update(parsed_jd_updated_at=timezone.now() - timedelta(hours=1))
+        painter.refresh_from_db()
+        llm_cls.return_value.client = object()
+        llm_cls.return_value.generate_with_prompts.return_value = ("no json here", 10, "")
+        self.assertFalse(ensure_parsed_jd(painter)[0])
+        llm_cls.return_value.generate_with_prompts.assert_called_once()
+        # An unusable answer is about this description, so it is kept until the JD changes
+        painter.refresh_from_db()
+        self.assertTrue(is_current(painter))
+        self.assertEqual(parse_jobs([python_job, painter])['unchanged'], 2)
+        llm_cls.return_value.client = None
+
+        python_job.description = 'Go services.'
+        python_job.save()
+        self.assertFalse(is_current(python_job))
+        ensure_parsed_jd(python_job)
+        self.assertEqual(Job.objects.get(pk=python_job.pk).parsed_jd_status, 'ERROR')
+
+
+class VetGateBatchTests(TestCase):
+    def setUp(self):
+        employee = User.objects.create_user(username='gatebatch', password='x', role=User.Role.EMPLOYEE)
+        company = Company.objects.create(name='Gate Batch Co')
+        Job.objects.create(title='Data Engineer', company='Gate Batch Co', location='Austin, TX',
+                           posted_by=employee, description='x', url_hash='b' * 64)
+        jd = 'Build and operate data pipelines on cloud infrastructure with strong testing. ' * 12
+        specs = [
+            ('Platform Engineer', 'a' * 64, 'Remote', jd),     # clean
+            ('Analytics Engineer', 'b' * 64, 'Remote', jd),    # url_hash already live
+            ('Data Engineer', 'c' * 64, 'austin, tx', jd),     # company+title+location live
+            ('Site Engineer', 'd' * 64, 'Remote', 'Too short.'),
+        ]
+        for title, url_hash, location, description in specs:
+            RawJob.objects.create(
+                company=company, title=title, url_hash=url_hash, location_raw=location,
+                original_url=f'https://example.com/jobs/{url_hash[:8]}', description=description,
+                classification_confidence=0.9, scope_status=RawJob.ScopeStatus.PRIORITY_TARGET,
+            )
+
+    def test_batch_results_match_single_row_gate_with_fixed_queries(self):
+        from harvest.models import VetGateConfig
+        from .gating import evaluate_raw_job_gate, evaluate_raw_job_gates
+
+        cfg = VetGateConfig.get()
+        single = {rj.pk: evaluate_raw_job_gate(rj, cfg=cfg) for rj in RawJob.objects.all()}
+        with self.assertNumQueries(3):  # rows (projected), live url hashes, company+title matches
+            batch = {rj.pk: result for rj, result in evaluate_raw_job_gates(RawJob.objects.all(), cfg)}
+        self.assertEqual(batch, single)
+        by_title = {rj.title: batch[rj.pk] for rj in RawJob.objects.all()}
+        self.assertTrue(by_title['Platform Engineer'].checks['dedupe_passed'])
+        self.assertFalse(by_title['Analytics Engineer'].checks['dedupe_passed'])
+        self.assertFalse(by_title['Data Engineer'].checks['dedupe_passed'])
+        self.assertFalse(by_title['Site Engineer'].checks['clean_jd_present'])
+
+
+class DeferredPipelineEventTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='evbuffer', password='x', role=User.Role.EMPLOYEE)
+
+    @patch("companies.tasks.enrich_company_task.delay")
+    def test_block_buffers_events_and_links_companies_once_per_name(self, enrich):
+        from .event_buffer import deferred_pipeline_events
+        from .models import PipelineEvent
+
+        with deferred_pipeline_events():
+            jobs = [
+                Job.objects.create(title=f'Engineer {i}', company='Buffered Widgets', posted_by=self.user,
+                                   description='x', status=Job.Status.POOL, stage=Job.Stage.VETTED)
+                for i in range(3)
+            ]
+            self.assertFalse(PipelineEvent.objects.filter(job__in=jobs).exists())
+            self.assertFalse(Company.objects.filter(name='Buffered Widgets').exists())
+
+        self.assertEqual(
+            PipelineEvent.objects.filter(job__in=jobs, task_name='signal.job_created').count(), 3
+        )
+        company = Company.objects.get(name='Buffered Widgets')
+        self.assertEqual(Job.objects.filter(pk__in=[j.pk for j in jobs], company_obj=company).count(), 3)
+        enrich.assert_called_once_with(company.pk)
+
+    @patch("companies.tasks.enrich_company_task.delay")
+    def test_block_links_name_variants_through_the_company_index(self, enrich):
+        from companies.resolution import clear_company_index
+
+        from .event_buffer import deferred_pipeline_events
+
+        clear_company_index()
+        existing = Company.objects.create(name='Indexed Widgets')
+        with deferred_pipeline_events():
+            jobs = [
+                Job.objects.create(title=f'Analyst {i}', company=name, posted_by=self.user,
+                                   description='x', status=Job.Status.POOL, stage=Job.Stage.VETTED)
+                for i, name in enumerate(['Indexed Widgets, Inc.', 'INDEXED WIDGETS', 'Indexedwidgets'])
+            ]
+        self.assertEqual(Job.objects.filter(pk__in=[j.pk for j in jobs], company_obj=existing).count(), 3)
+        enrich.assert_not_called()
+
+    def test_coalesce_merges_chained_transitions(self):
+        from .event_buffer import deferred_pipeline_events
+        from .models import PipelineEvent
+
+        job = Job.objects.create(title='Chained', company='Chain Co', posted_by=self.user, description='x',
+                                 company_obj=Company.objects.create(name='Chain Co'))
+        with deferred_pipeline_events(coalesce=True):
+            for from_stage, to_stage in [('VETTED', 'LIVE'), ('LIVE', 'ARCHIVED')]:
+                PipelineEvent.record(job=job, from_stage=from_stage, to_stage=to_stage, task_name='test.chain')
+            PipelineEvent.record(job=job, from_stage='X', to_stage='Y', task_name='test.other')
+        chain = PipelineEvent.objects.get(job=job, task_name='test.chain')
+        self.assertEqual((chain.from_stage, chain.to_stage, chain.meta['coalesced']), ('VETTED', 'ARCHIVED', 2))
+        self.assertTrue(PipelineEvent.objects.filter(job=job, task_name='test.other').exists())
+
+
 class MarketingRoleRoutingTests(TestCase):
     def setUp(self):
         clear_marketing_role_cache()
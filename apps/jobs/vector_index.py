@@ -0,0 +1,266 @@
+"""
+Packed float32 embeddings + in-memory vector index for semantic matching.
+
+Embeddings are stored L2-normalised as little-endian float32 bytes
+(JobEmbedding.vector_f32 / ConsultantEmbedding.vector_f32), so cosine
+similarity is a plain dot product. VectorIndex keeps every row of one
+embedding table in a float32 matrix; a query is one matrix-vector product
+plus argpartition for the top-k, and refresh() only reads rows whose
+updated_at moved since the last call.
+
+NumPy is optional (it ships with requirements-ml.txt). Without it the index
+keeps array('f') rows and ranks with heapq — same results, pure-Python speed.
+
+When settings.MATCHING_INDEX_DIR is set, a full rebuild snapshots the matrix
+there as .npy and later processes open it memory-mapped, so workers share one
+copy through the page cache instead of each decoding every row.
+"""
+from __future__ import annotations
+
+import heapq
+import json
+import logging
+import math
+import re
+import sys
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import Iterable, Sequence
+
+from django.apps import apps
+from django.conf import settings
+from django.db.models import Max
+
+try:  # optional — see requirements-ml.txt
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+logger = logging.getLogger(__name__)
+
+FULL_REBUILD_SECONDS = 15 * 60     # backstop for rows whose updated_at lagged the watermark
+
+
+def pack_vector(values: Sequence[float]) -> bytes:
+    """L2-normalise and pack as little-endian float32."""
+    if np is not None:
+        vec = np.asarray(values, dtype=np.float32)
+        norm = float(np.linalg.norm(vec))
+        if norm:
+            vec = vec / norm
+        return vec.astype("<f4").tobytes()
+    vec = array("f", values)
+    norm = math.sqrt(sum(x * x for x in vec))
+    if norm:
+        vec = array("f", (x / norm for x in vec))
+    if sys.byteorder != "little":
+        vec.byteswap()
+    return vec.tobytes()
+
+
+def unpack_vector(data: bytes | memoryview | None):
+    """Inverse of pack_vector: a float32 ndarray (or array('f') without NumPy)."""
+    if not data:
+        return None
+    data = bytes(data)
+    if np is not None:
+        return np.frombuffer(data, dtype="<f4")
+    vec = array("f")
+    vec.frombytes(data)
+    if sys.byteorder != "little":
+        vec.byteswap()
+    return vec
+
+
+def _dot(a, b) -> float:
+    return sum(x * y for x, y in zip(a, b))
+
+
+class VectorIndex:
+    """
+    All packed vectors of one embedding model, keyed by `key_field`.
+
+    Thread-safe; one instance per process (see consultant_index()).
+    """
+
+    def __init__(self, model_label: str, key_field: str, name: str, embedding_model: str = ""):
+        self.model_label = model_label
+        self.key_field = key_field
+        self.name = name
+        self.embedding_model = embedding_model
+        self.dims = 0
+        self._lock = threading.Lock()
+        self._ids: list[int] = []
+        self._pos: dict[int, int] = {}
+        self._rows = None              # ndarray (n × dims) or list[array('f')]
+        self._watermark = None
+        self._built_at = 0.0
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _queryset(self):
+        qs = apps.get_model(self.model_label).objects.exclude(vector_f32=None)
+        if self.embedding_model:
+            qs = qs.filter(model=self.embedding_model)
+        return qs
+
+    # ── loading ──────────────────────────────────────────────────────────────
+
+    def _snapshot_paths(self) -> tuple[Path, Path, Path] | None:
+        root = getattr(settings, "MATCHING_INDEX_DIR", "")
+        if not root or np is None:
+            return None
+        base = Path(root)
+        return base / f"{self.name}.npy", base / f"{self.name}.ids.npy", base / f"{self.name}.json"
+
+    def _load_snapshot(self, count: int, watermark) -> bool:
+        paths = self._snapshot_paths()
+        if not paths or not all(p.exists() for p in paths):
+            return False
+        try:
+            meta = json.loads(paths[2].read_text())
+            if meta.get("count") != count or meta.get("watermark") != (watermark.isoformat() if watermark else None):
+                return False
+            self._rows = np.load(paths[0], mmap_mode="r")
+            self._ids = [int(i) for i in np.load(paths[1])]
+            self.dims = int(meta.get("dims") or 0)
+        except Exception:
+            logger.exception("vector index %s: snapshot load failed", self.name)
+            return False
+        self._pos = {pk: i for i, pk in enumerate(self._ids)}
+        self._watermark = watermark
+        return True
+
+    def _save_snapshot(self) -> None:
+        paths = self._snapshot_paths()
+        if not paths:
+            return
+        try:
+            paths[0].parent.mkdir(parents=True, exist_ok=True)
+            np.save(paths[0], self._rows)
+            np.save(paths[1], np.asarray(self._ids, dtype=np.int64))
+            paths[2].write_text(json.dumps({
+                "count": len(self._ids),
+                "dims": self.dims,
+                "watermark": self._watermark.isoformat() if self._watermark else None,
+            }))
+        except Exception:
+            logger.exception("vector index %s: snapshot save failed", self.name)
+
+    def _rebuild(self) -> None:
+        qs = self._queryset()
+        stats = qs.aggregate(watermark=Max("updated_at"))
+        count = qs.count()
+        self._built_at = time.monotonic()
+        if self._load_snapshot(count, stats["watermark"]):
+            return
+        ids: list[int] = []
+        vectors: list = []
+        dims = 0
+        for key, data, _updated in qs.values_list(self.key_field, "vector_f32", "updated_at").iterator(chunk_size=2000):
+            vec = unpack_vector(data)
+            if vec is None:
+                continue
+            dims = dims or len(vec)
+            if len(vec) != dims:
+                continue  # mixed models mid-migration; the majority model wins on the next rebuild
+            ids.append(key)
+            vectors.append(vec)
+        self.dims = dims
+        self._ids = ids
+        self._pos = {pk: i for i, pk in enumerate(ids)}
+        if np is not None:
+            self._rows = np.vstack(vectors) if vectors else np.zeros((0, dims), dtype=np.float32)
+        else:
+            self._rows = vectors
+        self._watermark = stats["watermark"]
+        self._save_snapshot()
+
+    def _apply(self, key: int, vec) -> None:
+        if len(vec) != self.dims:
+            return
+        pos = self._pos.get(key)
+        if np is not None:
+            if pos is not None:
+                if not self._rows.flags.writeable:  # memory-mapped snapshot
+                    self._rows = np.array(self._rows)
+                self._rows[pos] = vec
+                return
+            self._rows = np.vstack([self._rows, vec[np.newaxis, :]])
+        elif pos is not None:
+            self._rows[pos] = vec
+            return
+        else:
+            self._rows.append(vec)
+        self._pos[key] = len(self._ids)
+        self._ids.append(key)
+
+    def refresh(self) -> None:
+        """Pick up rows saved since the last refresh; rebuild after deletes or FULL_REBUILD_SECONDS."""
+        with self._lock:
+            if (
+                self._rows is None
+                or not self.dims
+                or time.monotonic() - self._built_at > FULL_REBUILD_SECONDS
+            ):
+                self._rebuild()
+                return
+            qs = self._queryset()
+            changed = qs.filter(updated_at__gte=self._watermark) if self._watermark else qs
+            for key, data, updated in changed.values_list(self.key_field, "vector_f32", "updated_at"):
+                vec = unpack_vector(data)
+                if vec is not None:
+                    self._apply(key, vec)
+                if self._watermark is None or updated > self._watermark:
+                    self._watermark = updated
+            if qs.count() != len(self._ids):
+                self._rebuild()
+
+    # ── queries ──────────────────────────────────────────────────────────────
+
+    def search(self, query, k: int | None = None, exclude: Iterable[int] = ()) -> list[tuple[int, float]]:
+        """
+        Top-k (key, cosine) pairs for a normalised query vector, best first.
+
+        k=None ranks every row.
+        """
+        with self._lock:
+            ids, rows = self._ids, self._rows
+        n = len(ids)
+        if not n or query is None or len(query) != self.dims:
+            return []
+        excluded = set(exclude)
+        want = n if k is None else min(n, k + len(excluded))
+        if np is not None:
+            scores = rows @ np.asarray(query, dtype=np.float32)
+            if want >= n:
+                order = np.argsort(-scores, kind="stable")
+            else:
+                part = np.argpartition(-scores, want - 1)[:want]
+                order = part[np.argsort(-scores[part], kind="stable")]
+            ranked = [(ids[i], float(scores[i])) for i in order]
+        else:
+            scored = ((ids[i], _dot(rows[i], query)) for i in range(n))
+            ranked = heapq.nlargest(want, scored, key=lambda x: x[1])
+        if excluded:
+            ranked = [r for r in ranked if r[0] not in excluded]
+        return ranked if k is None else ranked[:k]
+
+
+_consultant_indexes: dict[str, VectorIndex] = {}
+_index_lock = threading.Lock()
+
+
+def consultant_index(embedding_model: str = "text-embedding-3-small") -> VectorIndex:
+    """Process-wide index over one provider's ConsultantEmbedding rows, refreshed on each call."""
+    with _index_lock:
+        index = _consultant_indexes.get(embedding_model)
+        if index is None:
+            slug = re.sub(r"[^A-Za-z0-9]+", "-", embedding_model).strip("-")
+            index = VectorIndex("users.ConsultantEmbedding", "consultant_id", f"consultants-{slug}", embedding_model)
+            _consultant_indexes[embedding_model] = index
+    index.refresh()
+    return index
@@ -6,7 +6,6 @@ from django.contrib import messages
 from django.utils import timezone
 from django.utils.dateparse import parse_date
 from django.db.models import Q, Count
-from django.core.paginator import Paginator
 from django.http import HttpResponse, JsonResponse
 from django.conf import settings
 import re
@@ -17,6 +16,7 @@ import logging
 from urllib.parse import urlencode
 
 from .models import Job, PipelineEvent
+from .event_buffer import deferred_pipeline_events
 from config.pagination import PAGE_SIZE_OPTIONS, get_page_size, build_pagination_window
 
 logger = logging.getLogger(__name__)
@@ -1117,6 +1117,7 @@ class JobRejectView(LoginRequiredMixin, EmployeeRequiredMixin, View):
 class JobBulkApproveView(LoginRequiredMixin, EmployeeRequiredMixin, View):
     employee_feature_key = 'employee_bulk_ops'
     """Bulk-approve multiple POOL jobs at once."""
+    @deferred_pipeline_events()
     def post(self, request):
         from .gating import apply_gate_result_to_job, evaluate_job_gate
 
@@ -1238,11 +1239,15 @@ class JobsPipelineView(LoginRequiredMixin, EmployeeRequiredMixin, View):
 
     def _raw_json_response(self, request):
         from harvest.models import RawJob
-        from harvest.enrichments import infer_country_from_location
-        from harvest.jd_gate import evaluate_raw_job_resume_gate
-        from harvest.services.rawjob_query import apply_rawjob_filters
+        from harvest.jd_gate import _runtime_thresholds, evaluate_raw_job_resume_gate
+        from harvest.services.rawjob_derived import DERIVED_FIELDS
+        from harvest.services.rawjob_query import (
+            apply_rawjob_filters,
+            cached_rawjob_list_count,
+            rawjob_list_page,
+        )
         # Keep JSON loader query lightweight and avoid select_related+defer conflicts.
-        qs = RawJob.objects.order_by('-fetched_at')
+        qs = RawJob.objects.all()
         qs = apply_rawjob_filters(qs, request.GET)
         qs = qs.only(
             "id", "company_name", "platform_slug", "title", "original_url",
@@ -1261,24 +1266,19 @@ class JobsPipelineView(LoginRequiredMixin, EmployeeRequiredMixin, View):
             "sync_skip_reason", "external_id", "location_type", "salary_currency",
             "salary_period", "jd_backfill_locked_at",
             "filter_decision", "filter_reason", "is_cold", "jd_fetch_skipped",
-            "is_test_run", "fetch_batch",
+            "is_test_run", "fetch_batch", *DERIVED_FIELDS,
         )
 
-        paginator = Paginator(qs, 100)
         try:
-            page_num = int(request.GET.get("page", 1))
-            page_obj = paginator.page(page_num)
-        except Exception:
-            return JsonResponse({"jobs": [], "has_next": False, "total": 0, "num_pages": 0, "next_page": None})
+            rows, next_cursor = rawjob_list_page(qs, (request.GET.get("cursor") or "").strip())
+        except ValueError:
+            return JsonResponse({"jobs": [], "has_next": False, "total": 0, "next_cursor": ""})
 
+        thresholds = _runtime_thresholds()
         jobs_data = []
-        for job in page_obj.object_list:
-            jd_gate = evaluate_raw_job_resume_gate(job)
-            detected_country = infer_country_from_location(
-                location_raw=job.location_raw or "",
-                state=job.state or "",
-                country=job.country or "",
-            )
+        for job in rows:
+            jd_gate = evaluate_raw_job_resume_gate(job, thresholds=thresholds)
+            detected_country = job.detected_country()
             row = build_rawjob_pipeline_row(job, gate=jd_gate, country_label=detected_country or "")
             jobs_data.append({
                 "id": job.pk,
@@ -1315,10 +1315,9 @@ class JobsPipelineView(LoginRequiredMixin, EmployeeRequiredMixin, View):
 
         return JsonResponse({
             "jobs": jobs_data,
-            "has_next": page_obj.has_next(),
-            "next_page": page_obj.next_page_number() if page_obj.has_next() else None,
-            "total": paginator.count,
-            "num_pages": paginator.num_pages,
+            "has_next": bool(next_cursor),
+            "next_cursor": next_cursor,
+            "total": cached_rawjob_list_count(qs, request.GET),
         })
 
     def get(self, request):
@@ -1346,13 +1345,16 @@ class JobsPipelineView(LoginRequiredMixin, EmployeeRequiredMixin, View):
             load_rawjobs_dashboard_stats,
             raw_jobs_workflow_insights,
         )
+        from harvest.services.rawjob_derived import DERIVED_FIELDS
         from harvest.services.rawjob_query import (
             FILTER_STATE_KEYS,
             apply_rawjob_filters,
             build_funnel_counts,
+            cached_rawjob_list_count,
             effective_classification_q,
             filtered_out_q,
             production_rawjobs_queryset,
+            rawjob_list_page,
             ready_stage_q,
         )
         from harvest.runtime_config import get_ready_stage_min_confidence
@@ -1440,7 +1442,7 @@ class JobsPipelineView(LoginRequiredMixin, EmployeeRequiredMixin, View):
             return urlencode(pairs)
 
         if tab == 'raw':
-            qs = RawJob.objects.select_related('company', 'job_platform').order_by('-fetched_at')
+            qs = RawJob.objects.select_related('company', 'job_platform')
             qs = apply_rawjob_filters(qs, request.GET)
             for key in FILTER_STATE_KEYS:
                 if key == "q":
@@ -1552,15 +1554,13 @@ class JobsPipelineView(LoginRequiredMixin, EmployeeRequiredMixin, View):
                 "state",
                 "country",
                 "word_count",
+                *DERIVED_FIELDS,
             )
-            raw_paginator = Paginator(raw_seed_qs, 100)
-            raw_page = raw_paginator.page(1)
-            tab_raw = raw_page.object_list
+            tab_raw, raw_next_cursor = rawjob_list_page(raw_seed_qs)
             for raw_job in tab_raw:
                 raw_job.pipeline_row = build_rawjob_pipeline_row(raw_job)
-            raw_has_next = raw_page.has_next()
-            raw_next_page = raw_page.next_page_number() if raw_page.has_next() else None
-            raw_total_filtered = raw_paginator.count
+            raw_has_next = bool(raw_next_cursor)
+            raw_total_filtered = cached_rawjob_list_count(qs, request.GET)
 
         elif tab == 'pool':
             score_tab = request.GET.get('score', 'all')
@@ -1706,7 +1706,7 @@ class JobsPipelineView(LoginRequiredMixin, EmployeeRequiredMixin, View):
             'tab_jobs': tab_jobs,
             'tab_raw': tab_raw,
             'raw_has_next': raw_has_next if tab == "raw" else False,
-            'raw_next_page': raw_next_page if tab == "raw" else None,
+            'raw_next_cursor': raw_next_cursor if tab == "raw" else "",
             'raw_total_filtered': raw_total_filtered if tab == "raw" else 0,
             'vet_gate_summary': vet_gate_summary,
             'raw_country_code_options': (
@@ -10,16 +10,20 @@ Replaces the multi-call pipeline with:
 The old pipeline (services.py) is preserved for backward compatibility
 but new generation flows should use this engine.
 """
+import hashlib
 import json
 import re
 import time
 import logging
 import openai
 
+from django.core.cache import cache
 from django.utils import timezone
-from django.db.models import Sum
 
+from core.llm_throttle import LLMBudgetExceeded, estimate_tokens, in_task, llm_slot
+from core.llm_usage import CAP_REACHED_MESSAGE, monthly_cap_reached
 from core.models import LLMConfig, LLMUsageLog
+from jobs import jd_store
 from core.security import decrypt_value
 from core.llm_services import calculate_cost
 from .models import MasterPrompt
@@ -254,9 +258,9 @@ def preflight_check(job, consultant):
     Compare consultant skills against JD keywords.
     Returns dict with match_pct, matched, missing, warnings.
     """
-    from .services import extract_keywords
+    from .jd_analysis import analyze_job
 
-    jd_keywords = set(extract_keywords(job.description or "", max_keywords=50))
+    jd_keywords = analyze_job(job).keyword_set(50)
     consultant_skills = set()
     for skill in (consultant.skills or []):
         # Tokenize each skill into individual words for matching
@@ -278,6 +282,14 @@ def preflight_check(job, consultant):
     missing = jd_keywords - consultant_skills
     match_pct = round(len(matched) / len(jd_keywords) * 100) if jd_keywords else 0
 
+    # Required skills from the stored JD parse (read only; never parsed here)
+    required_missing = []
+    if jd_store.is_current(job):
+        for skill in jd_store.required_skills(job):
+            tokens = re.findall(r"[a-z0-9][a-z0-9+.#/-]{1,}", str(skill).lower())
+            if tokens and not all(t in consultant_skills for t in tokens):
+                required_missing.append(str(skill).lower())
+
     warnings = []
     if match_pct < 40:
         warnings.append(
@@ -294,6 +306,7 @@ def preflight_check(job, consultant):
         "matched": sorted(matched),
         "missing": sorted(missing),
         "jd_keyword_count": len(jd_keywords),
+        "required_missing": required_missing,
         "warnings": warnings,
     }
 
@@ -402,6 +415,44 @@ def build_candidate_input(consultant, sections=None, master=None, location=None)
     return "".join(parts)
 
 
+CANDIDATE_BLOCK_TTL = 6 * 3600
+HEADER_LOCATION_REF = "see RESUME HEADER LOCATION below"
+
+
+def candidate_cache_key(consultant, kind, master=None, sections=None):
+    """
+    Cache key for a serialised consultant block: changes whenever the profile
+    (updated_at, also bumped by experience/education/certification/user edits),
+    the master prompt or the selected input sections change.
+    """
+    updated = getattr(consultant, "updated_at", None)
+    version = f"{updated.timestamp():.6f}" if updated else "0"
+    master_version = (
+        f"{master.pk}-{master.updated_at.timestamp():.6f}" if master is not None and master.updated_at else "none"
+    )
+    sections_key = hashlib.md5(json.dumps(sections or {}, sort_keys=True).encode()).hexdigest()[:12]
+    return f"resumes:candidate:{kind}:{consultant.pk}:{version}:{master_version}:{sections_key}"
+
+
+def cached_candidate_input(consultant, sections=None, master=None):
+    """
+    build_candidate_input() with the per-job header location left out (it
+    points at HEADER_LOCATION_REF), memoised per profile / master prompt version.
+
+    Generating one consultant against many jobs then costs no profile queries
+    after the first job, and the system prompt + this block form a byte-identical
+    prompt prefix across jobs, which the provider's prompt cache can reuse.
+    """
+    if sections is None:
+        sections = merge_input_sections(master, None)
+    key = candidate_cache_key(consultant, "engine", master=master, sections=sections)
+    block = cache.get(key)
+    if block is None:
+        block = build_candidate_input(consultant, sections=sections, master=master, location=HEADER_LOCATION_REF)
+        cache.set(key, block, CANDIDATE_BLOCK_TTL)
+    return block
+
+
 def build_jd_input(job):
     """Build the JD input block matching the Master Prompt's INPUT 2 format."""
     return (
@@ -449,24 +500,22 @@ def generate_resume(job, consultant, actor=None, input_sections=None, coaching_k
     if not api_key or api_key.startswith('sk-your') or not config.generation_enabled:
         return None, 0, "Resume generation not available. Configure a valid OpenAI API key in Settings → LLM Config.", {}
 
-    # Check token cap
-    if config.monthly_token_cap:
-        month_start = timezone.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        total_month = LLMUsageLog.objects.filter(
-            created_at__gte=month_start
-        ).aggregate(total=Sum('total_tokens'))['total'] or 0
-        if total_month >= config.monthly_token_cap and config.auto_disable_on_cap:
-            config.generation_enabled = False
-            config.save()
-            return None, 0, "Monthly token cap reached. Generation disabled.", {}
+    # Check token cap (running counters, see core.llm_usage)
+    if monthly_cap_reached(config):
+        return None, 0, CAP_REACHED_MESSAGE, {}
 
     # Build prompts
     system_prompt = master.system_prompt
 
-    candidate_input = build_candidate_input(consultant, sections=effective_sections, master=master, location=resolved_location)
+    # Stable prefix first (system prompt, candidate block); everything job-specific follows
+    candidate_input = cached_candidate_input(consultant, sections=effective_sections, master=master)
     jd_input = build_jd_input(job)
 
-    user_prompt = candidate_input + "\n" + jd_input
+    user_prompt = candidate_input + "\n"
+    if effective_sections.get("personal", True):
+        header_location = resolved_location or getattr(consultant, 'preferred_location', '') or "Not provided"
+        user_prompt += f"RESUME HEADER LOCATION: {header_location}\n\n"
+    user_prompt += jd_input
     if coaching_keywords:
         kw = ", ".join([str(x).strip() for x in coaching_keywords if str(x).strip()][:24])
         if kw:
@@ -501,22 +550,24 @@ def generate_resume(job, consultant, actor=None, input_sections=None, coaching_k
     # Single LLM call
     client = openai.OpenAI(api_key=api_key)
     try:
-        start = time.time()
-        response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-            temperature=temperature,
-            max_tokens=max_tokens,
-        )
-        latency_ms = int((time.time() - start) * 1000)
+        with llm_slot(estimate_tokens(system_prompt, user_prompt, max_output_tokens=max_tokens)) as reservation:
+            start = time.time()
+            response = client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt},
+                ],
+                temperature=temperature,
+                max_tokens=max_tokens,
+            )
+            latency_ms = int((time.time() - start) * 1000)
 
-        content = response.choices[0].message.content
-        prompt_tokens = response.usage.prompt_tokens if response.usage else 0
-        completion_tokens = response.usage.completion_tokens if response.usage else 0
-        total_tokens = response.usage.total_tokens if response.usage else 0
+            content = response.choices[0].message.content
+            prompt_tokens = response.usage.prompt_tokens if response.usage else 0
+            completion_tokens = response.usage.completion_tokens if response.usage else 0
+            total_tokens = response.usage.total_tokens if response.usage else 0
+            reservation.settle(total_tokens)
 
         costs = calculate_cost(model, prompt_tokens, completion_tokens)
         LLMUsageLog.objects.create(
@@ -540,6 +591,10 @@ def generate_resume(job, consultant, actor=None, input_sections=None, coaching_k
         )
         return content, total_tokens, None, metadata
 
+    except LLMBudgetExceeded as e:
+        if in_task():
+            raise  # the task retries with e.retry_after
+        return None, 0, e.user_message(), metadata
     except Exception as e:
         LLMUsageLog.objects.create(
             request_type='master_resume_generation',
@@ -0,0 +1,224 @@
+"""
+Content-addressed cache for rendered resume exports (PDF / DOCX).
+
+An export is a pure function of (editor sections, template config, renderer
+version, format), so its sha256 over those inputs names the artifact. Rendered
+files live in media storage under EXPORT_DIR/<2-char shard>/<key>.<ext>:
+
+  - the export views serve the stored file (or render + store it on a miss),
+    send the key as a strong ETag and answer If-None-Match with 304;
+  - ResumeEditorSaveView calls schedule_prerender(), which queues one
+    prerender_resume_exports_task per draft per PRERENDER_DEBOUNCE_SECONDS
+    (autosave fires often), so the next download after an edit is already
+    rendered.
+
+Bulk / first-time exports go through build_export_bundle(), run by
+render_resume_exports_task on the RESUME_EXPORT_QUEUE Celery queue (its own
+prefork worker pool, see docker-compose.prod.yml): it renders every requested
+draft × format through the same cache, reports progress via
+core.task_progress and leaves one ZIP in media storage for ResumeExportBundleDownloadView.
+
+Bump RENDERER_VERSION whenever export_utils output changes so stale artifacts
+are never served. Old artifacts are unreferenced, not wrong;
+purge_stale_exports() expires them by age: files written more than a cutoff
+ago are deleted whether or not they were served since, and the next export of
+a still-current draft simply renders it again.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import tempfile
+import zipfile
+from datetime import timedelta
+from typing import Callable, Iterable
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile, File
+from django.core.files.storage import default_storage
+from django.utils import timezone
+
+from .export_utils import export_docx, export_pdf
+
+logger = logging.getLogger("apps.resumes.export_cache")
+
+RENDERER_VERSION = 1
+EXPORT_DIR = "resume_exports"
+BUNDLE_DIR = f"{EXPORT_DIR}/bundles"
+MAX_BUNDLE_DRAFTS = 500
+PRERENDER_DEBOUNCE_SECONDS = 30
+_PRERENDER_PENDING_KEY = "resumes:export-prerender:{pk}"
+
+FORMATS = {
+    "pdf": ("application/pdf", export_pdf),
+    "docx": ("application/vnd.openxmlformats-officedocument.wordprocessingml.document", export_docx),
+}
+
+
+def export_inputs(draft) -> tuple[dict, dict]:
+    """(sections, template config) an export of this draft renders from."""
+    from .models import ResumeTemplate
+    from .parser import parse_resume
+
+    state = getattr(draft, "editor_state", None)
+    sections = state.sections_json if state else parse_resume(draft.content or "")
+    tpl = (state.template if state and state.template else
+           ResumeTemplate.objects.filter(is_builtin=True).first())
+    return sections, (tpl.to_dict() if tpl else {})
+
+
+def export_filename(draft, ext: str, suffix: str = "") -> str:
+    consultant = draft.consultant.user.get_full_name() or draft.consultant.user.username
+    job_title = draft.job.title.replace(" ", "_")[:40]
+    return f"{consultant.replace(' ', '_')}_{job_title}_v{draft.version}{suffix}.{ext}"
+
+
+def artifact_key(sections: dict, tpl: dict, fmt: str) -> str:
+    payload = json.dumps(
+        {"f": fmt, "v": RENDERER_VERSION, "s": sections, "t": tpl},
+        sort_keys=True, separators=(",", ":"), default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def artifact_path(key: str, fmt: str) -> str:
+    return f"{EXPORT_DIR}/{key[:2]}/{key}.{fmt}"
+
+
+def get_or_render(sections: dict, tpl: dict, fmt: str, key: str | None = None) -> bytes:
+    """
+    Stored artifact bytes, rendering and storing them on a miss.
+
+    Renderer errors propagate (export_pdf raises ImportError without a PDF library).
+    """
+    key = key or artifact_key(sections, tpl, fmt)
+    path = artifact_path(key, fmt)
+    if default_storage.exists(path):
+        with default_storage.open(path, "rb") as fh:
+            return fh.read()
+    data = FORMATS[fmt][1](sections, tpl)
+    if not default_storage.exists(path):  # another worker may have raced us; content is identical
+        default_storage.save(path, ContentFile(data))
+    return data
+
+
+def prerender(draft, formats=("pdf", "docx")) -> dict:
+    """Render any missing artifacts for the draft's current state. Returns {fmt: key | error}."""
+    sections, tpl = export_inputs(draft)
+    done = {}
+    for fmt in formats:
+        key = artifact_key(sections, tpl, fmt)
+        try:
+            get_or_render(sections, tpl, fmt, key=key)
+            done[fmt] = key
+        except ImportError:
+            done[fmt] = "renderer unavailable"
+        except Exception as exc:
+            done[fmt] = f"error: {exc}"
+    return done
+
+
+def bundle_path(bundle_id: str) -> str:
+    return f"{BUNDLE_DIR}/{bundle_id}.zip"
+
+
+def build_export_bundle(
+    bundle_id: str,
+    draft_ids: Iterable[int],
+    formats: Iterable[str] = ("pdf", "docx"),
+    progress: Callable[[int, int, str], None] | None = None,
+) -> dict:
+    """
+    Render drafts × formats (through the artifact cache) into one ZIP at bundle_path(bundle_id).
+
+    PDFs fall back to print-ready HTML when no PDF library is installed; other
+    render errors are listed in the result rather than aborting the bundle.
+    Returns {"path", "files", "failed": [{"draft_id", "format", "error"}]}.
+    """
+    from .export_utils import export_pdf_html
+    from .models import ResumeDraft
+
+    formats = [f for f in formats if f in FORMATS] or ["pdf"]
+    wanted = list(dict.fromkeys(int(pk) for pk in draft_ids))[:MAX_BUNDLE_DRAFTS]
+    drafts = ResumeDraft.objects.select_related(
+        "consultant__user", "job", "editor_state__template"
+    ).in_bulk(wanted)
+    total = len(wanted) * len(formats)
+    done = 0
+    files = 0
+    failed: list[dict] = []
+    used_names: set[str] = set()
+
+    with tempfile.SpooledTemporaryFile(max_size=32 * 1024 * 1024) as tmp:
+        with zipfile.ZipFile(tmp, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            for pk in wanted:
+                draft = drafts.get(pk)
+                if draft is None:
+                    failed.append({"draft_id": pk, "format": "*", "error": "not found"})
+                    done += len(formats)
+                    continue
+                sections, tpl = export_inputs(draft)
+                for fmt in formats:
+                    name = export_filename(draft, fmt)
+                    try:
+                        data = get_or_render(sections, tpl, fmt)
+                    except ImportError:
+                        data = export_pdf_html(sections, tpl).encode("utf-8")
+                        name = export_filename(draft, "html", "_print")
+                    except Exception as exc:
+                        failed.append({"draft_id": pk, "format": fmt, "error": str(exc)[:300]})
+                        data = None
+                    if data is not None:
+                        if name in used_names:
+                            name = f"{draft.pk}_{name}"
+                        used_names.add(name)
+                        zf.writestr(name, data)
+                        files += 1
+                    done += 1
+                    if progress:
+                        progress(done, total, f"Rendered {done}/{total} file(s)")
+        tmp.seek(0)
+        path = bundle_path(bundle_id)
+        if default_storage.exists(path):
+            default_storage.delete(path)
+        default_storage.save(path, File(tmp, name=f"{bundle_id}.zip"))  # streamed in chunks, never copied whole
+    return {"path": path, "files": files, "failed": failed}
+
+
+def schedule_prerender(draft_id: int) -> None:
+    """Queue a prerender of the draft's exports, at most once per PRERENDER_DEBOUNCE_SECONDS."""
+    if not cache.add(_PRERENDER_PENDING_KEY.format(pk=draft_id), True, timeout=PRERENDER_DEBOUNCE_SECONDS * 2):
+        return
+    from .tasks import prerender_resume_exports_task
+
+    try:
+        prerender_resume_exports_task.apply_async(args=[draft_id], countdown=PRERENDER_DEBOUNCE_SECONDS)
+    except Exception:
+        cache.delete(_PRERENDER_PENDING_KEY.format(pk=draft_id))
+        logger.exception("Could not queue export prerender for draft %s", draft_id)
+
+
+def clear_prerender_pending(draft_id: int) -> None:
+    cache.delete(_PRERENDER_PENDING_KEY.format(pk=draft_id))
+
+
+def purge_stale_exports(older_than_days: int = 30) -> int:
+    """Delete artifacts written more than `older_than_days` ago (age-based, not last access). Returns files removed."""
+    cutoff = timezone.now() - timedelta(days=older_than_days)
+    removed = 0
+    try:
+        shards, _ = default_storage.listdir(EXPORT_DIR)
+    except (FileNotFoundError, NotImplementedError):
+        return 0
+    for shard in shards:
+        _, files = default_storage.listdir(f"{EXPORT_DIR}/{shard}")
+        for name in files:
+            path = f"{EXPORT_DIR}/{shard}/{name}"
+            try:
+                if default_storage.get_modified_time(path) < cutoff:
+                    default_storage.delete(path)
+                    removed += 1
+            except (FileNotFoundError, NotImplementedError):
+                continue
+    return removed
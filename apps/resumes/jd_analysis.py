@@ -0,0 +1,121 @@
+"""
+One keyword analysis per job description, shared by ATS scoring and the
+generation helpers.
+
+score_ats, preflight_check, _collect_method_keywords, _apply_jd_alignment_rules
+and the skills extractor all used to re-tokenise the same JD within one
+generation (and again for every draft scored against it). analyze_jd() runs
+the tokeniser once per description and keeps the result:
+
+  - per process, in an LRU keyed by the description's sha256 (ANALYSIS_VERSION
+    is part of the key, bump it when the tokeniser or STOPWORDS change);
+  - on the Job instance (analyze_job), so one generation never hashes the
+    description twice.
+
+skills_extractor.extract_required_terms_from_jd keeps its LLM answer in the
+shared Django cache under the same hash (REQUIRED_TERMS_KEY), so
+auto-generating dozens of drafts for one job makes that call once.
+
+Scoring intersects the JD keyword set with the resume's token set, so a
+keyword only matches whole tokens ("java" no longer matches "javascript").
+"""
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+ANALYSIS_VERSION = 1
+MAX_KEYWORDS = 400           # largest max_keywords any caller asks extract_keywords for
+SCORE_KEYWORDS = 200         # score_ats' historic extract_keywords default
+PHRASE_N = 4
+MEMO_SIZE = 512
+REQUIRED_TERMS_TTL = 7 * 24 * 3600
+REQUIRED_TERMS_KEY = "resumes:jd-required-terms:{digest}"
+
+_TOKEN_RE = re.compile(r"[A-Za-z0-9][A-Za-z0-9+./#_-]{1,}")
+_EDGE_PUNCT = "./-_"
+
+
+def jd_digest(text: str) -> str:
+    return hashlib.sha256(f"{ANALYSIS_VERSION}\n{text or ''}".encode("utf-8")).hexdigest()
+
+
+def _match_form(token: str) -> str:
+    """Token as compared when scoring ("python." at a sentence end == "python")."""
+    return token.strip(_EDGE_PUNCT)
+
+
+def resume_token_set(text: str) -> set[str]:
+    return {_match_form(t) for t in _TOKEN_RE.findall((text or "").lower())}
+
+
+@dataclass(frozen=True)
+class JDAnalysis:
+    digest: str
+    keywords: tuple[str, ...]        # extract_keywords(text, MAX_KEYWORDS), in JD order
+    tokens: tuple[str, ...]          # stopword-filtered tokens (phrase matching)
+    phrases: frozenset[str]          # PHRASE_N-grams over tokens
+    score_terms: frozenset[str]      # match forms of the first SCORE_KEYWORDS keywords
+
+    def top_keywords(self, n: int) -> list[str]:
+        """Same list as extract_keywords(text, max_keywords=n) for n <= MAX_KEYWORDS."""
+        return list(self.keywords[:n])
+
+    def keyword_set(self, n: int = MAX_KEYWORDS) -> set[str]:
+        return set(self.keywords[:n])
+
+    def score(self, resume_text: str) -> int:
+        """Percent of JD keywords present as tokens of the resume (0–100)."""
+        if not self.score_terms or not resume_text:
+            return 0
+        matched = self.score_terms & resume_token_set(resume_text)
+        return min(100, int(len(matched) / len(self.score_terms) * 100))
+
+
+def _build(text: str, digest: str) -> JDAnalysis:
+    from .services import _phrase_tokens, extract_keywords
+
+    keywords = tuple(extract_keywords(text, max_keywords=MAX_KEYWORDS))
+    tokens = tuple(_phrase_tokens(text))
+    phrases = frozenset(" ".join(tokens[i:i + PHRASE_N]) for i in range(len(tokens) - PHRASE_N + 1))
+    score_terms = frozenset(filter(None, (_match_form(k) for k in keywords[:SCORE_KEYWORDS])))
+    return JDAnalysis(digest, keywords, tokens, phrases, score_terms)
+
+
+_memo: OrderedDict[str, JDAnalysis] = OrderedDict()
+_memo_lock = threading.Lock()
+
+
+def analyze_jd(text: str) -> JDAnalysis:
+    """Analysis of a JD text, memoised per process by content hash."""
+    digest = jd_digest(text)
+    with _memo_lock:
+        found = _memo.get(digest)
+        if found is not None:
+            _memo.move_to_end(digest)
+            return found
+    analysis = _build(text or "", digest)
+    with _memo_lock:
+        _memo[digest] = analysis
+        if len(_memo) > MEMO_SIZE:
+            _memo.popitem(last=False)
+    return analysis
+
+
+def analyze_job(job) -> JDAnalysis:
+    """analyze_jd(job.description), kept on the instance until the description changes."""
+    text = job.description or ""
+    cached = getattr(job, "_jd_analysis", None)
+    if cached is not None and cached[0] == text:
+        return cached[1]
+    analysis = analyze_jd(text)
+    job._jd_analysis = (text, analysis)
+    return analysis
+
+
+def clear_jd_analysis_memo() -> None:
+    with _memo_lock:
+        _memo.clear()
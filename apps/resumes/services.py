@@ -5,8 +5,6 @@ import json
 import logging
 import datetime
 from django.utils.html import strip_tags
-from django.utils import timezone
-from django.db.models import Sum
 from docx import Document
 from docx.shared import Pt, Inches
 from docx.enum.text import WD_ALIGN_PARAGRAPH
@@ -40,6 +38,8 @@ from .prompt_strings import (
     BUILD_PROMPT_REQUIRED_SECTIONS,
 )
 from django.utils.html import strip_tags
+from core.llm_throttle import LLMBudgetExceeded, estimate_tokens, in_task, llm_slot
+from core.llm_usage import CAP_REACHED_MESSAGE, monthly_cap_reached
 from core.models import LLMConfig, LLMUsageLog, PlatformConfig
 from core.security import decrypt_value
 from core.llm_services import calculate_cost
@@ -119,6 +119,10 @@ def _phrase_tokens(text):
 
 
 def _build_jd_phrase_set(jd_text, n=4):
+    from .jd_analysis import PHRASE_N, analyze_jd
+
+    if n == PHRASE_N:
+        return analyze_jd(jd_text or "").phrases
     tokens = _phrase_tokens(jd_text)
     phrases = set()
     for i in range(len(tokens) - n + 1):
@@ -145,9 +149,7 @@ def _humanize_bullet(line):
 
 
 def _apply_jd_alignment_rules(bullets, jd_text, max_keyword_reuse=2):
-    jd_keywords = set(extract_keywords(jd_text or "", max_keywords=40))
     jd_phrase_set = _build_jd_phrase_set(jd_text or "", n=4)
-    keyword_use = {k: 0 for k in jd_keywords}
     out = []
 
     # First pass: humanize and count keyword presence
@@ -166,17 +168,12 @@ def _apply_jd_alignment_rules(bullets, jd_text, max_keyword_reuse=2):
 
 
 def score_ats(jd_text, resume_text):
+    """Percent of JD keywords found in the resume (see jd_analysis.JDAnalysis.score)."""
+    from .jd_analysis import analyze_jd
+
     if not jd_text or not resume_text:
         return 0
-    keywords = extract_keywords(jd_text)
-    if not keywords:
-        return 0
-    content = resume_text.lower()
-    matched = [k for k in keywords if k in content]
-    score = int((len(matched) / len(keywords)) * 100)
-    if score > 100:
-        score = 100
-    return score
+    return analyze_jd(jd_text).score(resume_text)
 
 
 def validate_resume(content):
@@ -489,12 +486,14 @@ def _jd_requires_metrics(job):
 
 
 def _collect_method_keywords(job, consultant):
+    from .jd_analysis import analyze_job
+
     keywords = set()
     for s in (consultant.skills or []):
         s = s.strip().lower()
         if len(s) >= 3:
             keywords.add(s)
-    for k in extract_keywords(job.description or "", max_keywords=30):
+    for k in analyze_job(job).top_keywords(30):
         if len(k) >= 4:
             keywords.add(k.lower())
     return keywords
@@ -1449,8 +1448,16 @@ class LLMService:
         else:
             self.client = None
 
-    def _build_prompt(self, job, consultant, prompt_override=None):
-        """Build the user prompt from template or default."""
+    def _consultant_block(self, consultant):
+        """Consultant half of the user prompt; memoised per profile version (see engine.candidate_cache_key)."""
+        from django.core.cache import cache
+        from .engine import CANDIDATE_BLOCK_TTL, candidate_cache_key
+
+        key = candidate_cache_key(consultant, "legacy")
+        block = cache.get(key)
+        if block is not None:
+            return block
+
         # Gather contact info
         contact_name = consultant.user.get_full_name() or consultant.user.username
         contact_email = consultant.user.email or "Not provided."
@@ -1475,24 +1482,13 @@ class LLMService:
         certs = consultant.certifications.all()
         cert_summary = ", ".join(c.name for c in certs) or "None listed."
 
-        input_summary = (
-            f"Job: {job.title} @ {job.company}\n"
-            f"Job Location: {job.location or 'Not provided.'}\n"
-            f"Consultant: {contact_name}\n"
-            f"Email: {contact_email}\n"
-            f"Phone: {contact_phone}\n"
-            f"Experience:\n{exp_summary}\n"
-            f"Education:\n{edu_summary}\n"
-            f"Certifications: {cert_summary}\n"
-        )
-
         base_section = (
             BUILD_PROMPT_BASE_SECTION_WITH.format(base_resume_text=base_resume_text)
             if base_resume_text.strip()
             else BUILD_PROMPT_BASE_SECTION_WITHOUT
         )
 
-        return (
+        block = (
             f"Consultant Name: {contact_name}\n"
             f"Consultant Email: {contact_email}\n"
             f"Consultant Phone: {contact_phone}\n"
@@ -1502,6 +1498,14 @@ class LLMService:
             f"Experience:\n{exp_summary}\n"
             f"Education:\n{edu_summary}\n"
             f"Certifications: {cert_summary}\n\n"
+        )
+        cache.set(key, block, CANDIDATE_BLOCK_TTL)
+        return block
+
+    def _build_prompt(self, job, consultant, prompt_override=None):
+        """Build the user prompt: cached consultant block (stable prefix), then the target job."""
+        return (
+            f"{self._consultant_block(consultant)}"
             f"--- TARGET JOB ---\n"
             f"Title: {job.title}\n"
             f"Company: {job.company}\n"
@@ -1536,15 +1540,8 @@ class LLMService:
             )
             return mock, 0, None
 
-        if self.config.monthly_token_cap:
-            month_start = timezone.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-            total_month_tokens = LLMUsageLog.objects.filter(created_at__gte=month_start).aggregate(
-                total=Sum('total_tokens')
-            )['total'] or 0
-            if total_month_tokens >= self.config.monthly_token_cap and self.config.auto_disable_on_cap:
-                self.config.generation_enabled = False
-                self.config.save()
-                return None, 0, "Monthly token cap reached. Generation disabled."
+        if monthly_cap_reached(self.config):
+            return None, 0, CAP_REACHED_MESSAGE
 
         request_payload = {
             "model": self.config.active_model or "gpt-4o-mini",
@@ -1556,19 +1553,22 @@ class LLMService:
             "max_tokens": self.config.max_output_tokens,
         }
 
+        estimate = estimate_tokens(system_prompt, prompt_text, max_output_tokens=self.config.max_output_tokens)
         try:
-            start = time.time()
-            response = self.client.chat.completions.create(
-                model=request_payload["model"],
-                messages=request_payload["messages"],
-                temperature=request_payload["temperature"],
-                max_tokens=request_payload["max_tokens"],
-            )
-            latency_ms = int((time.time() - start) * 1000)
-            content = response.choices[0].message.content
-            prompt_tokens = response.usage.prompt_tokens if response.usage else 0
-            completion_tokens = response.usage.completion_tokens if response.usage else 0
-            tokens = response.usage.total_tokens if response.usage else 0
+            with llm_slot(estimate) as reservation:
+                start = time.time()
+                response = self.client.chat.completions.create(
+                    model=request_payload["model"],
+                    messages=request_payload["messages"],
+                    temperature=request_payload["temperature"],
+                    max_tokens=request_payload["max_tokens"],
+                )
+                latency_ms = int((time.time() - start) * 1000)
+                content = response.choices[0].message.content
+                prompt_tokens = response.usage.prompt_tokens if response.usage else 0
+                completion_tokens = response.usage.completion_tokens if response.usage else 0
+                tokens = response.usage.total_tokens if response.usage else 0
+                reservation.settle(tokens)
             costs = calculate_cost(self.config.active_model, prompt_tokens, completion_tokens)
             LLMUsageLog.objects.create(
                 model_name=self.config.active_model,
@@ -1589,6 +1589,10 @@ class LLMService:
                 actor=actor,
             )
             return content, tokens, None
+        except LLMBudgetExceeded as e:
+            if in_task():
+                raise  # the task retries with e.retry_after
+            return None, 0, e.user_message()
         except Exception as e:
             LLMUsageLog.objects.create(
                 model_name=self.config.active_model,
@@ -1636,15 +1640,8 @@ class LLMService:
             )
             return mock, 0, None
 
-        if self.config.monthly_token_cap:
-            month_start = timezone.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-            total_month_tokens = LLMUsageLog.objects.filter(created_at__gte=month_start).aggregate(
-                total=Sum('total_tokens')
-            )['total'] or 0
-            if total_month_tokens >= self.config.monthly_token_cap and self.config.auto_disable_on_cap:
-                self.config.generation_enabled = False
-                self.config.save()
-                return None, 0, "Monthly token cap reached. Generation disabled."
+        if monthly_cap_reached(self.config):
+            return None, 0, CAP_REACHED_MESSAGE
 
         temperature = float(self.config.temperature)
         if temperature_override is not None:
@@ -1660,19 +1657,22 @@ class LLMService:
             "max_tokens": self.config.max_output_tokens,
         }
 
+        estimate = estimate_tokens(system_prompt, user_prompt, max_output_tokens=self.config.max_output_tokens)
         try:
-            start = time.time()
-            response = self.client.chat.completions.create(
-                model=request_payload["model"],
-                messages=request_payload["messages"],
-                temperature=request_payload["temperature"],
-                max_tokens=request_payload["max_tokens"],
-            )
-            latency_ms = int((time.time() - start) * 1000)
-            content = response.choices[0].message.content
-            prompt_tokens = response.usage.prompt_tokens if response.usage else 0
-            completion_tokens = response.usage.completion_tokens if response.usage else 0
-            tokens = response.usage.total_tokens if response.usage else 0
+            with llm_slot(estimate) as reservation:
+                start = time.time()
+                response = self.client.chat.completions.create(
+                    model=request_payload["model"],
+                    messages=request_payload["messages"],
+                    temperature=request_payload["temperature"],
+                    max_tokens=request_payload["max_tokens"],
+                )
+                latency_ms = int((time.time() - start) * 1000)
+                content = response.choices[0].message.content
+                prompt_tokens = response.usage.prompt_tokens if response.usage else 0
+                completion_tokens = response.usage.completion_tokens if response.usage else 0
+                tokens = response.usage.total_tokens if response.usage else 0
+                reservation.settle(tokens)
             costs = calculate_cost(self.config.active_model, prompt_tokens, completion_tokens)
             LLMUsageLog.objects.create(
                 model_name=self.config.active_model,
@@ -1693,6 +1693,10 @@ class LLMService:
                 actor=actor,
             )
             return content, tokens, None
+        except LLMBudgetExceeded as e:
+            if in_task():
+                raise  # the task retries with e.retry_after
+            return None, 0, e.user_message()
         except Exception as e:
             LLMUsageLog.objects.create(
                 model_name=self.config.active_model,
@@ -2,6 +2,9 @@ import json
 import re
 from typing import Dict, List, Tuple
 
+from django.core.cache import cache
+
+from .jd_analysis import REQUIRED_TERMS_KEY, REQUIRED_TERMS_TTL, analyze_jd, jd_digest
 from .services import LLMService
 from .services import extract_keywords
 from .prompt_strings import (
@@ -15,6 +18,12 @@ def extract_required_terms_from_jd(jd_text: str) -> List[str]:
     if not jd_text.strip():
         return []
 
+    # LLM answers are cached per JD hash; the keyword fallback is cheap and never cached
+    cache_key = REQUIRED_TERMS_KEY.format(digest=jd_digest(jd_text))
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return list(cached)
+
     llm = LLMService()
     if llm.client:
         system_prompt = REQUIRED_TERMS_SYSTEM_PROMPT
@@ -24,12 +33,14 @@ def extract_required_terms_from_jd(jd_text: str) -> List[str]:
             try:
                 data = json.loads(content)
                 if isinstance(data, list):
-                    return [str(x).strip().lower() for x in data if str(x).strip()]
+                    terms = [str(x).strip().lower() for x in data if str(x).strip()]
+                    cache.set(cache_key, terms, timeout=REQUIRED_TERMS_TTL)
+                    return terms
             except Exception:
                 pass
 
     # Fallback: keyword extraction only (no hardcoded list)
-    return extract_keywords(jd_text, max_keywords=40)
+    return analyze_jd(jd_text).top_keywords(40)
 
 
 def _normalize_line(line: str) -> str:
@@ -97,7 +108,7 @@ def _skills_validate_block(skills: Dict[str, List[str]]) -> Tuple[bool, List[str
 
 def _skills_only_from_jd(skills: Dict[str, List[str]], jd_text: str) -> Dict[str, List[str]]:
     jd_lower = (jd_text or "").lower()
-    jd_terms = set(extract_keywords(jd_text or "", max_keywords=400))
+    jd_terms = analyze_jd(jd_text or "").keyword_set(400)
     cleaned: Dict[str, List[str]] = {}
     for category, items in skills.items():
         kept = []
@@ -121,13 +132,14 @@ def _format_skills_block(skills: Dict[str, List[str]]) -> str:
 
 def _skills_only_from_experience(skills: Dict[str, List[str]], exp_text: str) -> Dict[str, List[str]]:
     exp_lower = (exp_text or "").lower()
+    exp_terms = set(extract_keywords(exp_text, max_keywords=400))
     cleaned: Dict[str, List[str]] = {}
     for category, items in skills.items():
         kept = []
         for item in items:
             item_l = item.lower()
             tokens = set(extract_keywords(item, max_keywords=40))
-            if item_l in exp_lower or tokens & set(extract_keywords(exp_text, max_keywords=400)):
+            if item_l in exp_lower or tokens & exp_terms:
                 kept.append(item)
         if kept:
             cleaned[category] = kept
@@ -510,7 +522,7 @@ def generate_skills_from_jd(job, required_terms=None, consultant=None) -> str:
 
     def _build_lines_from_map(source_map: Dict[str, List[str]], min_items: int) -> List[str]:
         lines_out = ["SKILLS"]
-        jd_terms = set(extract_keywords(jd_text, max_keywords=400))
+        jd_terms = analyze_jd(jd_text).keyword_set(400)
         exp_terms = set(extract_keywords(exp_text, max_keywords=400)) if exp_text else set()
         for category, values in source_map.items():
             values = [_normalize_item(v) for v in values]
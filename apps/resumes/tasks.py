@@ -6,18 +6,182 @@ Pipeline: Vetted Job → Marketing Role Match → Auto-Generate Resume
 When jobs are synced to the vet pool, they get marketing_roles assigned.
 Consultants also have marketing_roles. This task matches them and generates
 tailored resumes for each consultant-job pair automatically.
+
+The orchestrators only find the pairs; each pair is generated by its own
+generate_auto_draft_task, fanned out as a Celery chord whose callback logs
+the totals. Concurrent LLM calls across all workers are bounded by
+core.llm_throttle (LLM_BACKGROUND_CONCURRENCY of the LLM_MAX_CONCURRENCY
+slots, LLM_TOKENS_PER_MINUTE), which keeps a slot free for interactive calls;
+a worker that finds the budget exhausted retries later instead of blocking.
+
+Every pair has a deterministic idempotency key (auto_draft_key) stored as the
+draft's generation_id, so re-dispatching a pair or retrying a worker reuses the
+same ResumeDraft row instead of creating v2, v3, ...
 """
 
 from __future__ import annotations
 
 import logging
+import random
+import uuid
 from typing import Optional
 
-from celery import shared_task
+from celery import chord, shared_task
+from django.db import IntegrityError, transaction
 from django.utils import timezone
 
 logger = logging.getLogger("apps.resumes.tasks")
 
+AUTO_DRAFT_NAMESPACE = uuid.UUID("5b8f0c1e-7d4a-4c39-9a1e-2f6b8d3c4e71")
+AUTO_DRAFT_LEASE_SECONDS = 15 * 60   # one worker per pair at a time
+AUTO_DRAFT_TOKEN_ESTIMATE = 8000     # reserved against the per-minute budget, settled with real usage
+AUTO_DRAFT_MAX_RETRIES = 30
+
+
+def auto_draft_key(consultant_id: int, job_id: int) -> uuid.UUID:
+    """Idempotency key for the auto-generated draft of one consultant × job pair."""
+    return uuid.uuid5(AUTO_DRAFT_NAMESPACE, f"auto-draft:{consultant_id}:{job_id}")
+
+
+def _claim_auto_draft(consultant, job):
+    """
+    (draft, created) for the pair's idempotency key. New drafts start PROCESSING.
+
+    Returns (None, False) when a manual draft grabbed the same version concurrently.
+    """
+    from resumes.models import ResumeDraft
+
+    try:
+        with transaction.atomic():
+            return ResumeDraft.objects.get_or_create(
+                generation_id=auto_draft_key(consultant.pk, job.pk),
+                defaults={
+                    "consultant": consultant,
+                    "job": job,
+                    "status": ResumeDraft.Status.PROCESSING,
+                    "auto_generated": True,
+                },
+            )
+    except IntegrityError:
+        return None, False
+
+
+def _finish_draft(draft, job, content, tokens, error, metadata) -> bool:
+    """Store a generation result on a claimed draft. Returns True when a resume was produced."""
+    from resumes.models import ResumeDraft
+
+    if error:
+        draft.status = ResumeDraft.Status.ERROR
+        draft.error_message = (error or "")[:500]
+        draft.save(update_fields=["status", "error_message"])
+        return False
+
+    from resumes.services import validate_resume, score_ats
+
+    errors_list, warnings_list = validate_resume(content or "")
+    draft.status = ResumeDraft.Status.REVIEW if errors_list else ResumeDraft.Status.DRAFT
+    draft.content = content or ""
+    draft.tokens_used = tokens
+    draft.ats_score = score_ats(job.description or "", content or "")
+    draft.validation_errors = errors_list
+    draft.validation_warnings = warnings_list
+    draft.llm_system_prompt = metadata.get("system_prompt", "")
+    draft.llm_user_prompt = metadata.get("user_prompt", "")
+    draft.llm_input_summary = metadata.get("input_sections", {})
+    draft.error_message = ""
+    draft.save(update_fields=[
+        "status", "content", "tokens_used", "ats_score", "validation_errors", "validation_warnings",
+        "llm_system_prompt", "llm_user_prompt", "llm_input_summary", "error_message",
+    ])
+    return True
+
+
+@shared_task(
+    bind=True,
+    name="resumes.generate_auto_draft",
+    max_retries=AUTO_DRAFT_MAX_RETRIES,
+    soft_time_limit=600,
+    time_limit=660,
+)
+def generate_auto_draft_task(self, consultant_id: int, job_id: int):
+    """
+    Generate the auto draft for one consultant × job pair (idempotent).
+
+    Returns {"consultant_id", "job_id", "status": generated|failed|skipped, "draft_id"}.
+    """
+    from core.llm_throttle import LLMBudgetExceeded, llm_slot
+    from core.shared_state import add_flag, delete_flag
+    from jobs.models import Job
+    from users.models import ConsultantProfile
+    from resumes.models import ResumeDraft
+    from resumes.engine import generate_resume
+
+    result = {"consultant_id": consultant_id, "job_id": job_id, "status": "skipped", "draft_id": None}
+    try:
+        consultant = ConsultantProfile.objects.select_related("user").get(pk=consultant_id)
+        job = Job.objects.get(pk=job_id)
+    except (ConsultantProfile.DoesNotExist, Job.DoesNotExist):
+        return result
+
+    draft, _created = _claim_auto_draft(consultant, job)
+    if draft is None or draft.status != ResumeDraft.Status.PROCESSING:
+        return result  # already generated (or failed) by an earlier attempt
+    result["draft_id"] = draft.pk
+
+    # Shared state, not the per-process cache: the lease must hold across every worker process.
+    lease_key = f"resumes:auto-draft:{draft.generation_id}"
+    if not add_flag(lease_key, AUTO_DRAFT_LEASE_SECONDS):
+        return result  # another worker is generating this pair right now
+
+    try:
+        try:
+            with llm_slot(estimated_tokens=AUTO_DRAFT_TOKEN_ESTIMATE) as reservation:
+                content, tokens, error, metadata = generate_resume(job=job, consultant=consultant, actor=None)
+                reservation.settle(tokens)
+        except LLMBudgetExceeded as exc:
+            if self.request.retries >= self.max_retries:
+                content, tokens, error, metadata = None, 0, f"LLM budget unavailable: {exc}", {}
+            else:
+                delete_flag(lease_key)
+                raise self.retry(exc=exc, countdown=exc.retry_after + random.randint(0, 10))
+        except Exception as exc:
+            logger.error(
+                "Exception generating resume for consultant %s × job %s: %s",
+                consultant_id, job_id, exc,
+            )
+            content, tokens, error, metadata = None, 0, str(exc), {}
+
+        if _finish_draft(draft, job, content, tokens, error, metadata):
+            result["status"] = "generated"
+            logger.info(
+                "Auto-generated resume draft %s for consultant %s × job %s (ATS: %s)",
+                draft.pk, consultant_id, job_id, draft.ats_score,
+            )
+        else:
+            result["status"] = "failed"
+            logger.warning("Resume gen error for consultant %s × job %s: %s", consultant_id, job_id, error)
+    finally:
+        delete_flag(lease_key)
+    return result
+
+
+@shared_task(name="resumes.auto_generate_summary")
+def summarize_auto_drafts_task(results, context: Optional[dict] = None):
+    """Chord callback: tally the per-pair results of one fan-out."""
+    summary = dict(context or {})
+    for key in ("generated", "failed", "skipped"):
+        summary[key] = sum(1 for r in results or [] if (r or {}).get("status") == key)
+    logger.info("auto draft fan-out complete: %s", summary)
+    return summary
+
+
+def _dispatch_pairs(pairs: list[tuple[int, int]], context: dict):
+    """Fan pairs out to generate_auto_draft_task; returns the chord result (None when empty)."""
+    if not pairs:
+        return None
+    header = [generate_auto_draft_task.s(consultant_id, job_id) for consultant_id, job_id in pairs]
+    return chord(header)(summarize_auto_drafts_task.s(context))
+
 
 # ── Auto-match & generate for newly vetted jobs ──────────────────────────────
 
@@ -41,8 +205,11 @@ def auto_generate_for_new_jobs_task(
     Flow:
         1. Find jobs that are in POOL status with marketing_roles but no resume drafts yet
         2. For each job, find active consultants whose marketing_roles overlap
-        3. For each consultant-job pair, generate a resume via the LLM engine
-        4. Save as ResumeDraft with status=DRAFT (or ERROR on failure)
+        3. Fan each new consultant-job pair out to generate_auto_draft_task
+        4. Each worker saves its ResumeDraft with status=DRAFT (or ERROR on failure)
+
+    Returns immediately after dispatch; summary_task_id is the chord callback
+    whose result holds the generated/failed/skipped totals.
 
     Args:
         job_ids:   Specific Job PKs to process (None = all unprocessed)
@@ -52,7 +219,6 @@ def auto_generate_for_new_jobs_task(
     from jobs.models import Job
     from users.models import ConsultantProfile
     from resumes.models import ResumeDraft
-    from resumes.engine import generate_resume
 
     # Step 1: Find eligible jobs
     qs = Job.objects.filter(
@@ -83,9 +249,8 @@ def auto_generate_for_new_jobs_task(
         return {
             "processed_jobs": 0,
             "total_pairs": 0,
-            "generated": 0,
+            "queued": 0,
             "skipped": 0,
-            "failed": 0,
             "dry_run": dry_run,
         }
 
@@ -93,151 +258,77 @@ def auto_generate_for_new_jobs_task(
     active_consultants = list(
         ConsultantProfile.objects.filter(
             status__in=[ConsultantProfile.Status.ACTIVE, ConsultantProfile.Status.BENCH],
-        ).prefetch_related("marketing_roles")
+        ).select_related("user").prefetch_related("marketing_roles")
     )
 
-    if not active_consultants:
+    # Build consultant → role slug set for fast matching
+    consultant_roles: dict[int, set[str]] = {}
+    for c in active_consultants:
+        slugs = {role.slug for role in c.marketing_roles.all()}
+        if slugs:
+            consultant_roles[c.pk] = slugs
+
+    if not consultant_roles:
         logger.info("auto_generate_for_new_jobs: no active consultants with marketing roles")
         return {
             "processed_jobs": total_jobs,
             "total_pairs": 0,
-            "generated": 0,
+            "queued": 0,
             "skipped": 0,
-            "failed": 0,
             "dry_run": dry_run,
         }
 
-    # Build consultant → role slug set for fast matching
-    consultant_roles: dict[int, set[str]] = {}
-    for c in active_consultants:
-        slugs = set(c.marketing_roles.values_list("slug", flat=True))
-        if slugs:
-            consultant_roles[c.pk] = slugs
+    # Pairs that already have a draft are skipped — except auto drafts still
+    # PROCESSING (an earlier fan-out died mid-way), which are re-dispatched.
+    existing_pairs = set(
+        ResumeDraft.objects.filter(job__in=jobs, consultant_id__in=consultant_roles)
+        .exclude(auto_generated=True, status=ResumeDraft.Status.PROCESSING)
+        .values_list("consultant_id", "job_id")
+    )
 
-    generated = 0
+    pairs: list[tuple[int, int]] = []
     skipped = 0
-    failed = 0
     pairs_found = 0
-
-    for job_idx, job in enumerate(jobs):
-        job_role_slugs = set(job.marketing_roles.values_list("slug", flat=True))
+    for job in jobs:
+        job_role_slugs = {role.slug for role in job.marketing_roles.all()}
         if not job_role_slugs:
             continue
-
-        # Find matching consultants
-        matched_consultants = []
-        for c in active_consultants:
-            c_slugs = consultant_roles.get(c.pk, set())
-            if c_slugs & job_role_slugs:  # intersection
-                matched_consultants.append(c)
-
-        for consultant in matched_consultants:
+        for consultant in active_consultants:
+            if not (consultant_roles.get(consultant.pk, set()) & job_role_slugs):
+                continue
             pairs_found += 1
-
-            # Check if draft already exists for this pair
-            existing = ResumeDraft.objects.filter(
-                consultant=consultant,
-                job=job,
-            ).first()
-            if existing:
+            if (consultant.pk, job.pk) in existing_pairs:
                 skipped += 1
                 continue
-
             if dry_run:
-                generated += 1  # would generate
                 logger.info(
                     "DRY RUN: Would generate resume for consultant %s (%s) × job %s (%s @ %s)",
                     consultant.pk, consultant.user.get_full_name(),
                     job.pk, job.title, job.company,
                 )
-                continue
-
-            # Generate resume
-            try:
-                content, tokens, error, metadata = generate_resume(
-                    job=job,
-                    consultant=consultant,
-                    actor=None,
-                )
-                if error:
-                    draft = ResumeDraft.objects.create(
-                        consultant=consultant,
-                        job=job,
-                        version=1,
-                        status=ResumeDraft.Status.ERROR,
-                        error_message=(error or "")[:500],
-                        auto_generated=True,
-                    )
-                    logger.warning(
-                        "Resume gen error for consultant %s × job %s: %s",
-                        consultant.pk, job.pk, error,
-                    )
-                    failed += 1
-                else:
-                    # Run validation
-                    from resumes.services import validate_resume, score_ats
-                    errors_list, warnings_list = validate_resume(content or "")
-                    ats = score_ats(job.description or "", content or "")
-
-                    draft = ResumeDraft.objects.create(
-                        consultant=consultant,
-                        job=job,
-                        version=1,
-                        status=ResumeDraft.Status.REVIEW if errors_list else ResumeDraft.Status.DRAFT,
-                        content=content or "",
-                        tokens_used=tokens,
-                        ats_score=ats,
-                        validation_errors=errors_list,
-                        validation_warnings=warnings_list,
-                        llm_system_prompt=metadata.get("system_prompt", ""),
-                        llm_user_prompt=metadata.get("user_prompt", ""),
-                        llm_input_summary=metadata.get("input_sections", {}),
-                        auto_generated=True,
-                    )
-                    generated += 1
-                    logger.info(
-                        "Auto-generated resume draft %s for consultant %s × job %s (ATS: %s)",
-                        draft.pk, consultant.pk, job.pk, ats,
-                    )
-
-            except Exception as exc:
-                logger.error(
-                    "Exception generating resume for consultant %s × job %s: %s",
-                    consultant.pk, job.pk, exc,
-                )
-                try:
-                    ResumeDraft.objects.create(
-                        consultant=consultant,
-                        job=job,
-                        version=1,
-                        status=ResumeDraft.Status.ERROR,
-                        error_message=str(exc)[:500],
-                        auto_generated=True,
-                    )
-                except Exception:
-                    pass
-                failed += 1
-
-        # Progress update
-        if hasattr(self, 'update_state'):
-            self.update_state(
-                state="PROGRESS",
-                meta={
-                    "current": job_idx + 1,
-                    "total": total_jobs,
-                    "message": f"Processed {job_idx + 1}/{total_jobs} jobs — {generated} resumes generated",
-                },
-            )
+            pairs.append((consultant.pk, job.pk))
 
     result = {
         "processed_jobs": total_jobs,
         "total_pairs": pairs_found,
-        "generated": generated,
+        "queued": len(pairs),
         "skipped": skipped,
-        "failed": failed,
         "dry_run": dry_run,
     }
-    logger.info("auto_generate_for_new_jobs complete: %s", result)
+    if not dry_run:
+        fan_out = _dispatch_pairs(pairs, {"source": "auto_generate_for_new_jobs", "pairs": len(pairs)})
+        if fan_out is not None:
+            result["summary_task_id"] = fan_out.id
+    if hasattr(self, 'update_state'):
+        self.update_state(
+            state="PROGRESS",
+            meta={
+                "current": total_jobs,
+                "total": total_jobs,
+                "message": f"Queued {len(pairs)} resume(s) across {total_jobs} jobs",
+            },
+        )
+    logger.info("auto_generate_for_new_jobs dispatched: %s", result)
     return result
 
 
@@ -263,7 +354,6 @@ def generate_for_consultant_task(
     from jobs.models import Job
     from users.models import ConsultantProfile
     from resumes.models import ResumeDraft
-    from resumes.engine import generate_resume
 
     try:
         consultant = ConsultantProfile.objects.prefetch_related("marketing_roles").get(pk=consultant_id)
@@ -275,8 +365,11 @@ def generate_for_consultant_task(
         return {"error": "Consultant has no marketing roles assigned", "consultant_id": consultant_id}
 
     # Find POOL jobs matching consultant's roles, excluding existing drafts
+    # (auto drafts stuck in PROCESSING are re-dispatched; the worker is idempotent)
     existing_job_ids = set(
-        ResumeDraft.objects.filter(consultant=consultant).values_list("job_id", flat=True)
+        ResumeDraft.objects.filter(consultant=consultant)
+        .exclude(auto_generated=True, status=ResumeDraft.Status.PROCESSING)
+        .values_list("job_id", flat=True)
     )
     jobs = list(
         Job.objects.filter(
@@ -292,57 +385,87 @@ def generate_for_consultant_task(
         jobs = jobs[:max_jobs]
 
     total = len(jobs)
-    generated = 0
-    failed = 0
-
-    for idx, job in enumerate(jobs):
-        if dry_run:
-            generated += 1
-            continue
-
-        try:
-            content, tokens, error, metadata = generate_resume(job=job, consultant=consultant)
-            if error:
-                ResumeDraft.objects.create(
-                    consultant=consultant, job=job, version=1,
-                    status=ResumeDraft.Status.ERROR,
-                    error_message=(error or "")[:500],
-                    auto_generated=True,
-                )
-                failed += 1
-            else:
-                from resumes.services import validate_resume, score_ats
-                errors_list, warnings_list = validate_resume(content or "")
-                ats = score_ats(job.description or "", content or "")
-                ResumeDraft.objects.create(
-                    consultant=consultant, job=job, version=1,
-                    status=ResumeDraft.Status.REVIEW if errors_list else ResumeDraft.Status.DRAFT,
-                    content=content or "",
-                    tokens_used=tokens,
-                    ats_score=ats,
-                    validation_errors=errors_list,
-                    validation_warnings=warnings_list,
-                    llm_system_prompt=metadata.get("system_prompt", ""),
-                    llm_user_prompt=metadata.get("user_prompt", ""),
-                    llm_input_summary=metadata.get("input_sections", {}),
-                    auto_generated=True,
-                )
-                generated += 1
-        except Exception as exc:
-            logger.error("Exception for consultant %s × job %s: %s", consultant_id, job.pk, exc)
-            failed += 1
-
-        if hasattr(self, 'update_state'):
-            self.update_state(state="PROGRESS", meta={
-                "current": idx + 1, "total": total,
-                "message": f"{idx + 1}/{total} — {generated} generated",
-            })
+    pairs = [(consultant.pk, job.pk) for job in jobs]
+    fan_out = None if dry_run else _dispatch_pairs(
+        pairs, {"source": "generate_for_consultant", "consultant_id": consultant_id, "pairs": total}
+    )
+    if hasattr(self, 'update_state'):
+        self.update_state(state="PROGRESS", meta={
+            "current": total, "total": total,
+            "message": f"Queued {total} resume(s)",
+        })
 
     return {
         "consultant_id": consultant_id,
         "consultant_name": consultant.user.get_full_name(),
         "jobs_matched": total,
-        "generated": generated,
-        "failed": failed,
+        "queued": total,
+        "summary_task_id": fan_out.id if fan_out is not None else None,
         "dry_run": dry_run,
     }
+
+
+# ── Export artifacts (resumes.export_cache) ──────────────────────────────────
+
+@shared_task(name="resumes.prerender_exports")
+def prerender_resume_exports_task(draft_id: int):
+    """Render the PDF/DOCX artifacts for a draft's current editor state ahead of download."""
+    from resumes.export_cache import clear_prerender_pending, prerender
+    from resumes.models import ResumeDraft
+
+    clear_prerender_pending(draft_id)  # edits from here on queue another run
+    draft = (
+        ResumeDraft.objects.select_related("editor_state__template")
+        .filter(pk=draft_id)
+        .first()
+    )
+    if draft is None:
+        return {"draft_id": draft_id, "error": "not found"}
+    return {"draft_id": draft_id, **prerender(draft)}
+
+
+@shared_task(
+    bind=True,
+    name="resumes.render_exports",
+    soft_time_limit=1800,
+    time_limit=1900,
+)
+def render_resume_exports_task(self, draft_ids: list[int], formats: Optional[list[str]] = None,
+                               requested_by: Optional[int] = None):
+    """
+    Render many drafts into one ZIP (resumes.export_cache.build_export_bundle).
+
+    Enqueue with enqueue_export_bundle() so it lands on RESUME_EXPORT_QUEUE;
+    poll /core/api/task-progress/<id>/ and fetch the ZIP from the bundle download URL.
+    """
+    from core.task_progress import update_task_progress
+    from resumes.export_cache import build_export_bundle
+
+    bundle_id = self.request.id or uuid.uuid4().hex
+    update_task_progress(self, current=0, total=len(draft_ids), message="Preparing export…")
+    result = build_export_bundle(
+        bundle_id,
+        draft_ids,
+        formats or ["pdf", "docx"],
+        progress=lambda done, total, msg: update_task_progress(self, current=done, total=total, message=msg),
+    )
+    return {"bundle_id": bundle_id, "requested_by": requested_by, **result}
+
+
+def enqueue_export_bundle(draft_ids: list[int], formats: Optional[list[str]] = None,
+                          requested_by: Optional[int] = None):
+    """Queue render_resume_exports_task on the dedicated export queue; returns the AsyncResult."""
+    from django.conf import settings
+
+    return render_resume_exports_task.apply_async(
+        kwargs={"draft_ids": list(draft_ids), "formats": formats, "requested_by": requested_by},
+        queue=getattr(settings, "RESUME_EXPORT_QUEUE", "exports"),
+    )
+
+
+@shared_task(name="resumes.purge_stale_exports")
+def purge_stale_exports_task(older_than_days: int = 30):
+    """Delete cached export artifacts written more than `older_than_days` ago."""
+    from resumes.export_cache import purge_stale_exports
+
+    return {"removed": purge_stale_exports(older_than_days)}
@@ -100,6 +100,48 @@ class ResumeViewTests(TestCase):
         resp = self.client.get(url)
         self.assertEqual(resp.status_code, 200)
 
+    def test_docx_export_is_cached_and_revalidated_by_etag(self):
+        import tempfile
+        from unittest.mock import patch
+        from django.test import override_settings
+
+        self.client.login(username="emp1", password="testpass")
+        url = reverse("resume-export-docx", args=[self.draft.pk])
+        with tempfile.TemporaryDirectory() as media, override_settings(MEDIA_ROOT=media):
+            first = self.client.get(url)
+            self.assertEqual(first.status_code, 200)
+            etag = first["ETag"]
+            with patch("resumes.export_cache.FORMATS", {"docx": (None, None)}):
+                # A stored artifact is served without rendering again
+                again = self.client.get(url)
+                self.assertEqual(again.content, first.content)
+                not_modified = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(not_modified.status_code, 304)
+
+    def test_bulk_export_renders_a_zip_bundle(self):
+        import io
+        import json
+        import tempfile
+        import zipfile
+        from django.core.files.storage import default_storage
+        from django.test import override_settings
+        from resumes.export_cache import bundle_path
+
+        self.client.login(username="emp1", password="testpass")
+        with tempfile.TemporaryDirectory() as media, override_settings(MEDIA_ROOT=media):
+            resp = self.client.post(
+                reverse("resume-export-bundle"),
+                data=json.dumps({"draft_ids": [self.draft.pk, 999999], "formats": ["docx"]}),
+                content_type="application/json",
+            )
+            self.assertEqual(resp.status_code, 202)
+            body = resp.json()
+            self.assertIn(body["task_id"], body["download_url"])
+            with default_storage.open(bundle_path(body["task_id"]), "rb") as fh:
+                names = zipfile.ZipFile(io.BytesIO(fh.read())).namelist()
+        self.assertEqual(len(names), 1)
+        self.assertTrue(names[0].endswith(".docx"))
+
     def test_draft_detail_unauthenticated(self):
         url = reverse("draft-detail", args=[self.draft.pk])
         resp = self.client.get(url)
@@ -162,3 +204,164 @@ class EngineInputSectionsTests(TestCase):
             }
         )
         self.assertIsNotNone(err)
+
+
+class AutoDraftPipelineTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        from users.models import MarketingRole
+
+        cache.clear()
+        self.role = MarketingRole.objects.create(name="Auto Draft Test Role", slug="auto-draft-test-role")
+        employee = User.objects.create_user(username="autoemp", password="x", role=User.Role.EMPLOYEE)
+        user = User.objects.create_user(username="autocon", password="x", role=User.Role.CONSULTANT)
+        self.profile = ConsultantProfile.objects.create(user=user, skills=["Python"])
+        self.profile.marketing_roles.add(self.role)
+        self.job = Job.objects.create(
+            title="Data Engineer", company="Co", posted_by=employee, description="Python pipelines",
+            status="POOL",
+        )
+        self.job.marketing_roles.add(self.role)
+
+    def _fake_generate(self, **kwargs):
+        content = "PROFESSIONAL SUMMARY\nEngineer\nSKILLS\nPython\nPROFESSIONAL EXPERIENCE\n- Built pipelines\nEDUCATION\nBSc"
+        return content, 120, None, {"system_prompt": "S"}
+
+    def test_fan_out_is_idempotent_per_pair(self):
+        from unittest.mock import patch
+        from .tasks import auto_draft_key, auto_generate_for_new_jobs_task, generate_auto_draft_task
+
+        with patch("resumes.engine.generate_resume", side_effect=self._fake_generate) as gen:
+            result = auto_generate_for_new_jobs_task.apply(kwargs={"job_ids": [self.job.pk]}).get()
+            self.assertEqual(result["queued"], 1)
+            again = generate_auto_draft_task.apply(args=(self.profile.pk, self.job.pk)).get()
+        self.assertEqual(gen.call_count, 1)
+        self.assertEqual(again["status"], "skipped")
+        draft = ResumeDraft.objects.get(consultant=self.profile, job=self.job)
+        self.assertEqual(draft.generation_id, auto_draft_key(self.profile.pk, self.job.pk))
+        self.assertEqual(draft.tokens_used, 120)
+        self.assertTrue(draft.auto_generated)
+
+    def test_pair_leased_by_another_worker_is_skipped(self):
+        from unittest.mock import patch
+        from core.shared_state import add_flag
+        from .tasks import auto_draft_key, generate_auto_draft_task
+
+        add_flag(f"resumes:auto-draft:{auto_draft_key(self.profile.pk, self.job.pk)}", 60)
+        with patch("resumes.engine.generate_resume", side_effect=self._fake_generate) as gen:
+            result = generate_auto_draft_task.apply(args=(self.profile.pk, self.job.pk)).get()
+        gen.assert_not_called()
+        self.assertEqual(result["status"], "skipped")
+        self.assertEqual(
+            ResumeDraft.objects.get(consultant=self.profile, job=self.job).status, ResumeDraft.Status.PROCESSING
+        )
+
+    def test_exhausted_budget_retries_then_records_error(self):
+        from unittest.mock import patch
+        from django.core.cache import cache
+        from django.test import override_settings
+        from core.llm_throttle import SLOT_KEY
+        from .tasks import generate_auto_draft_task
+
+        cache.add(SLOT_KEY.format(n=0), "busy", timeout=60)
+        with override_settings(LLM_MAX_CONCURRENCY=1, LLM_SLOT_WAIT_SECONDS=0, SHARED_STATE_REDIS_URL=""), \
+                patch.object(generate_auto_draft_task, "max_retries", 2), \
+                patch("resumes.engine.generate_resume", side_effect=self._fake_generate) as gen:
+            generate_auto_draft_task.apply(args=(self.profile.pk, self.job.pk))
+        gen.assert_not_called()
+        draft = ResumeDraft.objects.get(consultant=self.profile, job=self.job)
+        self.assertEqual(draft.status, ResumeDraft.Status.ERROR)
+        self.assertIn("LLM budget unavailable", draft.error_message)
+
+    def test_web_request_waits_briefly_when_slots_are_busy(self):
+        import time
+        from unittest.mock import MagicMock
+        from django.core.cache import cache
+        from django.test import override_settings
+        from core.llm_throttle import SLOT_KEY
+        from .services import LLMService
+
+        llm = LLMService()
+        llm.client = MagicMock()
+        cache.add(SLOT_KEY.format(n=0), "busy", timeout=60)
+        with override_settings(
+            LLM_MAX_CONCURRENCY=1, LLM_SLOT_WAIT_SECONDS=30, LLM_INTERACTIVE_WAIT_SECONDS=0.5,
+            SHARED_STATE_REDIS_URL="",
+        ):
+            started = time.monotonic()
+            content, tokens, error = llm.generate_with_prompts(self.job, self.profile, "system", "user")
+        self.assertLess(time.monotonic() - started, 3)
+        self.assertIsNone(content)
+        self.assertIn("busy", error)
+        llm.client.chat.completions.create.assert_not_called()
+
+
+class CandidateBlockCacheTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        user = User.objects.create_user(username="cachecon", password="x", first_name="Ada", last_name="L")
+        self.profile = ConsultantProfile.objects.create(user=user, skills=["Python"], preferred_location="Austin, TX")
+
+    def test_block_is_reused_until_profile_changes(self):
+        import datetime
+        from users.models import Experience
+        from .engine import HEADER_LOCATION_REF, cached_candidate_input
+
+        first = cached_candidate_input(self.profile)
+        self.assertIn(HEADER_LOCATION_REF, first)
+        self.assertNotIn("Austin, TX", first)
+        with self.assertNumQueries(0):
+            self.assertEqual(cached_candidate_input(self.profile), first)
+
+        Experience.objects.create(
+            consultant_profile=self.profile, title="Staff Engineer", company="Initech",
+            start_date=datetime.date(2020, 1, 1),
+        )
+        self.profile.refresh_from_db()
+        self.assertIn("Staff Engineer", cached_candidate_input(self.profile))
+
+
+class JDAnalysisTests(TestCase):
+    JD = (
+        "We need a Python engineer with Django, PostgreSQL and Kubernetes. "
+        "Experience with Java services is a plus. Build reliable data pipelines in Python."
+    )
+
+    def test_analysis_matches_extract_keywords_and_is_memoised(self):
+        from .jd_analysis import analyze_jd
+        from .services import extract_keywords
+
+        first = analyze_jd(self.JD)
+        self.assertIs(analyze_jd(self.JD), first)
+        self.assertEqual(first.top_keywords(30), extract_keywords(self.JD, max_keywords=30))
+
+    def test_score_counts_whole_tokens_only(self):
+        from .services import score_ats
+
+        self.assertEqual(score_ats(self.JD, ""), 0)
+        full = score_ats(self.JD, self.JD)
+        self.assertEqual(full, 100)
+        # "javascript" contains "java" but is a different skill
+        with_js = score_ats(self.JD, "Python, Django, JavaScript.")
+        with_java = score_ats(self.JD, "Python, Django, Java.")
+        self.assertLess(with_js, with_java)
+
+    def test_required_terms_cache_llm_answers_only(self):
+        from unittest.mock import patch
+        from django.core.cache import cache
+        from .skills_extractor import extract_required_terms_from_jd
+
+        cache.clear()
+        with patch("resumes.skills_extractor.LLMService") as llm_cls:
+            llm = llm_cls.return_value
+            llm.client = None
+            fallback = extract_required_terms_from_jd(self.JD)
+            self.assertIn("django", fallback)
+
+            llm.client = object()
+            llm.generate_with_prompts.return_value = ('["Python", "Django"]', 10, None)
+            self.assertEqual(extract_required_terms_from_jd(self.JD), ["python", "django"])
+            self.assertEqual(extract_required_terms_from_jd(self.JD), ["python", "django"])
+        self.assertEqual(llm.generate_with_prompts.call_count, 1)
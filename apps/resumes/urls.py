@@ -8,6 +8,7 @@ from .views import (
     # Template editor
     ResumeEditorView, ResumeEditorSaveView, ResumeEditorPreviewView,
     ResumeExportDOCXView, ResumeExportPDFView,
+    ResumeExportBundleCreateView, ResumeExportBundleDownloadView,
     ResumeTemplateSaveView, ResumeTemplateDeleteView, ResumeTemplateListView,
     # Consultant self-resume & cover letter
     ConsultantResumeGeneratePageView,
@@ -36,6 +37,8 @@ urlpatterns = [
     path('drafts/<int:pk>/editor/preview/', ResumeEditorPreviewView.as_view(), name='resume-editor-preview'),
     path('drafts/<int:pk>/export/docx/', ResumeExportDOCXView.as_view(), name='resume-export-docx'),
     path('drafts/<int:pk>/export/pdf/', ResumeExportPDFView.as_view(), name='resume-export-pdf'),
+    path('exports/', ResumeExportBundleCreateView.as_view(), name='resume-export-bundle'),
+    path('exports/<str:task_id>/download/', ResumeExportBundleDownloadView.as_view(), name='resume-export-bundle-download'),
 
     # ── Template CRUD ────────────────────────────────────────────────
     path('templates/', ResumeTemplateListView.as_view(), name='resume-template-list'),
@@ -22,7 +22,7 @@ from .engine import (
 from users.models import ConsultantProfile, User
 from core.models import LLMConfig
 from core.feature_flags import feature_enabled_for
-from jobs.services import JDParserService
+from jobs.services import ensure_parsed_jd
 
 class AdminOrEmployeeMixin(LoginRequiredMixin, UserPassesTestMixin):
     """Only Admins and Employees can access draft features."""
@@ -209,8 +209,7 @@ class DraftRegenerateView(DraftRegenerateAccessMixin, BaseView):
         consultant_profile = existing.consultant
         job = existing.job
 
-        if not job.parsed_jd:
-            JDParserService.parse_job(job, actor=request.user)
+        ensure_parsed_jd(job, actor=request.user)
 
         post_sections = parse_input_sections_from_request(request)
         effective = merge_input_sections(MasterPrompt.get_active(), post_sections)
@@ -596,7 +595,13 @@ from django.http import JsonResponse
 from django.utils.text import slugify
 from .models import ResumeTemplate, ResumeEditorState
 from .parser import parse_resume
-from .export_utils import export_docx, export_pdf, export_pdf_html, render_resume_html
+from django.db import transaction as _transaction
+from django.http import HttpResponseNotModified
+from django.utils.http import parse_etags
+from .export_cache import (
+    FORMATS as EXPORT_FORMATS, artifact_key, export_filename, export_inputs, get_or_render, schedule_prerender,
+)
+from .export_utils import export_pdf_html, render_resume_html
 
 
 class ResumeEditorView(DraftAccessMixin, BaseView):
@@ -683,6 +688,7 @@ class ResumeEditorSaveView(AdminOrEmployeeMixin, BaseView):
                 state.template = None
 
         state.save()
+        _transaction.on_commit(lambda: schedule_prerender(draft.pk))
         return JsonResponse({'ok': True, 'saved_at': state.updated_at.isoformat()})
 
 
@@ -702,6 +708,27 @@ class ResumeEditorPreviewView(AdminOrEmployeeMixin, BaseView):
         return HttpResponse(html)
 
 
+def _not_modified(request, etag):
+    """True when the client's If-None-Match already names this artifact."""
+    header = request.headers.get('If-None-Match', '')
+    return bool(header) and (header.strip() == '*' or etag in parse_etags(header))
+
+
+def _artifact_response(request, draft, fmt, sections, tpl_cfg):
+    """Serve a cached export artifact (see export_cache) with a strong ETag; 304 when unchanged."""
+    key = artifact_key(sections, tpl_cfg, fmt)
+    etag = f'"{key}"'
+    if _not_modified(request, etag):
+        resp = HttpResponseNotModified()
+    else:
+        data = get_or_render(sections, tpl_cfg, fmt, key=key)
+        resp = HttpResponse(data, content_type=EXPORT_FORMATS[fmt][0])
+        resp['Content-Disposition'] = f'attachment; filename="{export_filename(draft, fmt)}"'
+    resp['ETag'] = etag
+    resp['Cache-Control'] = 'private, no-cache'
+    return resp
+
+
 class ResumeExportDOCXView(DraftAccessMixin, BaseView):
     """Download DOCX with current editor state + template."""
 
@@ -709,23 +736,8 @@ class ResumeExportDOCXView(DraftAccessMixin, BaseView):
         draft = get_object_or_404(ResumeDraft, pk=pk)
         self._draft = draft
 
-        state = getattr(draft, 'editor_state', None)
-        sections = state.sections_json if state else parse_resume(draft.content or '')
-        tpl = (state.template if state and state.template else
-               ResumeTemplate.objects.filter(is_builtin=True).first())
-        tpl_cfg = tpl.to_dict() if tpl else {}
-
-        docx_bytes = export_docx(sections, tpl_cfg)
-        consultant = draft.consultant.user.get_full_name() or draft.consultant.user.username
-        job_title  = draft.job.title.replace(' ', '_')[:40]
-        filename   = f"{consultant.replace(' ','_')}_{job_title}_v{draft.version}.docx"
-
-        resp = HttpResponse(
-            docx_bytes,
-            content_type='application/vnd.openxmlformats-officedocument.wordprocessingml.document'
-        )
-        resp['Content-Disposition'] = f'attachment; filename="{filename}"'
-        return resp
+        sections, tpl_cfg = export_inputs(draft)
+        return _artifact_response(request, draft, 'docx', sections, tpl_cfg)
 
     def get_object(self):
         return getattr(self, '_draft', None) or get_object_or_404(ResumeDraft, pk=self.kwargs['pk'])
@@ -738,28 +750,15 @@ class ResumeExportPDFView(DraftAccessMixin, BaseView):
         draft = get_object_or_404(ResumeDraft, pk=pk)
         self._draft = draft
 
-        state    = getattr(draft, 'editor_state', None)
-        sections = state.sections_json if state else parse_resume(draft.content or '')
-        tpl      = (state.template if state and state.template else
-                    ResumeTemplate.objects.filter(is_builtin=True).first())
-        tpl_cfg  = tpl.to_dict() if tpl else {}
-
-        consultant = draft.consultant.user.get_full_name() or draft.consultant.user.username
-        job_title  = draft.job.title.replace(' ', '_')[:40]
-        safe_name  = consultant.replace(' ', '_')
+        sections, tpl_cfg = export_inputs(draft)
 
         try:
-            pdf_bytes = export_pdf(sections, tpl_cfg)
-            filename  = f"{safe_name}_{job_title}_v{draft.version}.pdf"
-            resp = HttpResponse(pdf_bytes, content_type='application/pdf')
-            resp['Content-Disposition'] = f'attachment; filename="{filename}"'
-            return resp
+            return _artifact_response(request, draft, 'pdf', sections, tpl_cfg)
         except ImportError:
             # No PDF library installed — serve print-ready HTML (browser prints to PDF)
             html = export_pdf_html(sections, tpl_cfg)
-            filename = f"{safe_name}_{job_title}_v{draft.version}_print.html"
             resp = HttpResponse(html, content_type='text/html; charset=utf-8')
-            resp['Content-Disposition'] = f'inline; filename="{filename}"'
+            resp['Content-Disposition'] = f'inline; filename="{export_filename(draft, "html", "_print")}"'
             return resp
         except Exception as e:
             messages.error(request, f'PDF generation failed: {e}')
@@ -769,6 +768,66 @@ class ResumeExportPDFView(DraftAccessMixin, BaseView):
         return getattr(self, '_draft', None) or get_object_or_404(ResumeDraft, pk=self.kwargs['pk'])
 
 
+class ResumeExportBundleCreateView(AdminOrEmployeeMixin, BaseView):
+    """
+    Queue a background export of many drafts (JSON: {"draft_ids": [...], "formats": ["pdf", "docx"]}).
+
+    Rendering runs on the export worker queue; poll progress_url, then GET download_url.
+    """
+
+    def post(self, request):
+        from .export_cache import MAX_BUNDLE_DRAFTS
+        from .tasks import enqueue_export_bundle
+
+        try:
+            body = _json.loads(request.body)
+            draft_ids = [int(pk) for pk in body.get('draft_ids') or []]
+        except (ValueError, TypeError):
+            return JsonResponse({'ok': False, 'error': 'Invalid JSON'}, status=400)
+        if not draft_ids:
+            return JsonResponse({'ok': False, 'error': 'draft_ids is required'}, status=400)
+        if len(draft_ids) > MAX_BUNDLE_DRAFTS:
+            return JsonResponse({'ok': False, 'error': f'At most {MAX_BUNDLE_DRAFTS} drafts per export'}, status=400)
+        formats = [f for f in (body.get('formats') or ['pdf', 'docx']) if f in EXPORT_FORMATS]
+        if not formats:
+            return JsonResponse({'ok': False, 'error': 'formats must be pdf and/or docx'}, status=400)
+
+        task = enqueue_export_bundle(draft_ids, formats, requested_by=request.user.pk)
+        return JsonResponse({
+            'ok': True,
+            'task_id': task.id,
+            'progress_url': reverse('api-task-progress', args=[task.id]),
+            'download_url': reverse('resume-export-bundle-download', args=[task.id]),
+        }, status=202)
+
+
+class ResumeExportBundleDownloadView(AdminOrEmployeeMixin, BaseView):
+    """Stream the ZIP produced by render_resume_exports_task (requester or superuser only)."""
+
+    def get(self, request, task_id):
+        from celery.result import AsyncResult
+        from django.core.files.storage import default_storage
+        from django.http import FileResponse, Http404
+
+        from config.celery import app as celery_app
+
+        result = AsyncResult(task_id, app=celery_app)
+        if result.state != 'SUCCESS':
+            return JsonResponse({'ok': False, 'state': result.state}, status=409)
+        info = result.result if isinstance(result.result, dict) else {}
+        if info.get('requested_by') != request.user.pk and not request.user.is_superuser:
+            raise Http404
+        path = info.get('path')
+        if not path or not default_storage.exists(path):
+            raise Http404
+        return FileResponse(
+            default_storage.open(path, 'rb'),
+            as_attachment=True,
+            filename=f"resume-exports-{task_id[:8]}.zip",
+            content_type='application/zip',
+        )
+
+
 # ─── Template CRUD ────────────────────────────────────────────────────────────
 
 class ResumeTemplateSaveView(AdminOrEmployeeMixin, BaseView):
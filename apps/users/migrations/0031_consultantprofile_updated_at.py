@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0030_embedding_content_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='consultantprofile',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, help_text="Also bumped when experience, education, certifications or the user's name change."),
+        ),
+    ]
@@ -207,6 +207,10 @@ class ConsultantProfile(models.Model):
         blank=True,
         help_text=_("Set when the consultant finishes the onboarding wizard."),
     )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        help_text=_("Also bumped when experience, education, certifications or the user's name change."),
+    )
 
     def save(self, *args, **kwargs):
         if not self.profile_slug and self.user_id:
@@ -308,10 +312,13 @@ class ConsultantEmbedding(models.Model):
     consultant = models.OneToOneField(
         ConsultantProfile, on_delete=models.CASCADE, related_name='embedding'
     )
-    vector = models.JSONField(help_text="Embedding float list from text-embedding-3-small")
+    vector = models.JSONField(null=True, blank=True, help_text="Legacy float list (superseded by vector_f32)")
+    vector_f32 = models.BinaryField(null=True, editable=False, help_text="L2-normalised float32 vector (jobs.vector_index)")
+    dims = models.PositiveSmallIntegerField(default=0)
     model = models.CharField(max_length=80, default='text-embedding-3-small')
+    content_hash = models.CharField(max_length=64, blank=True, default='', help_text="sha256 of model + embedded text")
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         verbose_name = "Consultant Embedding"
@@ -0,0 +1,35 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+_PROFILE_CHILDREN = ("users.Experience", "users.Education", "users.Certification")
+
+
+def _touch_profile(**lookup):
+    """
+    Bump ConsultantProfile.updated_at without a full save (so no profile
+    post_save side effects). The resume engine keys its cached candidate
+    block on updated_at.
+    """
+    from .models import ConsultantProfile
+
+    ConsultantProfile.objects.filter(**lookup).update(updated_at=timezone.now())
+
+
+def _profile_child_changed(sender, instance, **kwargs):
+    if kwargs.get("raw"):
+        return
+    _touch_profile(pk=instance.consultant_profile_id)
+
+
+for _model in _PROFILE_CHILDREN:
+    post_save.connect(_profile_child_changed, sender=_model, dispatch_uid=f"users.touch_profile.save.{_model}")
+    post_delete.connect(_profile_child_changed, sender=_model, dispatch_uid=f"users.touch_profile.delete.{_model}")
+
+
+@receiver(post_save, sender="users.User")
+def touch_profile_on_user_change(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    """Name / email feed the resume header, so user edits also bump the profile."""
+    if created or raw or (update_fields and set(update_fields) <= {"last_login"}):
+        return
+    _touch_profile(user_id=instance.pk)
@@ -0,0 +1,421 @@
+"""
+Company identity resolution index.
+
+Shared by push ingest (harvest.push_api), Jarvis imports
+(harvest.tasks._jarvis_resolve_company) and the duplicate review
+(services.find_potential_duplicate_companies), which used to run their own
+icontains scans for every name.
+
+The index is built once per process from a single values_list() query:
+
+  key     → ids   normalised name/alias ("Acme, Inc." → "acme")
+  compact → ids   key without spaces ("Applied Systems" ↔ "Appliedsystems")
+  domain  → ids   normalised host of Company.domain / Company.website
+                  (services.normalize_domain: careers.acme.co.uk → acme.co.uk;
+                  no label-count guess, so acme.co.uk and other.co.uk differ)
+  token   → ids   word postings for fuzzy candidate lookups
+
+Company post_save / post_delete patch the local index in place
+(companies.signals) and append the pk to a change log in the broker Redis
+(core.shared_state): a sorted set scored by a generation counter. Other
+processes replay the ids logged since their generation, re-reading just those
+rows, and only rebuild when the log was trimmed past them. Without Redis they
+catch up on the TTL below. Queryset .update() bypasses signals, so the index
+is also rebuilt every INDEX_TTL_SECONDS, and ids that no longer exist are
+dropped when a lookup hits them.
+"""
+from __future__ import annotations
+
+import re
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Iterable
+
+import redis
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+from core.shared_state import get_redis, mark_unavailable
+
+from .models import Company
+
+INDEX_TTL_SECONDS = 300
+MEMO_SIZE = 10_000
+GENERATION_KEY = "companies:resolution-index:generation"
+CHANGES_KEY = "companies:resolution-index:changes"
+CHANGES_TRIMMED_KEY = "companies:resolution-index:changes-trimmed"
+CHANGE_LOG_SIZE = 10_000
+
+# KEYS = generation, changes, trimmed; ARGV = log size, pk... Returns the new generation.
+_RECORD_CHANGES_LUA = """
+local gen = redis.call('INCR', KEYS[1])
+for i = 2, #ARGV do
+  redis.call('ZADD', KEYS[2], gen, ARGV[i])
+end
+local excess = redis.call('ZCARD', KEYS[2]) - tonumber(ARGV[1])
+if excess > 0 then
+  local dropped = redis.call('ZRANGE', KEYS[2], 0, excess - 1, 'WITHSCORES')
+  redis.call('SET', KEYS[3], dropped[#dropped])
+  redis.call('ZREMRANGEBYRANK', KEYS[2], 0, excess - 1)
+end
+return gen
+"""
+
+NAME_KEY_STOPWORDS = frozenset({
+    "the", "inc", "incorporated", "llc", "ltd", "ltda", "corp", "corporation",
+    "co", "company", "group", "holdings", "plc", "gmbh",
+    "sa", "bv", "srl", "pte", "and", "of", "for", "a", "an", "do", "de", "da",
+})
+
+
+def clean_company_name(raw: str) -> str:
+    """Collapse whitespace and strip stray punctuation from a scraped company name."""
+    return re.sub(r"\s+", " ", raw or "").strip(" -_,.")
+
+
+def company_name_key(raw: str) -> str:
+    """Normalise a name for identity checks (ignore punctuation / legal suffix noise)."""
+    if not raw:
+        return ""
+    text = raw.strip().lower().replace("&", " and ")
+    tokens = re.sub(r"[^a-z0-9]+", " ", text).split()
+    if not tokens:
+        return ""
+    reduced = [t for t in tokens if t not in NAME_KEY_STOPWORDS] or tokens
+    return " ".join(reduced)
+
+
+def name_tokens(raw: str) -> set[str]:
+    """Lower-cased alphanumeric words of a name (no stopword removal)."""
+    return set(re.sub(r"[^a-z0-9]+", " ", (raw or "").lower()).split())
+
+
+def domain_key(value: str) -> str:
+    """Normalised host of a URL or hostname (https://careers.acme.co.uk/x → acme.co.uk)."""
+    from .services import normalize_domain
+
+    return normalize_domain(value or "").split(":")[0].strip(".")
+
+
+INDEX_FIELDS = ("id", "name", "alias", "domain", "website")
+
+
+class CompanyIndex:
+    """In-memory identity index over every Company (see module docstring)."""
+
+    def __init__(self, generation: int = 0):
+        self.generation = generation
+        self.built_at = time.monotonic()
+        self._entries: dict[int, tuple] = {}
+        self._by_key: dict[str, set[int]] = defaultdict(set)
+        self._by_compact: dict[str, set[int]] = defaultdict(set)
+        self._by_domain: dict[str, set[int]] = defaultdict(set)
+        self._postings: dict[str, set[int]] = defaultdict(set)
+        self._memo: OrderedDict[tuple[str, str], int | None] = OrderedDict()
+
+    @classmethod
+    def build(cls, generation: int = 0) -> "CompanyIndex":
+        index = cls(generation)
+        for row in Company.objects.values_list(*INDEX_FIELDS).iterator(chunk_size=5000):
+            index.add(*row)
+        return index
+
+    def refresh(self, pks: Iterable[int], generation: int) -> None:
+        """Re-read only the given Companies (one query) and move to `generation`."""
+        pks = set(pks)
+        found = set()
+        for row in Company.objects.filter(pk__in=pks).values_list(*INDEX_FIELDS):
+            self.add(*row)
+            found.add(row[0])
+        for pk in pks - found:
+            self.remove(pk)
+        self.generation = generation
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def expired(self) -> bool:
+        return time.monotonic() - self.built_at > INDEX_TTL_SECONDS
+
+    # ── maintenance ──────────────────────────────────────────────────────────
+
+    def add(self, pk: int, name: str, alias: str = "", domain: str = "", website: str = "") -> None:
+        self.remove(pk)
+        keys = {k for k in (company_name_key(name), company_name_key(alias)) if k}
+        compacts = {k.replace(" ", "") for k in keys}
+        domains = {d for d in (domain_key(domain), domain_key(website)) if d}
+        tokens = frozenset(name_tokens(name) | name_tokens(alias))
+        self._entries[pk] = (name or "", keys, compacts, domains, tokens)
+        for k in keys:
+            self._by_key[k].add(pk)
+        for k in compacts:
+            self._by_compact[k].add(pk)
+        for d in domains:
+            self._by_domain[d].add(pk)
+        for t in tokens:
+            self._postings[t].add(pk)
+        self._memo.clear()
+
+    def add_company(self, company: Company) -> None:
+        self.add(company.pk, company.name, company.alias, company.domain, company.website)
+
+    def remove(self, pk: int) -> None:
+        entry = self._entries.pop(pk, None)
+        if entry is None:
+            return
+        _, keys, compacts, domains, tokens = entry
+        for table, values in (
+            (self._by_key, keys), (self._by_compact, compacts),
+            (self._by_domain, domains), (self._postings, tokens),
+        ):
+            for v in values:
+                ids = table.get(v)
+                if ids is not None:
+                    ids.discard(pk)
+                    if not ids:
+                        del table[v]
+        self._memo.clear()
+
+    # ── lookups ──────────────────────────────────────────────────────────────
+
+    def name_of(self, pk: int) -> str:
+        entry = self._entries.get(pk)
+        return entry[0] if entry else ""
+
+    def tokens_of(self, pk: int) -> frozenset[str]:
+        entry = self._entries.get(pk)
+        return entry[4] if entry else frozenset()
+
+    def domains_of(self, pk: int) -> set[str]:
+        entry = self._entries.get(pk)
+        return entry[3] if entry else set()
+
+    def best(self, ids: Iterable[int]) -> int | None:
+        """Prefer the shortest (most canonical) name, then alphabetical."""
+        ids = [i for i in ids if i in self._entries]
+        if not ids:
+            return None
+        return min(ids, key=lambda i: (len(self.name_of(i)), self.name_of(i).lower(), i))
+
+    def by_domain(self, domain: str) -> set[int]:
+        return set(self._by_domain.get(domain_key(domain), ()))
+
+    def by_name(self, name: str) -> set[int]:
+        """Ids whose name/alias key (or compact key) equals that of `name`."""
+        key = company_name_key(name)
+        if not key:
+            return set()
+        ids = self._by_key.get(key)
+        if ids:
+            return set(ids)
+        return set(self._by_compact.get(key.replace(" ", ""), ()))
+
+    def by_token(self, token: str) -> set[int]:
+        return set(self._postings.get((token or "").lower(), ()))
+
+    def candidates(self, tokens: Iterable[str]) -> set[int]:
+        found: set[int] = set()
+        for t in tokens:
+            found.update(self._postings.get(t, ()))
+        return found
+
+    def match(self, name: str, domain: str = "") -> int | None:
+        """
+        Best id for a name (domain first when given), memoised per (key, domain).
+
+        Takes _index_lock: the LRU memo is reordered on every hit and the index
+        is shared by every thread in the process.
+        """
+        memo_key = (company_name_key(name), domain_key(domain) if domain else "")
+        with _index_lock:
+            if memo_key in self._memo:
+                self._memo.move_to_end(memo_key)
+                return self._memo[memo_key]
+            pk = None
+            if memo_key[1]:
+                pk = self.best(self._by_domain.get(memo_key[1], ()))
+            if pk is None and memo_key[0]:
+                pk = self.best(self.by_name(name))
+            self._memo[memo_key] = pk
+            if len(self._memo) > MEMO_SIZE:
+                self._memo.popitem(last=False)
+            return pk
+
+
+_index: CompanyIndex | None = None
+_index_lock = threading.Lock()
+
+
+def _record_changes(pks: Iterable[int]) -> int | None:
+    """Log changed Company ids for other processes; returns the new generation (None without Redis)."""
+    pks = [int(pk) for pk in pks if pk]
+    client = get_redis()
+    if not pks or client is None:
+        return None
+    try:
+        return int(client.eval(
+            _RECORD_CHANGES_LUA, 3, GENERATION_KEY, CHANGES_KEY, CHANGES_TRIMMED_KEY, CHANGE_LOG_SIZE, *pks,
+        ))
+    except redis.RedisError as exc:
+        mark_unavailable(exc)
+        return None
+
+
+def _changes_since(generation: int) -> tuple[int, set[int]] | None:
+    """
+    (current generation, ids changed after `generation`), or None when the log
+    no longer reaches back that far and the index must be rebuilt.
+    """
+    client = get_redis()
+    if client is None:
+        return generation, set()
+    try:
+        with client.pipeline(transaction=False) as pipe:
+            pipe.get(GENERATION_KEY)
+            pipe.get(CHANGES_TRIMMED_KEY)
+            pipe.zrangebyscore(CHANGES_KEY, f"({generation}", "+inf")
+            current, trimmed, members = pipe.execute()
+    except redis.RedisError as exc:
+        mark_unavailable(exc)
+        return generation, set()
+    if trimmed is not None and int(float(trimmed)) > generation:
+        return None
+    return int(current or 0), {int(m) for m in members}
+
+
+def _current_generation() -> int:
+    changes = _changes_since(0)
+    return changes[0] if changes else 0
+
+
+def get_company_index() -> CompanyIndex:
+    """Process-wide index: replays other processes' Company changes, rebuilt when the TTL lapses."""
+    global _index
+    index = _index
+    if index is not None and not index.expired():
+        changes = _changes_since(index.generation)
+        if changes is not None:
+            generation, pks = changes
+            if generation != index.generation:
+                with _index_lock:
+                    if generation > index.generation:
+                        index.refresh(pks, generation)
+            return index
+    with _index_lock:
+        if _index is index:
+            _index = CompanyIndex.build(_current_generation())
+        return _index
+
+
+def note_company_changed(company: Company, *, deleted: bool = False) -> None:
+    """Patch the local index for one Company and log the change for other processes."""
+    generation = _record_changes([company.pk])
+    index = _index
+    if index is None:
+        return
+    with _index_lock:
+        if deleted:
+            index.remove(company.pk)
+        else:
+            index.add_company(company)
+        if generation is not None and generation == index.generation + 1:
+            index.generation = generation  # nothing else happened in between
+
+
+def clear_company_index() -> None:
+    global _index
+    with _index_lock:
+        _index = None
+
+
+def _fetch(index: CompanyIndex, ids: set[int]) -> dict[int, Company]:
+    """in_bulk() the ids, dropping any the index still holds but the DB no longer has."""
+    if not ids:
+        return {}
+    found = Company.objects.in_bulk(ids)
+    stale = ids - found.keys()
+    if stale:
+        with _index_lock:
+            for pk in stale:
+                index.remove(pk)
+    return found
+
+
+def resolve_many(
+    names: Iterable[str],
+    domains: Iterable[str] | None = None,
+    *,
+    create: bool = False,
+) -> dict[str, Company | None]:
+    """
+    Resolve company names (each optionally paired with a URL or domain) in bulk.
+
+    Matching per name: root domain, then normalised name/alias key, then compact
+    key; index misses get one case-insensitive name/alias query. With
+    create=True the remaining names are bulk-created as stub Companies.
+
+    Returns {clean_company_name(name): Company | None}. Issues a constant number
+    of queries regardless of how many names are passed.
+    """
+    names = list(names)
+    domains = list(domains) if domains is not None else [""] * len(names)
+    pending: dict[str, str] = {}
+    for raw, domain in zip(names, domains):
+        name = clean_company_name(raw)
+        if name and name not in pending:
+            pending[name] = domain or ""
+    if not pending:
+        return {}
+
+    index = get_company_index()
+    result: dict[str, Company | None] = {}
+    for _attempt in range(2):
+        # A second pass only runs when the first hit ids deleted behind our back
+        matched = {name: index.match(name, domain) for name, domain in pending.items()}
+        wanted = {pk for pk in matched.values() if pk}
+        companies = _fetch(index, wanted)
+        for name, pk in matched.items():
+            if pk in companies:
+                result[name] = companies[pk]
+        pending = {n: d for n, d in pending.items() if n not in result}
+        if not pending or len(companies) == len(wanted):
+            break
+
+    if pending:
+        lowered = {n.lower(): n for n in pending}
+        rows = (
+            Company.objects.annotate(_lname=Lower("name"), _lalias=Lower("alias"))
+            .filter(Q(_lname__in=lowered) | Q(_lalias__in=lowered))
+            .order_by("name")
+        )
+        with _index_lock:
+            for company in rows:
+                index.add_company(company)
+                for lname in (company.name.lower(), (company.alias or "").lower()):
+                    name = lowered.get(lname)
+                    if name and name not in result:
+                        result[name] = company
+        pending = {n: d for n, d in pending.items() if n not in result}
+
+    if pending and create:
+        Company.objects.bulk_create([Company(name=name[:255]) for name in pending], ignore_conflicts=True)
+        created = {c.name: c for c in Company.objects.filter(name__in=[n[:255] for n in pending])}
+        generation = _record_changes(c.pk for c in created.values())
+        with _index_lock:
+            for company in created.values():
+                index.add_company(company)
+            if generation is not None and generation == index.generation + 1:
+                index.generation = generation
+        for name in pending:
+            result[name] = created.get(name[:255])
+        pending = {}
+
+    for name in pending:
+        result[name] = None
+    return result
+
+
+def resolve_company(name: str, domain: str = "", *, create: bool = False) -> Company | None:
+    """Single-name convenience wrapper around resolve_many()."""
+    return resolve_many([name], [domain], create=create).get(clean_company_name(name))
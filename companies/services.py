@@ -108,30 +108,30 @@ def find_potential_duplicate_companies(
     """
     Rules-first duplicate detection for companies.
     Returns a list of (company, score) sorted by score (1.0 = perfect match).
-    """
-    name_tokens = _tokenize(name or "")
-    domain = _extract_domain(website or "")
 
-    qs = Company.objects.all()
-    if name:
-        qs = qs.filter(name__icontains=name) | qs.filter(alias__icontains=name)
+    Candidates come from the in-memory identity index (companies.resolution):
+    companies sharing a name/alias word or the domain. Scoring runs on the
+    indexed tokens, so only the companies that clear `threshold` are loaded.
+    """
+    from .resolution import domain_key, get_company_index
 
-    candidates: list[tuple[Company, float]] = []
-    for company in qs[:50]:
-        score = 0.0
-        existing_tokens = _tokenize(company.name) | _tokenize(company.alias)
-        score = _jaccard(name_tokens, existing_tokens)
+    index = get_company_index()
+    name_tokens = _tokenize(name or "")
+    domain = domain_key(website or "")
 
+    domain_ids = index.by_domain(domain) if domain else set()
+    scored: dict[int, float] = {}
+    for pk in index.candidates(name_tokens) | domain_ids:
+        score = _jaccard(name_tokens, set(index.tokens_of(pk)))
         # Boost when domains match
-        existing_domain = _extract_domain(company.website or "")
-        if domain and existing_domain and domain == existing_domain:
+        if pk in domain_ids:
             score = max(score, 0.9)
-
         if score >= threshold:
-            candidates.append((company, score))
+            scored[pk] = score
 
-    candidates.sort(key=lambda x: x[1], reverse=True)
-    return candidates[:limit]
+    top = sorted(scored.items(), key=lambda x: (-x[1], x[0]))[:limit]
+    companies = Company.objects.in_bulk([pk for pk, _ in top])
+    return [(companies[pk], score) for pk, score in top if pk in companies]
 
 
 @transaction.atomic
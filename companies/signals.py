@@ -1,21 +1,22 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
 
-@receiver(post_save, sender="jobs.Job")
-def auto_create_company_from_job(sender, instance, **kwargs):
-    """
-    When a Job is saved with a company name but no company_obj link,
-    find-or-create the Company record and queue free enrichment.
-    """
-    # Skip if already linked
-    if instance.company_obj_id:
-        return
+FUZZY_MATCH_RATIO = 0.82
 
-    raw_name = (getattr(instance, "company", None) or "").strip()
-    if not raw_name:
-        return
 
+def company_candidates() -> list:
+    """(pk, name, alias) rows the fuzzy match scans; load once and pass to resolve_company_for_name in loops."""
+    from .models import Company
+
+    return list(Company.objects.only("pk", "name", "alias"))
+
+
+def resolve_company_for_name(raw_name: str, candidates: list | None = None):
+    """
+    Find or create the Company for a free-text company name (exact, alias, then
+    fuzzy match); a newly created Company is queued for free enrichment.
+    """
     from difflib import SequenceMatcher
     from .models import Company
     from .services import normalize_company_name
@@ -34,19 +35,68 @@ def auto_create_company_from_job(sender, instance, **kwargs):
     # 3. Fuzzy match — catch typos like "brighthorizon" → "BrightHorizons"
     if not company:
         best, best_ratio = None, 0.0
-        for c in Company.objects.only("pk", "name", "alias"):
+        for c in (candidates if candidates is not None else company_candidates()):
             ratio = SequenceMatcher(None, name_lower, c.name.lower()).ratio()
             if c.alias:
                 ratio = max(ratio, SequenceMatcher(None, name_lower, c.alias.lower()).ratio())
             if ratio > best_ratio:
                 best_ratio = ratio
                 best = c
-        if best_ratio >= 0.82:
+        if best_ratio >= FUZZY_MATCH_RATIO:
             company = best
 
     if not company:
         company = Company.objects.create(name=name)
         enrich_company_task.delay(company.pk)
+        if candidates is not None:
+            candidates.append(company)
+    return company
+
+
+def link_jobs_to_company(job_ids, company) -> int:
+    """Link still-unlinked Jobs without triggering the post_save signal again (queryset update)."""
+    from jobs.models import Job
+
+    return Job.objects.filter(pk__in=list(job_ids), company_obj__isnull=True).update(company_obj=company)
+
+
+@receiver(post_save, sender="jobs.Job")
+def auto_create_company_from_job(sender, instance, update_fields=None, **kwargs):
+    """
+    When a Job is saved with a company name but no company_obj link,
+    find-or-create the Company record and queue free enrichment.
+
+    Saves that name their update_fields without "company" skip the lookup, and
+    inside jobs.event_buffer.deferred_pipeline_events() the link is made once
+    per company name when the block exits.
+    """
+    # Skip if already linked
+    if instance.company_obj_id:
+        return
+    if update_fields is not None and "company" not in update_fields:
+        return
+
+    raw_name = (getattr(instance, "company", None) or "").strip()
+    if not raw_name:
+        return
+
+    from jobs.event_buffer import defer_company_link
+
+    if defer_company_link(instance.pk, raw_name):
+        return
+    link_jobs_to_company([instance.pk], resolve_company_for_name(raw_name))
+
+
+@receiver(post_save, sender="companies.Company")
+def refresh_company_index_on_save(sender, instance, **kwargs):
+    """Keep the identity resolution index (companies.resolution) in step with edits."""
+    from .resolution import note_company_changed
+
+    note_company_changed(instance)
+
+
+@receiver(post_delete, sender="companies.Company")
+def refresh_company_index_on_delete(sender, instance, **kwargs):
+    from .resolution import note_company_changed
 
-    # Link without triggering the signal again (use queryset update)
-    sender.objects.filter(pk=instance.pk).update(company_obj=company)
+    note_company_changed(instance, deleted=True)
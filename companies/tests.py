@@ -73,3 +73,75 @@ class CompanyViewTests(TestCase):
         url = reverse("company-list")
         resp = self.client.get(url)
         self.assertEqual(resp.status_code, 302)
+
+
+class CompanyResolutionIndexTests(TestCase):
+    def setUp(self):
+        from .resolution import clear_company_index
+
+        clear_company_index()
+        self.applied = Company.objects.create(name="Applied Systems", website="https://www.appliedsystems.com")
+        self.acme = Company.objects.create(name="Acme", alias="Acme Holdings")
+
+    def test_resolve_many_matches_keys_and_creates_in_few_queries(self):
+        from .resolution import get_company_index, resolve_many
+
+        get_company_index()
+        names = ["Appliedsystems", "ACME, Inc.", "Acme Holdings"] + [f"New Co {i}" for i in range(50)]
+        with self.assertNumQueries(4):
+            resolved = resolve_many(names, create=True)
+        self.assertEqual(resolved["Appliedsystems"].pk, self.applied.pk)
+        self.assertEqual(resolved["ACME, Inc"].pk, self.acme.pk)
+        self.assertEqual(resolved["Acme Holdings"].pk, self.acme.pk)
+        self.assertEqual(Company.objects.filter(name__startswith="New Co").count(), 50)
+        self.assertEqual(resolved["New Co 7"].name, "New Co 7")
+
+    def test_domain_match_and_save_invalidation(self):
+        from .resolution import resolve_company
+
+        self.assertEqual(resolve_company("Whatever", "https://careers.appliedsystems.com/x").pk, self.applied.pk)
+        self.acme.name = "Acme Robotics"
+        self.acme.alias = ""
+        self.acme.save()
+        self.assertIsNone(resolve_company("Acme Holdings"))
+        self.assertEqual(resolve_company("acme robotics").pk, self.acme.pk)
+
+    def test_domains_under_multi_label_suffixes_do_not_collide(self):
+        from .resolution import resolve_company
+
+        uk = Company.objects.create(name="Brightside UK", domain="brightside.co.uk")
+        Company.objects.create(name="Other UK", website="https://www.other.co.uk")
+        self.assertEqual(resolve_company("Nope", "https://careers.brightside.co.uk/jobs/1").pk, uk.pk)
+        self.assertIsNone(resolve_company("Nope", "https://unrelated.co.uk"))
+
+    def test_refresh_replays_only_changed_companies(self):
+        from .resolution import get_company_index
+
+        index = get_company_index()
+        Company.objects.filter(pk=self.acme.pk).update(name="Acme Robotics", alias="")
+        with self.assertNumQueries(1):
+            index.refresh([self.acme.pk, 10**9], index.generation + 1)
+        self.assertEqual(index.by_name("Acme Robotics"), {self.acme.pk})
+        self.assertEqual(index.by_name("Acme Holdings"), set())
+        self.assertEqual(index.by_name("Applied Systems"), {self.applied.pk})
+
+    def test_potential_duplicates_use_index_tokens(self):
+        from .services import find_potential_duplicate_companies
+
+        dupes = find_potential_duplicate_companies("Applied Systems", None, threshold=0.7)
+        self.assertEqual([c.pk for c, _ in dupes], [self.applied.pk])
+        dupes = find_potential_duplicate_companies("Other", "http://appliedsystems.com", threshold=0.7)
+        self.assertEqual(dupes[0][0].pk, self.applied.pk)
+        self.assertEqual(dupes[0][1], 0.9)
+
+    def test_concurrent_matches_share_the_memo_safely(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        from .resolution import MEMO_SIZE, get_company_index
+
+        index = get_company_index()
+        names = [f"Unknown {i}" for i in range(MEMO_SIZE + 500)] + ["Applied Systems"] * 50
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            matched = list(pool.map(index.match, names))
+        self.assertEqual(matched[-1], self.applied.pk)
+        self.assertLessEqual(len(index._memo), MEMO_SIZE)
@@ -96,7 +96,7 @@ app.conf.beat_schedule = {
     "harvest-sync-to-pool-daily": {
         "task": "harvest.sync_harvested_to_pool",
         "schedule": crontab(hour=6, minute=30),      # daily 06:30 UTC
-        "kwargs": {"max_jobs": 200},
+        "kwargs": {"max_jobs": 2000},
     },
     "harvest-cleanup-daily": {
         "task": "harvest.cleanup_harvested_jobs",
@@ -114,6 +114,21 @@ app.conf.beat_schedule = {
         "options": {"queue": "harvest"},
     },
 
+    # Dashboard rollup (RawJobRollup): recount the last few fetched days often,
+    # everything nightly. Incremental upkeep covers saves and pool sync between runs.
+    "harvest-reconcile-rawjob-rollup-recent": {
+        "task": "harvest.reconcile_rawjob_rollup",
+        "schedule": crontab(minute="5,20,35,50"),    # every 15 min
+        "kwargs": {"days": 3},
+        "options": {"queue": "harvest"},
+    },
+    "harvest-reconcile-rawjob-rollup-nightly": {
+        "task": "harvest.reconcile_rawjob_rollup",
+        "schedule": crontab(hour=1, minute=45),      # daily 01:45 UTC
+        "kwargs": {"days": 0},
+        "options": {"queue": "harvest"},
+    },
+
     # Continuously fetch missing JDs — runs every hour so new harvests get
     # their descriptions filled without manual intervention. The task itself
     # loops until all eligible rows are processed, so a single run covers
@@ -62,6 +62,14 @@ _CSRF_DEFAULT = (
 CSRF_TRUSTED_ORIGINS = _csv_list(config('CSRF_TRUSTED_ORIGINS', default=_CSRF_DEFAULT))
 
 LLM_ENCRYPTION_KEY = config('LLM_ENCRYPTION_KEY', default='')
+# Shared budget for LLM calls (core.llm_throttle): in-flight calls across all workers,
+# and tokens reserved per minute (0 = unlimited)
+LLM_MAX_CONCURRENCY = config('LLM_MAX_CONCURRENCY', default=4, cast=int)
+LLM_TOKENS_PER_MINUTE = config('LLM_TOKENS_PER_MINUTE', default=0, cast=int)
+# Slots Celery tasks may hold (0 = all but one, kept free for interactive calls),
+# and how long a web request waits for a slot before showing "busy"
+LLM_BACKGROUND_CONCURRENCY = config('LLM_BACKGROUND_CONCURRENCY', default=0, cast=int)
+LLM_INTERACTIVE_WAIT_SECONDS = config('LLM_INTERACTIVE_WAIT_SECONDS', default=3, cast=float)
 
 INSTALLED_APPS = [
     'django.contrib.admin',
@@ -71,6 +79,7 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'django.contrib.humanize',
+    'django.contrib.postgres',
 
     # Third-party
     'tailwind',
@@ -208,6 +217,9 @@ NPM_BIN_PATH = "npm"
 
 # ── Celery ────────────────────────────────────────────────────────────────────
 CELERY_BROKER_URL = config('CELERY_BROKER_URL', default='redis://localhost:6379/0')
+# Cross-process counters and leases (core.shared_state, e.g. the LLM throttle) live here;
+# LocMemCache is per process. Empty / non-redis URL = per-process fallback.
+SHARED_STATE_REDIS_URL = config('SHARED_STATE_REDIS_URL', default=CELERY_BROKER_URL)
 # Store task results in DB (django-celery-results) so they survive restarts.
 # Override via env: CELERY_RESULT_BACKEND=django-db (Docker) or redis://... (local)
 CELERY_RESULT_BACKEND = config('CELERY_RESULT_BACKEND', default='django-db')
@@ -235,6 +247,9 @@ CELERY_WORKER_PREFETCH_MULTIPLIER = 1    # fair task distribution
 # always picks them up.  Without this, Celery uses the queue named "celery"
 # by default which the worker doesn't listen to.
 CELERY_TASK_DEFAULT_QUEUE = "default"
+# Bulk resume exports (resumes.tasks.enqueue_export_bundle) run on their own queue so PDF
+# rendering never competes with UI-triggered tasks. Set to "default" when no export worker runs.
+RESUME_EXPORT_QUEUE = config('RESUME_EXPORT_QUEUE', default='exports')
 
 # Jarvis outbound HTTP (per worker process). Tune with load tests; multiply by Celery workers for cluster totals.
 # Higher throughput targets need higher max_global + enough worker concurrency; per-host protects 429/blocks.
@@ -249,6 +264,17 @@ HARVEST_BACKFILL_INTER_JOB_DELAY_SEC = config(
 )
 # Missing-JD rows with posted_date older than this are labeled "expired" (stale listings). Override via env.
 HARVEST_JD_STALE_DAYS = config('HARVEST_JD_STALE_DAYS', default=120, cast=int)
+# Refresh the RawJob MinHash signature + detect duplicates as JDs are ingested (harvest.signals).
+HARVEST_INCREMENTAL_DEDUP = config('HARVEST_INCREMENTAL_DEDUP', default=True, cast=bool)
+
+# Directory for memory-mapped embedding matrix snapshots (jobs.vector_index); empty = in-memory only
+MATCHING_INDEX_DIR = config('MATCHING_INDEX_DIR', default='')
+# Embedding backend for job–consultant matching: 'openai' or 'local' (SentenceTransformer, requirements-ml.txt)
+MATCHING_EMBEDDING_BACKEND = config('MATCHING_EMBEDDING_BACKEND', default='openai')
+MATCHING_LOCAL_EMBED_MODEL = config('MATCHING_LOCAL_EMBED_MODEL', default='BAAI/bge-small-en-v1.5')
+MATCHING_LOCAL_EMBED_INT8 = config('MATCHING_LOCAL_EMBED_INT8', default=False, cast=bool)
+# MatchScore rows kept per job (best-ranked consultants); the rest are not stored
+MATCHING_STORED_SCORES = config('MATCHING_STORED_SCORES', default=100, cast=int)
 
 # ── Local Harvesting Agent ────────────────────────────────────────────────────
 # Bearer token that the local harvesting agent must send in Authorization header.